@@ -7,36 +7,160 @@ visualization of system resources including CPU, memory, disk, and network usage
 """
 
 import os
+import select
 import sys
-import time
-from typing import Dict, List, Optional, Union
+from typing import List, Optional
 
 import typer
-from blessed import Terminal
 
-# Import internal modules
-from monitor.collectors.cpu import CPUCollector
+# Import internal modules. Everything else (the UI, numpy, the exporters
+# and transports) is imported by the commands that use it, so the batch
+# modes start without loading it.
 from monitor.config import Config, expand_paths, validate_config
-from monitor.processors.resource_processor import ResourceProcessor
-from monitor.ui.dashboard import Dashboard
-from monitor.ui.layout_manager import LayoutManager
 
 # Create Typer app
 app = typer.Typer(help="Terminal-based system monitoring tool for Linux")
 
 
-@app.command()
+# Default endpoint for `monitor agent`
+DEFAULT_AGENT_ENDPOINT = "unix:~/.local/share/linux-system-monitor/agent.sock"
+
+# Processes listed per sample by --once and `monitor batch`
+DEFAULT_BATCH_TOP = 5
+
+# Sources `monitor record` can sample (see monitor.recorder.SOURCES)
+RECORD_SOURCES = ("cpu", "pressure", "memory")
+
+
+def load_config(config_path: Optional[str], interval: Optional[float] = None,
+                metrics_port: Optional[int] = None, websocket_port: Optional[int] = None,
+                proc_root: Optional[str] = None, sys_root: Optional[str] = None,
+                instrument: Optional[bool] = None) -> Config:
+    """
+    Load, expand and validate the configuration, exiting on errors.
+    
+    Args:
+        config_path: Path to configuration file, or None for the default
+        interval: Update interval override
+        metrics_port: Metrics endpoint port override
+        websocket_port: WebSocket endpoint port override
+        proc_root: Proc filesystem root override
+        sys_root: Sys filesystem root override
+        instrument: Self-instrumentation override
+        
+    Returns:
+        The loaded configuration
+    """
+    config = Config(config_path=config_path)
+    config.load()
+    
+    if interval is not None:
+        config.general.update_interval = interval
+    if metrics_port is not None:
+        config.export.metrics_port = metrics_port
+    if websocket_port is not None:
+        config.export.websocket_port = websocket_port
+    if proc_root is not None:
+        config.general.proc_root = proc_root
+    if sys_root is not None:
+        config.general.sys_root = sys_root
+    if instrument is not None:
+        config.general.instrumentation = instrument
+    
+    # Expand path variables in configuration
+    expand_paths(config)
+    
+    # Validate configuration
+    errors = validate_config(config)
+    if errors:
+        for error in errors:
+            typer.echo(f"Configuration error: {error}", err=True)
+        sys.exit(1)
+    
+    return config
+
+
+def run_batch_mode(config: Config, count: int, interval: float, output_format: str, top: int):
+    """
+    Print samples to stdout without the dashboard, exiting on errors.
+    
+    Args:
+        config: Application configuration
+        count: Number of samples (0 = until interrupted)
+        interval: Seconds between samples
+        output_format: "text" or "json"
+        top: Number of processes listed per sample
+    """
+    from monitor.batch import FORMATS, BatchSampler, run_batch
+    
+    if output_format not in FORMATS:
+        typer.echo(f"Unknown output format {output_format} (expected {', '.join(FORMATS)})", err=True)
+        sys.exit(1)
+    
+    sampler = BatchSampler(config.general.proc_root, top, config.general.sys_root)
+    try:
+        run_batch(sampler, count, interval, output_format, sys.stdout)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        sampler.close()
+
+
+def start_exporters(config: Config, pipeline) -> List:
+    """
+    Start the export endpoints enabled in the configuration.
+    
+    Args:
+        config: Application configuration
+        pipeline: Pipeline (or shared sample source) whose samples are exported
+        
+    Returns:
+        List of started exporters (each has a stop() method)
+    """
+    from monitor.exporters.prometheus import PrometheusExporter
+    from monitor.exporters.websocket import WebSocketExporter
+    
+    exporters = []
+    if config.export.metrics_port:
+        exporter = PrometheusExporter()
+        exporter.start(config.export.metrics_port, config.export.metrics_address)
+        pipeline.add_listener(exporter.update)
+        exporters.append(exporter)
+    if config.export.websocket_port:
+        exporter = WebSocketExporter(config.general.update_interval, config.display.graph_history)
+        exporter.start(config.export.websocket_port, config.export.websocket_address)
+        pipeline.add_listener(exporter.update)
+        exporters.append(exporter)
+    return exporters
+
+
+@app.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     interval: float = typer.Option(1.0, "--interval", "-i", help="Update interval in seconds"),
     layout: str = typer.Option("detailed", "--layout", "-l", help="Layout type (detailed, compact, minimal)"),
     theme: str = typer.Option("dark", "--theme", "-t", help="Color theme (dark, light)"),
     config_path: Optional[str] = typer.Option(None, "--config", "-c", help="Path to configuration file"),
     log: bool = typer.Option(False, "--log", help="Enable logging to file"),
     export_csv: Optional[str] = typer.Option(None, "--export-csv", help="Export data to CSV file"),
+    metrics_port: Optional[int] = typer.Option(None, "--metrics-port", help="Serve Prometheus/OpenMetrics on this port"),
+    websocket_port: Optional[int] = typer.Option(None, "--ws-port", help="Stream samples to browser dashboards on this port"),
+    share: Optional[bool] = typer.Option(None, "--share/--no-share", help="Share one collection loop with other local dashboards"),
+    threads: Optional[int] = typer.Option(None, "--threads", help="Show the threads of this process (view 8)"),
+    proc_root: Optional[str] = typer.Option(None, "--proc-root", help="Read the proc filesystem from this directory"),
+    sys_root: Optional[str] = typer.Option(None, "--sys-root", help="Read the sys filesystem from this directory"),
+    instrument: Optional[bool] = typer.Option(None, "--instrument/--no-instrument", help="Time every stage and report the monitor's own overhead"),
+    profile: Optional[str] = typer.Option(None, "--profile", help="Profile the monitor and write the profile here on exit (.prof/.pstats: cProfile, else collapsed stacks)"),
+    once: bool = typer.Option(False, "--once", help="Print one sample to stdout and exit"),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format of --once (text, json)"),
 ):
     """
     Start the system monitor with the specified options.
     """
+    # Subcommands (agent, ...) handle their own setup
+    if ctx.invoked_subcommand is not None:
+        return
+    
     # Initialize configuration
     config = Config(config_path=config_path)
     config.load()
@@ -50,6 +174,20 @@ def main(
         config.display.theme = theme
     if log:
         config.general.enable_logging = True
+    if metrics_port is not None:
+        config.export.metrics_port = metrics_port
+    if websocket_port is not None:
+        config.export.websocket_port = websocket_port
+    if share is not None:
+        config.general.share_samples = share
+    if threads is not None:
+        config.collectors.threads_pid = threads
+    if proc_root is not None:
+        config.general.proc_root = proc_root
+    if sys_root is not None:
+        config.general.sys_root = sys_root
+    if instrument is not None:
+        config.general.instrumentation = instrument
     
     # Expand path variables in configuration
     expand_paths(config)
@@ -61,78 +199,379 @@ def main(
             typer.echo(f"Configuration error: {error}", err=True)
         sys.exit(1)
     
+    # One sample without the dashboard, for scripts and health checks
+    if once:
+        run_batch_mode(config, 1, 0.0, output_format, DEFAULT_BATCH_TOP)
+        return
+    
+    from blessed import Terminal
+    
+    from monitor.event_loop import EventLoop
+    from monitor.instrumentation import Instrumentation
+    from monitor.pipeline import MonitorPipeline, sample_settings
+    from monitor.profiling import create_profiler
+    from monitor.transport.shm import SharedSampleSource
+    from monitor.ui.dashboard import Dashboard
+    from monitor.ui.keybindings import KeyBindings
+    from monitor.ui.layout_manager import LayoutManager
+    
     # Initialize terminal
     term = Terminal()
     
-    # Initialize collectors
-    cpu_collector = CPUCollector()
+    # Count what the dashboard prints when measuring the monitor itself.
+    # The terminal keeps the real stdout: blessed only reads the keyboard
+    # when its stream is the process's own stdout.
+    instrumentation = Instrumentation() if config.general.instrumentation else None
+    if instrumentation:
+        sys.stdout = instrumentation.wrap_output(sys.stdout)
     
-    # TODO: Initialize other collectors:
-    # - memory_collector = MemoryCollector()
-    # - disk_collector = DiskCollector()
-    # - network_collector = NetworkCollector()
-    # - process_collector = ProcessCollector()
+    # Profile the whole run when asked, attributing samples to the stage
+    # (collect, process, render) running at the time
+    profiler = create_profiler(profile) if profile else None
     
-    # Initialize processor
-    processor = ResourceProcessor()
+    def create_pipeline() -> MonitorPipeline:
+        pipeline = MonitorPipeline(config, instrumentation)
+        if profiler:
+            profiler.tag(pipeline, "collect", "collect")
+            profiler.tag(pipeline.processor, "process", "process")
+        return pipeline
+    
+    # Initialize collectors and processor, or attach to the dashboard that
+    # already collects on this host
+    if config.general.share_samples:
+        source = SharedSampleSource(create_pipeline, config.general.update_interval,
+                                    config.general.shared_ring_path or None, sample_settings(config))
+    else:
+        source = create_pipeline()
+    exporters = start_exporters(config, source)
     
     # Initialize layout manager
     layout_manager = LayoutManager(term, config.display.layout)
     
     # Initialize dashboard
-    dashboard = Dashboard(term, layout_manager, config)
+    dashboard = Dashboard(term, layout_manager, config, instrumentation)
+    if profiler:
+        profiler.tag(dashboard, "render", "render")
+    
+    # Collect, process and render one sample
+    def refresh():
+        delta = source.sample()
+        if delta is not None:
+            dashboard.update(delta)
+        else:
+            dashboard.refresh_clock()
+    
+    def reset_statistics():
+        source.reset()
+        collection_timer.fire_now()
+    
+    # Set up the event loop: stdin readiness wakes the loop immediately,
+    # while collection runs on its own deadline
+    loop = EventLoop()
+    collection_timer = loop.call_every(config.general.update_interval, refresh)
+    
+    bindings = KeyBindings()
+    bindings.bind("q", loop.stop, "Quit the application")
+    bindings.bind("r", reset_statistics, "Reset statistics")
+    dashboard.bind_keys(bindings)
+    
+    # PSI triggers fire when a stall starts, so a long update interval
+    # still shows pressure within milliseconds instead of a tick later
+    pipeline = getattr(source, "pipeline", source)
+    pressure_collector = getattr(pipeline, "pressure_collector", None)
+    trigger_fds: List[int] = []
+    if pressure_collector and config.collectors.pressure_triggers:
+        trigger_fds = pressure_collector.open_triggers(config.collectors.pressure_trigger_stall_ms,
+                                                       config.collectors.pressure_trigger_window_ms)
+    
+    def on_pressure(fd: int, revents: int):
+        collection_timer.fire_now()
+    
+    # Thread drill-down needs the local pipeline; dashboards attached to
+    # another dashboard's collector only show what it collects
+    thread_collector = getattr(pipeline, "thread_collector", None)
+    
+    def show_threads():
+        pid = dashboard.selected_pid()
+        if pid:
+            thread_collector.select(pid)
+            dashboard.set_view("8")
+            collection_timer.fire_now()
+    
+    if thread_collector:
+        bindings.bind("t", show_threads, "Show the threads of the selected process")
+    if config.collectors.threads_pid:
+        dashboard.set_view("8")
+    
+    def on_input(fd: int, revents: int):
+        # Drain every key that is already buffered, then redraw once
+        handled = False
+        key = term.inkey(timeout=0)
+        while key:
+            handled = bindings.dispatch(key) or handled
+            key = term.inkey(timeout=0)
+        if handled and loop.running:
+            dashboard.render()
     
     try:
         # Print welcome message
         print(term.clear)
         print(term.home + term.white_on_blue + term.center("Linux System Monitor") + term.normal)
         print(term.center("Press 'q' to quit, 'h' for help") + "\n")
+        if getattr(source, "role", None) == "reader":
+            print(term.center("Attached to the shared collector on this host") + "\n")
         
         # Main monitoring loop
         with term.cbreak(), term.hidden_cursor():
-            while True:
-                # Check for key presses
-                if term.inkey(timeout=0) == 'q':
-                    break
-                
-                # Collect system data
-                cpu_data = cpu_collector.collect()
-                
-                # TODO: Collect other system data:
-                # memory_data = memory_collector.collect()
-                # disk_data = disk_collector.collect()
-                # network_data = network_collector.collect()
-                # process_data = process_collector.collect()
-                
-                # For now, use placeholder data
-                memory_data = {"usage_percent": 45.2, "used": 4.5, "total": 15.8}
-                disk_data = {"usage_percent": 32.8, "read_speed": 15.6, "write_speed": 8.3}
-                network_data = {"download_speed": 1.2, "upload_speed": 0.4}
-                process_data = {"processes": []}
-                
-                # Process data
-                system_data = {
-                    "cpu": cpu_data,
-                    "memory": memory_data,
-                    "disk": disk_data,
-                    "network": network_data,
-                    "processes": process_data,
-                    "timestamp": time.time(),
-                }
-                processed_data = processor.process(system_data)
-                
-                # Update dashboard
-                dashboard.update(processed_data)
-                
-                # Sleep for update interval
-                time.sleep(config.general.update_interval)
+            loop.add_reader(sys.stdin.fileno(), on_input)
+            for fd in trigger_fds:
+                loop.add_reader(fd, on_pressure, select.POLLPRI)
+            if profiler:
+                profiler.start()
+            loop.run()
     
     except KeyboardInterrupt:
         pass
     finally:
         # Clean up resources
+        for exporter in exporters:
+            exporter.stop()
+        source.close()
         print(term.clear)
         print(term.home + "Linux System Monitor closed.")
+        if profiler:
+            profiler.stop()
+            profiler.write()
+            print(f"Profile written to {profiler.path}")
+
+
+
+@app.command()
+def agent(
+    listen: str = typer.Option(DEFAULT_AGENT_ENDPOINT, "--listen", "-L", help="Endpoint to publish on (unix:PATH or HOST:PORT)"),
+    interval: Optional[float] = typer.Option(None, "--interval", "-i", help="Update interval in seconds"),
+    config_path: Optional[str] = typer.Option(None, "--config", "-c", help="Path to configuration file"),
+    metrics_port: Optional[int] = typer.Option(None, "--metrics-port", help="Serve Prometheus/OpenMetrics on this port"),
+    websocket_port: Optional[int] = typer.Option(None, "--ws-port", help="Stream samples to browser dashboards on this port"),
+    proc_root: Optional[str] = typer.Option(None, "--proc-root", help="Read the proc filesystem from this directory"),
+    sys_root: Optional[str] = typer.Option(None, "--sys-root", help="Read the sys filesystem from this directory"),
+    instrument: Optional[bool] = typer.Option(None, "--instrument/--no-instrument", help="Time every stage and report the monitor's own overhead"),
+):
+    """
+    Run collection without a terminal and publish samples to viewers.
+    """
+    import asyncio
+    
+    from monitor.instrumentation import Instrumentation
+    from monitor.pipeline import MonitorPipeline
+    from monitor.transport.agent import MetricsAgent
+    
+    config = load_config(config_path, interval, metrics_port, websocket_port, proc_root, sys_root, instrument)
+    instrumentation = Instrumentation() if config.general.instrumentation else None
+    pipeline = MonitorPipeline(config, instrumentation)
+    exporters = start_exporters(config, pipeline)
+    metrics_agent = MetricsAgent(pipeline.sample, config.general.update_interval)
+    
+    typer.echo(f"Publishing samples on {listen}", err=True)
+    try:
+        asyncio.run(metrics_agent.serve_forever(listen))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for exporter in exporters:
+            exporter.stop()
+        pipeline.close()
+
+
+
+@app.command()
+def batch(
+    iterations: int = typer.Option(0, "--iterations", "-n", help="Number of samples to print (0 = until interrupted)"),
+    interval: Optional[float] = typer.Option(None, "--interval", "-i", help="Seconds between samples"),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format (text, or json with one object per line)"),
+    top: int = typer.Option(DEFAULT_BATCH_TOP, "--top", help="Number of processes per sample (0 skips the process scan)"),
+    config_path: Optional[str] = typer.Option(None, "--config", "-c", help="Path to configuration file"),
+    proc_root: Optional[str] = typer.Option(None, "--proc-root", help="Read the proc filesystem from this directory"),
+    sys_root: Optional[str] = typer.Option(None, "--sys-root", help="Read the sys filesystem from this directory"),
+):
+    """
+    Print samples to stdout, like top -b, without the dashboard.
+    """
+    config = load_config(config_path, interval, proc_root=proc_root, sys_root=sys_root)
+    if iterations < 0 or top < 0:
+        typer.echo("Iterations and process count must be at least 0", err=True)
+        sys.exit(1)
+    run_batch_mode(config, iterations, config.general.update_interval, output_format, top)
+
+
+@app.command()
+def record(
+    hz: float = typer.Option(100.0, "--hz", help="Samples per second (up to 1000)"),
+    duration: float = typer.Option(10.0, "--duration", "-d", help="Seconds to record (Ctrl-C stops early)"),
+    sources: str = typer.Option(",".join(RECORD_SOURCES), "--sources", "-s", help="Comma-separated sources (cpu, pressure, memory)"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Recording file (default: a new file in log_path)"),
+    config_path: Optional[str] = typer.Option(None, "--config", "-c", help="Path to configuration file"),
+    proc_root: Optional[str] = typer.Option(None, "--proc-root", help="Read the proc filesystem from this directory"),
+):
+    """
+    Record a few cheap sources at a high rate, for catching latency spikes.
+    """
+    from monitor.recorder import Recorder, default_recording_path
+    
+    config = load_config(config_path, proc_root=proc_root)
+    source_list = [source.strip() for source in sources.split(",") if source.strip()]
+    unknown = [source for source in source_list if source not in RECORD_SOURCES]
+    if unknown or not source_list:
+        typer.echo(f"Unknown sources {', '.join(unknown)} (expected {', '.join(RECORD_SOURCES)})", err=True)
+        sys.exit(1)
+    if not 0 < hz <= 1000 or duration <= 0:
+        typer.echo("Rate must be between 0 and 1000 Hz and duration greater than 0", err=True)
+        sys.exit(1)
+    
+    path = os.path.expanduser(output) if output else default_recording_path(config.general.log_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    
+    try:
+        recorder = Recorder(hz, duration, source_list, config.general.proc_root)
+    except OSError as e:
+        typer.echo(f"Cannot open a source: {e}", err=True)
+        sys.exit(1)
+    typer.echo(f"Recording {len(recorder.columns)} columns at {hz:g} Hz for up to {duration:g} s "
+               f"(Ctrl-C to stop)...", err=True)
+    try:
+        recorder.open(path)
+        recorder.run()
+        header = recorder.finish()
+    finally:
+        recorder.close()
+    
+    stats = header["statistics"]
+    typer.echo(f"Wrote {stats['samples']} samples to {path}")
+    typer.echo(f"Achieved {stats['achieved_hz']:.1f} Hz: interval {stats['interval_mean'] * 1e3:.3f} ms "
+               f"± {stats['interval_stddev'] * 1e3:.3f} ms, lateness p50 {stats['lateness_p50'] * 1e3:.3f} ms, "
+               f"p99 {stats['lateness_p99'] * 1e3:.3f} ms, max {stats['lateness_max'] * 1e3:.3f} ms")
+    typer.echo(f"Missed deadlines: {stats['missed']}")
+
+
+@app.command()
+def analyze(
+    recordings: Optional[List[str]] = typer.Argument(None, help="Recordings to analyze (default: every recording in log_path)"),
+    step: float = typer.Option(1.0, "--step", help="Seconds per step that percentiles are computed over"),
+    window: float = typer.Option(300.0, "--window", "-w", help="Seconds per interval for the busiest intervals and the trend"),
+    top: int = typer.Option(5, "--top", "-n", help="Number of busiest intervals and cores listed"),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format (text or json)"),
+    csv_path: Optional[str] = typer.Option(None, "--csv", help="Also write every interval to this CSV file"),
+    config_path: Optional[str] = typer.Option(None, "--config", "-c", help="Path to configuration file"),
+):
+    """
+    Summarize recorded sessions: percentiles, busiest intervals and trends.
+    """
+    import json
+    
+    from monitor.analysis import RecordingAnalysis, find_recordings, format_text, write_csv
+    
+    config = load_config(config_path)
+    paths = [os.path.expanduser(path) for path in recordings] if recordings else find_recordings(config.general.log_path)
+    if not paths:
+        typer.echo(f"No recordings in {config.general.log_path} (create one with `monitor record`)", err=True)
+        sys.exit(1)
+    if step <= 0 or window <= 0 or top < 0:
+        typer.echo("Step and window must be greater than 0 and the count at least 0", err=True)
+        sys.exit(1)
+    if output_format not in ("text", "json"):
+        typer.echo("Output format must be text or json", err=True)
+        sys.exit(1)
+    
+    analysis = RecordingAnalysis(step, window)
+    for path in paths:
+        try:
+            analysis.add(path)
+        except (OSError, ValueError) as e:
+            typer.echo(f"Skipping {path}: {e}", err=True)
+    
+    summary = analysis.summary(top)
+    if output_format == "json":
+        typer.echo(json.dumps(summary))
+    else:
+        typer.echo(format_text(summary), nl=False)
+    if csv_path:
+        with open(os.path.expanduser(csv_path), "w", newline="") as f:
+            write_csv(analysis.intervals(), f)
+
+
+@app.command()
+def fleet(
+    endpoints: Optional[List[str]] = typer.Argument(None, help="Agent endpoints (unix:PATH or HOST:PORT)"),
+    hosts_file: Optional[str] = typer.Option(None, "--hosts-file", "-f", help="File with one agent endpoint per line"),
+    top: int = typer.Option(5, "--top", "-n", help="Number of hosts in the top-N lists"),
+    standins: int = typer.Option(0, "--standins", help="Start N local stand-in agents publishing synthetic data"),
+    interval: Optional[float] = typer.Option(None, "--interval", "-i", help="Refresh interval in seconds"),
+    config_path: Optional[str] = typer.Option(None, "--config", "-c", help="Path to configuration file"),
+):
+    """
+    Show many hosts at once by subscribing to their agents.
+    """
+    import asyncio
+    
+    from blessed import Terminal
+    
+    from monitor.transport.fleet import FleetClient
+    from monitor.transport.standin import start_standin_agents
+    from monitor.ui.fleet_view import run_fleet_view
+    
+    config = load_config(config_path, interval)
+    
+    endpoint_list = list(endpoints or [])
+    if hosts_file:
+        with open(os.path.expanduser(hosts_file), "r") as f:
+            endpoint_list.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not endpoint_list and not standins:
+        typer.echo("No agent endpoints given", err=True)
+        sys.exit(1)
+    
+    term = Terminal()
+    
+    async def run():
+        agents = []
+        if standins:
+            agents, standin_endpoints = await start_standin_agents(standins, config.general.update_interval)
+            endpoint_list.extend(standin_endpoints)
+        try:
+            await run_fleet_view(term, FleetClient(endpoint_list), config, top)
+        finally:
+            for standin in agents:
+                await standin.stop()
+    
+    try:
+        with term.fullscreen(), term.cbreak(), term.hidden_cursor():
+            asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def fakefs(
+    directory: str = typer.Argument(..., help="Directory to write proc/ and sys/ in"),
+    cpus: int = typer.Option(64, "--cpus", help="Number of logical CPUs"),
+    processes: int = typer.Option(1000, "--processes", help="Number of processes"),
+    interfaces: int = typer.Option(2, "--interfaces", help="Number of network interfaces"),
+    seed: int = typer.Option(0, "--seed", help="Random seed"),
+):
+    """
+    Write a fake proc and sys tree for load-testing the collectors.
+    """
+    from monitor.collectors.fakefs import build_fake_system
+    
+    directory = os.path.expanduser(directory)
+    if os.path.exists(os.path.join(directory, "proc")) or os.path.exists(os.path.join(directory, "sys")):
+        typer.echo(f"{directory} already holds a proc or sys tree", err=True)
+        sys.exit(1)
+    if cpus <= 0 or processes < 0 or interfaces < 0:
+        typer.echo("CPU count must be greater than 0, process and interface counts at least 0", err=True)
+        sys.exit(1)
+    
+    proc_root, sys_root = build_fake_system(directory, cpus, processes, interfaces, seed)
+    typer.echo(f"Run the monitor against it with: --proc-root {proc_root} --sys-root {sys_root}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,501 @@
+"""
+Analysis Module for Linux System Monitor
+
+This module handles summarizing recorded sessions (see monitor.recorder)
+after the fact: percentiles of CPU usage, per-core usage, run queue,
+pressure and memory, the busiest intervals, and how the imbalance between
+cores (the spread core_imbalance shows live) developed over time.
+
+Recordings are read in chunks of bounded size. Samples are reduced to
+fixed steps as they are read, percentiles come from fixed-bin histograms,
+and intervals are kept as running sums. Memory use depends on the chunk
+size, the core count and the number of intervals but not on the length of
+the recordings.
+"""
+
+import csv
+import glob
+import os
+import time
+from typing import Dict, List, Optional, TextIO
+
+import numpy as np
+
+from monitor.recorder import RECORD_EXTENSION, open_recording
+
+# Largest block of rows read from a recording at once; the arrays derived
+# from a block take a few times as much
+CHUNK_BYTES = 4 * 1024 * 1024
+
+# Percentiles reported for every metric
+PERCENTILES = (50, 90, 99)
+
+# Histogram bins for percentages: 0.1 percentage points wide
+PERCENT_EDGES = np.linspace(0.0, 100.0, 1001)
+
+# Histogram bins for values of any magnitude (rates, task counts, bytes):
+# each 1% wider than the one before
+MAGNITUDE_EDGES = np.concatenate(([0.0], np.geomspace(1e-3, 1e15, 4166)))
+
+# Rows of the imbalance trend; intervals are merged to fit
+TREND_ROWS = 24
+
+# Gauges (rather than counters) in recordings: averaged over each step
+GAUGE_COLUMNS = ("procs_running", "procs_blocked", "memory.available", "swap.free", "swap.total")
+
+
+def find_recordings(log_path: str) -> List[str]:
+    """
+    List the recordings in a log directory.
+    
+    Args:
+        log_path: Log directory from the configuration
+        
+    Returns:
+        Recording paths, oldest first
+    """
+    return sorted(glob.glob(os.path.join(os.path.expanduser(log_path), f"*{RECORD_EXTENSION}")))
+
+
+class Histogram:
+    """
+    Fixed-bin histogram of one or more columns of values.
+    
+    Adding values costs one searchsorted and one bincount, and histograms
+    of any number of chunks add up, so percentiles over more values than
+    fit in memory are exact to the bin width.
+    """
+    
+    def __init__(self, edges: np.ndarray, columns: int = 1):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            edges: Increasing bin edges; values outside go to the end bins
+            columns: Number of independent columns
+        """
+        self.edges = edges
+        self.counts = np.zeros((columns, len(edges) - 1), dtype=np.int64)
+        self.total = np.zeros(columns)
+        self.maximum = np.full(columns, -np.inf)
+    
+    def add(self, values: np.ndarray):
+        """
+        Add values; NaN values are skipped.
+        
+        Args:
+            values: Array of shape (samples,) or (samples, columns)
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(len(values), -1)
+        if not len(values):
+            return
+        valid = ~np.isnan(values)
+        self.maximum = np.maximum(self.maximum, np.where(valid, values, -np.inf).max(axis=0))
+        
+        columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)[valid]
+        values = values[valid]
+        bins = self.counts.shape[1]
+        index = np.clip(np.searchsorted(self.edges, values, side="right") - 1, 0, bins - 1)
+        self.counts += np.bincount(columns * bins + index, minlength=self.counts.size).reshape(self.counts.shape)
+        self.total += np.bincount(columns, weights=values, minlength=len(self.total))
+    
+    def count(self) -> np.ndarray:
+        """Number of values per column."""
+        return self.counts.sum(axis=1)
+    
+    def mean(self) -> np.ndarray:
+        """Mean per column (NaN for empty columns)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.total / self.count()
+    
+    def percentile(self, q: float) -> np.ndarray:
+        """
+        Percentile per column, as the middle of the bin it falls in.
+        
+        Args:
+            q: Percentile between 0 and 100
+            
+        Returns:
+            Value per column (NaN for empty columns)
+        """
+        count = self.count()
+        cumulative = self.counts.cumsum(axis=1)
+        index = np.minimum((cumulative < (q / 100 * count)[:, None]).sum(axis=1), self.counts.shape[1] - 1)
+        middle = (self.edges[index] + self.edges[index + 1]) / 2
+        return np.where(count > 0, np.minimum(middle, self.maximum), np.nan)
+    
+    def summary(self) -> List[Dict[str, Optional[float]]]:
+        """
+        Summarize every column.
+        
+        Returns:
+            Per column: mean, the PERCENTILES ("p50", ...) and max, None
+            where the column is empty
+        """
+        columns = {"mean": self.mean()}
+        columns.update((f"p{q}", self.percentile(q)) for q in PERCENTILES)
+        columns["max"] = np.where(self.count() > 0, self.maximum, np.nan)
+        return [
+            {key: None if np.isnan(values[column]) else float(values[column]) for key, values in columns.items()}
+            for column in range(len(self.total))
+        ]
+
+
+class RecordingAnalysis:
+    """
+    Streams recordings into percentiles and per-interval summaries.
+    
+    Every recording is cut into steps of `step` seconds (or one sample,
+    whichever is longer); rates and usage are computed per step from the
+    counters at its ends, and gauges are averaged over it. Steps feed the
+    percentile histograms and are summed into intervals of `window`
+    seconds of wall-clock time, which the busiest-interval and trend
+    reports are built from.
+    """
+    
+    def __init__(self, step: float = 1.0, window: float = 300.0, chunk_bytes: int = CHUNK_BYTES):
+        """
+        Initialize an empty analysis.
+        
+        Args:
+            step: Seconds per step (percentiles are over step values)
+            window: Seconds per interval
+            chunk_bytes: Largest block read from a recording at once
+        """
+        self.step = step
+        self.window = window
+        self.chunk_bytes = chunk_bytes
+        self.sessions: List[Dict] = []
+        self.steps = 0
+        self.metrics: Dict[str, Histogram] = {}
+        # Per-core usage, keyed by the core names of a recording
+        self.cores: Dict[tuple, Histogram] = {}
+        # Interval number (start time // window) -> field -> running sum
+        self._windows: Dict[int, Dict[str, float]] = {}
+    
+    def add(self, path: str):
+        """
+        Add a recording, reading it chunk by chunk.
+        
+        Args:
+            path: Recording file
+            
+        Raises:
+            ValueError: If the file is not a recording
+        """
+        header, rows = open_recording(path)
+        names = header["columns"]
+        count = header["rows"]
+        self.sessions.append({
+            "path": path,
+            "hostname": header.get("hostname", ""),
+            "start_time": header["start_time"],
+            "duration": float(rows[count - 1, 0]) if count else 0.0,
+            "hz": header["hz"],
+            "samples": count,
+        })
+        
+        columns = {name: index for index, name in enumerate(names)}
+        cores = tuple(name[:-len(".busy")] for name in names
+                      if name.startswith("cpu") and name.endswith(".busy") and name != "cpu.busy")
+        gauges = [name for name in GAUGE_COLUMNS if name in columns]
+        gauge_index = [columns[name] for name in gauges]
+        
+        # Steps never straddle chunks: a chunk is a whole number of steps,
+        # plus the first row of the next chunk to close the last step.
+        # Chunks are read rather than sliced from the memory map, whose
+        # pages would otherwise stay resident until the whole file is
+        step_rows = max(1, int(round(self.step * header["hz"])))
+        chunk_rows = max(step_rows, self.chunk_bytes // (8 * len(names)) // step_rows * step_rows)
+        for begin in range(0, count - 1, chunk_rows):
+            end = min(begin + chunk_rows, count - 1) + 1
+            block = np.fromfile(path, dtype="<f8", count=(end - begin) * len(names),
+                                offset=rows.offset + begin * len(names) * 8).reshape(-1, len(names))
+            bounds = np.arange(0, len(block), step_rows)
+            if bounds[-1] != len(block) - 1:
+                # A final, shorter step
+                bounds = np.append(bounds, len(block) - 1)
+            
+            ends = block[bounds]
+            delta = ends[1:] - ends[:-1]
+            means = np.add.reduceat(block[:-1, gauge_index], bounds[:-1]) / np.diff(bounds)[:, None]
+            self._add_steps(header["start_time"] + ends[:-1, 0], delta, columns, cores,
+                            dict(zip(gauges, means.T)))
+    
+    def _add_steps(self, starts: np.ndarray, delta: np.ndarray, columns: Dict[str, int], cores: tuple,
+                   gauges: Dict[str, np.ndarray]):
+        """
+        Add steps to the histograms and intervals.
+        
+        Args:
+            starts: Start time of each step
+            delta: Change of every column over each step
+            columns: Column index by name
+            cores: Names of the per-core columns ("cpu0", ...)
+            gauges: Mean of every gauge column over each step
+        """
+        seconds = delta[:, columns["t"]]
+        values: Dict[str, np.ndarray] = {}
+        sums: Dict[str, np.ndarray] = {"seconds": seconds, "steps": np.ones(len(seconds))}
+        imbalance = None
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if "cpu.busy" in columns:
+                busy, total = delta[:, columns["cpu.busy"]], delta[:, columns["cpu.total"]]
+                values["cpu.usage_percent"] = np.where(total > 0, busy / total * 100, np.nan)
+                sums["cpu.busy"] = busy
+                sums["cpu.total"] = total
+            if cores:
+                busy = delta[:, [columns[f"{core}.busy"] for core in cores]]
+                total = delta[:, [columns[f"{core}.total"] for core in cores]]
+                usage = np.where(total > 0, busy / total * 100, np.nan)
+                histogram = self.cores.get(cores)
+                if histogram is None:
+                    histogram = self.cores[cores] = Histogram(PERCENT_EDGES, len(cores))
+                histogram.add(usage)
+                if len(cores) > 1:
+                    # Spread between the busiest and the idlest core, like
+                    # the live core_imbalance
+                    imbalance = np.fmax.reduce(usage, axis=1) - np.fmin.reduce(usage, axis=1)
+                    values["cpu.core_imbalance"] = imbalance
+                    sums["cpu.core_imbalance"] = imbalance
+                    sums["cpu.core_imbalance_steps"] = (~np.isnan(imbalance)).astype(np.float64)
+            if "ctxt" in columns:
+                values["context_switches_per_second"] = delta[:, columns["ctxt"]] / seconds
+                sums["ctxt"] = delta[:, columns["ctxt"]]
+            for name in ("procs_running", "procs_blocked"):
+                if name in gauges:
+                    values[name] = sums[name] = gauges[name]
+            for name in columns:
+                if name.startswith("pressure."):
+                    # Microseconds stalled per second of the step
+                    values[f"{name}_percent"] = np.clip(delta[:, columns[name]] / seconds / 1e4, 0, 100)
+                    sums[name] = delta[:, columns[name]]
+            if "memory.available" in gauges:
+                values["memory.available"] = sums["memory.available"] = gauges["memory.available"]
+            if "swap.total" in gauges:
+                values["swap.used"] = sums["swap.used"] = gauges["swap.total"] - gauges["swap.free"]
+        
+        for name, metric in values.items():
+            histogram = self.metrics.get(name)
+            if histogram is None:
+                edges = PERCENT_EDGES if name.endswith("_percent") or name == "cpu.core_imbalance" else MAGNITUDE_EDGES
+                histogram = self.metrics[name] = Histogram(edges)
+            histogram.add(metric)
+        self.steps += len(seconds)
+        
+        # Sum the steps into their intervals
+        windows, inverse = np.unique(np.floor(starts / self.window).astype(np.int64), return_inverse=True)
+        totals = {}
+        for name, metric in sums.items():
+            valid = ~np.isnan(metric)
+            totals[name] = np.bincount(inverse[valid], weights=metric[valid], minlength=len(windows)).tolist()
+        if imbalance is not None:
+            valid = ~np.isnan(imbalance)
+            peak = np.full(len(windows), -np.inf)
+            np.maximum.at(peak, inverse[valid], imbalance[valid])
+            peaks = peak.tolist()
+        for position, window in enumerate(windows.tolist()):
+            entry = self._windows.setdefault(window, {})
+            for name, values_by_window in totals.items():
+                entry[name] = entry.get(name, 0.0) + values_by_window[position]
+            if imbalance is not None:
+                entry["cpu.core_imbalance_max"] = max(entry.get("cpu.core_imbalance_max", -np.inf), peaks[position])
+    
+    def _interval(self, start: float, fields: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """Turn the running sums of an interval into its summary."""
+        seconds = fields.get("seconds", 0.0)
+        steps = fields.get("steps", 0.0)
+        
+        def ratio(numerator: str, denominator: float, scale: float = 1.0) -> Optional[float]:
+            if numerator not in fields or not denominator:
+                return None
+            return fields[numerator] / denominator * scale
+        
+        interval = {
+            "start": start,
+            "seconds": seconds,
+            "cpu.usage_percent": ratio("cpu.busy", fields.get("cpu.total", 0.0), 100),
+            "cpu.core_imbalance": ratio("cpu.core_imbalance", fields.get("cpu.core_imbalance_steps", 0.0)),
+            "cpu.core_imbalance_max": fields.get("cpu.core_imbalance_max"),
+            "context_switches_per_second": ratio("ctxt", seconds),
+            "procs_running": ratio("procs_running", steps),
+            "procs_blocked": ratio("procs_blocked", steps),
+        }
+        for name in sorted(fields):
+            if name.startswith("pressure."):
+                interval[f"{name}_percent"] = ratio(name, seconds, 1e-4)
+        interval["memory.available"] = ratio("memory.available", steps)
+        interval["swap.used"] = ratio("swap.used", steps)
+        if interval["cpu.core_imbalance_max"] == -np.inf:
+            interval["cpu.core_imbalance_max"] = None
+        return interval
+    
+    def intervals(self) -> List[Dict[str, Optional[float]]]:
+        """
+        Summarize every interval of `window` seconds that holds samples.
+        
+        Returns:
+            Per interval, oldest first: start time, seconds covered by
+            samples, CPU usage, mean and peak core imbalance, context
+            switch rate, run queue, pressure and memory (None where the
+            recordings lack the source)
+        """
+        return [self._interval(window * self.window, fields) for window, fields in sorted(self._windows.items())]
+    
+    def trend(self, rows: int = TREND_ROWS) -> List[Dict[str, Optional[float]]]:
+        """
+        Summarize the recordings as at most `rows` consecutive periods.
+        
+        Args:
+            rows: Largest number of periods
+            
+        Returns:
+            Per period, like intervals()
+        """
+        if not self._windows:
+            return []
+        first, last = min(self._windows), max(self._windows)
+        merge = max(1, -(-(last - first + 1) // rows))
+        periods: Dict[int, Dict[str, float]] = {}
+        for window, fields in sorted(self._windows.items()):
+            period = periods.setdefault((window - first) // merge, {})
+            for name, value in fields.items():
+                if name == "cpu.core_imbalance_max":
+                    period[name] = max(period.get(name, -np.inf), value)
+                else:
+                    period[name] = period.get(name, 0.0) + value
+        return [self._interval((first + period * merge) * self.window, fields)
+                for period, fields in sorted(periods.items())]
+    
+    def summary(self, top: int = 5) -> Dict:
+        """
+        Summarize everything added.
+        
+        Args:
+            top: Number of busiest intervals and busiest cores listed
+            
+        Returns:
+            Dict with the sessions, step and interval lengths, the number of
+            steps, percentiles per metric, the busiest cores and intervals,
+            and the trend
+        """
+        cores = []
+        for names, histogram in self.cores.items():
+            cores.extend(dict(stats, cpu=name) for name, stats in zip(names, histogram.summary()))
+        cores.sort(key=lambda core: core["mean"] if core["mean"] is not None else -1, reverse=True)
+        
+        # Intervals less than half covered by samples would rank on a few
+        # seconds at the edge of a recording
+        intervals = [interval for interval in self.intervals() if interval["seconds"] >= self.window / 2]
+        key = "cpu.usage_percent" if any(interval["cpu.usage_percent"] is not None
+                                         for interval in intervals) else "procs_running"
+        busiest = sorted((interval for interval in intervals if interval[key] is not None),
+                         key=lambda interval: interval[key], reverse=True)
+        
+        return {
+            "sessions": self.sessions,
+            "step": self.step,
+            "window": self.window,
+            "steps": self.steps,
+            "metrics": {name: histogram.summary()[0] for name, histogram in self.metrics.items()},
+            "cores": cores[:top],
+            "busiest": busiest[:top],
+            "trend": self.trend(),
+        }
+    
+    def to_dataframe(self):
+        """
+        Get every interval as a pandas DataFrame indexed by start time.
+        
+        Returns:
+            DataFrame with one row per interval (see intervals())
+            
+        Raises:
+            ImportError: If pandas (the analysis extra) is not installed
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required; install the analysis extra "
+                              "(pip install linux-system-monitor[analysis])") from None
+        frame = pd.DataFrame(self.intervals())
+        if not frame.empty:
+            frame["start"] = pd.to_datetime(frame["start"], unit="s")
+            frame = frame.set_index("start")
+        return frame
+
+
+def _format_value(name: str, value: Optional[float]) -> str:
+    """Format a metric value for the text report."""
+    if value is None:
+        return "-"
+    if name.startswith(("memory.", "swap.")):
+        for unit in ("B", "K", "M", "G", "T"):
+            if abs(value) < 1024 or unit == "T":
+                return f"{value:.1f}{unit}"
+            value /= 1024
+    if name.endswith("_percent") or name.startswith("cpu.core_imbalance"):
+        return f"{value:.1f}%"
+    return f"{value:.1f}"
+
+
+def format_text(summary: Dict) -> str:
+    """
+    Render a summary as a text report.
+    
+    Args:
+        summary: Summary from RecordingAnalysis.summary
+        
+    Returns:
+        Text ending with a newline
+    """
+    def when(timestamp: float) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+    
+    lines = [f"{len(summary['sessions'])} recordings, {summary['steps']} steps of {summary['step']:g} s"]
+    for session in summary["sessions"]:
+        lines.append(f"  {session['path']}: {session['hostname']}, {when(session['start_time'])}, "
+                     f"{session['duration']:.0f} s at {session['hz']:g} Hz")
+    
+    columns = ["mean"] + [f"p{q}" for q in PERCENTILES] + ["max"]
+    lines += ["", f"{'METRIC':<32}" + "".join(f"{column.upper():>10}" for column in columns)]
+    for name, stats in summary["metrics"].items():
+        lines.append(f"{name:<32}" + "".join(f"{_format_value(name, stats[column]):>10}" for column in columns))
+    
+    if summary["cores"]:
+        lines += ["", "Busiest cores:", f"{'CPU':<32}" + "".join(f"{column.upper():>10}" for column in columns)]
+        for core in summary["cores"]:
+            lines.append(f"{core['cpu']:<32}" + "".join(
+                f"{_format_value('cpu.usage_percent', core[column]):>10}" for column in columns))
+    
+    report = {"cpu.usage_percent": "CPU", "cpu.core_imbalance": "IMBALANCE", "cpu.core_imbalance_max": "PEAK IMBAL.",
+              "procs_running": "RUNNING"}
+    header = f"{'START':<21}" + "".join(f"{label:>14}" for label in report.values())
+    if summary["busiest"]:
+        lines += ["", f"Busiest {summary['window']:g} s intervals:", header]
+        for interval in summary["busiest"]:
+            lines.append(f"{when(interval['start']):<21}" + "".join(
+                f"{_format_value(name, interval[name]):>14}" for name in report))
+    if summary["trend"]:
+        lines += ["", "Trend:", header]
+        for period in summary["trend"]:
+            lines.append(f"{when(period['start']):<21}" + "".join(
+                f"{_format_value(name, period[name]):>14}" for name in report))
+    return "\n".join(lines) + "\n"
+
+
+def write_csv(intervals: List[Dict], stream: TextIO):
+    """
+    Write intervals as CSV, one row per interval.
+    
+    Args:
+        intervals: Intervals from RecordingAnalysis.intervals
+        stream: Stream to write to
+    """
+    fields: List[str] = []
+    for interval in intervals:
+        fields.extend(name for name in interval if name not in fields)
+    writer = csv.DictWriter(stream, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(intervals)
@@ -0,0 +1,329 @@
+"""
+Batch Module for Linux System Monitor
+
+This module prints samples to stdout instead of drawing the dashboard, like
+`top -b`, for cron jobs and health checks. It only imports what a compact
+sample needs (the CPU and pressure collectors), none of the UI, numpy or
+export modules, so a one-shot run is dominated by interpreter startup and
+the first sample's measurement window.
+
+Everything is read from the configured proc root, including memory and
+processes, so a batch run inside a container can report its host. Rates in
+the first sample cover FIRST_SAMPLE_WINDOW seconds, taken before it is
+printed; later samples cover the time since the previous one.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, TextIO
+
+from monitor.collectors.cpu import PROC_ROOT, SYS_ROOT, CPUCollector
+from monitor.collectors.pressure import PressureCollector
+
+# Output formats accepted by run_batch
+FORMATS = ("text", "json")
+
+# Processes listed per sample by default
+DEFAULT_TOP = 5
+
+# Seconds between the two reads the first sample's rates come from; short
+# enough to keep a one-shot run's startup-to-first-sample under 100 ms
+FIRST_SAMPLE_WINDOW = 0.03
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# Fields of /proc/<pid>/stat, counted after the ")" that ends the command
+# name (which may itself contain spaces and parentheses)
+_UTIME = 11
+_STIME = 12
+_STARTTIME = 19
+_RSS = 21
+
+
+def read_meminfo(proc_root: str = PROC_ROOT) -> Dict[str, int]:
+    """
+    Read /proc/meminfo.
+    
+    Args:
+        proc_root: Directory the proc filesystem is read from
+        
+    Returns:
+        Dict of field name to bytes (empty if unreadable)
+    """
+    values = {}
+    try:
+        with open(os.path.join(proc_root, "meminfo"), "rb") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2:
+                    values[fields[0].rstrip(b":").decode("ascii", "replace")] = int(fields[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return values
+
+
+def parse_process_stat(data: bytes) -> Optional[tuple]:
+    """
+    Parse a process's stat line.
+    
+    Args:
+        data: Contents of /proc/<pid>/stat
+        
+    Returns:
+        (name, CPU seconds, start time in seconds since boot, resident
+        bytes), or None if the line is malformed
+    """
+    open_paren = data.find(b"(")
+    close_paren = data.rfind(b")")
+    fields = data[close_paren + 2:].split()
+    if open_paren < 0 or len(fields) <= _RSS:
+        return None
+    return (
+        data[open_paren + 1:close_paren].decode("utf-8", "replace"),
+        (int(fields[_UTIME]) + int(fields[_STIME])) / CLOCK_TICKS,
+        int(fields[_STARTTIME]) / CLOCK_TICKS,
+        int(fields[_RSS]) * PAGE_SIZE,
+    )
+
+
+class BatchSampler:
+    """
+    Collects a compact sample: CPU, load, memory, swap, pressure and the
+    top processes by CPU usage.
+    """
+    
+    def __init__(self, proc_root: str = PROC_ROOT, top_count: int = DEFAULT_TOP, sys_root: str = SYS_ROOT):
+        """
+        Initialize the sampler.
+        
+        Args:
+            proc_root: Directory the proc filesystem is read from
+            top_count: Number of processes listed per sample (0 skips the
+                process scan, the slowest part of a sample)
+            sys_root: Directory the sys filesystem is read from
+        """
+        self.proc_root = proc_root
+        self.top_count = top_count
+        self.cpu_collector = CPUCollector(proc_root, sys_root)
+        self.pressure_collector = PressureCollector(os.path.join(proc_root, "pressure"))
+        
+        # Per-process CPU seconds and the time of the previous sample; the
+        # first sample takes a reading of its own before its window
+        self._prev_process_cpu: Dict[int, float] = {}
+        self._prev_time: Optional[float] = None
+    
+    def _start_window(self):
+        """Take the readings the first sample's rates are measured from, and wait out its window."""
+        self.cpu_collector.reset()
+        self._prev_time = time.time()
+        if self.top_count:
+            self._processes(None)
+        time.sleep(FIRST_SAMPLE_WINDOW)
+    
+    def _cpu(self) -> Dict:
+        """CPU usage overall and per core since the previous sample."""
+        cpu = self.cpu_collector.collect()
+        return {
+            "usage_percent": round(cpu["usage_percent"], 1),
+            "per_core_percent": cpu["per_core_percent"],
+        }
+    
+    def _uptime(self) -> float:
+        """Seconds since boot of the monitored system."""
+        try:
+            with open(os.path.join(self.proc_root, "uptime"), "r") as f:
+                return float(f.read().split()[0])
+        except (OSError, IndexError, ValueError):
+            return 0.0
+    
+    def _loadavg(self) -> Dict:
+        """Load averages and scheduler entity counts from loadavg."""
+        try:
+            with open(os.path.join(self.proc_root, "loadavg"), "r") as f:
+                fields = f.read().split()
+            running, total = fields[3].split("/")
+            return {"1min": float(fields[0]), "5min": float(fields[1]), "15min": float(fields[2]),
+                    "running": int(running), "threads": int(total)}
+        except (OSError, IndexError, ValueError):
+            return {}
+    
+    def _hostname(self) -> str:
+        """Hostname of the monitored system."""
+        try:
+            with open(os.path.join(self.proc_root, "sys", "kernel", "hostname"), "r") as f:
+                return f.read().strip()
+        except OSError:
+            return os.uname().nodename
+    
+    def _processes(self, elapsed: Optional[float]) -> List[Dict]:
+        """The top processes by CPU usage since the previous sample."""
+        # Tick-rounded CPU times can briefly exceed the wall time elapsed
+        cpu_limit = 100.0 * self.cpu_collector.cpu_count
+        memory_total = read_meminfo(self.proc_root).get("MemTotal", 0)
+        processes = []
+        process_cpu = {}
+        try:
+            pids = [int(name) for name in os.listdir(self.proc_root) if name.isdigit()]
+        except OSError:
+            pids = []
+        for pid in pids:
+            try:
+                with open(os.path.join(self.proc_root, str(pid), "stat"), "rb") as f:
+                    stat = parse_process_stat(f.read())
+            except (OSError, ValueError):
+                continue
+            if stat is None:
+                continue
+            name, cpu_seconds, _, rss = stat
+            process_cpu[pid] = cpu_seconds
+            # A process started since the previous sample used all of its
+            # CPU time within the window
+            previous = self._prev_process_cpu.get(pid, 0.0)
+            cpu_percent = min(max(cpu_seconds - previous, 0.0) / elapsed * 100, cpu_limit) if elapsed else 0.0
+            processes.append({
+                "pid": pid,
+                "name": name,
+                "cpu_percent": round(cpu_percent, 1),
+                "memory_percent": round(rss / memory_total * 100, 1) if memory_total else 0.0,
+                "rss": rss,
+            })
+        self._prev_process_cpu = process_cpu
+        
+        processes.sort(key=lambda process: process["cpu_percent"], reverse=True)
+        return processes[:self.top_count]
+    
+    def sample(self) -> Dict:
+        """
+        Collect one sample.
+        
+        Returns:
+            Dict containing timestamp, hostname, uptime (seconds), cpu,
+            load_avg, memory and swap (bytes and percent), pressure (avg10
+            per resource and kind) and processes (the top processes)
+        """
+        if self._prev_time is None:
+            self._start_window()
+        now = time.time()
+        elapsed = now - self._prev_time
+        self._prev_time = now
+        
+        uptime = self._uptime()
+        meminfo = read_meminfo(self.proc_root)
+        memory_total = meminfo.get("MemTotal", 0)
+        memory_available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+        swap_total = meminfo.get("SwapTotal", 0)
+        swap_used = swap_total - meminfo.get("SwapFree", 0)
+        pressure = self.pressure_collector.collect()
+        
+        return {
+            "timestamp": now,
+            "hostname": self._hostname(),
+            "uptime": uptime,
+            "cpu": self._cpu(),
+            "load_avg": self._loadavg(),
+            "memory": {"total": memory_total, "used": memory_total - memory_available,
+                       "available": memory_available,
+                       "usage_percent": round((memory_total - memory_available) / memory_total * 100, 1)
+                       if memory_total else 0.0},
+            "swap": {"total": swap_total, "used": swap_used,
+                     "usage_percent": round(swap_used / swap_total * 100, 1) if swap_total else 0.0},
+            "pressure": {
+                resource: {kind: values["avg10"] for kind, values in pressure[resource].items()}
+                for resource in ("cpu", "memory", "io") if resource in pressure
+            },
+            "processes": self._processes(elapsed) if self.top_count else [],
+        }
+    
+    def close(self):
+        """Close the CPU and pressure files."""
+        self.cpu_collector.close()
+        self.pressure_collector.close()
+
+
+def _bytes(value: float) -> str:
+    """Format a byte count with a binary unit."""
+    if value < 1024:
+        return f"{value:.0f}B"
+    for unit in ("K", "M", "G", "T"):
+        value /= 1024
+        if value < 1024 or unit == "T":
+            break
+    return f"{value:.1f}{unit}"
+
+
+def format_text(sample: Dict) -> str:
+    """
+    Render a sample as a top-style text block.
+    
+    Args:
+        sample: Sample from BatchSampler.sample
+        
+    Returns:
+        Text ending with a newline
+    """
+    uptime = int(sample["uptime"])
+    days, rest = divmod(uptime, 86400)
+    load = sample["load_avg"]
+    lines = [
+        f"{sample['hostname']} - {time.strftime('%H:%M:%S', time.localtime(sample['timestamp']))} "
+        f"up {days}d {rest // 3600:02d}:{rest % 3600 // 60:02d}, "
+        f"load average: {load.get('1min', 0):.2f}, {load.get('5min', 0):.2f}, {load.get('15min', 0):.2f}",
+        f"Threads: {load.get('threads', 0)} total, {load.get('running', 0)} running",
+        f"CPU: {sample['cpu']['usage_percent']:5.1f}% used, per core: "
+        + " ".join(f"{value:.0f}" for value in sample["cpu"]["per_core_percent"]),
+    ]
+    memory, swap = sample["memory"], sample["swap"]
+    lines.append(f"Mem: {_bytes(memory['total'])} total, {_bytes(memory['used'])} used, "
+                 f"{_bytes(memory['available'])} available ({memory['usage_percent']:.1f}%)")
+    lines.append(f"Swap: {_bytes(swap['total'])} total, {_bytes(swap['used'])} used ({swap['usage_percent']:.1f}%)")
+    if sample["pressure"]:
+        lines.append("Pressure (avg10): " + ", ".join(
+            f"{resource} " + "/".join(f"{kind} {value:.2f}" for kind, value in kinds.items())
+            for resource, kinds in sample["pressure"].items()))
+    if sample["processes"]:
+        lines.append("")
+        lines.append(f"{'PID':>8} {'%CPU':>6} {'%MEM':>5} {'RSS':>8}  COMMAND")
+        for process in sample["processes"]:
+            lines.append(f"{process['pid']:>8} {process['cpu_percent']:>6.1f} {process['memory_percent']:>5.1f} "
+                         f"{_bytes(process['rss']):>8}  {process['name']}")
+    return "\n".join(lines) + "\n"
+
+
+def format_json(sample: Dict) -> str:
+    """
+    Render a sample as one line of JSON (JSON Lines across samples).
+    
+    Args:
+        sample: Sample from BatchSampler.sample
+        
+    Returns:
+        JSON text ending with a newline
+    """
+    return json.dumps(sample, separators=(",", ":")) + "\n"
+
+
+def run_batch(sampler: BatchSampler, count: int, interval: float, output_format: str, stream: TextIO):
+    """
+    Print samples to a stream.
+    
+    Args:
+        sampler: Sampler to collect with
+        count: Number of samples (0 = until interrupted)
+        interval: Seconds between samples
+        output_format: "text" or "json"
+        stream: Stream to write to
+    """
+    formatter = format_json if output_format == "json" else format_text
+    printed = 0
+    next_time = time.monotonic()
+    while not count or printed < count:
+        if printed:
+            time.sleep(max(0.0, next_time - time.monotonic()))
+            if output_format == "text":
+                stream.write("\n")
+        stream.write(formatter(sampler.sample()))
+        stream.flush()
+        printed += 1
+        next_time += interval
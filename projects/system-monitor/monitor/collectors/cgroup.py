@@ -0,0 +1,381 @@
+"""
+Cgroup Collector Module for Linux System Monitor
+
+This module handles collecting per-cgroup (per-container) resource usage
+from the cgroup v2 hierarchy.
+"""
+
+import heapq
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from monitor.collectors.descriptors import FD_EXHAUSTED, DescriptorBudget, shared_budget
+
+# Roots of the proc and sys filesystems
+PROC_ROOT = "/proc"
+SYS_ROOT = "/sys"
+
+# Default cgroup v2 mount point
+CGROUP2_ROOT = "/sys/fs/cgroup"
+
+# Files read for every cgroup on every collection, in the order they get
+# one of the limited held-open descriptors
+HOT_FILES = ("cpu.stat", "memory.current", "io.stat", "cpu.pressure", "memory.pressure", "io.pressure")
+
+# memory.stat is only read for cgroups that make it into a top-N list
+MEMORY_STAT_KEYS = ("anon", "file", "kernel", "shmem", "sock")
+
+# Seconds between full tree rescans, catching creations and removals that
+# leave the descendant count unchanged
+FULL_RESCAN_INTERVAL = 30.0
+
+# Largest file read through a held descriptor
+READ_SIZE = 65536
+
+
+def find_cgroup2_root(mounts_path: str = "/proc/self/mounts") -> Optional[str]:
+    """
+    Find where the cgroup v2 hierarchy is mounted.
+    
+    Args:
+        mounts_path: Mount table to search
+        
+    Returns:
+        Mount point, or None if cgroup v2 is not mounted
+    """
+    try:
+        with open(mounts_path, "r") as f:
+            mount_points = [line.split()[1] for line in f if line.split()[2:3] == ["cgroup2"]]
+    except OSError:
+        return None
+    if CGROUP2_ROOT in mount_points:
+        return CGROUP2_ROOT
+    return mount_points[0] if mount_points else None
+
+
+_IO_READ_BYTES = re.compile(rb"rbytes=(\d+)")
+_IO_WRITE_BYTES = re.compile(rb"wbytes=(\d+)")
+_PRESSURE_AVG10 = re.compile(rb"(some|full) avg10=([\d.]+)")
+
+
+def _parse_keyed(text: bytes) -> Dict[str, int]:
+    """Parse a flat "key value" file such as cpu.stat or memory.stat."""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(b" ")
+        try:
+            values[key.decode("ascii")] = int(value)
+        except ValueError:
+            pass
+    return values
+
+
+def _parse_usage_usec(text: bytes) -> int:
+    """Get usage_usec from cpu.stat, which the kernel always prints first."""
+    if text.startswith(b"usage_usec "):
+        return int(text[11:text.index(b"\n")])
+    return _parse_keyed(text).get("usage_usec", 0)
+
+
+def _parse_io_stat(text: bytes) -> Tuple[int, int]:
+    """Sum read and written bytes over every device in io.stat."""
+    if not text:
+        return 0, 0
+    read_bytes = sum(map(int, _IO_READ_BYTES.findall(text)))
+    write_bytes = sum(map(int, _IO_WRITE_BYTES.findall(text)))
+    return read_bytes, write_bytes
+
+
+def _parse_pressure(text: bytes) -> Tuple[float, float]:
+    """Get the "some" and "full" 10-second averages from a pressure file."""
+    averages = dict(_PRESSURE_AVG10.findall(text))
+    return float(averages.get(b"some", 0.0)), float(averages.get(b"full", 0.0))
+
+
+class _Cgroup:
+    """Discovery and rate state for one cgroup directory."""
+    
+    __slots__ = ("path", "name", "fds", "missing", "has_children", "prev_usage", "prev_io", "stats")
+    
+    def __init__(self, path: str, name: str):
+        """Initialize tracking state for a cgroup directory."""
+        self.path = path
+        self.name = name
+        self.fds: Dict[str, int] = {}
+        self.missing = set()
+        self.has_children = False
+        self.prev_usage: Optional[int] = None
+        self.prev_io: Optional[Tuple[int, int]] = None
+        self.stats: Dict[str, float] = {}
+
+
+class CgroupCollector:
+    """
+    Collector for per-cgroup CPU, memory, I/O and pressure.
+    
+    The cgroup tree is cached between collections. It is rescanned only when
+    the root's descendant count changes, when a cgroup disappears, and every
+    FULL_RESCAN_INTERVAL seconds; a rescan only opens files for cgroups it
+    has not seen before. Hot files are read through held-open descriptors
+    with pread, so a collection costs one syscall per file and no path
+    lookups.
+    """
+    
+    def __init__(self, root: Optional[str] = None, top_count: int = 10,
+                 proc_root: str = PROC_ROOT, sys_root: str = SYS_ROOT,
+                 fd_budget: Optional[DescriptorBudget] = None):
+        """
+        Initialize the cgroup collector.
+        
+        Args:
+            root: cgroup v2 mount point (found from the mount table if None)
+            top_count: Number of cgroups in each top-N list
+            proc_root: Root of the proc filesystem
+            sys_root: Root of the sys filesystem; if it is not /sys, the
+                hierarchy is expected at its fs/cgroup
+            fd_budget: Descriptors the held-open files may take (defaults
+                to the budget shared by every collector)
+        """
+        if not root and sys_root != SYS_ROOT:
+            root = os.path.join(sys_root, "fs", "cgroup")
+        self.root = root or find_cgroup2_root(os.path.join(proc_root, "self", "mounts"))
+        self.top_count = top_count
+        self.available = bool(self.root) and os.path.isfile(os.path.join(self.root, "cgroup.controllers"))
+        
+        self._groups: Dict[str, _Cgroup] = {}
+        self._descendants: Optional[Tuple[int, int]] = None
+        self._last_scan = 0.0
+        self._prev_time: Optional[float] = None
+        self._fd_budget = fd_budget or shared_budget()
+    
+    def collect(self) -> Dict:
+        """
+        Collect current per-cgroup metrics.
+        
+        Returns:
+            Dict containing cgroup metrics:
+                - available: Whether a cgroup v2 hierarchy was found
+                - count: Number of leaf cgroups (containers, services, scopes)
+                - cgroups: Leaf cgroups in the top-N by CPU, memory or I/O,
+                  each with cpu_percent (of one CPU), memory_current (bytes),
+                  memory breakdown, io_read_rate / io_write_rate (bytes/s)
+                  and pressure averages
+        """
+        if not self.available:
+            return {"available": False, "count": 0, "cgroups": []}
+        
+        now = time.monotonic()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        self._prev_time = now
+        
+        if self._needs_rescan(now):
+            self._scan(now)
+        
+        removed = []
+        for group in self._groups.values():
+            if not self._sample(group, elapsed):
+                removed.append(group.path)
+        if removed:
+            # Some cgroups went away; forget them and pick up any new ones
+            self._scan(now)
+        
+        leaves = [group for group in self._groups.values() if not group.has_children and group.name]
+        selected = {}
+        for key in ("cpu_percent", "memory_current", "io_rate"):
+            for group in heapq.nlargest(self.top_count, leaves, key=lambda group: group.stats.get(key, 0)):
+                selected[group.name] = group
+        
+        cgroups = []
+        for group in selected.values():
+            self._read_memory_stat(group)
+            entry = {"name": group.name}
+            entry.update(group.stats)
+            cgroups.append(entry)
+        
+        return {"available": True, "count": len(leaves), "cgroups": cgroups}
+    
+    def top(self, key: str = "cpu_percent", count: Optional[int] = None) -> List[Dict]:
+        """
+        Get the busiest leaf cgroups from the last collection.
+        
+        Args:
+            key: Metric to rank by (cpu_percent, memory_current, io_rate, ...)
+            count: Number of cgroups (defaults to top_count)
+            
+        Returns:
+            List of dicts with the cgroup name and its metrics, busiest first
+        """
+        leaves = [group for group in self._groups.values() if not group.has_children and group.name]
+        busiest = heapq.nlargest(count or self.top_count, leaves, key=lambda group: group.stats.get(key, 0))
+        return [dict(group.stats, name=group.name) for group in busiest]
+    
+    def _needs_rescan(self, now: float) -> bool:
+        """Check the cheap signals that the cgroup tree changed."""
+        if now - self._last_scan > FULL_RESCAN_INTERVAL:
+            return True
+        try:
+            with open(os.path.join(self.root, "cgroup.stat"), "rb") as f:
+                stat = _parse_keyed(f.read())
+        except OSError:
+            return True
+        descendants = (stat.get("nr_descendants", 0), stat.get("nr_dying_descendants", 0))
+        if descendants != self._descendants:
+            self._descendants = descendants
+            return True
+        return False
+    
+    def _scan(self, now: float):
+        """Walk the tree, adding new cgroups and dropping removed ones."""
+        seen = set()
+        complete = True
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            group = self._groups.get(path)
+            if group is None:
+                group = self._add(path)
+            seen.add(path)
+            
+            try:
+                children = [entry.path for entry in os.scandir(path) if entry.is_dir(follow_symlinks=False)]
+            except OSError as error:
+                if error.errno in FD_EXHAUSTED:
+                    # Out of descriptors: the walk is incomplete, so nothing
+                    # unseen can be taken as removed
+                    complete = False
+                else:
+                    seen.discard(path)
+                continue
+            group.has_children = bool(children)
+            stack.extend(children)
+        
+        if complete:
+            for path in self._groups.keys() - seen:
+                self._remove(path)
+        self._last_scan = now
+    
+    def _add(self, path: str) -> _Cgroup:
+        """Start tracking a cgroup, holding its hot files open while the budget allows."""
+        group = _Cgroup(path, os.path.relpath(path, self.root) if path != self.root else "")
+        for filename in HOT_FILES:
+            if not self._fd_budget.acquire():
+                break
+            try:
+                group.fds[filename] = os.open(os.path.join(path, filename), os.O_RDONLY)
+            except FileNotFoundError:
+                # Controller not enabled for this cgroup
+                group.missing.add(filename)
+                self._fd_budget.release()
+            except OSError:
+                self._fd_budget.release()
+        self._groups[path] = group
+        return group
+    
+    def _remove(self, path: str):
+        """Stop tracking a cgroup and close its descriptors."""
+        group = self._groups.pop(path)
+        for fd in group.fds.values():
+            os.close(fd)
+        self._fd_budget.release(len(group.fds))
+        group.fds.clear()
+    
+    def _read(self, group: _Cgroup, filename: str) -> Optional[bytes]:
+        """
+        Read one cgroup file, through its held descriptor if it has one.
+        
+        Returns:
+            File contents, or None if the file does not exist for this cgroup
+            or no descriptor was free to read it by path
+            
+        Raises:
+            OSError: If the cgroup itself is gone
+        """
+        if filename in group.missing:
+            return None
+        fd = group.fds.get(filename)
+        if fd is not None:
+            return os.pread(fd, READ_SIZE, 0)
+        try:
+            with open(os.path.join(group.path, filename), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            if not os.path.isdir(group.path):
+                raise
+            group.missing.add(filename)
+            return None
+        except OSError as error:
+            # The process or system is out of descriptors: skip the file
+            # this time, the cgroup is still there
+            if error.errno in FD_EXHAUSTED:
+                return None
+            raise
+    
+    def _sample(self, group: _Cgroup, elapsed: float) -> bool:
+        """
+        Read a cgroup's hot files and update its rates.
+        
+        Returns:
+            False if the cgroup no longer exists
+        """
+        try:
+            if len(group.fds) == len(HOT_FILES):
+                # Fast path: every hot file is held open, in HOT_FILES order
+                texts = [os.pread(fd, READ_SIZE, 0) for fd in group.fds.values()]
+            else:
+                texts = [self._read(group, filename) for filename in HOT_FILES]
+        except OSError:
+            return False
+        cpu_stat, memory_current, io_stat = texts[:3]
+        pressure = texts[3:]
+        
+        stats = group.stats
+        
+        if cpu_stat is not None:
+            usage = _parse_usage_usec(cpu_stat)
+            if group.prev_usage is not None and elapsed > 0:
+                stats["cpu_percent"] = max(0, usage - group.prev_usage) / 1e6 / elapsed * 100
+            group.prev_usage = usage
+        
+        if memory_current is not None:
+            stats["memory_current"] = int(memory_current or 0)
+        
+        if io_stat is not None:
+            io_bytes = _parse_io_stat(io_stat)
+            if group.prev_io is not None and elapsed > 0:
+                stats["io_read_rate"] = max(0, io_bytes[0] - group.prev_io[0]) / elapsed
+                stats["io_write_rate"] = max(0, io_bytes[1] - group.prev_io[1]) / elapsed
+                stats["io_rate"] = stats["io_read_rate"] + stats["io_write_rate"]
+            group.prev_io = io_bytes
+        
+        for resource_name, text in zip(("cpu", "memory", "io"), pressure):
+            if text is not None:
+                stats[f"{resource_name}_pressure_some"], stats[f"{resource_name}_pressure_full"] = _parse_pressure(text)
+        
+        return True
+    
+    def _read_memory_stat(self, group: _Cgroup):
+        """Add the memory breakdown for a cgroup that is being reported."""
+        try:
+            text = self._read(group, "memory.stat")
+        except OSError:
+            return
+        if text is not None:
+            memory_stat = _parse_keyed(text)
+            for key in MEMORY_STAT_KEYS:
+                group.stats[f"memory_{key}"] = memory_stat.get(key, 0)
+    
+    def reset(self):
+        """Reset rate state and rescan the tree on the next collection."""
+        for group in self._groups.values():
+            group.prev_usage = None
+            group.prev_io = None
+            group.stats = {}
+        self._prev_time = None
+        self._last_scan = 0.0
+    
+    def close(self):
+        """Close every held descriptor."""
+        for path in list(self._groups):
+            self._remove(path)
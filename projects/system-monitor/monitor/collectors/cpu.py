@@ -4,200 +4,319 @@ CPU Collector Module for Linux System Monitor
 This module handles collecting CPU usage metrics from the system.
 """
 
+import glob
+import os
 import time
-from typing import Dict, List, Optional, Union
+from typing import List, Optional
 
 import psutil
 
+from monitor.collectors.records import CPUFrequency, CPUSample, CPUTemperature, LoadAverage
+from monitor.collectors.topology import read_cpu_topology
+
+# Roots of the proc and sys filesystems (a container monitoring its host
+# sees them under e.g. /host/proc and /host/sys)
+PROC_ROOT = "/proc"
+SYS_ROOT = "/sys"
+
+# hwmon drivers reporting CPU temperature, in order of preference
+CPU_SENSORS = ("coretemp", "k10temp", "zenpower", "acpitz")
+
+# Bytes read from /proc/stat beyond its size at the previous read (the
+# read is retried with a doubled size when the file has grown past that)
+STAT_READ_SLACK = 4096
+
+
+def _read_int(path: str) -> Optional[int]:
+    """Read an integer sysfs attribute, or None if it is missing."""
+    try:
+        with open(path, "rb") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _open_all(paths: List[str]) -> List[int]:
+    """Open sysfs attributes to be re-read with pread, skipping unreadable ones."""
+    fds = []
+    for path in paths:
+        try:
+            fds.append(os.open(path, os.O_RDONLY))
+        except OSError:
+            pass
+    return fds
+
+
+def _pread_int(fd: int) -> Optional[int]:
+    """Re-read an integer sysfs attribute through a held descriptor."""
+    try:
+        return int(os.pread(fd, 32, 0))
+    except (OSError, ValueError):
+        return None
+
 
 class CPUCollector:
     """Collector for CPU metrics including usage, load, frequency, and temperature."""
     
-    def __init__(self):
-        """Initialize the CPU collector with initial measurements."""
-        # Cache the number of CPU cores
-        self.cpu_count = psutil.cpu_count(logical=True)
-        self.physical_cores = psutil.cpu_count(logical=False)
+    def __init__(self, proc_root: str = PROC_ROOT, sys_root: str = SYS_ROOT):
+        """
+        Initialize the CPU collector with initial measurements.
         
-        # Initialize previous measurements for delta calculations
+        Args:
+            proc_root: Root of the proc filesystem
+            sys_root: Root of the sys filesystem
+        """
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        
+        # /proc/stat is held open and parsed once per collection for the
+        # overall and per-core times, context switches and interrupts
+        # (psutil would read and parse it three times)
+        self._stat_fd = os.open(os.path.join(proc_root, "stat"), os.O_RDONLY)
+        self._stat_size = STAT_READ_SLACK
+        
+        # Socket, NUMA node and physical core of each logical CPU (static,
+        # read once)
+        self.cpu_groups = read_cpu_topology(os.path.join(sys_root, "devices", "system"))
+        
+        # Previous measurements for delta calculations: overall busy and
+        # total jiffies, and per-core (busy, total) pairs
         self._prev_total = None
         self._prev_busy = None
+        self._prev_cores: List[tuple] = []
         self._prev_time = time.time()
         
         # Take initial measurements
         self._init_measurements()
+        
+        # Cache the number of CPU cores, as seen in proc_root rather than by
+        # the machine the monitor runs on
+        self.cpu_count = len(self._prev_cores) or psutil.cpu_count(logical=True)
+        self.physical_cores = len(set(self.cpu_groups["core"])) or psutil.cpu_count(logical=False)
+        
+        # Frequency and temperature files are found and opened once, then
+        # re-read with pread on every collection (hundreds of files on
+        # large machines, so path lookups would dominate)
+        frequency_paths, self._frequency_range = self._find_frequency_files()
+        self._frequency_fds = _open_all(frequency_paths)
+        self._temperature_fds = _open_all(self._find_temperature_files())
+    
+    def _read_stat(self):
+        """
+        Read and parse /proc/stat.
+        
+        Returns:
+            (overall busy jiffies, overall total jiffies, per-core
+            (busy, total) pairs, context switches, interrupts)
+        """
+        data = os.pread(self._stat_fd, self._stat_size, 0)
+        while len(data) == self._stat_size:
+            # The file did not fit (large machines have long intr lines)
+            self._stat_size *= 2
+            data = os.pread(self._stat_fd, self._stat_size, 0)
+        # Reading exactly what is needed keeps the buffer small
+        self._stat_size = len(data) + STAT_READ_SLACK
+        
+        busy = total = 0
+        cores = []
+        context_switches = interrupts = 0
+        for line in data.splitlines():
+            if line.startswith(b"cpu"):
+                # user nice system idle iowait irq softirq steal guest
+                # guest_nice; guest time is already counted in user and
+                # nice, and steal counts as busy (the CPU was wanted but
+                # the hypervisor ran something else), as in psutil
+                fields = [int(field) for field in line.split()[1:9]]
+                cpu_total = sum(fields)
+                cpu_busy = cpu_total - fields[3] - fields[4]
+                if line[3:4] == b" ":
+                    busy, total = cpu_busy, cpu_total
+                else:
+                    cores.append((cpu_busy, cpu_total))
+            elif line.startswith(b"intr "):
+                # Only the first field (the total) of a long line is needed
+                interrupts = int(line.split(None, 2)[1])
+            elif line.startswith(b"ctxt "):
+                context_switches = int(line[5:])
+        return busy, total, cores, context_switches, interrupts
     
     def _init_measurements(self):
         """Take initial CPU measurements for delta calculations."""
-        cpu_times = psutil.cpu_times()
-        self._prev_busy = cpu_times.user + cpu_times.system + cpu_times.nice + cpu_times.irq + cpu_times.softirq
-        self._prev_total = self._prev_busy + cpu_times.idle + cpu_times.iowait
+        self._prev_busy, self._prev_total, self._prev_cores, _, _ = self._read_stat()
     
-    def collect(self) -> Dict[str, Union[float, Dict, List]]:
+    def collect(self) -> CPUSample:
         """
         Collect current CPU metrics.
         
         Returns:
-            Dict containing CPU metrics:
+            CPUSample record (see monitor.collectors.records) containing:
                 - usage_percent: Overall CPU usage as a percentage
                 - per_core_percent: List of per-core usage percentages
                 - load_avg: 1, 5, and 15-minute load averages
                 - frequency: Current, min, and max CPU frequencies
                 - temperature: CPU temperature if available
-                - context_switches: Number of context switches since last collection
-                - interrupts: Number of interrupts since last collection
+                - context_switches: Number of context switches since boot
+                - interrupts: Number of interrupts since boot
+                - groups: Socket, NUMA node and physical core id of each logical CPU
+                - utilization_level, potential_bottleneck, core_imbalance:
+                  derived from the above
         """
         # Get current time for calculations
         current_time = time.time()
-        elapsed = current_time - self._prev_time
         self._prev_time = current_time
         
-        # Collect CPU metrics
-        result = {
-            "usage_percent": 0.0,
-            "per_core_percent": [],
-            "load_avg": {},
-            "frequency": {},
-            "temperature": None,
-            "context_switches": 0,
-            "interrupts": 0,
-        }
-        
-        # Calculate CPU usage since last collection
-        if self._prev_total is not None:
-            cpu_times = psutil.cpu_times()
-            current_busy = cpu_times.user + cpu_times.system + cpu_times.nice + cpu_times.irq + cpu_times.softirq
-            current_total = current_busy + cpu_times.idle + cpu_times.iowait
-            
-            # Calculate the delta
-            busy_delta = current_busy - self._prev_busy
-            total_delta = current_total - self._prev_total
-            
-            # Update previous values for next collection
-            self._prev_busy = current_busy
-            self._prev_total = current_total
-            
-            # Calculate usage percentage
-            if total_delta > 0:
-                result["usage_percent"] = (busy_delta / total_delta) * 100
-        else:
-            # First collection - use psutil's measurement
-            result["usage_percent"] = psutil.cpu_percent(interval=None)
-            self._init_measurements()
-        
-        # Get per-core CPU usage
-        result["per_core_percent"] = psutil.cpu_percent(interval=None, percpu=True)
-        
-        # Get load average (returns 1, 5, and 15-minute averages)
-        load_avgs = psutil.getloadavg()
-        result["load_avg"] = {
-            "1min": load_avgs[0],
-            "5min": load_avgs[1],
-            "15min": load_avgs[2],
-            # Normalize load by core count for better comparison
-            "1min_normalized": load_avgs[0] / self.cpu_count,
-            "5min_normalized": load_avgs[1] / self.cpu_count,
-            "15min_normalized": load_avgs[2] / self.cpu_count,
-        }
+        # Calculate CPU usage overall and per core since last collection
+        try:
+            current_busy, current_total, cores, context_switches, interrupts = self._read_stat()
+        except (OSError, ValueError, IndexError):
+            current_busy, current_total, cores, context_switches, interrupts = (
+                self._prev_busy, self._prev_total, self._prev_cores, 0, 0)
+        
+        busy_delta = current_busy - self._prev_busy
+        total_delta = current_total - self._prev_total
+        usage_percent = (busy_delta / total_delta) * 100 if total_delta > 0 else 0.0
+        
+        previous_cores = self._prev_cores if len(self._prev_cores) == len(cores) else [(0, 0)] * len(cores)
+        per_core_percent = [
+            round((busy - prev_busy) / (total - prev_total) * 100, 1) if total > prev_total else 0.0
+            for (busy, total), (prev_busy, prev_total) in zip(cores, previous_cores)
+        ]
+        
+        # Update previous values for next collection
+        self._prev_busy = current_busy
+        self._prev_total = current_total
+        self._prev_cores = cores
         
         # Get CPU frequency information if available
-        try:
-            freq = psutil.cpu_freq(percpu=False)
-            if freq:
-                result["frequency"] = {
-                    "current_mhz": freq.current,
-                    "min_mhz": freq.min if hasattr(freq, "min") else None,
-                    "max_mhz": freq.max if hasattr(freq, "max") else None,
-                }
-        except (AttributeError, OSError):
-            # CPU frequency info may not be available on all systems
-            pass
+        current_mhz = self._get_cpu_frequency()
+        frequency = None
+        if current_mhz is not None:
+            frequency = CPUFrequency(current_mhz, self._frequency_range[0], self._frequency_range[1])
         
         # Get CPU temperature information if available
         try:
-            temp_info = self._get_cpu_temperature()
-            if temp_info is not None:
-                result["temperature"] = temp_info
+            temperature = self._get_cpu_temperature()
         except (AttributeError, OSError):
             # Temperature info may not be available on all systems
-            pass
+            temperature = None
         
-        # Get context switches and interrupts
-        try:
-            cpu_stats = psutil.cpu_stats()
-            result["context_switches"] = cpu_stats.ctx_switches
-            result["interrupts"] = cpu_stats.interrupts
-        except (AttributeError, OSError):
-            pass
+        return CPUSample(
+            usage_percent,
+            per_core_percent,
+            LoadAverage(*self._get_load_average(), self.cpu_count),
+            frequency,
+            temperature,
+            context_switches,
+            interrupts,
+            self.cpu_groups,
+        )
+    
+    def _find_frequency_files(self):
+        """
+        Find the cpufreq files of every CPU frequency policy.
+        
+        Returns:
+            (current frequency files, (min MHz, max MHz)); the files are
+            empty if cpufreq is unavailable
+        """
+        base = os.path.join(self.sys_root, "devices", "system", "cpu")
+        policies = glob.glob(os.path.join(base, "cpufreq", "policy[0-9]*"))
+        if not policies:
+            policies = glob.glob(os.path.join(base, "cpu[0-9]*", "cpufreq"))
         
-        # Additional processing
-        self._enrich_data(result)
+        paths = []
+        minimums, maximums = [], []
+        for policy in sorted(policies):
+            path = os.path.join(policy, "scaling_cur_freq")
+            if not os.path.exists(path):
+                continue
+            paths.append(path)
+            minimum = _read_int(os.path.join(policy, "cpuinfo_min_freq"))
+            maximum = _read_int(os.path.join(policy, "cpuinfo_max_freq"))
+            if minimum is not None:
+                minimums.append(minimum)
+            if maximum is not None:
+                maximums.append(maximum)
         
-        return result
+        # cpufreq reports kHz
+        frequency_range = (min(minimums) / 1000 if minimums else None,
+                           max(maximums) / 1000 if maximums else None)
+        return paths, frequency_range
     
-    def _get_cpu_temperature(self) -> Optional[Dict[str, float]]:
+    def _get_cpu_frequency(self) -> Optional[float]:
         """
-        Attempt to get CPU temperature from sensors.
+        Get the mean current CPU frequency.
         
         Returns:
-            Dict with temperature data or None if unavailable
+            Frequency in MHz, or None if unavailable
         """
+        if self._frequency_fds:
+            values = [value for value in map(_pread_int, self._frequency_fds) if value is not None]
+            return sum(values) / len(values) / 1000 if values else None
+        
+        # Without cpufreq (e.g. in many VMs) cpuinfo has the clock speed
         try:
-            # Try using psutil for temperature (if available)
-            temps = psutil.sensors_temperatures()
-            
-            # Look for CPU temperature sensors
-            cpu_temp = None
-            
-            # Check common temperature sensor names
-            for sensor_name in ["coretemp", "k10temp", "zenpower", "acpitz"]:
-                if sensor_name in temps:
-                    # Get the highest temperature from the CPU cores
-                    cpu_temp = max(temp.current for temp in temps[sensor_name])
-                    break
-            
-            if cpu_temp is not None:
-                return {
-                    "celsius": cpu_temp,
-                    "fahrenheit": (cpu_temp * 9/5) + 32,
-                }
-        except (AttributeError, OSError, KeyError):
-            pass
+            with open(os.path.join(self.proc_root, "cpuinfo"), "r") as f:
+                values = [float(line.split(":")[1]) for line in f if line.startswith("cpu MHz")]
+        except (OSError, ValueError, IndexError):
+            return None
+        return sum(values) / len(values) if values else None
+    
+    def _get_load_average(self):
+        """Get the 1, 5 and 15-minute load averages from proc_root."""
+        try:
+            with open(os.path.join(self.proc_root, "loadavg"), "r") as f:
+                fields = f.read().split()
+            return float(fields[0]), float(fields[1]), float(fields[2])
+        except (OSError, ValueError, IndexError):
+            return 0.0, 0.0, 0.0
+    
+    def _find_temperature_files(self) -> List[str]:
+        """
+        Find the temperature inputs of the preferred CPU sensor.
         
-        return None
+        Returns:
+            hwmon temp*_input files, empty if no CPU sensor is present
+        """
+        sensors = {}
+        for hwmon in glob.glob(os.path.join(self.sys_root, "class", "hwmon", "hwmon*")):
+            try:
+                with open(os.path.join(hwmon, "name"), "r") as f:
+                    name = f.read().strip()
+            except OSError:
+                continue
+            sensors.setdefault(name, []).extend(glob.glob(os.path.join(hwmon, "temp*_input")))
+        
+        for sensor_name in CPU_SENSORS:
+            if sensors.get(sensor_name):
+                return sorted(sensors[sensor_name])
+        return []
     
-    def _enrich_data(self, data: Dict):
+    def _get_cpu_temperature(self) -> Optional[CPUTemperature]:
         """
-        Add derived metrics and additional context to the collected data.
+        Attempt to get CPU temperature from sensors.
         
-        Args:
-            data: The data dictionary to enrich
+        Returns:
+            Temperature record or None if unavailable
         """
-        # Calculate overall system utilization level
-        if data["usage_percent"] <= 30:
-            data["utilization_level"] = "low"
-        elif data["usage_percent"] <= 70:
-            data["utilization_level"] = "moderate"
-        else:
-            data["utilization_level"] = "high"
-        
-        # Check for potential CPU bottlenecks
-        if data["usage_percent"] > 90 and data["load_avg"]["1min_normalized"] > 1.0:
-            data["potential_bottleneck"] = True
-        else:
-            data["potential_bottleneck"] = False
-        
-        # Calculate core imbalance (max difference between any two cores)
-        if len(data["per_core_percent"]) > 1:
-            core_min = min(data["per_core_percent"])
-            core_max = max(data["per_core_percent"])
-            data["core_imbalance"] = core_max - core_min
-        else:
-            data["core_imbalance"] = 0
+        # Get the highest temperature from the CPU cores (hwmon reports
+        # millidegrees)
+        values = [value for value in map(_pread_int, self._temperature_fds) if value is not None]
+        if not values:
+            return None
+        return CPUTemperature(max(values) / 1000)
     
     def reset(self):
         """Reset collector state, clearing any cached or accumulated data."""
-        self._prev_total = None
-        self._prev_busy = None
         self._prev_time = time.time()
         self._init_measurements()
+    
+    def close(self):
+        """Close the held /proc/stat, frequency and temperature descriptors."""
+        for fd in [self._stat_fd] + self._frequency_fds + self._temperature_fds:
+            if fd is not None:
+                os.close(fd)
+        self._stat_fd = None
+        self._frequency_fds = []
+        self._temperature_fds = []
+
@@ -0,0 +1,98 @@
+"""
+Descriptor Budget Module for Linux System Monitor
+
+This module handles sharing the process's file descriptor limit between the
+collectors that hold files open across collections, so that together they
+never take the descriptors the rest of the monitor needs.
+"""
+
+import errno
+import resource
+import threading
+from typing import Optional
+
+# Descriptors left for everything else the process opens
+RESERVED_FDS = 256
+
+# Highest soft descriptor limit the monitor asks for
+MAX_FD_LIMIT = 65536
+
+# errno values of an open that failed because no descriptor was free; the
+# file is still there and can be read by path once one is
+FD_EXHAUSTED = (errno.EMFILE, errno.ENFILE)
+
+
+def raise_fd_limit() -> int:
+    """Raise the soft descriptor limit as far as allowed and return it."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = MAX_FD_LIMIT if hard == resource.RLIM_INFINITY else min(hard, MAX_FD_LIMIT)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    return soft if soft != resource.RLIM_INFINITY else MAX_FD_LIMIT
+
+
+class DescriptorBudget:
+    """
+    Count of descriptors collectors may hold open between collections.
+    
+    A collector claims a descriptor before opening a file it keeps, and
+    gives it back when it closes the file; a file it cannot claim one for is
+    read by path on every collection instead. Claims are thread-safe, as
+    some collectors scan on background threads.
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize the budget.
+        
+        Args:
+            capacity: Descriptors that may be held at once
+        """
+        self.capacity = max(0, capacity)
+        self.held = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        """
+        Claim one descriptor.
+        
+        Returns:
+            False if the budget is used up
+        """
+        with self._lock:
+            if self.held >= self.capacity:
+                return False
+            self.held += 1
+            return True
+    
+    def release(self, count: int = 1):
+        """
+        Give back descriptors that have been closed.
+        
+        Args:
+            count: Number of descriptors
+        """
+        with self._lock:
+            self.held = max(0, self.held - count)
+
+
+_shared: Optional[DescriptorBudget] = None
+_shared_lock = threading.Lock()
+
+
+def shared_budget() -> DescriptorBudget:
+    """
+    Get the budget shared by every collector in the process.
+    
+    The first call raises the soft descriptor limit and keeps RESERVED_FDS
+    of it out of the budget.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DescriptorBudget(raise_fd_limit() - RESERVED_FDS)
+        return _shared
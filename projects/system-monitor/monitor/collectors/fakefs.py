@@ -0,0 +1,306 @@
+"""
+Fake Filesystem Module for Linux System Monitor
+
+This module writes synthetic proc and sys trees in the kernel's formats, so
+the collectors can be load-tested deterministically at scales (hundreds of
+CPUs, tens of thousands of processes, thousands of network interfaces) that
+no development machine has. Point the monitor at a generated tree with
+--proc-root and --sys-root.
+"""
+
+import os
+import random
+from typing import Dict, List, Tuple
+
+# Logical CPUs per socket and NUMA node of the synthetic topology (two SMT
+# threads per core, two nodes per socket)
+CPUS_PER_SOCKET = 128
+CPUS_PER_NODE = 64
+THREADS_PER_CORE = 2
+
+# Boot time written to /proc/stat
+BOOT_TIME = 1700000000
+
+# Hardware IRQs per CPU in the synthetic /proc/interrupts (one queue per CPU
+# for each of a NIC and an NVMe drive)
+IRQ_SOURCES = ("eth0-TxRx", "nvme0q")
+
+SOFTIRQS = ("HI", "TIMER", "NET_TX", "NET_RX", "BLOCK", "IRQ_POLL", "TASKLET", "SCHED", "HRTIMER", "RCU")
+
+# Processes per synthetic cgroup
+PROCESSES_PER_CGROUP = 100
+
+PAGE_SIZE = 4096
+
+
+def cpu_layout(cpu: int, cpus: int) -> Tuple[int, int, int]:
+    """
+    Place a logical CPU in the synthetic topology.
+    
+    Args:
+        cpu: Logical CPU number
+        cpus: Number of logical CPUs
+        
+    Returns:
+        (socket, NUMA node, lowest-numbered SMT sibling)
+    """
+    per_socket = min(cpus, CPUS_PER_SOCKET)
+    per_node = min(cpus, CPUS_PER_NODE)
+    return cpu // per_socket, cpu // per_node, cpu - cpu % THREADS_PER_CORE
+
+
+def interface_names(interfaces: int) -> List[str]:
+    """
+    Name the synthetic network interfaces: loopback, one NIC, then veths.
+    
+    Args:
+        interfaces: Number of interfaces
+        
+    Returns:
+        Interface names
+    """
+    names = ["lo", "eth0"][:interfaces]
+    names.extend(f"veth{index:05x}" for index in range(interfaces - len(names)))
+    return names
+
+
+def _write(path: str, text: str):
+    """Create a file, and its parent directory if needed."""
+    try:
+        f = open(path, "w")
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, "w")
+    with f:
+        f.write(text)
+
+
+def _counter_table(header_width: int, labels: List[Tuple[str, str]], cpus: int, rng: random.Random) -> str:
+    """Format a /proc/interrupts style table with fixed-width per-CPU counts."""
+    lines = [" " * header_width + "".join(f"CPU{cpu:<8d}" for cpu in range(cpus)).rstrip()]
+    for label, description in labels:
+        counts = "".join(f" {rng.randrange(10 ** 8):10d}" for _ in range(cpus))
+        lines.append(f"{label:>{header_width - 1}}:{counts}{description}")
+    return "\n".join(lines) + "\n"
+
+
+def _inet_row(slot: int, local: str, remote: str, state: int, inode: int) -> str:
+    """Format one row of /proc/net/tcp or /proc/net/udp."""
+    return (f"{slot:4d}: {local} {remote} {state:02X} 00000000:00000000 00:00000000 00000000 "
+            f" 1000        0 {inode} 1 0000000000000000 100 0 0 10 0")
+
+
+def build_procfs(root: str, cpus: int, processes: int = 0, interfaces: int = 2, seed: int = 0):
+    """
+    Write a fake proc filesystem.
+    
+    Args:
+        root: Directory standing in for /proc
+        cpus: Number of logical CPUs
+        processes: Number of processes (single-threaded, PIDs from 1), each
+            owning one TCP socket
+        interfaces: Number of network interfaces
+        seed: Random seed; the same arguments always write the same tree
+    """
+    rng = random.Random(seed * 1_000_003 + cpus)
+    
+    # CPU time, load and memory
+    lines = []
+    totals = [0] * 10
+    for cpu in range(cpus):
+        fields = [rng.randrange(10_000, 1_000_000) for _ in range(10)]
+        totals = [total + value for total, value in zip(totals, fields)]
+        lines.append(f"cpu{cpu} " + " ".join(map(str, fields)))
+    _write(os.path.join(root, "stat"), "\n".join(
+        ["cpu  " + " ".join(map(str, totals))] + lines + [
+            "intr 123456789 " + " ".join("0" for _ in range(64)),
+            "ctxt 987654321",
+            f"btime {BOOT_TIME}",
+            f"processes {processes + 1000}",
+            "procs_running 3",
+            "procs_blocked 0",
+            "softirq 12345678 " + " ".join("0" for _ in SOFTIRQS),
+        ]) + "\n")
+    
+    cpuinfo = []
+    for cpu in range(cpus):
+        socket, _, sibling = cpu_layout(cpu, cpus)
+        cpuinfo.append(f"processor\t: {cpu}\nphysical id\t: {socket}\ncore id\t\t: {sibling // THREADS_PER_CORE}\n"
+                       f"cpu MHz\t\t: {2000 + cpu % 7 * 100}.000\n")
+    _write(os.path.join(root, "cpuinfo"), "\n".join(cpuinfo))
+    
+    load = cpus * 0.4
+    _write(os.path.join(root, "loadavg"), f"{load:.2f} {load:.2f} {load:.2f} 3/{processes} {processes}\n")
+    _write(os.path.join(root, "uptime"), "123456.78 987654.32\n")
+    total_kb = cpus * 4 * 1024 * 1024
+    _write(os.path.join(root, "meminfo"),
+           f"MemTotal:       {total_kb} kB\nMemFree:        {total_kb // 4} kB\n"
+           f"MemAvailable:   {total_kb // 2} kB\nBuffers:        {total_kb // 64} kB\n"
+           f"Cached:         {total_kb // 8} kB\nSwapTotal:      0 kB\nSwapFree:       0 kB\n")
+    _write(os.path.join(root, "sys", "kernel", "hostname"), f"fake-{cpus}c\n")
+    for resource in ("cpu", "memory", "io"):
+        _write(os.path.join(root, "pressure", resource),
+               "some avg10=1.50 avg60=1.20 avg300=0.90 total=123456789\n"
+               "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    
+    # Interrupt and softirq tables
+    irqs = [("0", "   IO-APIC    2-edge      timer")]
+    for source in IRQ_SOURCES:
+        for queue in range(cpus):
+            irqs.append((str(24 + len(irqs)), f"  PCI-MSIX-0000:00:00.0 {queue}-edge      {source}-{queue}"))
+    irqs += [("NMI", "   Non-maskable interrupts"), ("LOC", "   Local timer interrupts")]
+    _write(os.path.join(root, "interrupts"), _counter_table(len(str(len(irqs) + 24)) + 2, irqs, cpus, rng))
+    _write(os.path.join(root, "softirqs"),
+           _counter_table(13, [(name, "") for name in SOFTIRQS], cpus, rng))
+    
+    # Network interfaces and socket tables
+    net = os.path.join(root, "net")
+    dev = ["Inter-|   Receive                                                |  Transmit",
+           " face |bytes    packets errs drop fifo frame compressed multicast|"
+           "bytes    packets errs drop fifo colls carrier compressed"]
+    for name in interface_names(interfaces):
+        received, sent = rng.randrange(1 << 40), rng.randrange(1 << 40)
+        dev.append(f"{name:>6}: {received} {received // 1000} 0 0 0 0 0 0 {sent} {sent // 1000} 0 0 0 0 0 0")
+    _write(os.path.join(net, "dev"), "\n".join(dev) + "\n")
+    
+    header = ("  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode")
+    tcp = [header, _inet_row(0, "00000000:0016", "00000000:0000", 0x0A, 1000)]
+    for pid in range(1, processes + 1):
+        peer = 0x0A000000 + rng.randrange(1 << 16)
+        tcp.append(_inet_row(pid, f"0100000A:{32768 + pid % 28000:04X}", f"{peer:08X}:01BB",
+                             0x01 if pid % 10 else 0x06, 1000 + pid))
+    _write(os.path.join(net, "tcp"), "\n".join(tcp) + "\n")
+    _write(os.path.join(net, "udp"), "\n".join([
+        header, _inet_row(0, "00000000:0035", "00000000:0000", 0x07, 999)]) + "\n")
+    inet6_header = header.replace("local_address", "local_address" + " " * 24)
+    _write(os.path.join(net, "tcp6"), inet6_header + "\n")
+    _write(os.path.join(net, "udp6"), inet6_header + "\n")
+    _write(os.path.join(net, "unix"), "Num       RefCount Protocol Flags    Type St Inode Path\n"
+           "0000000000000000: 00000002 00000000 00010000 0001 01 998 /run/systemd/notify\n")
+    
+    # Processes: PID 1 doubles as the monitor itself ("self")
+    for pid in range(1, processes + 1):
+        path = os.path.join(root, str(pid))
+        name = f"worker-{pid % 97}" if pid > 1 else "init"
+        utime, stime = rng.randrange(100_000), rng.randrange(10_000)
+        stat = (f"{pid} ({name}) S 1 {pid} {pid} 0 -1 4194560 1000 0 0 0 {utime} {stime} 0 0 20 0 1 0 "
+                f"{rng.randrange(10_000_000)} {rng.randrange(1 << 30)} {rng.randrange(1 << 16)} "
+                f"18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 {pid % cpus} 0 0 0 0 0\n")
+        resident = rng.randrange(256, 1 << 18)
+        shared = resident // 4
+        _write(os.path.join(path, "stat"), stat)
+        _write(os.path.join(path, "statm"), f"{resident * 2} {resident} {shared} 100 0 {resident // 2} 0\n")
+        _write(os.path.join(path, "comm"), name + "\n")
+        _write(os.path.join(path, "cmdline"), f"/usr/bin/{name}\0--serve\0")
+        rss_kb = resident * PAGE_SIZE // 1024
+        private_kb = (resident - shared) * PAGE_SIZE // 1024
+        _write(os.path.join(path, "smaps_rollup"),
+               f"00400000-7fffffffffff ---p 00000000 00:00 0                          [rollup]\n"
+               f"Rss:            {rss_kb:8d} kB\nPss:            {private_kb + (rss_kb - private_kb) // 8:8d} kB\n"
+               f"Shared_Clean:   {rss_kb - private_kb:8d} kB\nShared_Dirty:          0 kB\n"
+               f"Private_Clean:  {private_kb // 2:8d} kB\nPrivate_Dirty:  {private_kb - private_kb // 2:8d} kB\n"
+               f"Swap:                  0 kB\nSwapPss:               0 kB\n")
+        _write(os.path.join(path, "task", str(pid), "stat"), stat)
+        _write(os.path.join(path, "task", str(pid), "schedstat"),
+               f"{(utime + stime) * 10_000_000} {rng.randrange(1 << 30)} {rng.randrange(1 << 20)}\n")
+        os.makedirs(os.path.join(path, "fd"), exist_ok=True)
+        os.symlink("/dev/null", os.path.join(path, "fd", "0"))
+        os.symlink(f"socket:[{1000 + pid}]", os.path.join(path, "fd", "3"))
+    
+    self_path = os.path.join(root, "1") if processes else os.path.join(root, "self")
+    _write(os.path.join(self_path, "mountinfo"),
+           "22 1 259:1 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p1 rw\n"
+           "23 22 0:22 / /sys/fs/cgroup rw,nosuid,nodev,noexec,relatime shared:9 - cgroup2 cgroup2 rw\n")
+    _write(os.path.join(self_path, "mounts"),
+           "/dev/nvme0n1p1 / ext4 rw,relatime 0 0\ncgroup2 /sys/fs/cgroup cgroup2 rw,nosuid,nodev,noexec,relatime 0 0\n")
+    _write(os.path.join(self_path, "schedstat"), "0 0 0\n")
+    if processes:
+        os.symlink("1", os.path.join(root, "self"))
+    else:
+        _write(os.path.join(self_path, "smaps_rollup"), "")
+
+
+def build_sysfs(root: str, cpus: int, interfaces: int = 2, cgroups: int = 0, seed: int = 0):
+    """
+    Write a fake sys filesystem.
+    
+    Args:
+        root: Directory standing in for /sys
+        cpus: Number of logical CPUs
+        interfaces: Number of network interfaces
+        cgroups: Number of leaf cgroups under system.slice
+        seed: Random seed; the same arguments always write the same tree
+    """
+    rng = random.Random(seed * 1_000_003 + cpus)
+    
+    # CPU topology and frequency
+    system = os.path.join(root, "devices", "system")
+    nodes: Dict[int, List[int]] = {}
+    for cpu in range(cpus):
+        socket, node, sibling = cpu_layout(cpu, cpus)
+        topology = os.path.join(system, "cpu", f"cpu{cpu}", "topology")
+        _write(os.path.join(topology, "physical_package_id"), f"{socket}\n")
+        _write(os.path.join(topology, "core_id"), f"{sibling // THREADS_PER_CORE}\n")
+        _write(os.path.join(topology, "thread_siblings_list"), f"{sibling}-{sibling + THREADS_PER_CORE - 1}\n")
+        cpufreq = os.path.join(system, "cpu", f"cpu{cpu}", "cpufreq")
+        _write(os.path.join(cpufreq, "scaling_cur_freq"), f"{rng.randrange(800_000, 3_600_000)}\n")
+        _write(os.path.join(cpufreq, "cpuinfo_min_freq"), "800000\n")
+        _write(os.path.join(cpufreq, "cpuinfo_max_freq"), "3600000\n")
+        nodes.setdefault(node, []).append(cpu)
+    for node, node_cpus in nodes.items():
+        _write(os.path.join(system, "node", f"node{node}", "cpulist"), f"{node_cpus[0]}-{node_cpus[-1]}\n")
+    
+    # One coretemp sensor per socket, with a package and per-core inputs
+    for socket in range(len({cpu_layout(cpu, cpus)[0] for cpu in range(cpus)})):
+        hwmon = os.path.join(root, "class", "hwmon", f"hwmon{socket}")
+        _write(os.path.join(hwmon, "name"), "coretemp\n")
+        for index in range(1, min(cpus, CPUS_PER_SOCKET) // THREADS_PER_CORE + 2):
+            _write(os.path.join(hwmon, f"temp{index}_input"), f"{rng.randrange(35_000, 85_000)}\n")
+    
+    # Network interface counters
+    for name in interface_names(interfaces):
+        interface = os.path.join(root, "class", "net", name)
+        _write(os.path.join(interface, "operstate"), "up\n" if name != "lo" else "unknown\n")
+        _write(os.path.join(interface, "mtu"), "1500\n" if name != "lo" else "65536\n")
+        _write(os.path.join(interface, "statistics", "rx_bytes"), f"{rng.randrange(1 << 40)}\n")
+        _write(os.path.join(interface, "statistics", "tx_bytes"), f"{rng.randrange(1 << 40)}\n")
+    
+    # cgroup v2 hierarchy: the root, system.slice and its services
+    cgroup_root = os.path.join(root, "fs", "cgroup")
+    _write(os.path.join(cgroup_root, "cgroup.controllers"), "cpuset cpu io memory pids\n")
+    _write(os.path.join(cgroup_root, "cgroup.stat"), f"nr_descendants {cgroups + 1}\nnr_dying_descendants 0\n")
+    paths = [os.path.join(cgroup_root, "system.slice")]
+    paths.extend(os.path.join(cgroup_root, "system.slice", f"service-{index:05d}.service") for index in range(cgroups))
+    for path in paths:
+        usage = rng.randrange(1 << 40)
+        _write(os.path.join(path, "cpu.stat"), f"usage_usec {usage}\nuser_usec {usage // 2}\nsystem_usec {usage // 2}\n")
+        memory = rng.randrange(1 << 32)
+        _write(os.path.join(path, "memory.current"), f"{memory}\n")
+        _write(os.path.join(path, "memory.stat"),
+               f"anon {memory // 2}\nfile {memory // 4}\nkernel {memory // 16}\nshmem 0\nsock 0\n")
+        _write(os.path.join(path, "io.stat"), f"259:0 rbytes={rng.randrange(1 << 36)} wbytes={rng.randrange(1 << 36)} "
+                                              "rios=1000 wios=1000 dbytes=0 dios=0\n")
+        for resource in ("cpu", "memory", "io"):
+            _write(os.path.join(path, f"{resource}.pressure"),
+                   "some avg10=0.00 avg60=0.00 avg300=0.00 total=0\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+
+
+def build_fake_system(base: str, cpus: int, processes: int = 0, interfaces: int = 2, seed: int = 0) -> Tuple[str, str]:
+    """
+    Write a fake proc and sys filesystem side by side.
+    
+    Args:
+        base: Directory to create proc/ and sys/ in
+        cpus: Number of logical CPUs
+        processes: Number of processes
+        interfaces: Number of network interfaces
+        seed: Random seed
+        
+    Returns:
+        (proc root, sys root)
+    """
+    proc_root = os.path.join(base, "proc")
+    sys_root = os.path.join(base, "sys")
+    build_procfs(proc_root, cpus, processes, interfaces, seed)
+    build_sysfs(sys_root, cpus, interfaces, processes // PROCESSES_PER_CGROUP, seed)
+    return proc_root, sys_root
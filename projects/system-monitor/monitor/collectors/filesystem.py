@@ -0,0 +1,283 @@
+"""
+Filesystem Collector Module for Linux System Monitor
+
+This module handles collecting per-filesystem space and inode usage. The
+mount list comes from /proc/self/mountinfo and is only re-read when the
+kernel reports a mount table change; statvfs runs on its own slower
+schedule on worker threads, so an unresponsive network mount never blocks
+collection.
+"""
+
+import os
+import queue
+import re
+import select
+import threading
+import time
+from typing import Dict, List, Optional
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+
+# Filesystems without a block device that are still worth reporting
+NETWORK_FSTYPES = {"nfs", "nfs4", "cifs", "smb3", "ceph", "glusterfs", "lustre", "9p", "fuse.sshfs"}
+
+# Filesystems reported even though their source is not a device path
+LOCAL_FSTYPES = {"zfs", "btrfs"}
+
+# Threads issuing statvfs calls; a mount that hangs ties up one of them
+STATVFS_WORKERS = 4
+
+# Largest mountinfo chunk read at once
+READ_SIZE = 65536
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(field: str) -> str:
+    """Decode the octal escapes (\\040 for space etc.) used in mountinfo."""
+    if "\\" not in field:
+        return field
+    return _OCTAL_ESCAPE.sub(lambda match: chr(int(match.group(1), 8)), field)
+
+
+def parse_mountinfo(text: str) -> List[Dict]:
+    """
+    Parse /proc/<pid>/mountinfo.
+    
+    Args:
+        text: File contents
+        
+    Returns:
+        List of mounts with device (major:minor), mountpoint, fstype and
+        source, in mount order
+    """
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split(" ")
+        try:
+            separator = fields.index("-", 6)
+        except ValueError:
+            continue
+        mounts.append({
+            "device": fields[2],
+            "mountpoint": _unescape(fields[4]),
+            "fstype": fields[separator + 1],
+            "source": _unescape(fields[separator + 2]),
+        })
+    return mounts
+
+
+def select_filesystems(mounts: List[Dict]) -> List[Dict]:
+    """
+    Pick the mounts to report: block-device, ZFS/btrfs and network
+    filesystems, once per device.
+    
+    Bind mounts and repeated mounts of one filesystem share a device number;
+    only the first (usually the shortest path) is kept, so hosts with
+    hundreds of bind and overlay mounts stat each filesystem once.
+    
+    Args:
+        mounts: Mounts from parse_mountinfo
+        
+    Returns:
+        Mounts to report
+    """
+    selected = []
+    seen = set()
+    for mount in mounts:
+        fstype = mount["fstype"]
+        if not (mount["source"].startswith("/dev/") or fstype in NETWORK_FSTYPES or fstype in LOCAL_FSTYPES):
+            continue
+        if mount["device"] in seen:
+            continue
+        seen.add(mount["device"])
+        selected.append(mount)
+    return selected
+
+
+class _Filesystem:
+    """Per-filesystem state: the last statvfs result and any call in flight."""
+    
+    __slots__ = ("mount", "usage", "requested", "completed")
+    
+    def __init__(self, mount: Dict):
+        """Initialize state for a mounted filesystem."""
+        self.mount = mount
+        self.usage: Optional[Dict] = None
+        self.requested: Optional[float] = None
+        self.completed: Optional[float] = None
+
+
+class FilesystemCollector:
+    """Collector for filesystem space and inode usage."""
+    
+    def __init__(self, statvfs_interval: float = 10.0, statvfs_timeout: float = 2.0,
+                 mountinfo_path: str = MOUNTINFO_PATH):
+        """
+        Initialize the filesystem collector.
+        
+        Args:
+            statvfs_interval: Seconds between statvfs calls per filesystem
+            statvfs_timeout: Seconds after which a statvfs call that has not
+                returned marks its filesystem unresponsive
+            mountinfo_path: Mount table to read
+        """
+        self.statvfs_interval = statvfs_interval
+        self.statvfs_timeout = statvfs_timeout
+        self.mountinfo_path = mountinfo_path
+        self.mount_table_reads = 0
+        
+        self._filesystems: Dict[str, _Filesystem] = {}
+        self._lock = threading.Lock()
+        self._requests: "queue.Queue[_Filesystem]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        
+        # The kernel flags POLLPRI|POLLERR on a mountinfo descriptor after
+        # any mount or unmount in the namespace
+        self._fd: Optional[int] = None
+        self._poll = select.poll()
+        try:
+            self._fd = os.open(mountinfo_path, os.O_RDONLY)
+            self._poll.register(self._fd, select.POLLPRI | select.POLLERR)
+        except OSError:
+            pass
+        self.available = self._fd is not None
+        if self.available:
+            self._reload_mounts()
+    
+    def _read_mountinfo(self) -> str:
+        """Read the whole mount table through the held descriptor."""
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(self._fd, READ_SIZE, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b"".join(chunks).decode("utf-8", "replace")
+    
+    def _reload_mounts(self):
+        """Re-read the mount table, keeping state for unchanged filesystems."""
+        try:
+            mounts = select_filesystems(parse_mountinfo(self._read_mountinfo()))
+        except OSError:
+            return
+        self.mount_table_reads += 1
+        
+        with self._lock:
+            filesystems = {}
+            for mount in mounts:
+                filesystem = self._filesystems.get(mount["mountpoint"])
+                if filesystem is None or filesystem.mount != mount:
+                    filesystem = _Filesystem(mount)
+                filesystems[mount["mountpoint"]] = filesystem
+            self._filesystems = filesystems
+    
+    def _mounts_changed(self) -> bool:
+        """Check, without blocking, whether the mount table has changed."""
+        return bool(self._poll.poll(0))
+    
+    def _statvfs_worker(self):
+        """Worker thread: run statvfs for queued filesystems."""
+        while True:
+            filesystem = self._requests.get()
+            try:
+                stats = os.statvfs(filesystem.mount["mountpoint"])
+            except OSError:
+                usage = None
+            else:
+                total = stats.f_blocks * stats.f_frsize
+                free = stats.f_bavail * stats.f_frsize
+                used = total - stats.f_bfree * stats.f_frsize
+                usage = {
+                    "total": total,
+                    "used": used,
+                    "free": free,
+                    # Like df: the share of the space available to
+                    # unprivileged users that is in use
+                    "usage_percent": used / (used + free) * 100 if used + free else 0.0,
+                    "inodes_percent": ((stats.f_files - stats.f_ffree) / stats.f_files * 100
+                                       if stats.f_files else 0.0),
+                }
+            with self._lock:
+                filesystem.usage = usage
+                filesystem.completed = time.monotonic()
+    
+    def _request_statvfs(self, now: float):
+        """Queue statvfs for every filesystem that is due and not in flight."""
+        if not self._workers:
+            for index in range(STATVFS_WORKERS):
+                worker = threading.Thread(target=self._statvfs_worker, name=f"statvfs-{index}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        
+        with self._lock:
+            for filesystem in self._filesystems.values():
+                in_flight = filesystem.requested is not None and (
+                    filesystem.completed is None or filesystem.completed < filesystem.requested)
+                if in_flight:
+                    continue
+                if filesystem.requested is None or now - filesystem.requested >= self.statvfs_interval:
+                    filesystem.requested = now
+                    self._requests.put(filesystem)
+    
+    def collect(self) -> Dict:
+        """
+        Collect filesystem usage.
+        
+        Returns:
+            Dict containing:
+                - available: Whether the mount table could be read
+                - usage_percent: Space used across all responsive filesystems
+                - partitions: Per mountpoint, device, fstype, total, used,
+                  free (bytes), usage_percent, inodes_percent and whether the
+                  last statvfs returned in time (responsive)
+        """
+        if not self.available:
+            return {"available": False}
+        
+        if self._mounts_changed():
+            self._reload_mounts()
+        
+        now = time.monotonic()
+        self._request_statvfs(now)
+        
+        partitions = {}
+        total = 0
+        used = 0
+        with self._lock:
+            for mountpoint, filesystem in self._filesystems.items():
+                in_flight = filesystem.completed is None or filesystem.completed < filesystem.requested
+                responsive = not (in_flight and now - filesystem.requested > self.statvfs_timeout)
+                if filesystem.usage is None and responsive:
+                    # Not measured yet (or statvfs failed)
+                    continue
+                
+                entry = {"device": filesystem.mount["source"], "fstype": filesystem.mount["fstype"],
+                         "responsive": responsive}
+                if filesystem.usage is not None:
+                    entry.update(filesystem.usage)
+                    if responsive:
+                        total += filesystem.usage["used"] + filesystem.usage["free"]
+                        used += filesystem.usage["used"]
+                partitions[mountpoint] = entry
+        
+        return {
+            "available": True,
+            "usage_percent": used / total * 100 if total else 0.0,
+            "partitions": partitions,
+        }
+    
+    def reset(self):
+        """Reset collector state, re-reading the mount table."""
+        if self.available:
+            self._reload_mounts()
+    
+    def close(self):
+        """Close the mount table descriptor."""
+        if self._fd is not None:
+            self._poll.unregister(self._fd)
+            os.close(self._fd)
+            self._fd = None
+            self.available = False
@@ -0,0 +1,270 @@
+"""
+Interrupt Collector Module for Linux System Monitor
+
+This module handles collecting per-CPU hardware interrupt and softirq counts
+from /proc/interrupts and /proc/softirqs as IRQ x CPU matrices, so that IRQ
+affinity imbalance (for example a NIC queue pinned to one core) is visible.
+"""
+
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+INTERRUPTS_PATH = "/proc/interrupts"
+SOFTIRQS_PATH = "/proc/softirqs"
+
+# The kernel prints every per-CPU count right-aligned in 10 columns
+FIELD_WIDTH = 10
+
+# Counters are 32-bit and wrap around
+COUNTER_MODULUS = 1 << 32
+
+_CPU_HEADER = re.compile(rb"CPU(\d+)")
+_COUNT = re.compile(rb" *(\d+)")
+_PLACE_VALUES = 10 ** np.arange(FIELD_WIDTH - 1, -1, -1, dtype=np.int64)
+
+
+class CounterMatrixParser:
+    """
+    Parses a /proc/interrupts style file (header of CPU columns, then one row
+    per counter) into a rows x CPUs matrix.
+    
+    Every count is printed at a fixed width, so as long as no row is added or
+    removed the file has the same byte layout on every read. The first read
+    tokenizes the file once and caches the byte offset of every count field;
+    later reads only verify that the bytes outside those fields are unchanged
+    and convert all fields at once with array operations. Any other change
+    (an IRQ registered, a CPU brought online) rebuilds the layout.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the parser.
+        
+        Args:
+            path: File to parse
+        """
+        self.path = path
+        self.cpus: List[int] = []
+        self.rows: List[str] = []
+        self.descriptions: List[str] = []
+        self.layout_builds = 0
+        self._fd: Optional[int] = None
+        self._read_size = 65536
+        self._size = -1
+        self._field_index: Optional[np.ndarray] = None
+        self._static_mask: Optional[np.ndarray] = None
+        self._static_bytes: Optional[np.ndarray] = None
+    
+    def _read(self) -> Optional[bytes]:
+        """Read the whole file through a held descriptor."""
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDONLY)
+            while True:
+                data = os.pread(self._fd, self._read_size, 0)
+                if len(data) < self._read_size:
+                    return data
+                # Grow the buffer until the file fits in one read
+                self._read_size *= 2
+        except OSError:
+            return None
+    
+    def _build_layout(self, data: bytes):
+        """
+        Tokenize the file once and cache the position of every count field.
+        
+        Args:
+            data: File contents
+        """
+        lines = data.split(b"\n")
+        self.cpus = [int(cpu) for cpu in _CPU_HEADER.findall(lines[0])]
+        cpu_count = len(self.cpus)
+        
+        rows, descriptions, field_ends = [], [], []
+        offset = len(lines[0]) + 1
+        for line in lines[1:]:
+            label, colon, _ = line.partition(b":")
+            if colon:
+                ends = []
+                position = len(label) + 1
+                for _ in range(cpu_count):
+                    match = _COUNT.match(line, position)
+                    if match is None or match.end() - match.start(1) > FIELD_WIDTH:
+                        break
+                    ends.append(offset + match.end())
+                    position = match.end()
+                
+                # Rows such as ERR and MIS hold a single total rather than
+                # per-CPU counts and are left out of the matrix
+                if len(ends) == cpu_count:
+                    rows.append(label.strip().decode("ascii", "replace"))
+                    descriptions.append(" ".join(line[position:].decode("ascii", "replace").split()))
+                    field_ends.extend(ends)
+            offset += len(line) + 1
+        
+        self.rows = rows
+        self.descriptions = descriptions
+        ends = np.array(field_ends, dtype=np.int64)
+        self._field_index = (ends[:, None] - FIELD_WIDTH + np.arange(FIELD_WIDTH)).reshape(-1)
+        
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        self._static_mask = np.ones(len(buffer), dtype=bool)
+        self._static_mask[self._field_index] = False
+        self._static_bytes = buffer[self._static_mask]
+        self._size = len(data)
+        self.layout_builds += 1
+    
+    def read(self) -> Optional[np.ndarray]:
+        """
+        Read the file into a matrix.
+        
+        Returns:
+            int64 matrix of shape (len(rows), len(cpus)), or None if the
+            file cannot be read
+        """
+        data = self._read()
+        if not data:
+            return None
+        
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        if len(data) != self._size or not np.array_equal(buffer[self._static_mask], self._static_bytes):
+            self._build_layout(data)
+        
+        # The low nibble of an ASCII digit is its value, and the spaces
+        # padding the fields on the left (0x20) become zero digits
+        digits = (buffer[self._field_index] & 0x0F).reshape(-1, FIELD_WIDTH)
+        return np.einsum("ij,j->i", digits, _PLACE_VALUES).reshape(len(self.rows), len(self.cpus))
+    
+    def close(self):
+        """Close the held descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class InterruptCollector:
+    """Collector for per-CPU interrupt and softirq rates."""
+    
+    def __init__(self, top_count: int = 10, interrupts_path: str = INTERRUPTS_PATH,
+                 softirqs_path: str = SOFTIRQS_PATH):
+        """
+        Initialize the interrupt collector.
+        
+        Args:
+            top_count: Number of IRQs and CPUs reported in the top lists
+            interrupts_path: Path of the hardware interrupt table
+            softirqs_path: Path of the softirq table
+        """
+        self.top_count = top_count
+        self.interrupts = CounterMatrixParser(interrupts_path)
+        self.softirqs = CounterMatrixParser(softirqs_path)
+        
+        # Previous matrices with the layout they were read with, and when
+        # they were read, for rates
+        self._prev: Dict[str, Tuple[int, np.ndarray]] = {}
+        self._prev_time: Optional[float] = None
+    
+    def _rates(self, parser: CounterMatrixParser, matrix: np.ndarray, elapsed: float) -> np.ndarray:
+        """
+        Convert a counter matrix into per-second rates since the last read.
+        
+        Args:
+            parser: Parser the matrix was read with
+            matrix: Current counts
+            elapsed: Seconds since the previous read
+            
+        Returns:
+            Rate matrix (all zeros on the first read or after a layout change)
+        """
+        layout, previous = self._prev.get(parser.path, (None, None))
+        self._prev[parser.path] = (parser.layout_builds, matrix)
+        if previous is None or layout != parser.layout_builds or elapsed <= 0:
+            return np.zeros(matrix.shape, dtype=np.float64)
+        return ((matrix - previous) % COUNTER_MODULUS) / elapsed
+    
+    def collect(self) -> Dict:
+        """
+        Collect interrupt and softirq rates.
+        
+        Returns:
+            Dict containing:
+                - available: Whether /proc/interrupts could be read
+                - cpus: CPU numbers of the matrix columns
+                - irq_rate, softirq_rate: Total interrupts and softirqs per second
+                - top_irqs: Busiest IRQs with their rate, per-CPU rates and
+                  the share handled by their busiest CPU
+                - top_cpus: CPUs handling the most interrupts, with their
+                  interrupt and softirq rates
+                - softirqs: Rate of each softirq type
+        """
+        interrupts = self.interrupts.read()
+        if interrupts is None:
+            return {"available": False}
+        softirqs = self.softirqs.read()
+        
+        now = time.monotonic()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        self._prev_time = now
+        
+        irq_rates = self._rates(self.interrupts, interrupts, elapsed)
+        irq_per_cpu = irq_rates.sum(axis=0)
+        irq_totals = irq_rates.sum(axis=1)
+        
+        softirq_per_cpu = np.zeros(len(self.interrupts.cpus))
+        softirq_types: Dict[str, float] = {}
+        if softirqs is not None:
+            softirq_rates = self._rates(self.softirqs, softirqs, elapsed)
+            softirq_types = dict(zip(self.softirqs.rows, softirq_rates.sum(axis=1).tolist()))
+            
+            # /proc/softirqs lists possible CPUs, /proc/interrupts online ones
+            columns = dict(zip(self.softirqs.cpus, softirq_rates.sum(axis=0).tolist()))
+            softirq_per_cpu = np.array([columns.get(cpu, 0.0) for cpu in self.interrupts.cpus])
+        
+        top_irqs = []
+        for row in np.argsort(irq_totals)[::-1][:self.top_count]:
+            total = float(irq_totals[row])
+            if total <= 0:
+                break
+            per_cpu = irq_rates[row]
+            busiest = int(per_cpu.argmax())
+            top_irqs.append({
+                "irq": self.interrupts.rows[row],
+                "name": self.interrupts.descriptions[row],
+                "rate": total,
+                "per_cpu": per_cpu.tolist(),
+                "top_cpu": self.interrupts.cpus[busiest],
+                "top_cpu_share": float(per_cpu[busiest]) / total * 100,
+            })
+        
+        top_cpus = [
+            {
+                "cpu": self.interrupts.cpus[column],
+                "irq_rate": float(irq_per_cpu[column]),
+                "softirq_rate": float(softirq_per_cpu[column]),
+            }
+            for column in np.argsort(irq_per_cpu + softirq_per_cpu)[::-1][:self.top_count]
+        ]
+        
+        return {
+            "available": True,
+            "cpus": self.interrupts.cpus,
+            "irq_rate": float(irq_totals.sum()),
+            "softirq_rate": float(sum(softirq_types.values())),
+            "top_irqs": top_irqs,
+            "top_cpus": top_cpus,
+            "softirqs": softirq_types,
+        }
+    
+    def reset(self):
+        """Reset collector state, clearing previous counts."""
+        self._prev = {}
+        self._prev_time = None
+    
+    def close(self):
+        """Close held descriptors."""
+        self.interrupts.close()
+        self.softirqs.close()
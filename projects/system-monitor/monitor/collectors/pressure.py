@@ -0,0 +1,201 @@
+"""
+Pressure Collector Module for Linux System Monitor
+
+This module handles collecting Pressure Stall Information (PSI) from
+/proc/pressure and arming PSI triggers that wake the monitor as soon as a
+stall starts.
+"""
+
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+# Directory with the system-wide PSI files
+PRESSURE_ROOT = "/proc/pressure"
+
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+
+# "some" avg10 (percent of time at least one task stalled) at which a
+# resource counts as a bottleneck
+BOTTLENECK_THRESHOLD = 10.0
+
+_PRESSURE_LINE = re.compile(rb"(some|full) avg10=([\d.]+) avg60=([\d.]+) avg300=([\d.]+) total=(\d+)")
+
+
+def parse_pressure(text: bytes) -> Dict[str, Dict[str, float]]:
+    """
+    Parse a PSI file.
+    
+    Args:
+        text: Contents of a /proc/pressure file or a cgroup *.pressure file
+        
+    Returns:
+        Dict keyed by "some" and "full", each with avg10, avg60, avg300
+        (percent) and total (microseconds stalled since boot)
+    """
+    lines = {}
+    for kind, avg10, avg60, avg300, total in _PRESSURE_LINE.findall(text):
+        lines[kind.decode("ascii")] = {
+            "avg10": float(avg10),
+            "avg60": float(avg60),
+            "avg300": float(avg300),
+            "total": int(total),
+        }
+    return lines
+
+
+class PressureTrigger:
+    """
+    A PSI trigger: the kernel signals POLLPRI on the file descriptor when
+    tasks stall on a resource for longer than a threshold within a window.
+    
+    The window must be between 500 ms and 10 s, and unprivileged processes
+    may only use multiples of 2 s.
+    """
+    
+    def __init__(self, resource: str, stall_ms: int, window_ms: int, kind: str = "some",
+                 root: str = PRESSURE_ROOT):
+        """
+        Initialize the trigger (it is not armed until open() is called).
+        
+        Args:
+            resource: "cpu", "memory" or "io"
+            stall_ms: Stall time within the window that fires the trigger
+            window_ms: Tracking window
+            kind: "some" (any task stalled) or "full" (all non-idle tasks stalled)
+            root: Directory with the PSI files
+        """
+        self.resource = resource
+        self.stall_ms = stall_ms
+        self.window_ms = window_ms
+        self.kind = kind
+        self.path = os.path.join(root, resource)
+        self.fd: Optional[int] = None
+    
+    def open(self) -> bool:
+        """
+        Arm the trigger.
+        
+        Returns:
+            True if the kernel accepted the trigger
+        """
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        except OSError:
+            return False
+        try:
+            # The kernel replaces the last byte written with a terminator
+            os.write(fd, f"{self.kind} {self.stall_ms * 1000} {self.window_ms * 1000}\0".encode("ascii"))
+        except OSError:
+            os.close(fd)
+            return False
+        self.fd = fd
+        return True
+    
+    def close(self):
+        """Disarm the trigger."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class PressureCollector:
+    """Collector for system-wide CPU, memory and I/O pressure."""
+    
+    def __init__(self, root: str = PRESSURE_ROOT):
+        """
+        Initialize the pressure collector.
+        
+        Args:
+            root: Directory with the PSI files
+        """
+        self.root = root
+        self.triggers: List[PressureTrigger] = []
+        
+        # PSI files are re-read through descriptors held open for the
+        # collector's lifetime
+        self._fds: Dict[str, int] = {}
+        for resource in PRESSURE_RESOURCES:
+            try:
+                self._fds[resource] = os.open(os.path.join(root, resource), os.O_RDONLY)
+            except OSError:
+                pass
+        self.available = bool(self._fds)
+        
+        self._prev_totals: Dict[str, Dict[str, int]] = {}
+        self._prev_time: Optional[float] = None
+    
+    def collect(self) -> Dict:
+        """
+        Collect current pressure metrics.
+        
+        Returns:
+            Dict containing:
+                - available: Whether the kernel exposes PSI
+                - cpu, memory, io: Per resource, the "some" and "full" lines
+                  (avg10, avg60, avg300, total) plus stall_percent, the share
+                  of time stalled since the previous collection
+                - bottleneck: Resources whose "some" avg10 is at least
+                  BOTTLENECK_THRESHOLD
+        """
+        result = {"available": self.available, "bottleneck": []}
+        if not self.available:
+            return result
+        
+        now = time.monotonic()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        self._prev_time = now
+        
+        for resource, fd in self._fds.items():
+            try:
+                lines = parse_pressure(os.pread(fd, 256, 0))
+            except OSError:
+                continue
+            
+            previous = self._prev_totals.get(resource, {})
+            for kind, values in lines.items():
+                if kind in previous and elapsed > 0:
+                    stalled_us = values["total"] - previous[kind]
+                    values["stall_percent"] = min(100.0, max(0.0, stalled_us / 1e6 / elapsed * 100))
+                else:
+                    values["stall_percent"] = values["avg10"]
+            self._prev_totals[resource] = {kind: values["total"] for kind, values in lines.items()}
+            
+            result[resource] = lines
+            if lines.get("some", {}).get("avg10", 0) >= BOTTLENECK_THRESHOLD:
+                result["bottleneck"].append(resource)
+        
+        return result
+    
+    def open_triggers(self, stall_ms: int, window_ms: int) -> List[int]:
+        """
+        Arm a "some" trigger for every resource.
+        
+        Args:
+            stall_ms: Stall time within the window that fires a trigger
+            window_ms: Tracking window
+            
+        Returns:
+            File descriptors to poll for POLLPRI (empty if triggers are
+            unsupported or not permitted)
+        """
+        for resource in self._fds:
+            trigger = PressureTrigger(resource, stall_ms, window_ms, root=self.root)
+            if trigger.open():
+                self.triggers.append(trigger)
+        return [trigger.fd for trigger in self.triggers]
+    
+    def reset(self):
+        """Reset collector state, clearing accumulated totals."""
+        self._prev_totals = {}
+        self._prev_time = None
+    
+    def close(self):
+        """Disarm triggers and close held descriptors."""
+        for trigger in self.triggers:
+            trigger.close()
+        self.triggers = []
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
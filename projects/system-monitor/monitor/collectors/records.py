@@ -0,0 +1,229 @@
+"""
+Records Module for Linux System Monitor
+
+This module defines the compact records the CPU collector hands to the
+processor in place of nested dicts. Every record declares __slots__, so a
+sample is a handful of fixed-size objects instead of a dict per group of
+fields, and derived fields (normalized load, Fahrenheit, utilization
+level) are computed when read instead of stored on every tick.
+
+Records are read-only mappings with the same keys the dicts had, so code
+reading samples with `sample["load_avg"]["1min"]` or `.get()` works
+unchanged. They are only converted at the edges: flattening for the
+transports and exporters descends into them like dicts, and to_dict()
+gives a plain dict for JSON.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, List, Optional
+
+
+class Record(Mapping):
+    """
+    Base class of the slotted records: a read-only mapping whose keys are
+    the keys of ATTRIBUTES, each read from the attribute or property named
+    there.
+    """
+    
+    __slots__ = ()
+    
+    # Mapping key -> attribute or property name, in key order
+    ATTRIBUTES: Dict[str, str] = {}
+    
+    def __getitem__(self, key: str):
+        """Read a field by its mapping key."""
+        try:
+            return getattr(self, self.ATTRIBUTES[key])
+        except KeyError:
+            raise KeyError(key) from None
+    
+    def __iter__(self):
+        """Iterate over the mapping keys."""
+        return iter(self.ATTRIBUTES)
+    
+    def __len__(self) -> int:
+        """Number of mapping keys."""
+        return len(self.ATTRIBUTES)
+    
+    def __repr__(self) -> str:
+        """Show the record like the dict it stands for."""
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert to a plain dict, converting nested records too.
+        
+        Returns:
+            Dict with the mapping keys
+        """
+        return {key: value.to_dict() if isinstance(value, Record) else value for key, value in self.items()}
+
+
+class LoadAverage(Record):
+    """1, 5 and 15-minute load averages, also normalized by CPU count."""
+    
+    __slots__ = ("one", "five", "fifteen", "cpu_count")
+    
+    ATTRIBUTES = {
+        "1min": "one",
+        "5min": "five",
+        "15min": "fifteen",
+        "1min_normalized": "one_normalized",
+        "5min_normalized": "five_normalized",
+        "15min_normalized": "fifteen_normalized",
+    }
+    
+    def __init__(self, one: float, five: float, fifteen: float, cpu_count: int):
+        """
+        Initialize the record.
+        
+        Args:
+            one: 1-minute load average
+            five: 5-minute load average
+            fifteen: 15-minute load average
+            cpu_count: Logical CPUs the load is normalized by
+        """
+        self.one = one
+        self.five = five
+        self.fifteen = fifteen
+        self.cpu_count = cpu_count
+    
+    @property
+    def one_normalized(self) -> float:
+        """1-minute load average per CPU."""
+        return self.one / self.cpu_count
+    
+    @property
+    def five_normalized(self) -> float:
+        """5-minute load average per CPU."""
+        return self.five / self.cpu_count
+    
+    @property
+    def fifteen_normalized(self) -> float:
+        """15-minute load average per CPU."""
+        return self.fifteen / self.cpu_count
+
+
+class CPUFrequency(Record):
+    """Mean current CPU frequency and the frequency range, in MHz."""
+    
+    __slots__ = ("current_mhz", "min_mhz", "max_mhz")
+    
+    ATTRIBUTES = {"current_mhz": "current_mhz", "min_mhz": "min_mhz", "max_mhz": "max_mhz"}
+    
+    def __init__(self, current_mhz: float, min_mhz: Optional[float], max_mhz: Optional[float]):
+        """
+        Initialize the record.
+        
+        Args:
+            current_mhz: Mean current frequency
+            min_mhz: Lowest frequency, if known
+            max_mhz: Highest frequency, if known
+        """
+        self.current_mhz = current_mhz
+        self.min_mhz = min_mhz
+        self.max_mhz = max_mhz
+
+
+class CPUTemperature(Record):
+    """Hottest CPU sensor reading."""
+    
+    __slots__ = ("celsius",)
+    
+    ATTRIBUTES = {"celsius": "celsius", "fahrenheit": "fahrenheit"}
+    
+    def __init__(self, celsius: float):
+        """
+        Initialize the record.
+        
+        Args:
+            celsius: Temperature in degrees Celsius
+        """
+        self.celsius = celsius
+    
+    @property
+    def fahrenheit(self) -> float:
+        """Temperature in degrees Fahrenheit."""
+        return self.celsius * 9 / 5 + 32
+
+
+class CPUSample(Record):
+    """One collection of CPU metrics (see CPUCollector.collect)."""
+    
+    __slots__ = ("usage_percent", "per_core_percent", "load_avg", "frequency", "temperature",
+                 "context_switches", "interrupts", "groups", "potential_bottleneck")
+    
+    ATTRIBUTES = {
+        "usage_percent": "usage_percent",
+        "per_core_percent": "per_core_percent",
+        "load_avg": "load_avg",
+        "frequency": "frequency",
+        "temperature": "temperature",
+        "context_switches": "context_switches",
+        "interrupts": "interrupts",
+        "groups": "groups",
+        "utilization_level": "utilization_level",
+        "potential_bottleneck": "potential_bottleneck",
+        "core_imbalance": "core_imbalance",
+    }
+    
+    def __init__(self, usage_percent: float, per_core_percent: List[float], load_avg: LoadAverage,
+                 frequency: Optional[CPUFrequency], temperature: Optional[CPUTemperature],
+                 context_switches: int, interrupts: int, groups: Dict[str, List[int]]):
+        """
+        Initialize the record.
+        
+        Args:
+            usage_percent: Overall CPU usage
+            per_core_percent: Usage of each logical CPU
+            load_avg: Load averages
+            frequency: Frequency, or None if unavailable
+            temperature: Temperature, or None if unavailable
+            context_switches: Context switches since boot
+            interrupts: Interrupts since boot
+            groups: Socket, NUMA node and physical core id of each logical
+                CPU (static, shared between samples)
+        """
+        self.usage_percent = usage_percent
+        self.per_core_percent = per_core_percent
+        self.load_avg = load_avg
+        self.frequency = frequency
+        self.temperature = temperature
+        self.context_switches = context_switches
+        self.interrupts = interrupts
+        self.groups = groups
+        # Heuristic, for kernels without PSI (the processor prefers CPU
+        # pressure when the kernel provides it)
+        self.potential_bottleneck = usage_percent > 90 and load_avg.one_normalized > 1.0
+    
+    @property
+    def utilization_level(self) -> str:
+        """"low" (up to 30%), "moderate" (up to 70%) or "high"."""
+        if self.usage_percent <= 30:
+            return "low"
+        if self.usage_percent <= 70:
+            return "moderate"
+        return "high"
+    
+    @property
+    def core_imbalance(self) -> float:
+        """Largest usage difference between any two cores."""
+        if len(self.per_core_percent) > 1:
+            return max(self.per_core_percent) - min(self.per_core_percent)
+        return 0
+
+
+def json_default(value):
+    """
+    `default` hook for json.dump: converts records to dicts, anything else
+    unknown to its string form.
+    
+    Args:
+        value: Object json cannot serialize
+        
+    Returns:
+        A serializable replacement
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,289 @@
+"""
+Smaps Collector Module for Linux System Monitor
+
+This module handles collecting accurate per-process memory usage (PSS, USS
+and swap) from /proc/<pid>/smaps_rollup. RSS counts every shared page in
+full for each process mapping it, which badly overstates forked worker
+pools; PSS splits shared pages between their users.
+"""
+
+import collections
+import os
+import re
+import time
+from typing import Deque, Dict, Optional
+
+# Root of the proc filesystem
+PROC_ROOT = "/proc"
+
+# smaps_rollup is a few hundred bytes
+ROLLUP_READ_SIZE = 4096
+
+# Reading smaps_rollup walks the process's page tables, so its cost grows
+# with resident memory (milliseconds for a process with a few hundred MB);
+# seconds per resident page until the collector has measured its own
+DEFAULT_PAGE_COST = 1e-7
+
+_ROLLUP_FIELD = re.compile(rb"^(Rss|Pss|Private_Clean|Private_Dirty|Swap|SwapPss): +(\d+) kB", re.MULTILINE)
+
+
+def parse_smaps_rollup(data: bytes) -> Dict[str, int]:
+    """
+    Parse /proc/<pid>/smaps_rollup.
+    
+    Args:
+        data: File contents
+        
+    Returns:
+        Dict with rss, pss, uss (private clean + dirty), swap and swap_pss
+        in bytes
+    """
+    fields = {name: int(value) * 1024 for name, value in _ROLLUP_FIELD.findall(data)}
+    return {
+        "rss": fields.get(b"Rss", 0),
+        "pss": fields.get(b"Pss", 0),
+        "uss": fields.get(b"Private_Clean", 0) + fields.get(b"Private_Dirty", 0),
+        "swap": fields.get(b"Swap", 0),
+        "swap_pss": fields.get(b"SwapPss", 0),
+    }
+
+
+class _ProcessMemory:
+    """Last smaps_rollup reading of one process."""
+    
+    __slots__ = ("pid", "name", "usage", "sampled", "cost")
+    
+    def __init__(self, pid: int):
+        """Initialize the state of a newly seen process."""
+        self.pid = pid
+        self.name = ""
+        self.usage: Optional[Dict[str, int]] = None
+        self.sampled: Optional[float] = None
+        self.cost: Optional[float] = None
+
+
+class SmapsCollector:
+    """
+    Collector for per-process PSS, USS and swap under a time budget.
+    
+    Every tick reads smaps_rollup for as many processes as fit in the
+    budget, continuing round-robin where the previous tick stopped; newly
+    seen processes go to the front of the queue. A read is only started if
+    the process's cost at its previous read fits in what is left of the
+    budget, so a tick only overruns it if a process's cost jumps between
+    reads. A new process is costed from its resident size in statm, which
+    the kernel reports from counters without a walk. A process costing more
+    than the whole budget is deferred: one deferred process is read per
+    pass over the queue, longest waiting first, at the start of a tick, so
+    that tick overruns by that one read only. Until its turn comes it keeps
+    its last value, and its cost is re-estimated from its current size
+    every time it is passed over.
+    """
+    
+    def __init__(self, budget_ms: float = 20.0, top_count: int = 15, proc_root: str = PROC_ROOT):
+        """
+        Initialize the smaps collector.
+        
+        Args:
+            budget_ms: Time spent reading smaps_rollup per collection
+            top_count: Processes reported, largest PSS first
+            proc_root: Root of the proc filesystem
+        """
+        self.budget = budget_ms / 1000
+        self.top_count = top_count
+        self.proc_root = proc_root
+        self.available = os.path.exists(f"{proc_root}/self/smaps_rollup")
+        self.total_memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        
+        self._processes: Dict[int, _ProcessMemory] = {}
+        self._queue: Deque[int] = collections.deque()
+        self._page_cost = DEFAULT_PAGE_COST
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        
+        # Processes costing more than the whole budget, longest waiting first
+        self._deferred: collections.OrderedDict = collections.OrderedDict()
+        # Queue entries left in the current pass, and whether one of the
+        # deferred processes may still be read during it
+        self._pass_left = 0
+        self._overrun_allowed = True
+    
+    def _refresh_pids(self):
+        """Add new processes to the front of the queue and forget exited ones."""
+        try:
+            live = {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+        except OSError:
+            return
+        
+        for pid in live - self._processes.keys():
+            self._processes[pid] = _ProcessMemory(pid)
+            self._queue.appendleft(pid)
+        for pid in self._processes.keys() - live:
+            del self._processes[pid]
+        # Exited PIDs left in the queue are skipped when they come up
+    
+    def _advance(self, drop: bool = False):
+        """
+        Move past the process at the front of the queue.
+        
+        Args:
+            drop: Remove it from the queue instead of moving it to the back
+        """
+        if drop:
+            self._queue.popleft()
+        else:
+            self._queue.rotate(-1)
+        self._pass_left -= 1
+        if self._pass_left <= 0:
+            self._start_pass()
+    
+    def _start_pass(self):
+        """Start a new pass over every queued process."""
+        self._pass_left = len(self._queue)
+        self._overrun_allowed = True
+    
+    def _estimate_cost(self, process: _ProcessMemory) -> float:
+        """Estimate the cost of reading a process's smaps_rollup from its resident size."""
+        try:
+            with open(f"{self.proc_root}/{process.pid}/statm", "rb") as f:
+                resident_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            resident_pages = 0
+        return resident_pages * self._page_cost
+    
+    def _read(self, process: _ProcessMemory) -> bool:
+        """
+        Read one process's smaps_rollup.
+        
+        Args:
+            process: Process to read
+            
+        Returns:
+            False if the process's memory cannot be read
+        """
+        path = f"{self.proc_root}/{process.pid}"
+        try:
+            if not process.name:
+                with open(f"{path}/comm", "rb") as f:
+                    process.name = f.read().strip().decode("utf-8", "replace")
+            fd = os.open(f"{path}/smaps_rollup", os.O_RDONLY)
+            try:
+                data = os.read(fd, ROLLUP_READ_SIZE)
+            finally:
+                os.close(fd)
+        except OSError:
+            return False
+        
+        # Kernel threads have no memory map and an empty rollup
+        process.usage = parse_smaps_rollup(data) if data else None
+        return True
+    
+    def _sample(self, process: _ProcessMemory) -> bool:
+        """
+        Read one process's smaps_rollup and record what it cost.
+        
+        Args:
+            process: Process to read
+            
+        Returns:
+            Whether the process's memory was read
+        """
+        start = time.perf_counter()
+        read = self._read(process)
+        # Unreadable processes (owned by another user, or exited) are
+        # retried on the next pass rather than on every tick
+        process.cost = time.perf_counter() - start
+        process.sampled = time.monotonic()
+        if process.usage and process.usage["rss"]:
+            page_cost = process.cost / (process.usage["rss"] / self._page_size)
+            self._page_cost += (page_cost - self._page_cost) / 8
+        return read
+    
+    def collect(self) -> Dict:
+        """
+        Sample smaps_rollup for as many processes as the budget allows.
+        
+        Returns:
+            Dict containing:
+                - available: Whether the kernel provides smaps_rollup
+                - processes: Largest processes by PSS, each with pid, name,
+                  rss, pss, uss, swap, swap_pss (bytes), memory_percent (PSS
+                  share of physical memory) and age (seconds since read)
+                - total_pss: PSS summed over all measured processes
+                - coverage: Share of live processes measured at least once
+                - sampled: Processes read during this collection
+                - budget_used: Share of the budget spent this collection
+        """
+        if not self.available:
+            return {"available": False}
+        
+        start = time.perf_counter()
+        deadline = start + self.budget
+        self._refresh_pids()
+        
+        if self._pass_left <= 0:
+            self._start_pass()
+        
+        sampled = 0
+        if self._overrun_allowed:
+            # One process too expensive for any tick is read per pass, first
+            # thing in a tick, so the tick overruns by that one read only
+            while self._deferred:
+                process = self._processes.get(self._deferred.popitem(last=False)[0])
+                if process is not None:
+                    self._overrun_allowed = False
+                    sampled += self._sample(process)
+                    break
+        
+        for _ in range(len(self._queue)):
+            pid = self._queue[0]
+            process = self._processes.get(pid)
+            if process is None:
+                self._advance(drop=True)
+                continue
+            
+            if process.cost is None:
+                process.cost = self._estimate_cost(process)
+            if process.cost > self.budget:
+                # Keep its last reading until its turn to overrun comes, and
+                # re-cost it with the calibrated page cost when it next
+                # comes up, as it may have shrunk
+                process.cost = None
+                self._deferred[pid] = None
+                self._advance()
+                continue
+            if time.perf_counter() + process.cost > deadline:
+                break
+            
+            self._advance()
+            sampled += self._sample(process)
+            self._deferred.pop(pid, None)
+        
+        now = time.monotonic()
+        measured = [process for process in self._processes.values() if process.usage is not None]
+        measured.sort(key=lambda process: process.usage["pss"], reverse=True)
+        processes = []
+        for process in measured[:self.top_count]:
+            entry = {"pid": process.pid, "name": process.name}
+            entry.update(process.usage)
+            entry["memory_percent"] = process.usage["pss"] / self.total_memory * 100
+            entry["age"] = now - process.sampled
+            processes.append(entry)
+        
+        seen = sum(1 for process in self._processes.values() if process.sampled is not None)
+        return {
+            "available": True,
+            "processes": processes,
+            "total_pss": sum(process.usage["pss"] for process in measured),
+            "coverage": seen / len(self._processes) if self._processes else 1.0,
+            "sampled": sampled,
+            "budget_used": (time.perf_counter() - start) / self.budget if self.budget else 0.0,
+        }
+    
+    def reset(self):
+        """Reset collector state, forgetting every reading."""
+        self._processes = {}
+        self._queue.clear()
+        self._page_cost = DEFAULT_PAGE_COST
+        self._deferred.clear()
+        self._pass_left = 0
+        self._overrun_allowed = True
@@ -0,0 +1,504 @@
+"""
+Socket Collector Module for Linux System Monitor
+
+This module handles collecting the kernel's socket tables (/proc/net/tcp,
+tcp6, udp, udp6 and unix): connection counts by state, listening ports, the
+busiest remote peers, and the processes owning the most sockets.
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Root of the proc filesystem
+PROC_ROOT = "/proc"
+
+# Socket tables in /proc/net: (file, protocol, address family)
+INET_TABLES = (
+    ("tcp", "tcp", socket.AF_INET),
+    ("tcp6", "tcp", socket.AF_INET6),
+    ("udp", "udp", socket.AF_INET),
+    ("udp6", "udp", socket.AF_INET6),
+)
+
+# Hex digits per address in the tcp/udp tables
+ADDRESS_WIDTH = {socket.AF_INET: 8, socket.AF_INET6: 32}
+
+# TCP states as printed in the st column
+TCP_STATES = {
+    0x01: "ESTABLISHED",
+    0x02: "SYN_SENT",
+    0x03: "SYN_RECV",
+    0x04: "FIN_WAIT1",
+    0x05: "FIN_WAIT2",
+    0x06: "TIME_WAIT",
+    0x07: "CLOSE",
+    0x08: "CLOSE_WAIT",
+    0x09: "LAST_ACK",
+    0x0A: "LISTEN",
+    0x0B: "CLOSING",
+    0x0C: "NEW_SYN_RECV",
+}
+
+TCP_ESTABLISHED = 0x01
+TCP_LISTEN = 0x0A
+
+# Unconnected UDP sockets show as CLOSE
+UDP_UNCONNECTED = 0x07
+
+# Connected unix sockets
+UNIX_CONNECTED = 0x03
+
+# Socket tables are read in chunks of this size into one reused buffer, so
+# a table with hundreds of thousands of sockets is never held in memory
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Seconds between full rescans of the inode index, catching sockets opened
+# by processes that were already indexed
+FULL_RESCAN_INTERVAL = 30.0
+
+_NEWLINE = ord("\n")
+_COLON = ord(":")
+_ZERO = ord("0")
+
+
+def decode_address(hex_address: bytes, family: int) -> str:
+    """
+    Convert an address from a /proc/net table to text.
+    
+    Args:
+        hex_address: Address as printed by the kernel (32-bit words in host
+            byte order)
+        family: socket.AF_INET or socket.AF_INET6
+        
+    Returns:
+        Address in dotted or colon notation
+    """
+    raw = bytes.fromhex(hex_address.decode("ascii"))
+    packed = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    return socket.inet_ntop(family, packed)
+
+
+def _process_name(pid: int, proc_root: str = PROC_ROOT) -> str:
+    """Get a process's command name, or an empty string if it is gone."""
+    try:
+        with open(f"{proc_root}/{pid}/comm", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _hex_byte(chunk: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Decode the two hex digits at each offset into their value."""
+    high = chunk[offsets].astype(np.int32)
+    low = chunk[offsets + 1].astype(np.int32)
+    # '0'-'9' keep their low nibble; 'A'-'F' have bit 6 set and need 9 more
+    return ((high & 0x0F) + 9 * (high >> 6)) * 16 + (low & 0x0F) + 9 * (low >> 6)
+
+
+def _line_starts(chunk: np.ndarray) -> np.ndarray:
+    """Get the offset of every line in a chunk of complete lines."""
+    starts = np.flatnonzero(chunk == _NEWLINE) + 1
+    return np.concatenate(([0], starts[starts < len(chunk)]))
+
+
+def _colons(chunk: np.ndarray, starts: np.ndarray, earliest: int) -> np.ndarray:
+    """
+    Find the first colon of every line.
+    
+    Args:
+        chunk: Lines of a table
+        starts: Offset of every line
+        earliest: Smallest possible distance from line start to the colon
+        
+    Returns:
+        Offset of the colon on every line
+    """
+    colons = np.minimum(starts + earliest, len(chunk) - 1)
+    pending = chunk[colons] != _COLON
+    while pending.any():
+        colons[pending] = np.minimum(colons[pending] + 1, len(chunk) - 1)
+        pending[pending] = chunk[colons[pending]] != _COLON
+    return colons
+
+
+class SocketTableReader:
+    """
+    Streams /proc/net tables through one reused buffer.
+    
+    Each read pulls a chunk into the buffer and hands out the complete lines
+    in it as an array; a partial line at the end of a chunk is moved to the
+    front of the buffer and completed by the next chunk.
+    """
+    
+    def __init__(self, chunk_size: int = READ_CHUNK_SIZE):
+        """
+        Initialize the reader.
+        
+        Args:
+            chunk_size: Bytes read per chunk
+        """
+        self._buffer = bytearray(chunk_size)
+    
+    def chunks(self, path: str) -> Iterator[np.ndarray]:
+        """
+        Iterate over a table's rows (the header skipped), one chunk at a time.
+        
+        Args:
+            path: Table to read
+            
+        Yields:
+            uint8 arrays of whole lines; an array is only valid until the
+            next one is requested
+        """
+        buffer = self._buffer
+        view = memoryview(buffer)
+        filled = 0
+        header = True
+        try:
+            with open(path, "rb", buffering=0) as f:
+                while True:
+                    if filled == len(buffer):
+                        # A line longer than the buffer; move to a larger one
+                        grown = bytearray(2 * len(buffer))
+                        grown[:filled] = buffer[:filled]
+                        buffer = self._buffer = grown
+                        view = memoryview(buffer)
+                    read = f.readinto(view[filled:])
+                    filled += read
+                    
+                    # Hand out complete lines only, unless the table has ended
+                    end = buffer.rfind(b"\n", 0, filled) + 1 if read else filled
+                    start = 0
+                    if header and end:
+                        start = buffer.find(b"\n", 0, end) + 1 or end
+                        header = False
+                    if end > start:
+                        yield np.frombuffer(view[start:end], dtype=np.uint8)
+                    
+                    # Keep the partial line for the next chunk
+                    buffer[:filled - end] = buffer[end:filled]
+                    filled -= end
+                    if not read:
+                        break
+        except OSError:
+            return
+        finally:
+            view.release()
+
+
+class SocketInodeIndex:
+    """
+    Maps socket inodes to the processes holding them.
+    
+    The index is kept from one refresh to the next: only processes that
+    appeared since the previous refresh have their /proc/<pid>/fd scanned,
+    and the inodes of processes that exited are dropped. Sockets opened by
+    an already indexed process are picked up by the periodic full rescan.
+    """
+    
+    def __init__(self, proc_root: str = PROC_ROOT):
+        """
+        Initialize an empty index.
+        
+        Args:
+            proc_root: Root of the proc filesystem
+        """
+        self.proc_root = proc_root
+        self.owners: Dict[int, int] = {}
+        self.pid_inodes: Dict[int, List[int]] = {}
+        self._last_full_scan: Optional[float] = None
+    
+    def _scan(self, pid: int) -> List[int]:
+        """
+        List the socket inodes a process holds.
+        
+        Args:
+            pid: Process ID
+            
+        Returns:
+            Socket inodes (empty if the process is gone or not accessible)
+        """
+        inodes = []
+        try:
+            dir_fd = os.open(f"{self.proc_root}/{pid}/fd", os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return inodes
+        try:
+            for name in os.listdir(dir_fd):
+                try:
+                    target = os.readlink(name, dir_fd=dir_fd)
+                except OSError:
+                    continue
+                if target.startswith("socket:["):
+                    inodes.append(int(target[8:-1]))
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+        return inodes
+    
+    def _forget(self, pid: int):
+        """Drop a process and its inodes from the index."""
+        for inode in self.pid_inodes.pop(pid, ()):
+            if self.owners.get(inode) == pid:
+                del self.owners[inode]
+    
+    def invalidate(self):
+        """Rebuild the whole index on the next refresh."""
+        self._last_full_scan = None
+    
+    def refresh(self):
+        """Index new processes and drop exited ones."""
+        try:
+            pids = {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+        except OSError:
+            return
+        
+        now = time.monotonic()
+        if self._last_full_scan is None or now - self._last_full_scan >= FULL_RESCAN_INTERVAL:
+            self._last_full_scan = now
+            for pid in list(self.pid_inodes):
+                self._forget(pid)
+        
+        for pid in [pid for pid in self.pid_inodes if pid not in pids]:
+            self._forget(pid)
+        
+        for pid in pids:
+            if pid not in self.pid_inodes:
+                inodes = self._scan(pid)
+                self.pid_inodes[pid] = inodes
+                for inode in inodes:
+                    self.owners[inode] = pid
+    
+    def owner(self, inode: int) -> Optional[int]:
+        """
+        Find the process holding a socket.
+        
+        Args:
+            inode: Socket inode
+            
+        Returns:
+            PID, or None if no indexed process holds it
+        """
+        return self.owners.get(inode)
+    
+    def top_processes(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Get the processes holding the most sockets.
+        
+        Args:
+            count: Number of processes to return
+            
+        Returns:
+            List of (pid, socket count), busiest first
+        """
+        counts = sorted(((len(inodes), pid) for pid, inodes in self.pid_inodes.items() if inodes), reverse=True)
+        return [(pid, sockets) for sockets, pid in counts[:count]]
+
+
+class SocketCollector:
+    """
+    Collector for socket tables.
+    
+    Rows are never tokenized one by one: the tcp/udp tables print the
+    addresses, ports and state at fixed widths after the row number, so each
+    chunk is decoded with array operations from the position of every line's
+    first colon. Only the few listening rows are split into fields.
+    
+    Reading the tables and indexing /proc/<pid>/fd can still take a while
+    on hosts with hundreds of thousands of sockets, so `collect` hands the
+    work to a background thread and returns the most recent completed result
+    instead of blocking the caller.
+    """
+    
+    def __init__(self, top_count: int = 10, proc_root: str = PROC_ROOT):
+        """
+        Initialize the socket collector.
+        
+        Args:
+            top_count: Entries reported per top-N list
+            proc_root: Root of the proc filesystem
+        """
+        self.top_count = top_count
+        self.proc_root = proc_root
+        self.index = SocketInodeIndex(proc_root)
+        self._reader = SocketTableReader()
+        
+        self._latest: Dict = {"available": os.path.exists(f"{proc_root}/net/tcp"), "pending": True}
+        self._wanted = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def _scan_inet(self, path: str, protocol: str, family: int, totals: Dict[int, int],
+                   peers: List[np.ndarray], listeners: List[Tuple]):
+        """
+        Accumulate one tcp/udp table.
+        
+        Args:
+            path: Table path
+            protocol: "tcp" or "udp"
+            family: Address family of the table
+            totals: Per-state counts, updated in place
+            peers: Remote addresses of established connections, appended to
+            listeners: (protocol, family, row fields) of listening sockets,
+                appended to
+        """
+        width = ADDRESS_WIDTH[family]
+        for chunk in self._reader.chunks(path):
+            starts = _line_starts(chunk)
+            colons = _colons(chunk, starts, 4)
+            
+            # "sl: local:port remote:port st" at fixed widths after the colon
+            remote = colons + 8 + width
+            states = _hex_byte(chunk, colons + 14 + 2 * width)
+            counts = np.bincount(states, minlength=256)
+            for state in np.flatnonzero(counts):
+                totals[int(state)] = totals.get(int(state), 0) + int(counts[state])
+            
+            if protocol == "tcp":
+                established = remote[states == TCP_ESTABLISHED]
+                addresses = chunk[established[:, None] + np.arange(width)]
+                peers.append(addresses.view(f"S{width}").ravel())
+                listening = states == TCP_LISTEN
+            else:
+                # Bound but unconnected: remote address and port all zeros
+                remote_bytes = chunk[remote[:, None] + np.arange(width + 5)]
+                unset = ((remote_bytes == _ZERO) | (remote_bytes == _COLON)).all(axis=1)
+                listening = (states == UDP_UNCONNECTED) & unset
+            
+            ends = np.append(starts[1:], len(chunk))
+            for row in np.flatnonzero(listening):
+                listeners.append((protocol, family, chunk[starts[row]:ends[row]].tobytes().split()))
+    
+    def scan(self) -> Dict:
+        """
+        Read the socket tables and refresh the inode index now.
+        
+        Only for callers that do not use `collect`, which runs scans on its
+        own thread.
+        
+        Returns:
+            Dict containing:
+                - available: Whether the socket tables could be read
+                - tcp: total and per-state counts
+                - udp: total and bound (unconnected) counts
+                - unix: total and connected counts
+                - listening: Listening TCP and bound UDP sockets with the
+                  owning pid and process name
+                - top_peers: Remote addresses with the most TCP connections
+                - top_processes: Processes holding the most sockets
+                - indexed_sockets: Sockets with a known owning process
+                - duration: Seconds the scan took
+        """
+        start = time.monotonic()
+        self.index.refresh()
+        
+        tcp_states: Dict[int, int] = {}
+        udp_states: Dict[int, int] = {}
+        peers_by_family: Dict[int, List[np.ndarray]] = {}
+        listeners: List[Tuple] = []
+        available = False
+        
+        for table, protocol, family in INET_TABLES:
+            path = f"{self.proc_root}/net/{table}"
+            if not os.path.exists(path):
+                continue
+            available = True
+            self._scan_inet(path, protocol, family, tcp_states if protocol == "tcp" else udp_states,
+                            peers_by_family.setdefault(family, []), listeners)
+        
+        if not available:
+            return {"available": False}
+        
+        # Unix rows: "pointer: refcount protocol flags type st inode path"
+        unix_total = 0
+        unix_connected = 0
+        for chunk in self._reader.chunks(f"{self.proc_root}/net/unix"):
+            colons = _colons(chunk, _line_starts(chunk), 8)
+            states = _hex_byte(chunk, colons + 34)
+            unix_total += len(states)
+            unix_connected += int(np.count_nonzero(states == UNIX_CONNECTED))
+        
+        listening = []
+        for protocol, family, fields in listeners:
+            local, _, port = fields[1].partition(b":")
+            pid = self.index.owner(int(fields[9])) if len(fields) > 9 else None
+            listening.append({
+                "protocol": protocol,
+                "address": decode_address(local, family),
+                "port": int(port, 16),
+                "pid": pid,
+                "process": _process_name(pid, self.proc_root) if pid else "",
+            })
+        listening.sort(key=lambda entry: (entry["port"], entry["protocol"]))
+        
+        top_peers = []
+        for family, arrays in peers_by_family.items():
+            addresses = np.concatenate(arrays) if arrays else np.array([])
+            if not len(addresses):
+                continue
+            addresses, connections = np.unique(addresses, return_counts=True)
+            for row in np.argsort(connections)[::-1][:self.top_count]:
+                top_peers.append({"address": decode_address(addresses[row], family),
+                                  "connections": int(connections[row])})
+        top_peers.sort(key=lambda peer: peer["connections"], reverse=True)
+        
+        top_processes = [
+            {"pid": pid, "name": _process_name(pid, self.proc_root), "sockets": sockets}
+            for pid, sockets in self.index.top_processes(self.top_count)
+        ]
+        
+        return {
+            "available": True,
+            "tcp": {
+                "total": sum(tcp_states.values()),
+                "states": {TCP_STATES.get(state, f"{state:02X}"): count for state, count in tcp_states.items()},
+            },
+            "udp": {
+                "total": sum(udp_states.values()),
+                "bound": sum(1 for entry in listening if entry["protocol"] == "udp"),
+            },
+            "unix": {"total": unix_total, "connected": unix_connected},
+            "listening": listening,
+            "top_peers": top_peers[:self.top_count],
+            "top_processes": top_processes,
+            "indexed_sockets": len(self.index.owners),
+            "duration": time.monotonic() - start,
+        }
+    
+    def _run(self):
+        """Background thread: scan whenever a new result is wanted."""
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            if self._closed:
+                return
+            self._latest = self.scan()
+    
+    def collect(self) -> Dict:
+        """
+        Request a fresh scan and return the latest completed one.
+        
+        Returns:
+            Result of the most recent scan (see `scan`); until the first
+            scan completes, only "available" and "pending" are set
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="socket-collector", daemon=True)
+            self._thread.start()
+        self._wanted.set()
+        return self._latest
+    
+    def reset(self):
+        """Reset collector state, forcing a full index rebuild."""
+        self.index.invalidate()
+    
+    def close(self):
+        """Stop the background thread."""
+        self._closed = True
+        self._wanted.set()
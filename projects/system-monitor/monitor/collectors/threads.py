@@ -0,0 +1,370 @@
+"""
+Thread Collector Module for Linux System Monitor
+
+This module handles collecting per-thread (task) CPU usage for one selected
+process from /proc/<pid>/task/*/stat, so the hot threads inside a JVM or
+database can be told apart.
+"""
+
+import errno
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from monitor.collectors.descriptors import FD_EXHAUSTED, DescriptorBudget, shared_budget
+
+# Root of the proc filesystem
+PROC_ROOT = "/proc"
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+# A task's stat line is well under this size
+STAT_READ_SIZE = 512
+
+# Threads above which reads are spread over the worker pool
+PARALLEL_THRESHOLD = 256
+
+# Fields of /proc/<pid>/task/<tid>/stat, counted after the ")" that ends
+# the command name (which may itself contain spaces and parentheses)
+_STATE = 0
+_UTIME = 11
+_STIME = 12
+_STARTTIME = 19
+_PROCESSOR = 36
+
+
+def parse_task_stat(data: bytes) -> Optional[Tuple[str, str, int, int, int, int]]:
+    """
+    Parse a task's stat line.
+    
+    Args:
+        data: Contents of /proc/<pid>/task/<tid>/stat
+        
+    Returns:
+        (name, state, user ticks, system ticks, start time, last CPU), or
+        None if the line is malformed
+    """
+    open_paren = data.find(b"(")
+    close_paren = data.rfind(b")")
+    fields = data[close_paren + 2:].split()
+    if open_paren < 0 or len(fields) <= _PROCESSOR:
+        return None
+    return (
+        data[open_paren + 1:close_paren].decode("utf-8", "replace"),
+        fields[_STATE].decode("ascii", "replace"),
+        int(fields[_UTIME]),
+        int(fields[_STIME]),
+        int(fields[_STARTTIME]),
+        int(fields[_PROCESSOR]),
+    )
+
+
+class _Task:
+    """Cached state of one thread between scans."""
+    
+    __slots__ = ("tid", "fd", "runtime", "delta")
+    
+    def __init__(self, tid: int):
+        """Initialize the cached state of a newly seen thread."""
+        self.tid = tid
+        self.fd: Optional[int] = None
+        self.runtime: Optional[int] = None
+        self.delta = 0
+
+
+class ThreadCollector:
+    """
+    Collector for the per-thread CPU usage of a selected process.
+    
+    The task table is cached between scans. Every scan lists the task
+    directory once; each thread's CPU time is then re-read with pread from
+    a descriptor opened when the thread was first seen, and a read failing
+    with ESRCH drops a thread that has exited (a descriptor stays bound to
+    its thread, so a reused thread id is picked up as a new thread). Only
+    the busiest threads have their full stat line read for name and state.
+    
+    CPU time comes from schedstat, which is much cheaper for the kernel to
+    format than stat. The reads are spread over a small thread pool, and the
+    whole scan runs on a background thread so that processes with thousands
+    of threads never block the UI.
+    """
+    
+    def __init__(self, pid: int = 0, top_count: int = 20, workers: int = 4, proc_root: str = PROC_ROOT,
+                 fd_budget: Optional[DescriptorBudget] = None):
+        """
+        Initialize the thread collector.
+        
+        Args:
+            pid: Process to inspect (0 = none until select() is called)
+            top_count: Threads reported, busiest first
+            workers: Threads reading task files in parallel
+            proc_root: Root of the proc filesystem
+            fd_budget: Descriptors the held-open files may take (defaults
+                to the budget shared by every collector)
+        """
+        self.top_count = top_count
+        self.workers = workers
+        self.proc_root = proc_root
+        self.pid = 0
+        
+        # Kernels built without schedstats only have the stat file
+        self._schedstat = os.path.exists(f"{proc_root}/self/schedstat")
+        
+        # Threads beyond what the budget leaves are read by path instead
+        self._fd_budget = fd_budget or shared_budget()
+        
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, _Task] = {}
+        self._prev_time: Optional[float] = None
+        self._dir_fd: Optional[int] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._latest: Dict = {"available": False}
+        self._wanted = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        
+        if pid:
+            self.select(pid)
+    
+    def select(self, pid: int):
+        """
+        Switch to another process, discarding the cached task table.
+        
+        Args:
+            pid: Process to inspect (0 = none)
+        """
+        with self._lock:
+            self.pid = pid
+            self._release()
+            self._latest = {"available": bool(pid), "pid": pid, "pending": True}
+    
+    def _release(self):
+        """Close every held descriptor and forget the task table."""
+        held = [task.fd for task in self._tasks.values() if task.fd is not None]
+        for fd in held:
+            os.close(fd)
+        self._fd_budget.release(len(held))
+        self._tasks = {}
+        self._prev_time = None
+        if self._dir_fd is not None:
+            os.close(self._dir_fd)
+            self._dir_fd = None
+    
+    def _read_runtime(self, task: _Task) -> Optional[int]:
+        """
+        Read a thread's total CPU time.
+        
+        Args:
+            task: Thread to read
+            
+        Returns:
+            CPU time in nanoseconds, or None if the thread has exited
+            
+        Raises:
+            OSError: If no descriptor was free to read it by path
+        """
+        try:
+            if task.fd is not None:
+                data = os.pread(task.fd, STAT_READ_SIZE, 0)
+            else:
+                fd = os.open(f"{task.tid}/{'schedstat' if self._schedstat else 'stat'}",
+                             os.O_RDONLY, dir_fd=self._dir_fd)
+                try:
+                    data = os.pread(fd, STAT_READ_SIZE, 0)
+                finally:
+                    os.close(fd)
+        except OSError as error:
+            if error.errno in FD_EXHAUSTED:
+                raise
+            return None
+        
+        if self._schedstat:
+            return int(data.split(None, 1)[0])
+        stat = parse_task_stat(data)
+        if stat is None:
+            return None
+        return (stat[2] + stat[3]) * 1_000_000_000 // CLOCK_TICKS
+    
+    def _refresh(self, tasks: List[_Task]) -> List[_Task]:
+        """
+        Update the CPU time of some threads.
+        
+        Args:
+            tasks: Threads to read
+            
+        Returns:
+            The threads that have exited
+        """
+        exited = []
+        for task in tasks:
+            try:
+                runtime = self._read_runtime(task)
+            except OSError:
+                # Still running, but unreadable until a descriptor is free;
+                # its CPU time counts towards the next reading
+                task.delta = 0
+                continue
+            if runtime is None:
+                exited.append(task)
+                continue
+            task.delta = runtime - task.runtime if task.runtime is not None else 0
+            task.runtime = runtime
+        return exited
+    
+    def _read_stat(self, tid: int) -> Optional[Tuple]:
+        """Read and parse a thread's stat file, or None if it has exited."""
+        try:
+            fd = os.open(f"{tid}/stat", os.O_RDONLY, dir_fd=self._dir_fd)
+            try:
+                return parse_task_stat(os.read(fd, STAT_READ_SIZE))
+            finally:
+                os.close(fd)
+        except OSError:
+            return None
+    
+    def scan(self) -> Dict:
+        """
+        Read every thread of the selected process and compute CPU usage.
+        
+        Returns:
+            Dict containing:
+                - available: Whether a process is selected
+                - pid, name: The selected process
+                - exited: Whether the process is gone
+                - thread_count: Live threads
+                - cpu_percent: CPU used by all threads (100 = one CPU)
+                - threads: Busiest threads with tid, name, state, cpu (the
+                  CPU it last ran on) and cpu_percent
+                - duration: Seconds the scan took
+        """
+        with self._lock:
+            pid = self.pid
+            if not pid:
+                return {"available": False}
+            
+            start = time.monotonic()
+            try:
+                if self._dir_fd is None:
+                    self._dir_fd = os.open(f"{self.proc_root}/{pid}/task", os.O_RDONLY | os.O_DIRECTORY)
+                tids = os.listdir(self._dir_fd)
+            except OSError as error:
+                if error.errno in FD_EXHAUSTED:
+                    # The process is still there; keep the last scan
+                    return self._latest
+                tids = []
+            if not tids:
+                # An exited process keeps an empty task directory while it
+                # is a zombie, and the directory vanishes once it is reaped
+                self._release()
+                return {"available": True, "pid": pid, "exited": True, "threads": []}
+            
+            # Hold a descriptor for each new thread while the budget allows
+            tasks = self._tasks
+            for name in tids:
+                tid = int(name)
+                if tid in tasks:
+                    continue
+                task = _Task(tid)
+                if self._fd_budget.acquire():
+                    try:
+                        task.fd = os.open(f"{name}/{'schedstat' if self._schedstat else 'stat'}",
+                                          os.O_RDONLY, dir_fd=self._dir_fd)
+                    except OSError as error:
+                        self._fd_budget.release()
+                        if error.errno in (errno.ENOENT, errno.ESRCH):
+                            # Exited since the directory was listed
+                            continue
+                        # Otherwise it is read by path
+                tasks[tid] = task
+            
+            # Split the reads between the pool's threads
+            live = list(tasks.values())
+            if len(live) > PARALLEL_THRESHOLD and self.workers > 1:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="task-stat")
+                chunk_size = (len(live) + self.workers - 1) // self.workers
+                chunks = [live[i:i + chunk_size] for i in range(0, len(live), chunk_size)]
+                exited = [task for chunk in self._pool.map(self._refresh, chunks) for task in chunk]
+            else:
+                exited = self._refresh(live)
+            
+            for task in exited:
+                del tasks[task.tid]
+                if task.fd is not None:
+                    os.close(task.fd)
+                    self._fd_budget.release()
+            
+            now = time.monotonic()
+            elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+            self._prev_time = now
+            scale = 100.0 / 1e9 / elapsed if elapsed > 0 else 0.0
+            
+            threads = []
+            for task in heapq.nlargest(self.top_count, tasks.values(), key=lambda task: task.delta):
+                stat = self._read_stat(task.tid)
+                if stat is None:
+                    continue
+                threads.append({
+                    "tid": task.tid,
+                    "name": stat[0],
+                    "state": stat[1],
+                    "cpu": stat[5],
+                    "cpu_percent": task.delta * scale,
+                })
+            
+            main_thread = self._read_stat(pid)
+            return {
+                "available": True,
+                "pid": pid,
+                "name": main_thread[0] if main_thread else "",
+                "exited": False,
+                "thread_count": len(tasks),
+                "cpu_percent": sum(task.delta for task in tasks.values()) * scale,
+                "threads": threads,
+                "duration": time.monotonic() - start,
+            }
+    
+    def _run(self):
+        """Background thread: scan whenever a new result is wanted."""
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            if self._closed:
+                return
+            result = self.scan()
+            # Drop a scan that finished after another process was selected
+            if result.get("pid") == self.pid:
+                self._latest = result
+    
+    def collect(self) -> Dict:
+        """
+        Request a fresh scan and return the latest completed one.
+        
+        Returns:
+            Result of the most recent scan (see `scan`); right after a
+            process is selected, only "available", "pid" and "pending" are set
+        """
+        if not self.pid:
+            return {"available": False}
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="thread-collector", daemon=True)
+            self._thread.start()
+        self._wanted.set()
+        return self._latest
+    
+    def reset(self):
+        """Reset collector state, discarding the cached task table."""
+        self.select(self.pid)
+    
+    def close(self):
+        """Stop the background thread and release held resources."""
+        self._closed = True
+        self._wanted.set()
+        with self._lock:
+            self._release()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
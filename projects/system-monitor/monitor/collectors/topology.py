@@ -0,0 +1,158 @@
+"""
+Topology Module for Linux System Monitor
+
+This module handles reading the CPU topology (logical CPU -> physical core
+-> socket -> NUMA node) from sysfs, and aggregating per-CPU metrics along
+it with index arrays computed once per topology.
+
+numpy is only imported by the aggregator, so reading the topology (as the
+CPU collector does) stays cheap enough for one-shot batch runs.
+"""
+
+import glob
+import os
+from typing import Dict, List
+
+SYSTEM_ROOT = "/sys/devices/system"
+
+# Levels a per-CPU metric is aggregated to
+TOPOLOGY_LEVELS = ("socket", "node", "core")
+
+
+def parse_cpulist(cpulist: str) -> List[int]:
+    """
+    Parse a kernel CPU list such as "0-3,8-11" into CPU indices.
+    
+    Args:
+        cpulist: CPU list string
+        
+    Returns:
+        List of CPU indices
+    """
+    cpus = []
+    for part in cpulist.split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read_first_line(path: str) -> str:
+    """Read a sysfs attribute, returning an empty string if it is missing."""
+    try:
+        with open(path, "r") as f:
+            return f.readline().strip()
+    except OSError:
+        return ""
+
+
+def read_cpu_topology(root: str = SYSTEM_ROOT) -> Dict[str, List[int]]:
+    """
+    Read the socket, NUMA node and physical core of each logical CPU.
+    
+    Physical cores are numbered densely across the machine; SMT siblings
+    share a number. The topology is static, so this is read once.
+    
+    Args:
+        root: sysfs directory holding the cpu and node directories
+        
+    Returns:
+        Dict with "socket", "node" and "core" lists indexed by logical CPU.
+        A list is left empty if the information is unavailable.
+    """
+    groups: Dict[str, List[int]] = {level: [] for level in TOPOLOGY_LEVELS}
+    
+    sockets, cores = {}, {}
+    core_numbers: Dict[tuple, int] = {}
+    paths = glob.glob(os.path.join(root, "cpu", "cpu[0-9]*", "topology"))
+    for path in sorted(paths, key=lambda path: int(path.split(os.sep)[-2][3:])):
+        cpu = int(path.split(os.sep)[-2][3:])
+        try:
+            sockets[cpu] = int(_read_first_line(os.path.join(path, "physical_package_id")))
+        except ValueError:
+            continue
+        
+        # The lowest-numbered SMT sibling identifies the physical core;
+        # core_id alone repeats across sockets and dies
+        siblings = parse_cpulist(_read_first_line(os.path.join(path, "thread_siblings_list")))
+        key = (min(siblings),) if siblings else (sockets[cpu], _read_first_line(os.path.join(path, "core_id")))
+        cores[cpu] = core_numbers.setdefault(key, len(core_numbers))
+    if sockets:
+        groups["socket"] = [sockets.get(cpu, 0) for cpu in range(max(sockets) + 1)]
+        groups["core"] = [cores.get(cpu, 0) for cpu in range(max(cores) + 1)]
+    
+    nodes = {}
+    for path in glob.glob(os.path.join(root, "node", "node[0-9]*", "cpulist")):
+        node = int(os.path.basename(os.path.dirname(path))[4:])
+        for cpu in parse_cpulist(_read_first_line(path)):
+            nodes[cpu] = node
+    if nodes:
+        groups["node"] = [nodes.get(cpu, 0) for cpu in range(max(nodes) + 1)]
+    
+    return groups
+
+
+class TopologyAggregator:
+    """
+    Aggregates per-CPU values to sockets, NUMA nodes and physical cores.
+    
+    The CPUs of every group are made contiguous by a permutation computed
+    once, so each aggregate is a single reduceat over the permuted values
+    rather than a Python loop over CPUs.
+    """
+    
+    def __init__(self, groups: Dict[str, List[int]], cpu_count: int):
+        """
+        Precompute the index arrays for a topology.
+        
+        Args:
+            groups: Per-CPU socket, node and core ids from read_cpu_topology
+            cpu_count: Number of per-CPU values that will be aggregated
+        """
+        import numpy as np
+        
+        self.cpu_count = cpu_count
+        self._levels = {}
+        for level in TOPOLOGY_LEVELS:
+            ids = np.zeros(cpu_count, dtype=np.int64)
+            known = groups.get(level, [])[:cpu_count]
+            ids[:len(known)] = known
+            
+            labels, index = np.unique(ids, return_inverse=True)
+            order = np.argsort(index, kind="stable")
+            counts = np.bincount(index, minlength=len(labels))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            self._levels[level] = (labels.tolist(), order, starts, counts)
+    
+    def aggregate(self, values: List[float]) -> Dict[str, Dict[str, List[float]]]:
+        """
+        Aggregate per-CPU values.
+        
+        Args:
+            values: One value per logical CPU
+            
+        Returns:
+            Dict keyed by level ("socket", "node", "core"), each with the
+            group ids, CPUs per group, and the mean and maximum value of
+            each group; empty if values does not match the topology
+        """
+        if len(values) != self.cpu_count or not self.cpu_count:
+            return {}
+        
+        import numpy as np
+        
+        array = np.asarray(values, dtype=np.float64)
+        result = {}
+        for level, (labels, order, starts, counts) in self._levels.items():
+            grouped = array[order]
+            result[level] = {
+                "ids": labels,
+                "cpus": counts.tolist(),
+                "mean": (np.add.reduceat(grouped, starts) / counts).tolist(),
+                "max": np.maximum.reduceat(grouped, starts).tolist(),
+            }
+        return result
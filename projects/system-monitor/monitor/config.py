@@ -21,6 +21,10 @@ except ImportError:
         import json
         USE_TOML = False
 
+# Shortest dashboard update interval: below it, collection and rendering
+# time dominate the sample spacing
+MIN_UPDATE_INTERVAL = 0.1
+
 
 @dataclass
 class GeneralConfig:
@@ -28,6 +32,11 @@ class GeneralConfig:
     update_interval: float = 1.0
     enable_logging: bool = True
     log_path: str = "~/.local/share/linux-system-monitor/logs"
+    share_samples: bool = True  # Share one collection loop between local dashboards
+    shared_ring_path: str = ""  # Empty = linux-system-monitor.ring in $XDG_RUNTIME_DIR
+    proc_root: str = "/proc"  # e.g. /host/proc to monitor the host from a container
+    sys_root: str = "/sys"
+    instrumentation: bool = False  # Time every stage and show the monitor's own overhead
 
 
 @dataclass
@@ -40,6 +49,7 @@ class DisplayConfig:
     process_count: int = 15
     enable_animations: bool = True
     compact_sidebar: bool = False
+    cpu_view: str = "auto"  # auto, list or heatmap
     color_mapping: Dict[str, str] = field(default_factory=lambda: {
         "cpu": "green",
         "memory": "blue",
@@ -56,6 +66,8 @@ class AlertConfig:
     memory_threshold: float = 85.0
     disk_threshold: float = 90.0
     network_threshold: float = 90.0
+    time_to_full_hours: float = 2.0  # Alert when disk, memory or swap is projected full sooner (0 = off)
+    forecast_window: float = 1800.0  # Seconds of recent usage the time-to-full trends follow
     enable_notifications: bool = True
     notification_sound: bool = False
     alert_log_path: str = "~/.local/share/linux-system-monitor/alerts.log"
@@ -68,6 +80,34 @@ class ExportConfig:
     csv_export_path: str = "~/.local/share/linux-system-monitor/exports"
     snapshot_format: str = "json"
     auto_snapshot_interval: int = 0  # 0 = disabled, otherwise in minutes
+    metrics_port: int = 0  # 0 = disabled, otherwise port for the /metrics endpoint
+    metrics_address: str = "127.0.0.1"
+    websocket_port: int = 0  # 0 = disabled, otherwise port for browser dashboards
+    websocket_address: str = "127.0.0.1"
+
+
+@dataclass
+class CollectorConfig:
+    """Optional collectors and their settings."""
+    cgroups: bool = True  # Per-cgroup (container) usage from cgroup v2
+    cgroup_root: str = ""  # Empty = find the cgroup v2 mount automatically
+    cgroup_top: int = 10  # Cgroups reported per top-N list
+    pressure: bool = True  # CPU, memory and I/O pressure from /proc/pressure
+    pressure_triggers: bool = True  # Wake collection early when a stall starts
+    pressure_trigger_stall_ms: int = 150  # Stall time within the window that fires a trigger
+    pressure_trigger_window_ms: int = 2000  # Trigger window (multiple of 2000 unless root)
+    interrupts: bool = True  # Per-CPU interrupt and softirq rates (view 6)
+    interrupt_top: int = 10  # IRQs and CPUs reported per top-N list
+    sockets: bool = True  # Socket tables and their owning processes (view 7)
+    socket_top: int = 10  # Peers and processes reported per top-N list
+    filesystems: bool = True  # Per-filesystem space and inode usage
+    statvfs_interval: float = 10.0  # Seconds between filesystem usage checks
+    statvfs_timeout: float = 2.0  # Seconds before a filesystem counts as unresponsive
+    memory_accuracy: bool = False  # PSS/USS/swap per process from smaps_rollup
+    memory_accuracy_budget_ms: float = 20.0  # Time spent reading smaps_rollup per update
+    threads_pid: int = 0  # Process whose threads view 8 shows (0 = none until selected)
+    thread_top: int = 20  # Threads reported, busiest first
+    thread_workers: int = 4  # Threads reading task stat files in parallel
 
 
 class Config:
@@ -97,6 +137,7 @@ class Config:
         self.display = DisplayConfig()
         self.alerts = AlertConfig()
         self.export = ExportConfig()
+        self.collectors = CollectorConfig()
         
         # Custom settings not covered by the dataclasses
         self.custom_settings = {}
@@ -126,13 +167,14 @@ class Config:
             self._update_section(self.display, config_data.get("display", {}))
             self._update_section(self.alerts, config_data.get("alerts", {}))
             self._update_section(self.export, config_data.get("export", {}))
+            self._update_section(self.collectors, config_data.get("collectors", {}))
             
             # Store any custom settings
             if "custom" in config_data:
                 self.custom_settings = config_data["custom"]
             
             return True
-            
+        
         except Exception as e:
             print(f"Error loading configuration: {str(e)}")
             # Fall back to defaults
@@ -155,6 +197,7 @@ class Config:
                 "display": self._dataclass_to_dict(self.display),
                 "alerts": self._dataclass_to_dict(self.alerts),
                 "export": self._dataclass_to_dict(self.export),
+                "collectors": self._dataclass_to_dict(self.collectors),
             }
             
             # Add custom settings
@@ -173,7 +216,7 @@ class Config:
                     json.dump(config_data, f, indent=2)
             
             return True
-            
+        
         except Exception as e:
             print(f"Error saving configuration: {str(e)}")
             return False
@@ -184,6 +227,7 @@ class Config:
         self.display = DisplayConfig()
         self.alerts = AlertConfig()
         self.export = ExportConfig()
+        self.collectors = CollectorConfig()
         self.custom_settings = {}
     
     def get_custom(self, key: str, default=None):
@@ -252,6 +296,9 @@ def expand_paths(config: Config):
     """
     # Expand paths in general section
     config.general.log_path = os.path.expanduser(config.general.log_path)
+    config.general.shared_ring_path = os.path.expanduser(config.general.shared_ring_path)
+    config.general.proc_root = os.path.expanduser(config.general.proc_root)
+    config.general.sys_root = os.path.expanduser(config.general.sys_root)
     
     # Expand paths in alerts section
     config.alerts.alert_log_path = os.path.expanduser(config.alerts.alert_log_path)
@@ -274,8 +321,15 @@ def validate_config(config: Config) -> List[str]:
     errors = []
     
     # Validate general section
-    if config.general.update_interval <= 0:
-        errors.append("Update interval must be greater than 0")
+    if config.general.update_interval < MIN_UPDATE_INTERVAL:
+        errors.append(f"Update interval must be at least {MIN_UPDATE_INTERVAL} seconds "
+                      "(use `monitor record` for faster sampling)")
+    
+    if not os.path.isdir(config.general.proc_root):
+        errors.append(f"Proc root {config.general.proc_root} is not a directory")
+    
+    if not os.path.isdir(config.general.sys_root):
+        errors.append(f"Sys root {config.general.sys_root} is not a directory")
     
     # Validate display section
     if config.display.theme not in ["dark", "light"]:
@@ -284,6 +338,9 @@ def validate_config(config: Config) -> List[str]:
     if config.display.layout not in ["detailed", "compact", "minimal"]:
         errors.append("Layout must be one of: 'detailed', 'compact', 'minimal'")
     
+    if config.display.cpu_view not in ["auto", "list", "heatmap"]:
+        errors.append("CPU view must be one of: 'auto', 'list', 'heatmap'")
+    
     if config.display.graph_history <= 0:
         errors.append("Graph history must be greater than 0")
     
@@ -303,6 +360,12 @@ def validate_config(config: Config) -> List[str]:
     if not (0 <= config.alerts.network_threshold <= 100):
         errors.append("Network threshold must be between 0 and 100")
     
+    if config.alerts.time_to_full_hours < 0:
+        errors.append("Time-to-full alert hours must be greater than or equal to 0")
+    
+    if config.alerts.forecast_window <= 0:
+        errors.append("Forecast window must be greater than 0")
+    
     # Validate export configuration
     if config.export.snapshot_format not in ["json", "yaml", "csv"]:
         errors.append("Snapshot format must be one of: 'json', 'yaml', 'csv'")
@@ -310,4 +373,44 @@ def validate_config(config: Config) -> List[str]:
     if config.export.auto_snapshot_interval < 0:
         errors.append("Auto snapshot interval must be greater than or equal to 0")
     
+    if not (0 <= config.export.metrics_port <= 65535):
+        errors.append("Metrics port must be between 0 and 65535")
+    
+    if not (0 <= config.export.websocket_port <= 65535):
+        errors.append("WebSocket port must be between 0 and 65535")
+    
+    # Validate collectors section
+    if config.collectors.cgroup_top <= 0:
+        errors.append("Cgroup top count must be greater than 0")
+    
+    if config.collectors.interrupt_top <= 0:
+        errors.append("Interrupt top count must be greater than 0")
+    
+    if config.collectors.socket_top <= 0:
+        errors.append("Socket top count must be greater than 0")
+    
+    if config.collectors.memory_accuracy_budget_ms <= 0:
+        errors.append("Memory accuracy budget must be greater than 0")
+    
+    if config.collectors.threads_pid < 0:
+        errors.append("Thread view PID must be greater than or equal to 0")
+    
+    if config.collectors.thread_top <= 0:
+        errors.append("Thread top count must be greater than 0")
+    
+    if config.collectors.thread_workers <= 0:
+        errors.append("Thread reader count must be greater than 0")
+    
+    if config.collectors.statvfs_interval <= 0:
+        errors.append("Filesystem usage interval must be greater than 0")
+    
+    if config.collectors.statvfs_timeout <= 0:
+        errors.append("Filesystem usage timeout must be greater than 0")
+    
+    if not (500 <= config.collectors.pressure_trigger_window_ms <= 10000):
+        errors.append("Pressure trigger window must be between 500 and 10000 ms")
+    
+    if not (0 < config.collectors.pressure_trigger_stall_ms <= config.collectors.pressure_trigger_window_ms):
+        errors.append("Pressure trigger stall time must be greater than 0 and at most the window")
+    
     return errors
@@ -0,0 +1,156 @@
+"""
+Event Loop Module for Linux System Monitor
+
+This module multiplexes file descriptor readiness (keyboard input, kernel
+event files) with the periodic collection and render deadlines.
+"""
+
+import select
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class PeriodicTimer:
+    """A callback scheduled at a fixed interval on the monotonic clock."""
+    
+    def __init__(self, interval: float, callback: Callable[[], None]):
+        """
+        Initialize the timer.
+        
+        Args:
+            interval: Seconds between invocations
+            callback: Function to call when the timer fires
+        """
+        self.interval = interval
+        self.callback = callback
+        self.deadline = time.monotonic()
+        self.cancelled = False
+    
+    def reschedule(self, now: float):
+        """
+        Advance the deadline by whole intervals so the schedule never drifts.
+        
+        Args:
+            now: Current monotonic time
+        """
+        self.deadline += self.interval
+        if self.deadline <= now:
+            # We fell behind (slow callback or suspended process); skip the
+            # missed ticks instead of firing them back to back.
+            missed = int((now - self.deadline) // self.interval) + 1
+            self.deadline += missed * self.interval
+    
+    def fire_now(self):
+        """Make the timer due immediately, e.g. after a forced refresh."""
+        self.deadline = time.monotonic()
+    
+    def cancel(self):
+        """Stop the timer from firing again."""
+        self.cancelled = True
+
+
+class EventLoop:
+    """
+    Single-threaded event loop built on poll(2).
+    
+    Readers are woken as soon as their descriptor becomes ready, and the
+    poll timeout is always the time remaining until the next timer deadline,
+    so input is handled within milliseconds regardless of how long the
+    sampling interval is.
+    """
+    
+    def __init__(self):
+        """Initialize an empty event loop."""
+        self._poller = select.poll()
+        self._readers: Dict[int, Callable[[int, int], None]] = {}
+        self._timers: List[PeriodicTimer] = []
+        self._running = False
+    
+    def add_reader(self, fd: int, callback: Callable[[int, int], None],
+                   events: int = select.POLLIN):
+        """
+        Watch a file descriptor and call back when it becomes ready.
+        
+        Args:
+            fd: File descriptor to watch
+            callback: Function called with (fd, revents)
+            events: poll event mask (POLLIN by default)
+        """
+        self._readers[fd] = callback
+        self._poller.register(fd, events)
+    
+    def remove_reader(self, fd: int):
+        """
+        Stop watching a file descriptor.
+        
+        Args:
+            fd: File descriptor to remove
+        """
+        if self._readers.pop(fd, None) is not None:
+            self._poller.unregister(fd)
+    
+    def call_every(self, interval: float, callback: Callable[[], None]) -> PeriodicTimer:
+        """
+        Schedule a callback at a fixed interval, starting immediately.
+        
+        Args:
+            interval: Seconds between invocations
+            callback: Function to call
+        
+        Returns:
+            The timer, which can be cancelled or fired early
+        """
+        timer = PeriodicTimer(interval, callback)
+        self._timers.append(timer)
+        return timer
+    
+    @property
+    def running(self) -> bool:
+        """Whether the loop is running and has not been asked to stop."""
+        return self._running
+    
+    def stop(self):
+        """Ask the loop to exit after the current iteration."""
+        self._running = False
+    
+    def run(self):
+        """Run until stop() is called."""
+        self._running = True
+        while self._running:
+            self.run_once()
+    
+    def run_once(self, max_wait: Optional[float] = None):
+        """
+        Run a single iteration: fire due timers, then wait for readiness.
+        
+        Args:
+            max_wait: Optional upper bound on the wait in seconds
+        """
+        now = time.monotonic()
+        self._timers = [timer for timer in self._timers if not timer.cancelled]
+        
+        for timer in self._timers:
+            if timer.deadline <= now:
+                timer.callback()
+                now = time.monotonic()
+                timer.reschedule(now)
+                if not self._running:
+                    return
+        
+        # Sleep only until the nearest deadline
+        timeout = None
+        if self._timers:
+            timeout = max(0.0, min(timer.deadline for timer in self._timers) - now)
+        if max_wait is not None:
+            timeout = max_wait if timeout is None else min(timeout, max_wait)
+        
+        timeout_ms = None if timeout is None else int(timeout * 1000) + 1
+        try:
+            events = self._poller.poll(timeout_ms)
+        except InterruptedError:
+            return
+        
+        for fd, revents in events:
+            callback = self._readers.get(fd)
+            if callback is not None:
+                callback(fd, revents)
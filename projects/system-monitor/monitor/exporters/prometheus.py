@@ -0,0 +1,360 @@
+"""
+Prometheus Exporter Module for Linux System Monitor
+
+This module serves the latest processed sample over HTTP in the Prometheus
+text exposition format and in OpenMetrics format.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from monitor.processors.delta import SampleDelta
+
+# Prefix for every exported metric name
+METRIC_PREFIX = "system_monitor"
+
+# Processed samples give throughput in MB/s and frequency in MHz; metrics
+# are exported in base units (bytes per second, hertz)
+MEGABYTE = 1024 * 1024
+MEGAHERTZ = 1e6
+
+# Suffix of the throughput fields of a processed sample
+SPEED_SUFFIX = "_speed"
+
+CONTENT_TYPE_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+CONTENT_TYPE_OPENMETRICS = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _escape_label(value) -> str:
+    """Escape a label value for the exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _is_number(value) -> bool:
+    """Whether a value can be exported as a sample value."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _scaled(value, factor: float):
+    """Convert a numeric value to base units; anything else is left out."""
+    return value * factor if _is_number(value) else None
+
+
+class MetricFamily:
+    """One metric name with its type, help text and samples."""
+    
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        """
+        Initialize an empty metric family.
+        
+        Args:
+            name: Metric name without the prefix (and without _total for counters)
+            metric_type: "gauge", "counter" or "histogram"
+            help_text: Description for the HELP line
+        """
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.metric_type = metric_type
+        self.help_text = help_text
+        # (sample name suffix, label text, value)
+        self.samples: List[Tuple[str, str, float]] = []
+    
+    def add(self, value, **labels):
+        """
+        Add a sample if the value is numeric.
+        
+        Args:
+            value: Sample value
+            **labels: Label names and values
+        """
+        if not _is_number(value):
+            return
+        self.samples.append(("", _label_text(labels), value))
+    
+    def add_histogram(self, bounds: List[float], bucket_counts: List[int], total: float, **labels):
+        """
+        Add the cumulative buckets, sum and count of one histogram.
+        
+        Args:
+            bounds: Upper bound of every bucket but the last (overflow) one
+            bucket_counts: Observations per bucket, including the overflow one
+            total: Sum of all observations
+            **labels: Label names and values
+        """
+        cumulative = 0
+        for index, bucket_count in enumerate(bucket_counts):
+            cumulative += bucket_count
+            le = repr(float(bounds[index])) if index < len(bounds) else "+Inf"
+            self.samples.append(("_bucket", _label_text(dict(labels, le=le)), cumulative))
+        self.samples.append(("_sum", _label_text(labels), total))
+        self.samples.append(("_count", _label_text(labels), cumulative))
+    
+    def render(self, openmetrics: bool, out: List[str]):
+        """
+        Append the family's lines to `out`.
+        
+        Args:
+            openmetrics: Render for OpenMetrics instead of the 0.0.4 text format
+            out: List of lines to append to
+        """
+        if not self.samples:
+            return
+        
+        sample_name = self.name
+        family_name = self.name
+        if self.metric_type == "counter":
+            sample_name = self.name + "_total"
+            if not openmetrics:
+                # The 0.0.4 format names the family after the sample
+                family_name = sample_name
+        
+        out.append(f"# HELP {family_name} {self.help_text}")
+        out.append(f"# TYPE {family_name} {self.metric_type}")
+        for suffix, label_text, value in self.samples:
+            out.append(f"{sample_name}{suffix}{label_text} {float(value)!r}")
+
+
+def _label_text(labels: Dict) -> str:
+    """Format labels as {name="value",...}, or nothing without labels."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items()) + "}"
+
+
+def build_families(sample: Dict) -> List[MetricFamily]:
+    """
+    Convert a processed sample into metric families.
+    
+    Args:
+        sample: Processed sample from ResourceProcessor
+        
+    Returns:
+        List of metric families
+    """
+    families = []
+    
+    def family(name: str, metric_type: str, help_text: str) -> MetricFamily:
+        metric_family = MetricFamily(name, metric_type, help_text)
+        families.append(metric_family)
+        return metric_family
+    
+    # CPU
+    cpu = sample.get("cpu", {})
+    family("cpu_usage_percent", "gauge", "Overall CPU usage in percent.").add(cpu.get("usage_percent"))
+    per_core = family("cpu_core_usage_percent", "gauge", "Per-core CPU usage in percent.")
+    for index, value in enumerate(cpu.get("per_core_percent", [])):
+        per_core.add(value, cpu=index)
+    for level in ("socket", "node"):
+        aggregate = cpu.get("topology", {}).get(level, {})
+        grouped = family(f"cpu_{level}_usage_percent", "gauge", f"Mean CPU usage per {level} in percent.")
+        for group_id, value in zip(aggregate.get("ids", []), aggregate.get("mean", [])):
+            grouped.add(value, **{level: group_id})
+    load = family("load_average", "gauge", "System load average.")
+    for period in ("1min", "5min", "15min"):
+        load.add(cpu.get("load_avg", {}).get(period), period=period)
+    family("cpu_frequency_hertz", "gauge", "Current CPU frequency in hertz.").add(
+        _scaled((cpu.get("frequency") or {}).get("current_mhz"), MEGAHERTZ))
+    family("cpu_temperature_celsius", "gauge", "CPU temperature in degrees Celsius.").add(
+        (cpu.get("temperature") or {}).get("celsius"))
+    family("context_switches", "counter", "Context switches since boot.").add(cpu.get("context_switches"))
+    family("interrupts", "counter", "Interrupts since boot.").add(cpu.get("interrupts"))
+    
+    # Memory
+    memory = sample.get("memory", {})
+    family("memory_usage_percent", "gauge", "Memory usage in percent.").add(memory.get("usage_percent"))
+    family("swap_usage_percent", "gauge", "Swap usage in percent.").add(memory.get("swap_percent"))
+    family("memory_time_to_full_seconds", "gauge", "Projected seconds until memory is full, while filling.").add(
+        memory.get("time_to_full"))
+    family("swap_time_to_full_seconds", "gauge", "Projected seconds until swap is full, while filling.").add(
+        memory.get("swap_time_to_full"))
+    
+    # Disk, with one series per filesystem
+    disk = sample.get("disk", {})
+    family("disk_usage_percent", "gauge", "Disk usage in percent.").add(disk.get("usage_percent"))
+    family("disk_read_bytes_per_second", "gauge", "Disk read throughput in bytes per second.").add(
+        _scaled(disk.get("read_speed"), MEGABYTE))
+    family("disk_write_bytes_per_second", "gauge", "Disk write throughput in bytes per second.").add(
+        _scaled(disk.get("write_speed"), MEGABYTE))
+    _add_per_device(family, "filesystem", "mountpoint", disk.get("partitions"), "Filesystem")
+    
+    # Network, with one series per interface
+    network = sample.get("network", {})
+    family("network_download_bytes_per_second", "gauge", "Network receive throughput in bytes per second.").add(
+        _scaled(network.get("download_speed"), MEGABYTE))
+    family("network_upload_bytes_per_second", "gauge", "Network transmit throughput in bytes per second.").add(
+        _scaled(network.get("upload_speed"), MEGABYTE))
+    _add_per_device(family, "network_interface", "interface", network.get("interfaces"), "Network interface")
+    
+    # Pressure stall information
+    pressure = sample.get("pressure", {})
+    if pressure.get("available"):
+        stall = family("pressure_stall_percent", "gauge", "Share of time tasks stalled on a resource, in percent.")
+        for resource in ("cpu", "memory", "io"):
+            for key, value in pressure.get(resource, {}).items():
+                kind, window = key.split("_", 1)
+                if window.startswith("avg"):
+                    stall.add(value, resource=resource, kind=kind, window=window)
+    
+    # System and alerts
+    system = sample.get("system", {})
+    family("uptime_seconds", "gauge", "System uptime in seconds.").add(system.get("uptime"))
+    alerts = family("alert", "gauge", "Active alerts (1 while the alert is raised).")
+    for resource, alert in sample.get("alerts", {}).items():
+        alerts.add(1, resource=resource, level=alert.get("level", ""))
+    
+    # The monitor's own overhead, when started with --instrument
+    instrumentation = sample.get("instrumentation")
+    if instrumentation:
+        stages = family("self_stage_duration_seconds", "histogram",
+                        "Latency of the monitor's collection, processing and rendering stages.")
+        for stage, summary in instrumentation.get("stages", {}).items():
+            stages.add_histogram(instrumentation["bucket_bounds"], summary["buckets"], summary["sum"], stage=stage)
+        family("self_frame_bytes", "gauge", "Bytes written to the terminal by the last frame.").add(
+            instrumentation.get("frame_bytes"))
+        family("self_output_bytes", "counter", "Bytes written to the terminal.").add(
+            instrumentation.get("output_bytes"))
+        family("self_cpu_seconds", "counter", "CPU time used by the monitor.").add(
+            instrumentation.get("cpu_seconds"))
+        family("self_cpu_percent", "gauge", "The monitor's own CPU usage in percent.").add(
+            instrumentation.get("cpu_percent"))
+    
+    return families
+
+
+def _add_per_device(family, prefix: str, label: str, devices, description: str):
+    """
+    Export every numeric field of a per-device mapping as its own family.
+    
+    Throughput fields ("download_speed", in MB/s) are exported in bytes per
+    second ("download_bytes_per_second").
+    
+    Args:
+        family: Factory creating and registering a MetricFamily
+        prefix: Metric name prefix ("filesystem", "network_interface")
+        label: Label name carrying the device name
+        devices: Mapping of device name to a dict of fields, or a list of
+            dicts with a "name" field
+        description: Human-readable device kind for the HELP text
+    """
+    if isinstance(devices, list):
+        devices = {device.get("name", str(index)): device for index, device in enumerate(devices)
+                   if isinstance(device, dict)}
+    if not isinstance(devices, dict):
+        return
+    
+    by_field: Dict[str, MetricFamily] = {}
+    for name, fields in devices.items():
+        if not isinstance(fields, dict):
+            continue
+        for field, value in fields.items():
+            if not _is_number(value):
+                continue
+            metric_family = by_field.get(field)
+            if metric_family is None:
+                if field.endswith(SPEED_SUFFIX):
+                    metric_name = f"{prefix}_{field[:-len(SPEED_SUFFIX)]}_bytes_per_second"
+                    help_text = f"{description} {field[:-len(SPEED_SUFFIX)]} throughput in bytes per second."
+                else:
+                    metric_name, help_text = f"{prefix}_{field}", f"{description} {field}."
+                metric_family = by_field[field] = family(metric_name, "gauge", help_text)
+            metric_family.add(value * MEGABYTE if field.endswith(SPEED_SUFFIX) else value, **{label: name})
+
+
+class PrometheusExporter:
+    """
+    HTTP endpoint serving the latest sample in exposition format.
+    
+    `update` only stores the sample. The body is rendered on the first
+    scrape after a new sample and cached, so any number of scrapes between
+    two samples share one rendering and never trigger collection.
+    """
+    
+    def __init__(self):
+        """Initialize the exporter with no sample."""
+        self._lock = threading.Lock()
+        self._sample: Optional[Dict] = None
+        self._bodies: Dict[bool, bytes] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def update(self, delta: SampleDelta):
+        """
+        Publish a new sample (suitable as a MonitorPipeline listener).
+        
+        The cached bodies are kept when no exported value changed (history
+        series are not exported).
+        
+        Args:
+            delta: Delta of the processed sample from the previous one
+        """
+        with self._lock:
+            self._sample = delta.sample
+            if delta.changed or delta.removed or delta.full:
+                self._bodies = {}
+    
+    def render(self, openmetrics: bool = False) -> bytes:
+        """
+        Get the exposition body for the latest sample.
+        
+        Args:
+            openmetrics: Render OpenMetrics instead of the 0.0.4 text format
+            
+        Returns:
+            Encoded body, cached until the next sample
+        """
+        with self._lock:
+            body = self._bodies.get(openmetrics)
+            if body is None:
+                lines: List[str] = []
+                if self._sample is not None:
+                    for metric_family in build_families(self._sample):
+                        metric_family.render(openmetrics, lines)
+                if openmetrics:
+                    lines.append("# EOF")
+                body = ("\n".join(lines) + "\n").encode("utf-8")
+                self._bodies[openmetrics] = body
+            return body
+    
+    def start(self, port: int, address: str = "127.0.0.1"):
+        """
+        Start serving /metrics on a background thread.
+        
+        Args:
+            port: TCP port to listen on (0 picks a free port)
+            address: Address to bind to
+        """
+        exporter = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = exporter.render(openmetrics)
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE_OPENMETRICS if openmetrics else CONTENT_TYPE_TEXT)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                # Keep scrapes out of the terminal
+                pass
+        
+        self._server = ThreadingHTTPServer((address, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+    
+    @property
+    def port(self) -> int:
+        """Port the endpoint is listening on."""
+        return self._server.server_address[1] if self._server else 0
+    
+    def stop(self):
+        """Stop the HTTP server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,423 @@
+"""
+WebSocket Exporter Module for Linux System Monitor
+
+This module streams processed samples to browser clients (the React
+dashboard component) over WebSocket: one full state on connect, then only
+the fields that changed and the points appended to each history series.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from monitor.processors.delta import SampleDelta
+from monitor.transport.protocol import unflatten
+
+# Clients with more than this many bytes queued are skipped until they
+# catch up, and are then resynchronized with a snapshot
+MAX_BUFFERED_BYTES = 1024 * 1024
+
+# Seconds a new connection has to complete the HTTP upgrade
+HANDSHAKE_TIMEOUT = 5.0
+
+# Decimal places kept for floating point values; smaller changes are not sent
+FLOAT_PRECISION = 2
+
+_WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Marks key paths that were not in the previous sample
+_MISSING = object()
+
+# WebSocket opcodes (RFC 6455, section 5.2)
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def _round(value: Any, precision: int = FLOAT_PRECISION) -> Any:
+    """Round floats (and lists of floats) to the streamed precision."""
+    if isinstance(value, float):
+        return round(value, precision)
+    if isinstance(value, list) and value and isinstance(value[0], float):
+        return [round(item, precision) if isinstance(item, float) else item for item in value]
+    return value
+
+
+def _is_number_list(value: Any) -> bool:
+    """Whether a value is a list of plain numbers."""
+    return isinstance(value, list) and all(
+        isinstance(item, (int, float)) and not isinstance(item, bool) for item in value
+    )
+
+
+def _list_patch(old: Any, new: Any) -> Optional[Dict[str, Any]]:
+    """
+    Describe a change to a numeric list as index updates.
+    
+    Args:
+        old: Previous value
+        new: Current value
+        
+    Returns:
+        Mapping of index (as a string) to new value, or None if the list
+        should be sent whole (different length, not numeric, or mostly changed)
+    """
+    if not (_is_number_list(old) and _is_number_list(new)) or len(old) != len(new):
+        return None
+    patch = {str(index): value for index, (previous, value) in enumerate(zip(old, new)) if previous != value}
+    # Past half the list, index keys cost more than the plain array
+    if len(patch) * 2 > len(new):
+        return None
+    return patch
+
+
+class JsonDeltaEncoder:
+    """
+    Encodes a stream of sample deltas into JSON snapshot and delta messages.
+    
+    Changes arrive from the processor by dotted key path (the same paths as
+    the binary agent protocol). Numeric arrays such as per-core usage are
+    patched by index, and history series are sent as appended points, so a
+    delta's size follows the number of values that changed rather than the
+    size of the sample.
+    """
+    
+    def __init__(self, interval: float, history_size: int):
+        """
+        Initialize the encoder.
+        
+        Args:
+            interval: Seconds between samples (lets clients label history points)
+            history_size: Length clients trim history series to
+        """
+        self.interval = interval
+        self.history_size = history_size
+        self._current: Dict[str, Any] = {}
+        self._history: Dict[str, List] = {}
+        self._timestamp = 0.0
+        self._snapshot: Optional[str] = None
+        self._delta_sequence = 0
+        self.sequence = 0
+    
+    def update(self, delta: SampleDelta) -> str:
+        """
+        Encode a new sample.
+        
+        Args:
+            delta: Change from the previous sample (see ResourceProcessor.delta)
+            
+        Returns:
+            Delta message containing only the changes
+        """
+        if not delta.follows(self._delta_sequence):
+            # A delta was missed (or the encoder started late); start over
+            # from the whole sample
+            delta = delta.as_full()
+        self._delta_sequence = delta.sequence
+        
+        current = self._current
+        history = self._history
+        if delta.full:
+            removed = [path for path in current if path not in delta.changed]
+            removed += [path for path in history if path not in delta.replaced]
+        else:
+            removed = [path for path in delta.removed if path in current or path in history]
+        for path in removed:
+            current.pop(path, None)
+            history.pop(path, None)
+        
+        changes: Dict[str, Any] = {}
+        patches: Dict[str, Dict[str, Any]] = {}
+        appends: Dict[str, List] = {}
+        
+        for path, value in delta.changed.items():
+            value = _round(value)
+            previous = current.get(path, _MISSING)
+            if previous == value:
+                # Changed only below the streamed precision
+                continue
+            current[path] = value
+            patch = _list_patch(previous, value)
+            if patch is not None:
+                patches[path] = patch
+            else:
+                changes[path] = value
+        
+        for path, points in delta.appended.items():
+            points = [_round(point) for point in points]
+            series = history.get(path)
+            # Appending then trimming on the client must reproduce the series
+            if series is not None and min(len(series) + len(points), self.history_size) == len(delta.history[path]):
+                history[path] = (series + points)[-self.history_size:]
+                appends[path] = points
+            else:
+                history[path] = changes[path] = [_round(point) for point in delta.history[path]]
+        for path, series in delta.replaced.items():
+            history[path] = changes[path] = [_round(point) for point in series]
+        
+        self.sequence += 1
+        self._timestamp = delta.timestamp
+        self._snapshot = None
+        
+        message: Dict[str, Any] = {"type": "delta", "seq": self.sequence, "ts": self._timestamp}
+        if changes:
+            message["set"] = changes
+        if patches:
+            message["patch"] = patches
+        if appends:
+            message["append"] = appends
+        if removed:
+            message["remove"] = removed
+        return json.dumps(message, separators=(",", ":"))
+    
+    def snapshot(self) -> str:
+        """
+        Get a snapshot message with the full state of the latest sample.
+        
+        It is built at most once per sample.
+        
+        Returns:
+            Snapshot message
+        """
+        if self._snapshot is None:
+            state = dict(self._current)
+            state.update(self._history)
+            self._snapshot = json.dumps({
+                "type": "snapshot",
+                "seq": self.sequence,
+                "ts": self._timestamp,
+                "interval": self.interval,
+                "history_size": self.history_size,
+                "data": unflatten(state),
+            }, separators=(",", ":"))
+        return self._snapshot
+
+
+def encode_frame(payload: bytes, opcode: int = OPCODE_TEXT) -> bytes:
+    """
+    Build an unmasked, unfragmented server-to-client WebSocket frame.
+    
+    Args:
+        payload: Frame payload
+        opcode: Frame opcode
+        
+    Returns:
+        Encoded frame
+    """
+    length = len(payload)
+    if length < 126:
+        header = struct.pack(">BB", 0x80 | opcode, length)
+    elif length < 0x10000:
+        header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """
+    Read one client-to-server WebSocket frame.
+    
+    Args:
+        reader: Stream to read from
+        
+    Returns:
+        Tuple of (opcode, unmasked payload)
+    """
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+    if length > MAX_BUFFERED_BYTES:
+        raise ConnectionError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if second & 0x80 else b"\x00\x00\x00\x00"
+    payload = await reader.readexactly(length)
+    return opcode, bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+
+
+class WebSocketClient:
+    """A connected browser and its delivery state."""
+    
+    def __init__(self, writer: asyncio.StreamWriter):
+        """
+        Initialize the client.
+        
+        Args:
+            writer: Stream to send frames on
+        """
+        self.writer = writer
+        # Clients start (and restart after falling behind) from a snapshot
+        self.needs_snapshot = True
+    
+    def send(self, delta_frame: bytes, snapshot_frame) -> None:
+        """
+        Send the current sample as a delta, or as a snapshot when needed.
+        
+        Args:
+            delta_frame: Encoded delta frame for the current sample
+            snapshot_frame: Function returning the encoded snapshot frame
+        """
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+            # Slow client: drop this sample rather than buffer without bound
+            self.needs_snapshot = True
+            return
+        
+        if self.needs_snapshot:
+            self.writer.write(snapshot_frame())
+            self.needs_snapshot = False
+        else:
+            self.writer.write(delta_frame)
+
+
+class WebSocketExporter:
+    """
+    WebSocket endpoint streaming samples to browser dashboards.
+    
+    The server runs its own asyncio loop on a background thread, so it can
+    be attached to any pipeline as a listener. Each sample is diffed and
+    framed once, and the same bytes are written to every client.
+    """
+    
+    def __init__(self, interval: float, history_size: int):
+        """
+        Initialize the exporter.
+        
+        Args:
+            interval: Seconds between samples
+            history_size: Number of history points the processor keeps
+        """
+        self.encoder = JsonDeltaEncoder(interval, history_size)
+        self.clients: Set[WebSocketClient] = set()
+        self._lock = threading.Lock()
+        self._snapshot_frame: Optional[bytes] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def update(self, delta: SampleDelta):
+        """
+        Encode a sample and send it to every client (suitable as a
+        MonitorPipeline listener).
+        
+        Args:
+            delta: Delta of the processed sample from the previous one
+        """
+        with self._lock:
+            delta_frame = encode_frame(self.encoder.update(delta).encode("utf-8"))
+            self._snapshot_frame = None
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._broadcast, delta_frame)
+    
+    def snapshot_frame(self) -> bytes:
+        """Get the encoded snapshot frame for the latest sample."""
+        with self._lock:
+            if self._snapshot_frame is None:
+                self._snapshot_frame = encode_frame(self.encoder.snapshot().encode("utf-8"))
+            return self._snapshot_frame
+    
+    def _broadcast(self, delta_frame: bytes):
+        """Send a delta frame to every client (runs on the server loop)."""
+        for client in list(self.clients):
+            if client.writer.is_closing():
+                self.clients.discard(client)
+                continue
+            client.send(delta_frame, self.snapshot_frame)
+    
+    def start(self, port: int, address: str = "127.0.0.1"):
+        """
+        Start serving WebSocket connections on a background thread.
+        
+        Args:
+            port: TCP port to listen on (0 picks a free port)
+            address: Address to bind to
+        """
+        loop = asyncio.new_event_loop()
+        self._server = loop.run_until_complete(asyncio.start_server(self._handle_client, address, port))
+        self._loop = loop
+        self._thread = threading.Thread(target=loop.run_forever, name="websocket", daemon=True)
+        self._thread.start()
+    
+    @property
+    def port(self) -> int:
+        """Port the endpoint is listening on."""
+        return self._server.sockets[0].getsockname()[1] if self._server else 0
+    
+    def stop(self):
+        """Stop the server and close every connection."""
+        if self._loop is None:
+            return
+        
+        async def shutdown():
+            self._server.close()
+            for client in list(self.clients):
+                client.writer.close()
+            self.clients.clear()
+        
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._server = None
+    
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """
+        Complete the HTTP upgrade (RFC 6455, section 4.2).
+        
+        Returns:
+            True if the connection is now a WebSocket
+        """
+        request = await reader.readuntil(b"\r\n\r\n")
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        key = headers.get("sec-websocket-key")
+        if "websocket" not in headers.get("upgrade", "").lower() or not key:
+            writer.write(b"HTTP/1.1 426 Upgrade Required\r\nSec-WebSocket-Version: 13\r\n"
+                         b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+            return False
+        
+        accept = base64.b64encode(hashlib.sha1(key.encode("latin-1") + _WEBSOCKET_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                     b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        return True
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle one browser connection from the upgrade until it closes."""
+        client = None
+        try:
+            if not await asyncio.wait_for(self._handshake(reader, writer), HANDSHAKE_TIMEOUT):
+                return
+            
+            client = WebSocketClient(writer)
+            self.clients.add(client)
+            
+            # Send the latest state right away instead of waiting for a tick
+            if self.encoder.sequence:
+                client.send(b"", self.snapshot_frame)
+            
+            # Clients only send control frames; text from them is ignored
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == OPCODE_CLOSE:
+                    writer.write(encode_frame(payload[:2], OPCODE_CLOSE))
+                    break
+                if opcode == OPCODE_PING:
+                    writer.write(encode_frame(payload, OPCODE_PONG))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                ConnectionError, ValueError):
+            pass
+        finally:
+            if client is not None:
+                self.clients.discard(client)
+            writer.close()
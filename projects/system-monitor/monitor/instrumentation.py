@@ -0,0 +1,284 @@
+"""
+Instrumentation Module for Linux System Monitor
+
+This module measures what the monitor itself costs: the latency of every
+collection, processing, layout and rendering stage, the bytes written to
+the terminal per frame, and the monitor's own CPU usage.
+
+Stages are timed by replacing the measured methods on their instances when
+instrumentation is enabled; when it is disabled nothing is replaced, so the
+hot path is exactly the uninstrumented code.
+"""
+
+import bisect
+import functools
+import os
+import time
+from typing import Dict, Optional
+
+# Upper bounds (seconds) of the latency buckets, in 1-2-5 steps from 10 µs
+# to 10 s; a final overflow bucket catches anything slower
+BUCKET_BOUNDS = tuple(mantissa * 10.0 ** exponent for exponent in range(-5, 1) for mantissa in (1, 2, 5)) + (10.0,)
+
+# Seconds over which the monitor's CPU usage is averaged
+CPU_WINDOW = 1.0
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets.
+    
+    Recording is a bisect into a small tuple and two additions, cheap enough
+    to run around every call of a hot-path method.
+    """
+    
+    __slots__ = ("counts", "count", "sum", "max")
+    
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float):
+        """
+        Record one measurement.
+        
+        Args:
+            seconds: Measured latency
+        """
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket holding it.
+        
+        Args:
+            q: Quantile between 0 and 1
+            
+        Returns:
+            Latency in seconds (the maximum seen for the overflow bucket)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+    
+    def snapshot(self) -> Dict:
+        """
+        Summarize the histogram.
+        
+        Returns:
+            Dict with count, sum, max, p50, p95, p99 (seconds) and the
+            per-bucket counts
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": list(self.counts),
+        }
+
+
+class CountingStream:
+    """
+    Write-through wrapper around the terminal's output stream that counts
+    the bytes written and the time spent writing them.
+    """
+    
+    def __init__(self, stream):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            stream: Text stream to write to (normally sys.stdout)
+        """
+        self.stream = stream
+        self.bytes = 0
+        self.write_time = 0.0
+    
+    def write(self, text: str) -> int:
+        """Write text, counting its encoded size and the time taken."""
+        start = time.perf_counter()
+        written = self.stream.write(text)
+        self.write_time += time.perf_counter() - start
+        self.bytes += len(text) if text.isascii() else len(text.encode("utf-8", "replace"))
+        return written
+    
+    def flush(self):
+        """Flush the underlying stream, counting the time taken."""
+        start = time.perf_counter()
+        self.stream.flush()
+        self.write_time += time.perf_counter() - start
+    
+    def __getattr__(self, name):
+        """Delegate everything else (fileno, isatty, encoding) to the stream."""
+        return getattr(self.stream, name)
+
+
+class Instrumentation:
+    """
+    Per-stage latency histograms and terminal output counters.
+    
+    One instance is shared by the pipeline and the dashboard; `snapshot`
+    summarizes everything for the overhead panel and the exporters.
+    """
+    
+    def __init__(self):
+        """Initialize empty histograms and counters."""
+        self.stages: Dict[str, Histogram] = {}
+        self.output: Optional[CountingStream] = None
+        self.frames = 0
+        self.frame_bytes = 0
+        
+        self._cpu_mark = (time.monotonic(), self._cpu_seconds())
+        self._cpu_percent = 0.0
+    
+    def histogram(self, stage: str) -> Histogram:
+        """
+        Get (creating if needed) the histogram of a stage.
+        
+        Args:
+            stage: Stage name, e.g. "collect.cpu"
+            
+        Returns:
+            The stage's histogram
+        """
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        return histogram
+    
+    def instrument(self, obj, method_name: str, stage: str):
+        """
+        Time every call of a method of one object.
+        
+        Args:
+            obj: Object whose method is timed (only this instance is affected)
+            method_name: Name of the method
+            stage: Stage name the calls are recorded under
+        """
+        method = getattr(obj, method_name)
+        histogram = self.histogram(stage)
+        perf_counter = time.perf_counter
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - start)
+        
+        setattr(obj, method_name, timed)
+    
+    def instrument_frame(self, obj, method_name: str):
+        """
+        Time a method that draws one frame, and attribute the terminal
+        output written during it to that frame.
+        
+        Args:
+            obj: Object whose method draws a frame
+            method_name: Name of the method
+        """
+        method = getattr(obj, method_name)
+        render = self.histogram("render")
+        output_histogram = self.histogram("output")
+        perf_counter = time.perf_counter
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            output = self.output
+            if output is not None:
+                start_bytes, start_write = output.bytes, output.write_time
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                render.observe(perf_counter() - start)
+                self.frames += 1
+                if output is not None:
+                    output_histogram.observe(output.write_time - start_write)
+                    self.frame_bytes = output.bytes - start_bytes
+        
+        setattr(obj, method_name, timed)
+    
+    def wrap_output(self, stream) -> CountingStream:
+        """
+        Count the terminal output written through a stream.
+        
+        Args:
+            stream: Stream the dashboard prints to
+            
+        Returns:
+            Counting wrapper to print through instead
+        """
+        self.output = CountingStream(stream)
+        return self.output
+    
+    @staticmethod
+    def _cpu_seconds() -> float:
+        """User and system CPU time used by this process."""
+        times = os.times()
+        return times.user + times.system
+    
+    def cpu_percent(self) -> float:
+        """
+        Get the monitor's own CPU usage (100 = one CPU), averaged over at
+        least CPU_WINDOW seconds.
+        
+        Returns:
+            CPU usage in percent
+        """
+        now, cpu_seconds = time.monotonic(), self._cpu_seconds()
+        mark_time, mark_cpu = self._cpu_mark
+        if now - mark_time >= CPU_WINDOW:
+            self._cpu_percent = (cpu_seconds - mark_cpu) / (now - mark_time) * 100
+            self._cpu_mark = (now, cpu_seconds)
+        return self._cpu_percent
+    
+    def snapshot(self) -> Dict:
+        """
+        Summarize all stages and counters.
+        
+        Returns:
+            Dict containing:
+                - stages: Histogram summary per stage (see Histogram.snapshot)
+                - bucket_bounds: Upper bound in seconds of every bucket but
+                  the last (overflow) one
+                - frames: Frames drawn
+                - frame_bytes: Bytes written to the terminal by the last frame
+                - output_bytes: Bytes written to the terminal in total
+                - cpu_seconds: CPU time used by the monitor
+                - cpu_percent: The monitor's recent CPU usage
+        """
+        return {
+            "stages": {stage: histogram.snapshot() for stage, histogram in sorted(self.stages.items())},
+            "bucket_bounds": list(BUCKET_BOUNDS),
+            "frames": self.frames,
+            "frame_bytes": self.frame_bytes,
+            "output_bytes": self.output.bytes if self.output is not None else 0,
+            "cpu_seconds": self._cpu_seconds(),
+            "cpu_percent": self.cpu_percent(),
+        }
+    
+    def reset(self):
+        """Forget every measurement."""
+        # Timed methods hold their histogram, so clear them in place
+        for histogram in self.stages.values():
+            histogram.__init__()
+        self.frames = 0
+        self.frame_bytes = 0
@@ -0,0 +1,257 @@
+"""
+Pipeline Module for Linux System Monitor
+
+This module ties the collectors and the resource processor together so that
+every front end (the dashboard, the headless agent) runs the same
+collection and processing steps.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from monitor.collectors.cgroup import CgroupCollector
+from monitor.collectors.cpu import CPUCollector
+from monitor.collectors.filesystem import FilesystemCollector
+from monitor.collectors.interrupts import InterruptCollector
+from monitor.collectors.pressure import PressureCollector
+from monitor.collectors.smaps import SmapsCollector
+from monitor.collectors.sockets import SocketCollector
+from monitor.collectors.threads import ThreadCollector
+from monitor.config import Config
+from monitor.instrumentation import Instrumentation
+from monitor.processors.delta import SampleDelta
+from monitor.processors.resource_processor import ResourceProcessor
+
+
+def sample_settings(config: Config) -> Dict:
+    """
+    Get the settings that shape the samples a pipeline produces.
+    
+    Dashboards sharing one collection loop must agree on these, since a
+    reader shows the publisher's samples instead of collecting its own.
+    
+    Args:
+        config: Application configuration
+        
+    Returns:
+        JSON-serializable settings
+    """
+    return {
+        "update_interval": config.general.update_interval,
+        "proc_root": config.general.proc_root,
+        "sys_root": config.general.sys_root,
+        "instrumentation": config.general.instrumentation,
+        "collectors": {key: value for key, value in config.collectors.__dict__.items()},
+        "process_count": config.display.process_count,
+        "graph_history": config.display.graph_history,
+        "forecast_window": config.alerts.forecast_window,
+        "time_to_full_hours": config.alerts.time_to_full_hours,
+    }
+
+
+class MonitorPipeline:
+    """
+    Runs the collectors and the resource processor for one sample at a time.
+    
+    Consumers that need every processed sample (exporters, publishers) can
+    register a listener instead of driving collection themselves, so a
+    sample is collected, processed and diffed once no matter how many
+    consumers there are. Listeners receive a SampleDelta: what changed since
+    the previous sample, with the full sample attached.
+    """
+    
+    def __init__(self, config: Config, instrumentation: Optional[Instrumentation] = None):
+        """
+        Initialize the collectors and the processor.
+        
+        Args:
+            config: Application configuration
+            instrumentation: Records the latency of every collector and of
+                processing when given
+        """
+        self.config = config
+        
+        # Initialize collectors, all reading from the configured proc and
+        # sys roots
+        proc_root = config.general.proc_root
+        sys_root = config.general.sys_root
+        self.cpu_collector = CPUCollector(proc_root, sys_root)
+        self.cgroup_collector = None
+        if config.collectors.cgroups:
+            self.cgroup_collector = CgroupCollector(config.collectors.cgroup_root or None,
+                                                    config.collectors.cgroup_top, proc_root, sys_root)
+        self.pressure_collector = None
+        if config.collectors.pressure:
+            self.pressure_collector = PressureCollector(os.path.join(proc_root, "pressure"))
+        self.interrupt_collector = None
+        if config.collectors.interrupts:
+            self.interrupt_collector = InterruptCollector(config.collectors.interrupt_top,
+                                                          os.path.join(proc_root, "interrupts"),
+                                                          os.path.join(proc_root, "softirqs"))
+        self.socket_collector = None
+        if config.collectors.sockets:
+            self.socket_collector = SocketCollector(config.collectors.socket_top, proc_root)
+        self.filesystem_collector = None
+        if config.collectors.filesystems:
+            self.filesystem_collector = FilesystemCollector(config.collectors.statvfs_interval,
+                                                            config.collectors.statvfs_timeout,
+                                                            os.path.join(proc_root, "self", "mountinfo"))
+        self.smaps_collector = None
+        if config.collectors.memory_accuracy:
+            self.smaps_collector = SmapsCollector(config.collectors.memory_accuracy_budget_ms,
+                                                  config.display.process_count, proc_root)
+        self.thread_collector = ThreadCollector(config.collectors.threads_pid, config.collectors.thread_top,
+                                                config.collectors.thread_workers, proc_root)
+        
+        # TODO: Initialize other collectors:
+        # - memory_collector = MemoryCollector()
+        # - disk_collector = DiskCollector()
+        # - network_collector = NetworkCollector()
+        # - process_collector = ProcessCollector()
+        
+        # Initialize processor
+        self.processor = ResourceProcessor(history_size=config.display.graph_history, proc_root=proc_root,
+                                           forecast_window=config.alerts.forecast_window,
+                                           time_to_full_alert=config.alerts.time_to_full_hours * 3600)
+        
+        self._listeners: List[Callable[[SampleDelta], None]] = []
+        
+        self.instrumentation = instrumentation
+        if instrumentation:
+            self._instrument(instrumentation)
+    
+    def _instrument(self, instrumentation: Instrumentation):
+        """Time every collector and the processor."""
+        collectors = {
+            "cpu": self.cpu_collector,
+            "cgroups": self.cgroup_collector,
+            "pressure": self.pressure_collector,
+            "interrupts": self.interrupt_collector,
+            "sockets": self.socket_collector,
+            "filesystems": self.filesystem_collector,
+            "smaps": self.smaps_collector,
+            "threads": self.thread_collector,
+        }
+        for name, collector in collectors.items():
+            if collector is None:
+                continue
+            instrumentation.instrument(collector, "collect", f"collect.{name}")
+            # Collectors scanning on their own thread only hand over the
+            # latest result from collect(); the scan is the real cost
+            if hasattr(collector, "scan"):
+                instrumentation.instrument(collector, "scan", f"scan.{name}")
+        instrumentation.instrument(self.processor, "process", "process")
+    
+    def add_listener(self, listener: Callable[[SampleDelta], None]):
+        """
+        Register a function to be called with every processed sample.
+        
+        Args:
+            listener: Function called with the delta of each sample
+        """
+        self._listeners.append(listener)
+    
+    def collect(self) -> Dict:
+        """
+        Collect raw data from every collector.
+        
+        Returns:
+            Dictionary of raw collector data, keyed by resource
+        """
+        # Collect system data
+        cpu_data = self.cpu_collector.collect()
+        
+        # TODO: Collect other system data:
+        # memory_data = memory_collector.collect()
+        # disk_data = disk_collector.collect()
+        # network_data = network_collector.collect()
+        # process_data = process_collector.collect()
+        
+        # For now, use placeholder data
+        memory_data = {"usage_percent": 45.2, "used": 4.5, "total": 15.8}
+        disk_data = {"usage_percent": 32.8, "read_speed": 15.6, "write_speed": 8.3}
+        network_data = {"download_speed": 1.2, "upload_speed": 0.4}
+        process_data = {"processes": []}
+        
+        # PSS, USS and swap for as many processes as the time budget allows
+        if self.smaps_collector:
+            process_data["memory"] = self.smaps_collector.collect()
+        
+        # Space usage comes from the filesystem collector
+        filesystem_data = self.filesystem_collector.collect() if self.filesystem_collector else {}
+        if filesystem_data.get("available"):
+            disk_data["usage_percent"] = filesystem_data["usage_percent"]
+            disk_data["partitions"] = filesystem_data["partitions"]
+        
+        cgroup_data = self.cgroup_collector.collect() if self.cgroup_collector else {}
+        pressure_data = self.pressure_collector.collect() if self.pressure_collector else {}
+        interrupt_data = self.interrupt_collector.collect() if self.interrupt_collector else {}
+        
+        # Socket tables are scanned on the collector's own thread; this
+        # returns the latest completed scan without waiting
+        socket_data = self.socket_collector.collect() if self.socket_collector else {}
+        
+        # Likewise for the threads of the selected process
+        thread_data = self.thread_collector.collect()
+        
+        return {
+            "cpu": cpu_data,
+            "memory": memory_data,
+            "disk": disk_data,
+            "network": network_data,
+            "processes": process_data,
+            "containers": cgroup_data,
+            "pressure": pressure_data,
+            "interrupts": interrupt_data,
+            "sockets": socket_data,
+            "threads": thread_data,
+            "timestamp": time.time(),
+        }
+    
+    def sample(self) -> SampleDelta:
+        """
+        Collect and process one sample, then notify listeners.
+        
+        Returns:
+            Delta from the previous sample; its `sample` attribute holds the
+            processed data
+        """
+        processed_data = self.processor.process(self.collect())
+        if self.instrumentation:
+            processed_data["instrumentation"] = self.instrumentation.snapshot()
+        delta = self.processor.delta(processed_data)
+        
+        for listener in self._listeners:
+            listener(delta)
+        
+        return delta
+    
+    def reset(self):
+        """Reset collector state and processor history."""
+        self.cpu_collector.reset()
+        if self.cgroup_collector:
+            self.cgroup_collector.reset()
+        if self.pressure_collector:
+            self.pressure_collector.reset()
+        if self.interrupt_collector:
+            self.interrupt_collector.reset()
+        if self.socket_collector:
+            self.socket_collector.reset()
+        if self.filesystem_collector:
+            self.filesystem_collector.reset()
+        if self.smaps_collector:
+            self.smaps_collector.reset()
+        self.thread_collector.reset()
+        self.processor.reset_history()
+        if self.instrumentation:
+            self.instrumentation.reset()
+    
+    def close(self):
+        """Release every descriptor and thread the collectors hold."""
+        collectors = [self.cpu_collector, self.cgroup_collector, self.pressure_collector,
+                      self.interrupt_collector, self.socket_collector, self.filesystem_collector,
+                      self.thread_collector]
+        for collector in collectors:
+            if collector is not None:
+                collector.close()
@@ -0,0 +1,255 @@
+"""
+Delta Module for Linux System Monitor
+
+This module defines the change-only contract between the resource processor
+and everything downstream of it: the dashboard, the exporters and the
+publishers. Rather than the whole processed sample, each consumer receives a
+SampleDelta naming the values that changed since the previous sample and the
+points appended to each history series. The diff is computed once per
+sample instead of once per consumer, and a consumer's work follows the
+amount of change rather than the size of the sample.
+
+Values are addressed by the dotted key paths of the transport protocol
+("cpu.load_avg.1min"). The full sample travels with every delta, so a
+consumer that needs the current state (a snapshot for a newly connected
+client) never has to rebuild it.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from monitor.collectors.records import Record
+from monitor.transport.protocol import EXCLUDED_KEYS, escape_key, flatten
+
+# Key holding each resource's history series in a processed sample
+HISTORY_KEY = "history"
+
+# Marks key paths that were not in the previous sample
+_MISSING = object()
+
+
+def appended_points(old: Optional[List], new: List, limit: Optional[int] = None) -> Optional[List]:
+    """
+    Find the points appended to a bounded history series.
+    
+    Args:
+        old: Previous series (None if there was none)
+        new: Current series
+        limit: Length the series is trimmed to (default: the length of `new`)
+        
+    Returns:
+        Points to append, or None if the series must be replaced whole
+        (first sample, reset, or not a continuation of `old`)
+    """
+    if old is None:
+        return None
+    if limit is None:
+        limit = len(new)
+    for shift in range(len(old) + 1):
+        kept = len(old) - shift
+        if kept > len(new) or new[:kept] != old[shift:]:
+            continue
+        points = new[kept:]
+        # Appending then trimming must reproduce `new`
+        if min(len(old) + len(points), limit) == len(new):
+            return points
+    return None
+
+
+def _is_subtree(value: Any) -> bool:
+    """Whether flatten descends into a value rather than keeping it as a leaf."""
+    return isinstance(value, (dict, Record)) and bool(value)
+
+
+def diff_subtrees(old: Dict, new: Dict, prefix: str, changed: Dict[str, Any], removed: List[str]):
+    """
+    Compare two nested samples, descending only into subtrees that differ.
+    
+    A subtree that is the same object as before, or compares equal, costs
+    one comparison however many leaves it holds. Paths and leaves are those
+    of flatten.
+    
+    Args:
+        old: Previous sample (or subtree)
+        new: Current sample (or subtree)
+        prefix: Key path prefix of both
+        changed: Receives key path -> value of leaves that changed or are new
+        removed: Receives key paths that are no longer present
+    """
+    for key, value in new.items():
+        if key in EXCLUDED_KEYS:
+            continue
+        previous = old.get(key, _MISSING)
+        if previous is value:
+            continue
+        path = prefix + (escape_key(key) if type(key) is not str or "." in key or "\\" in key else key)
+        if _is_subtree(value):
+            if _is_subtree(previous):
+                if previous != value:
+                    diff_subtrees(previous, value, path + ".", changed, removed)
+                continue
+            flatten(value, path + ".", changed)
+            if previous is not _MISSING:
+                removed.append(path)
+        elif previous != value:
+            changed[path] = value
+            if _is_subtree(previous):
+                removed.extend(flatten(previous, path + "."))
+    
+    for key in old:
+        if key in new or key in EXCLUDED_KEYS:
+            continue
+        path = prefix + escape_key(key)
+        if _is_subtree(old[key]):
+            removed.extend(flatten(old[key], path + "."))
+        else:
+            removed.append(path)
+
+
+class SampleDelta:
+    """
+    The changes from one processed sample to the next.
+    
+    Attributes:
+        sample: The full processed sample after the change (read-only)
+        changed: Key path -> new value of every leaf that changed or is new
+            (history series excluded)
+        removed: Key paths that are no longer present (history included)
+        appended: History path ("cpu.history") -> points appended
+        replaced: History path -> whole series, for series that are new or
+            did not continue the previous one
+        history: History path -> current series, for every series
+        sequence: Position in the tracker's stream of deltas
+        full: Whether the delta describes the whole sample (first sample,
+            reset, or resynchronization); a consumer then drops every path
+            not in `changed` and every series not in `replaced`
+    """
+    
+    def __init__(self, sample: Dict, changed: Dict[str, Any], removed: List[str],
+                 appended: Dict[str, List], replaced: Dict[str, List], history: Dict[str, List],
+                 sequence: int, full: bool = False):
+        """
+        Initialize the delta.
+        
+        Args:
+            sample: Processed sample after the change
+            changed: Changed leaves by key path
+            removed: Key paths that disappeared
+            appended: Points appended per history path
+            replaced: Whole series per history path that was replaced
+            history: Current series per history path
+            sequence: Position in the stream of deltas
+            full: Whether the delta describes the whole sample
+        """
+        self.sample = sample
+        self.changed = changed
+        self.removed = removed
+        self.appended = appended
+        self.replaced = replaced
+        self.history = history
+        self.sequence = sequence
+        self.full = full
+        
+        # Top-level resources touched by the change ("cpu", "alerts", ...)
+        self.sections = {path.split(".", 1)[0] for path in changed}
+        self.sections.update(path.split(".", 1)[0] for path in removed)
+        self.sections.update(path.split(".", 1)[0] for path in appended)
+        self.sections.update(path.split(".", 1)[0] for path in replaced)
+    
+    def __bool__(self) -> bool:
+        """Whether anything changed."""
+        return bool(self.sections) or self.full
+    
+    @property
+    def timestamp(self) -> float:
+        """Timestamp of the sample, or 0.0 if it has none."""
+        return self.sample.get("system", {}).get("timestamp", 0.0)
+    
+    def follows(self, sequence: int) -> bool:
+        """
+        Whether this delta applies on top of the one with a given sequence.
+        
+        A consumer that missed a delta (or started late) must treat the
+        next one as full, see as_full().
+        
+        Args:
+            sequence: Sequence of the last delta the consumer applied
+            
+        Returns:
+            True if the delta directly follows it
+        """
+        return self.sequence == sequence + 1
+    
+    def as_full(self) -> "SampleDelta":
+        """
+        Describe the same sample as a full delta.
+        
+        Returns:
+            Delta listing every leaf as changed and every series as replaced
+        """
+        if self.full:
+            return self
+        return SampleDelta(self.sample, flatten(self.sample), [], {}, dict(self.history), self.history,
+                           self.sequence, full=True)
+
+
+class DeltaTracker:
+    """
+    Turns a stream of processed samples into SampleDeltas.
+    
+    The previous sample is kept as it is and compared section by section,
+    descending only into the subtrees that changed (see diff_subtrees), so
+    an update costs about as much as the change rather than the sample.
+    This relies on samples not being modified once passed in: a subtree
+    updated in place would look unchanged.
+    """
+    
+    def __init__(self):
+        """Initialize a tracker whose first delta is full."""
+        self.sequence = 0
+        self._sample: Dict = {}
+        self._history: Dict[str, List] = {}
+        self._full = True
+    
+    def update(self, sample: Dict) -> SampleDelta:
+        """
+        Compare a new sample with the previous one.
+        
+        Args:
+            sample: Processed sample; it must not be modified afterwards,
+                since the next update compares against it
+                
+        Returns:
+            The delta from the previous sample
+        """
+        changed: Dict[str, Any] = {}
+        removed: List[str] = []
+        diff_subtrees(self._sample, sample, "", changed, removed)
+        
+        history = {
+            f"{section}.{HISTORY_KEY}": values[HISTORY_KEY]
+            for section, values in sample.items()
+            if isinstance(values, dict) and isinstance(values.get(HISTORY_KEY), list)
+        }
+        appended: Dict[str, List] = {}
+        replaced: Dict[str, List] = {}
+        for path, series in history.items():
+            points = None if self._full else appended_points(self._history.get(path), series)
+            if points is None:
+                replaced[path] = series
+            elif points:
+                appended[path] = points
+        if not self._full:
+            removed += [path for path in self._history if path not in history]
+        
+        self.sequence += 1
+        delta = SampleDelta(sample, changed, removed, appended, replaced, history, self.sequence, self._full)
+        self._sample = sample
+        self._history = history
+        self._full = False
+        return delta
+    
+    def reset(self):
+        """Make the next delta full, e.g. after statistics were reset."""
+        self._sample = {}
+        self._history = {}
+        self._full = True
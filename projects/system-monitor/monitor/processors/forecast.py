@@ -0,0 +1,160 @@
+"""
+Forecast Module for Linux System Monitor
+
+This module handles projecting when a filling resource (a filesystem,
+memory, swap) will run out. Usage alerts only fire once a resource is
+already nearly full; a trend fitted over the recent samples warns while
+there is still time to act.
+
+Every series is fitted by exponentially weighted least squares. The fit
+only needs five running sums per series, updated in constant time per
+sample, so no window of past samples is kept or refitted. All series are
+updated together as numpy arrays, so hundreds of filesystems cost a few
+array operations per sample rather than a loop.
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# Spread (weighted standard deviation) of sample times, in seconds, below
+# which a trend is not trusted
+MIN_FORECAST_SPAN = 60.0
+
+# Projections further out than this (seconds) are not reported
+FORECAST_HORIZON = 30 * 86400
+
+# A series that falls by more than this (in its own units) in one sample
+# was cleaned up; its fit restarts instead of averaging over the drop
+RESET_DROP = 5.0
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration as its two largest units ("3d 4h", "1h 35m", "12m").
+    
+    Args:
+        seconds: Duration in seconds
+        
+    Returns:
+        Short human-readable duration
+    """
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 1440)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+class TrendForecaster:
+    """
+    Projects the time until each of a set of percentage series reaches 100.
+    
+    A sample's weight halves every `window * ln 2` seconds, so the fit
+    follows roughly the last `window` seconds and adapts when the fill rate
+    changes. Series are identified by key; a series missing from an update
+    (an unmounted or unresponsive filesystem) is dropped and starts over
+    when it returns.
+    """
+    
+    def __init__(self, window: float, capacity: float = 100.0):
+        """
+        Initialize the forecaster.
+        
+        Args:
+            window: Time constant of the exponential weighting, in seconds
+            capacity: Value at which a series counts as full
+        """
+        self.window = window
+        self.capacity = capacity
+        self._keys: tuple = ()
+        self._sums = np.zeros((5, 0))
+        self._values = np.zeros(0)
+        self._timestamp: Optional[float] = None
+    
+    def _remap(self, keys: tuple):
+        """Carry the sums of the series still present over to a new key set."""
+        columns = {key: column for column, key in enumerate(self._keys)}
+        sums = np.zeros((5, len(keys)))
+        values = np.full(len(keys), np.nan)
+        kept = [(column, columns[key]) for column, key in enumerate(keys) if key in columns]
+        if kept:
+            new, old = np.array(kept).T
+            sums[:, new] = self._sums[:, old]
+            values[new] = self._values[old]
+        self._keys = keys
+        self._sums = sums
+        self._values = values
+    
+    def update(self, timestamp: float, values: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """
+        Add one sample of every series and project their time to full.
+        
+        Args:
+            timestamp: Sample time in seconds
+            values: Current value of each series, by key
+            
+        Returns:
+            Seconds until each series reaches capacity, by key; None if it
+            is not filling, its trend is not yet established, or it would
+            take longer than FORECAST_HORIZON
+        """
+        keys = tuple(values)
+        if keys != self._keys:
+            self._remap(keys)
+        if not keys:
+            self._timestamp = timestamp
+            return {}
+        current = np.fromiter(values.values(), dtype=np.float64, count=len(keys))
+        
+        # Running sums of the weights, t, t², y and t·y, with t the sample
+        # time relative to the latest sample (rows are views into _sums)
+        sums = self._sums
+        weight, time, time_squared, value, time_value = sums
+        elapsed = 0.0 if self._timestamp is None else timestamp - self._timestamp
+        if elapsed < 0:
+            # The clock went backwards; the sample times no longer line up
+            sums[:] = 0
+        elif elapsed > 0:
+            # Move the time origin to the new sample, then age the old ones
+            time_squared -= elapsed * (2 * time - elapsed * weight)
+            time -= elapsed * weight
+            time_value -= elapsed * value
+            sums *= math.exp(-elapsed / self.window)
+        self._timestamp = timestamp
+        
+        with np.errstate(invalid="ignore"):
+            sums[:, current < self._values - RESET_DROP] = 0
+        self._values = current
+        
+        # The new sample sits at t = 0, so it only adds to weight and value
+        weight += 1
+        value += current
+        
+        spread = weight * time_squared - time * time
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (weight * time_value - time * value) / spread
+            seconds = (self.capacity - current) / slope
+        seconds[(spread < (MIN_FORECAST_SPAN * weight) ** 2) | (slope <= 0) | (seconds > FORECAST_HORIZON)] = np.nan
+        seconds[current >= self.capacity] = 0.0
+        
+        # Two significant digits: the projection is not more precise than
+        # that, and the value then stays unchanged between most samples
+        # instead of being sent as a change every time
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = 10.0 ** (np.floor(np.log10(seconds)) - 1)
+            seconds = np.where(seconds > 0, np.round(seconds / scale) * scale, seconds)
+        
+        return {key: None if math.isnan(projected) else projected
+                for key, projected in zip(keys, seconds.tolist())}
+    
+    def reset(self):
+        """Forget every series."""
+        self._keys = ()
+        self._sums = np.zeros((5, 0))
+        self._values = np.zeros(0)
+        self._timestamp = None
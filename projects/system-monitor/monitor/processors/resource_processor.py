@@ -4,9 +4,18 @@ Resource Processor Module for Linux System Monitor
 This module processes raw data from collectors and prepares it for visualization.
 """
 
-import time
-from typing import Dict, List, Optional, Union
 import collections
+import os
+import time
+from typing import Dict, List, Optional
+
+from monitor.collectors.records import CPUSample
+from monitor.collectors.topology import TopologyAggregator
+from monitor.processors.delta import DeltaTracker, SampleDelta
+from monitor.processors.forecast import TrendForecaster, format_duration
+
+# Mean usage at which a NUMA node counts as saturated
+NODE_SATURATION_PERCENT = 90
 
 
 class ResourceProcessor:
@@ -20,14 +29,22 @@ class ResourceProcessor:
     - Detecting anomalies and setting alert states
     """
     
-    def __init__(self, history_size: int = 120):
+    def __init__(self, history_size: int = 120, proc_root: str = "/proc",
+                 forecast_window: float = 1800.0, time_to_full_alert: float = 7200.0):
         """
         Initialize the resource processor.
         
         Args:
             history_size: Number of historical data points to maintain (default: 120)
+            proc_root: Root of the proc filesystem, for uptime and hostname
+            forecast_window: Seconds of recent samples the time-to-full
+                trends of filesystems, memory and swap follow
+            time_to_full_alert: Raise an alert when a filesystem, memory or
+                swap is projected to fill within this many seconds (0 = never)
         """
         self.history_size = history_size
+        self.proc_root = proc_root
+        self.time_to_full_alert = time_to_full_alert
         
         # Initialize history for different metrics
         self.cpu_history = collections.deque(maxlen=history_size)
@@ -37,6 +54,16 @@ class ResourceProcessor:
         
         # Initialize timestamps
         self.last_processed_time = time.time()
+        
+        # Aggregator for the current CPU topology, keyed by the identity of
+        # the collector's (static) groups and the core count
+        self._topology_cache = (None, None)
+        
+        # Diffs consecutive processed samples for the consumers downstream
+        self.delta_tracker = DeltaTracker()
+        
+        # Usage trends of every filesystem, memory and swap, fitted together
+        self.forecaster = TrendForecaster(forecast_window)
     
     def process(self, data: Dict) -> Dict:
         """
@@ -53,30 +80,61 @@ class ResourceProcessor:
         self.last_processed_time = current_time
         
         # Process CPU data
+        cpu = self._process_cpu_data(data.get("cpu", {}), data.get("pressure", {}))
+        memory = self._process_memory_data(data.get("memory", {}))
+        disk = self._process_disk_data(data.get("disk", {}), time_delta)
+        forecasts = self._forecast(memory, disk, data.get("timestamp", current_time))
         processed_data = {
-            "cpu": self._process_cpu_data(data.get("cpu", {})),
-            "memory": self._process_memory_data(data.get("memory", {})),
-            "disk": self._process_disk_data(data.get("disk", {}), time_delta),
+            "cpu": cpu,
+            "memory": memory,
+            "disk": disk,
             "network": self._process_network_data(data.get("network", {}), time_delta),
             "processes": self._process_process_data(data.get("processes", {})),
+            "containers": self._process_container_data(data.get("containers", {})),
+            "pressure": self._process_pressure_data(data.get("pressure", {})),
+            "interrupts": self._process_interrupt_data(data.get("interrupts", {})),
+            "sockets": self._process_socket_data(data.get("sockets", {})),
+            "threads": self._process_thread_data(data.get("threads", {})),
             "system": {
                 "timestamp": data.get("timestamp", current_time),
                 "uptime": self._get_uptime(),
                 "hostname": self._get_hostname(),
             },
-            "alerts": self._detect_alerts(data),
+            "alerts": self._detect_alerts(data, cpu, forecasts),
         }
         
         return processed_data
     
-    def _process_cpu_data(self, cpu_data: Dict) -> Dict:
-        """Process CPU data and update history."""
+    def delta(self, processed_data: Dict) -> SampleDelta:
+        """
+        Describe a processed sample as the change from the previous one.
+        
+        This is what the dashboard, the exporters and the publishers
+        consume, so the comparison runs once per sample however many
+        consumers there are.
+        
+        Args:
+            processed_data: Sample returned by process (plus any sections
+                added afterwards); it must not be modified afterwards
+            
+        Returns:
+            Changed values and appended history points since the previous call
+        """
+        return self.delta_tracker.update(processed_data)
+    
+    def _process_cpu_data(self, cpu_data: CPUSample, pressure_data: Dict) -> Dict:
+        """
+        Process CPU data and update history.
+        
+        The collector's records (load average, frequency, temperature) are
+        passed through as they are rather than copied into new dicts.
+        """
         if not cpu_data:
             # Return placeholder if no data available
             return {"usage_percent": 0, "per_core_percent": [], "history": list(self.cpu_history)}
         
         # Add current CPU usage to history
-        self.cpu_history.append(cpu_data.get("usage_percent", 0))
+        self.cpu_history.append(cpu_data.usage_percent)
         
         # Calculate CPU time spent in each state
         cpu_states = {
@@ -87,18 +145,59 @@ class ResourceProcessor:
             "other": 0,
         }
         
+        # Runnable tasks waiting for a CPU are the direct signal of a CPU
+        # bottleneck; the usage/load heuristic is only a fallback for
+        # kernels without PSI
+        if pressure_data.get("available"):
+            potential_bottleneck = "cpu" in pressure_data.get("bottleneck", [])
+        else:
+            potential_bottleneck = cpu_data.potential_bottleneck
+        
+        topology = self._aggregate_topology(cpu_data.groups, cpu_data.per_core_percent)
+        nodes = topology.get("node", {})
+        saturated_nodes = [
+            node for node, mean in zip(nodes.get("ids", []), nodes.get("mean", []))
+            if mean >= NODE_SATURATION_PERCENT
+        ] if len(nodes.get("ids", [])) > 1 else []
+        
         # Return processed CPU data
         return {
-            "usage_percent": cpu_data.get("usage_percent", 0),
-            "per_core_percent": cpu_data.get("per_core_percent", []),
-            "core_count": len(cpu_data.get("per_core_percent", [])),
-            "load_avg": cpu_data.get("load_avg", {}),
+            "usage_percent": cpu_data.usage_percent,
+            "per_core_percent": cpu_data.per_core_percent,
+            "core_count": len(cpu_data.per_core_percent),
+            "load_avg": cpu_data.load_avg,
             "states": cpu_states,
             "history": list(self.cpu_history),
-            "frequency": cpu_data.get("frequency", {}),
-            "temperature": cpu_data.get("temperature", None),
+            "frequency": cpu_data.frequency,
+            "temperature": cpu_data.temperature,
+            "groups": cpu_data.groups,
+            "topology": topology,
+            "saturated_nodes": saturated_nodes,
+            "potential_bottleneck": potential_bottleneck,
         }
     
+    def _aggregate_topology(self, groups: Dict, per_core: List[float]) -> Dict:
+        """
+        Aggregate per-core usage to sockets, NUMA nodes and physical cores.
+        
+        The index arrays are only rebuilt when the topology changes.
+        
+        Args:
+            groups: Socket, node and core ids per logical CPU from the collector
+            per_core: Per-core usage percentages
+            
+        Returns:
+            Per-level ids, CPU counts, mean and max usage (see
+            TopologyAggregator.aggregate)
+        """
+        if not groups or not per_core:
+            return {}
+        
+        key = (id(groups), len(per_core))
+        if self._topology_cache[0] != key:
+            self._topology_cache = (key, TopologyAggregator(groups, len(per_core)))
+        return self._topology_cache[1].aggregate(per_core)
+    
     def _process_memory_data(self, memory_data: Dict) -> Dict:
         """Process memory data and update history."""
         if not memory_data:
@@ -148,6 +247,42 @@ class ResourceProcessor:
             "history": list(self.disk_io_history),
         }
     
+    def _forecast(self, memory: Dict, disk: Dict, timestamp: float) -> Dict[str, Optional[float]]:
+        """
+        Project when each filesystem, memory and swap will be full.
+        
+        The projections are added to the processed data: time_to_full and
+        swap_time_to_full in memory, and time_to_full in every measured
+        partition (seconds, or None when not filling).
+        
+        Args:
+            memory: Processed memory data
+            disk: Processed disk data
+            timestamp: Sample time
+            
+        Returns:
+            Seconds to full by series: "memory", "swap" and each mountpoint
+        """
+        values = {}
+        if memory.get("total"):
+            values["memory"] = memory["usage_percent"]
+        if memory.get("swap_total"):
+            values["swap"] = memory["swap_percent"]
+        partitions = disk.get("partitions", {})
+        for mountpoint, partition in partitions.items():
+            if partition.get("responsive", True) and "usage_percent" in partition:
+                values[mountpoint] = partition["usage_percent"]
+        
+        forecasts = self.forecaster.update(timestamp, values)
+        
+        if "total" in memory:
+            memory["time_to_full"] = forecasts.get("memory")
+            memory["swap_time_to_full"] = forecasts.get("swap")
+        for mountpoint, partition in partitions.items():
+            if "usage_percent" in partition:
+                partition["time_to_full"] = forecasts.get(mountpoint)
+        return forecasts
+    
     def _process_network_data(self, network_data: Dict, time_delta: float) -> Dict:
         """Process network data and update history."""
         if not network_data:
@@ -186,29 +321,152 @@ class ResourceProcessor:
             reverse=True
         )
         
+        # With memory accuracy on, PSS replaces RSS in the memory share of
+        # every process that has been measured, so forked workers sharing
+        # pages are no longer each charged for all of them
+        memory = process_data.get("memory", {"available": False})
+        if memory.get("available"):
+            by_pid = {entry["pid"]: entry for entry in memory.get("processes", [])}
+            for process in processes:
+                entry = by_pid.get(process.get("pid"))
+                if entry is not None:
+                    process["memory_percent"] = entry["memory_percent"]
+                    process["pss"] = entry["pss"]
+                    process["uss"] = entry["uss"]
+                    process["swap"] = entry["swap"]
+                    process["memory_age"] = entry["age"]
+        
         # Return processed process data
         return {
             "processes": processes,
             "total": len(processes),
+            "memory": memory,
+        }
+    
+    def _process_container_data(self, container_data: Dict) -> Dict:
+        """Process per-cgroup data."""
+        if not container_data.get("available"):
+            # Return placeholder if cgroup v2 is not available
+            return {"available": False, "count": 0, "cgroups": []}
+        
+        # Sort cgroups by CPU usage (descending)
+        cgroups = sorted(
+            container_data.get("cgroups", []),
+            key=lambda c: c.get("cpu_percent", 0),
+            reverse=True
+        )
+        
+        return {
+            "available": True,
+            "count": container_data.get("count", 0),
+            "cgroups": cgroups,
+        }
+    
+    def _process_pressure_data(self, pressure_data: Dict) -> Dict:
+        """Process pressure stall data."""
+        if not pressure_data.get("available"):
+            # Return placeholder if PSI is not available
+            return {"available": False, "bottleneck": []}
+        
+        processed = {"available": True, "bottleneck": pressure_data.get("bottleneck", [])}
+        for resource in ("cpu", "memory", "io"):
+            lines = pressure_data.get(resource, {})
+            processed[resource] = {
+                f"{kind}_{field}": lines.get(kind, {}).get(field, 0)
+                for kind in ("some", "full")
+                for field in ("avg10", "avg60", "avg300", "stall_percent")
+            }
+        
+        return processed
+    
+    def _process_interrupt_data(self, interrupt_data: Dict) -> Dict:
+        """Process per-CPU interrupt and softirq data."""
+        if not interrupt_data.get("available"):
+            # Return placeholder if the interrupt tables cannot be read
+            return {"available": False, "top_irqs": [], "top_cpus": []}
+        
+        return {
+            "available": True,
+            "cpu_count": len(interrupt_data.get("cpus", [])),
+            "irq_rate": interrupt_data.get("irq_rate", 0),
+            "softirq_rate": interrupt_data.get("softirq_rate", 0),
+            "top_irqs": interrupt_data.get("top_irqs", []),
+            "top_cpus": interrupt_data.get("top_cpus", []),
+            "softirqs": interrupt_data.get("softirqs", {}),
         }
     
-    def _detect_alerts(self, data: Dict) -> Dict:
-        """Detect alert conditions based on resource usage."""
+    def _process_socket_data(self, socket_data: Dict) -> Dict:
+        """Process socket table data."""
+        if not socket_data.get("available") or socket_data.get("pending"):
+            # Return placeholder until the first socket scan completes
+            return {
+                "available": socket_data.get("available", False),
+                "pending": socket_data.get("pending", False),
+                "listening": [],
+                "top_peers": [],
+                "top_processes": [],
+            }
+        
+        return {
+            "available": True,
+            "pending": False,
+            "tcp": socket_data.get("tcp", {}),
+            "udp": socket_data.get("udp", {}),
+            "unix": socket_data.get("unix", {}),
+            "listening": socket_data.get("listening", []),
+            "top_peers": socket_data.get("top_peers", []),
+            "top_processes": socket_data.get("top_processes", []),
+            "scan_duration": socket_data.get("duration", 0),
+        }
+    
+    def _process_thread_data(self, thread_data: Dict) -> Dict:
+        """Process per-thread data of the selected process."""
+        if not thread_data.get("available") or thread_data.get("pending"):
+            # Return placeholder until a process is selected and scanned
+            return {
+                "available": thread_data.get("available", False),
+                "pending": thread_data.get("pending", False),
+                "pid": thread_data.get("pid", 0),
+                "threads": [],
+            }
+        
+        return {
+            "available": True,
+            "pending": False,
+            "pid": thread_data.get("pid", 0),
+            "name": thread_data.get("name", ""),
+            "exited": thread_data.get("exited", False),
+            "thread_count": thread_data.get("thread_count", 0),
+            "cpu_percent": thread_data.get("cpu_percent", 0),
+            "threads": thread_data.get("threads", []),
+            "scan_duration": thread_data.get("duration", 0),
+        }
+    
+    def _detect_alerts(self, data: Dict, cpu: Dict, forecasts: Dict[str, Optional[float]]) -> Dict:
+        """Detect alert conditions based on resource usage and usage trends."""
         alerts = {}
         
         # CPU alerts
-        cpu_data = data.get("cpu", {})
-        if cpu_data.get("usage_percent", 0) > 90:
+        cpu_usage = cpu["usage_percent"]
+        if cpu_usage > 90:
             alerts["cpu"] = {
                 "level": "critical",
                 "message": "CPU usage over 90%",
             }
-        elif cpu_data.get("usage_percent", 0) > 75:
+        elif cpu_usage > 75:
             alerts["cpu"] = {
                 "level": "warning",
                 "message": "CPU usage over 75%",
             }
         
+        # A saturated NUMA node disappears in the machine-wide average
+        if "cpu" not in alerts and cpu.get("saturated_nodes"):
+            nodes = ", ".join(str(node) for node in cpu["saturated_nodes"])
+            alerts["cpu"] = {
+                "level": "warning",
+                "message": f"NUMA node {nodes} over {NODE_SATURATION_PERCENT}%",
+            }
+        
         # Memory alerts
         memory_data = data.get("memory", {})
         if memory_data.get("usage_percent", 0) > 90:
@@ -235,12 +493,42 @@ class ResourceProcessor:
                 "message": "Disk usage over 80%",
             }
         
+        # Exhaustion alerts: a filesystem, memory or swap projected to fill
+        # soon, when no usage alert is already raised for the resource
+        if self.time_to_full_alert > 0:
+            soonest = {}
+            for series, seconds in forecasts.items():
+                if seconds is None or seconds >= self.time_to_full_alert:
+                    continue
+                resource = series if series in ("memory", "swap") else "disk"
+                if resource not in soonest or seconds < soonest[resource][1]:
+                    soonest[resource] = (series, seconds)
+            for resource, (series, seconds) in soonest.items():
+                if resource in alerts:
+                    continue
+                label = {"memory": "Memory", "swap": "Swap"}.get(resource, f"Disk {series}")
+                alerts[resource] = {
+                    "level": "critical" if seconds < self.time_to_full_alert / 4 else "warning",
+                    "message": f"{label} projected full in {format_duration(seconds)}",
+                }
+        
+        # Pressure alerts: tasks stalled on memory or I/O, when no usage
+        # alert is already raised for the resource
+        pressure_data = data.get("pressure", {})
+        for resource, label in (("memory", "Memory"), ("io", "I/O")):
+            some_avg10 = pressure_data.get(resource, {}).get("some", {}).get("avg10", 0)
+            if resource not in alerts and some_avg10 > 10:
+                alerts[resource] = {
+                    "level": "critical" if some_avg10 > 40 else "warning",
+                    "message": f"{label} stalls over {some_avg10:.0f}% of the time",
+                }
+        
         return alerts
     
     def _get_uptime(self) -> float:
         """Get system uptime in seconds."""
         try:
-            with open('/proc/uptime', 'r') as f:
+            with open(os.path.join(self.proc_root, 'uptime'), 'r') as f:
                 uptime_seconds = float(f.readline().split()[0])
             return uptime_seconds
         except:
@@ -249,7 +537,7 @@ class ResourceProcessor:
     def _get_hostname(self) -> str:
         """Get system hostname."""
         try:
-            with open('/proc/sys/kernel/hostname', 'r') as f:
+            with open(os.path.join(self.proc_root, 'sys', 'kernel', 'hostname'), 'r') as f:
                 return f.read().strip()
         except:
             return "unknown"
@@ -260,3 +548,5 @@ class ResourceProcessor:
         self.memory_history.clear()
         self.disk_io_history.clear()
         self.network_history.clear()
+        self.delta_tracker.reset()
+        self.forecaster.reset()
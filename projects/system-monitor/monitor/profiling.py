@@ -0,0 +1,208 @@
+"""
+Profiling Module for Linux System Monitor
+
+This module profiles the monitor while it runs normally, so a profile can be
+taken on the host where a problem shows up and attached to a ticket.
+
+Two profilers are available, chosen by the output file name:
+- A sampling profiler (the default): a SIGPROF timer samples the main
+  thread's stack every few milliseconds of CPU time and the stacks are
+  written in the collapsed format read by flamegraph.pl, inferno and
+  speedscope.
+- cProfile, for files ending in .prof or .pstats, written as pstats data
+  for snakeviz, gprof2dot or `python -m pstats`.
+
+Both tag their samples with the pipeline stage running at the time
+(collect, process or render).
+"""
+
+import abc
+import cProfile
+import functools
+import os
+import signal
+import sys
+from typing import Dict, List, Optional
+
+# CPU seconds between two samples of the sampling profiler
+SAMPLE_INTERVAL = 0.005
+
+# Stage recorded while no tagged stage runs (input handling, the event loop)
+OTHER_STAGE = "other"
+
+# File extensions written by cProfile instead of the sampling profiler
+PSTATS_EXTENSIONS = (".prof", ".pstats")
+
+
+class StageProfiler(abc.ABC):
+    """
+    Base class of the profilers: tracks which pipeline stage is running.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the profiler.
+        
+        Args:
+            path: File the profile is written to
+        """
+        self.path = path
+        self.stage = OTHER_STAGE
+    
+    def tag(self, obj, method_name: str, stage: str):
+        """
+        Attribute everything run by a method of one object to a stage.
+        
+        The wrapper's code is renamed after the stage, so the stage also
+        shows up as a frame ("[collect]") in call graphs and pstats output.
+        
+        Args:
+            obj: Object whose method is tagged (only this instance is affected)
+            method_name: Name of the method
+            stage: Stage name
+        """
+        method = getattr(obj, method_name)
+        
+        def tagged(*args, **kwargs):
+            previous, self.stage = self.stage, stage
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.stage = previous
+        
+        tagged.__code__ = tagged.__code__.replace(co_name=f"[{stage}]", co_qualname=f"[{stage}]")
+        setattr(obj, method_name, functools.wraps(method)(tagged))
+    
+    @abc.abstractmethod
+    def start(self):
+        """Start profiling."""
+    
+    @abc.abstractmethod
+    def stop(self):
+        """Stop profiling."""
+    
+    @abc.abstractmethod
+    def write(self):
+        """Write the profile to its file."""
+
+
+class SamplingProfiler(StageProfiler):
+    """
+    Statistical profiler driven by a SIGPROF interval timer.
+    
+    The timer counts CPU time, so an idle monitor takes no samples. Each
+    sample walks the main thread's stack once; collector worker threads are
+    not sampled.
+    """
+    
+    def __init__(self, path: str, interval: float = SAMPLE_INTERVAL):
+        """
+        Initialize the profiler.
+        
+        Args:
+            path: File the collapsed stacks are written to
+            interval: CPU seconds between two samples
+        """
+        super().__init__(path)
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self._labels: Dict[object, str] = {}
+        self._previous_handler = None
+    
+    def start(self):
+        """Install the signal handler and start the timer."""
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        # Restart system calls the signal lands in, in every thread
+        signal.siginterrupt(signal.SIGPROF, False)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+    
+    def stop(self):
+        """Stop the timer and restore the previous signal handler."""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+    
+    def _label(self, code) -> str:
+        """Name a code object as a flame graph frame, cached per code object."""
+        label = self._labels.get(code)
+        if label is None:
+            name = f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            # ';' separates frames in the collapsed format
+            label = self._labels[code] = name.replace(";", ":")
+        return label
+    
+    def _sample(self, signum, frame):
+        """Record the interrupted stack under the running stage."""
+        frames: List[str] = []
+        while frame is not None:
+            frames.append(self._label(frame.f_code))
+            frame = frame.f_back
+        frames.append(self.stage)
+        stack = ";".join(reversed(frames))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+    
+    def write(self):
+        """Write one "stage;outer;...;inner count" line per distinct stack."""
+        with open(self.path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class CProfileProfiler(StageProfiler):
+    """
+    Deterministic profiler writing pstats data.
+    
+    Exact call counts at a higher overhead than sampling; the stages appear
+    as the "[collect]", "[process]" and "[render]" functions.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the profiler.
+        
+        Args:
+            path: File the pstats data is written to
+        """
+        super().__init__(path)
+        self.profile = cProfile.Profile()
+    
+    def start(self):
+        """Start profiling the main thread."""
+        self.profile.enable()
+    
+    def stop(self):
+        """Stop profiling."""
+        self.profile.disable()
+    
+    def write(self):
+        """Write the pstats data."""
+        self.profile.dump_stats(self.path)
+
+
+def create_profiler(path: str) -> StageProfiler:
+    """
+    Create the profiler matching an output file name.
+    
+    Args:
+        path: Output file; .prof and .pstats select cProfile, anything else
+            collapsed stacks from the sampling profiler
+            
+    Returns:
+        Profiler (not yet started)
+    """
+    path = os.path.expanduser(path)
+    if path.endswith(PSTATS_EXTENSIONS):
+        return CProfileProfiler(path)
+    return SamplingProfiler(path)
+
+
+def _short_path(filename: str) -> str:
+    """Shorten a source file name to its path below the sys.path entry holding it."""
+    best: Optional[str] = None
+    for entry in sys.path:
+        if entry and filename.startswith(entry.rstrip(os.sep) + os.sep):
+            relative = filename[len(entry.rstrip(os.sep)) + 1:]
+            if best is None or len(relative) < len(best):
+                best = relative
+    return best or filename
@@ -0,0 +1,447 @@
+"""
+Recorder Module for Linux System Monitor
+
+This module handles short high-frequency captures (10-1000 Hz) for chasing
+latency spikes that a 1 s dashboard averages away. Only a few cheap
+sources are read, each through a file descriptor held open and re-read
+with pread, on a deadline scheduler. Samples go into a preallocated buffer
+holding one chunk (at most CHUNK_BYTES, or FLUSH_INTERVAL seconds of
+samples), which is appended to the file whenever it fills. Memory use does
+not grow with the length of a capture, and a crash loses at most the
+samples of the chunk being filled. A capture that fits in one chunk is
+written once, at the end, so short high-rate captures do no I/O while
+sampling; longer ones show each write in their lateness statistics.
+
+A recording is a small JSON header followed by fixed-size rows of
+little-endian float64, so it can be memory-mapped column by column:
+
+    MAGIC | header length (uint32) | JSON header, padded to 8 bytes | rows
+
+The header lists the columns, the sample rate and the capture statistics.
+It is written with room to spare before the first row and rewritten in
+place when the capture ends; a recording whose writer died before that has
+no row count or statistics, and its complete rows are counted from the
+file size. Counters are stored raw (cumulative), so rates are computed afterwards
+over any window. CPU times in /proc/stat have USER_HZ (normally 100 Hz)
+resolution; PSI totals are in microseconds.
+"""
+
+import gc
+import json
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from monitor.collectors.pressure import parse_pressure
+
+# First bytes of every recording
+RECORD_MAGIC = b"LSMREC1\n"
+
+# File name extension of recordings in the log directory
+RECORD_EXTENSION = ".rec"
+
+# Sources that can be recorded, in column order
+SOURCES = ("cpu", "pressure", "memory")
+
+# Sleep until this many seconds before a deadline, then spin, so wakeup
+# latency of the sleep does not show up as jitter
+SPIN_WINDOW = 0.0005
+
+# Largest pread of a proc file
+READ_SIZE = 1 << 20
+
+# Largest chunk of rows buffered before it is appended to the file
+CHUNK_BYTES = 4 * 1024 * 1024
+
+# Seconds of samples buffered at most, bounding what a crash loses
+FLUSH_INTERVAL = 60.0
+
+# Spaces reserved after the header written at the start, for the row count
+# and statistics added when the capture ends
+HEADER_RESERVE = 1024
+
+# Lateness histogram bins (seconds), each 1% wider than the one before, so
+# lateness percentiles of any capture length are exact to 1%
+LATENESS_EDGES = np.concatenate(([0.0], np.geomspace(1e-7, 10.0, 1853)))
+
+
+class StatSource:
+    """
+    Scheduler counters from /proc/stat: busy and total jiffies overall and
+    per CPU, context switches, and runnable and blocked tasks.
+    """
+    
+    def __init__(self, proc_root: str):
+        """
+        Open /proc/stat and derive the columns from its CPU lines.
+        
+        Args:
+            proc_root: Directory the proc filesystem is read from
+        """
+        self.fd = os.open(os.path.join(proc_root, "stat"), os.O_RDONLY)
+        cpus = [line.split()[0].decode() for line in os.pread(self.fd, READ_SIZE, 0).splitlines()
+                if line.startswith(b"cpu") and line[3:4] != b" "]
+        self.columns = ["cpu.busy", "cpu.total"]
+        for cpu in cpus:
+            self.columns += [f"{cpu}.busy", f"{cpu}.total"]
+        self.columns += ["ctxt", "procs_running", "procs_blocked"]
+    
+    def read(self) -> List[float]:
+        """Read one row of values, in column order."""
+        values = []
+        tail = {}
+        for line in os.pread(self.fd, READ_SIZE, 0).splitlines():
+            if line.startswith(b"cpu"):
+                fields = line.split()[1:9]
+                total = sum(map(int, fields))
+                # idle and iowait are fields 4 and 5
+                values += [total - int(fields[3]) - int(fields[4]), total]
+            elif line.startswith((b"ctxt", b"procs_")):
+                name, value = line.split()
+                tail[name] = float(value)
+        values += [tail.get(b"ctxt", 0.0), tail.get(b"procs_running", 0.0), tail.get(b"procs_blocked", 0.0)]
+        return values
+    
+    def close(self):
+        """Close /proc/stat."""
+        os.close(self.fd)
+
+
+class PressureSource:
+    """Cumulative PSI stall time (microseconds) per resource, some and full."""
+    
+    def __init__(self, proc_root: str):
+        """
+        Open the PSI files that exist.
+        
+        Args:
+            proc_root: Directory the proc filesystem is read from
+        """
+        self.fds: Dict[str, int] = {}
+        for resource in ("cpu", "memory", "io"):
+            try:
+                self.fds[resource] = os.open(os.path.join(proc_root, "pressure", resource), os.O_RDONLY)
+            except OSError:
+                continue
+        self.columns = [f"pressure.{resource}.{kind}" for resource in self.fds for kind in ("some", "full")]
+    
+    def read(self) -> List[float]:
+        """Read one row of values, in column order."""
+        values = []
+        for fd in self.fds.values():
+            lines = parse_pressure(os.pread(fd, 256, 0))
+            values += [float(lines.get(kind, {}).get("total", 0)) for kind in ("some", "full")]
+        return values
+    
+    def close(self):
+        """Close the PSI files."""
+        for fd in self.fds.values():
+            os.close(fd)
+
+
+class MemorySource:
+    """Available and free memory, and free and total swap, in bytes from /proc/meminfo."""
+    
+    FIELDS = {b"MemAvailable:": "memory.available", b"MemFree:": "memory.free", b"SwapFree:": "swap.free",
+              b"SwapTotal:": "swap.total"}
+    
+    def __init__(self, proc_root: str):
+        """
+        Open /proc/meminfo.
+        
+        Args:
+            proc_root: Directory the proc filesystem is read from
+        """
+        self.fd = os.open(os.path.join(proc_root, "meminfo"), os.O_RDONLY)
+        self.columns = list(self.FIELDS.values())
+    
+    def read(self) -> List[float]:
+        """Read one row of values, in column order."""
+        found = {}
+        for line in os.pread(self.fd, READ_SIZE, 0).splitlines():
+            fields = line.split()
+            if fields and fields[0] in self.FIELDS:
+                found[fields[0]] = float(fields[1]) * 1024
+        return [found.get(key, 0.0) for key in self.FIELDS]
+    
+    def close(self):
+        """Close /proc/meminfo."""
+        os.close(self.fd)
+
+
+SOURCE_CLASSES = {"cpu": StatSource, "pressure": PressureSource, "memory": MemorySource}
+
+
+class Recorder:
+    """
+    Samples the chosen sources at a fixed rate, appending them to a file
+    chunk by chunk.
+    
+    Deadlines are absolute (start + n * period), so a late sample does not
+    push back the ones after it. When a deadline has already passed by a
+    whole period, the samples in between are skipped and counted as missed
+    rather than taken in a burst.
+    
+    Capture statistics are kept as running sums and a lateness histogram,
+    so they need no more memory for a month than for a second.
+    """
+    
+    def __init__(self, hz: float, duration: float, sources: List[str], proc_root: str = "/proc",
+                 chunk_bytes: int = CHUNK_BYTES):
+        """
+        Open the sources and allocate the buffer.
+        
+        Args:
+            hz: Samples per second
+            duration: Seconds to record
+            sources: Names from SOURCES
+            proc_root: Directory the proc filesystem is read from
+            chunk_bytes: Largest chunk buffered before it is written
+        """
+        self.hz = hz
+        self.period = 1.0 / hz
+        self.capacity = max(1, int(round(hz * duration)))
+        self.sources = []
+        try:
+            for name in SOURCES:
+                if name in sources:
+                    self.sources.append(SOURCE_CLASSES[name](proc_root))
+        except OSError:
+            self.close()
+            raise
+        
+        # "t" is the time of the sample since the start, "lateness" how far
+        # after its deadline it was taken
+        self.columns = ["t", "lateness"] + [column for source in self.sources for column in source.columns]
+        chunk_rows = min(chunk_bytes // (8 * len(self.columns)), int(round(hz * FLUSH_INTERVAL)))
+        self.buffer = np.zeros((max(1, min(self.capacity, chunk_rows)), len(self.columns)), dtype="<f8")
+        self.rows = 0
+        self.missed = 0
+        self.start_time = 0.0
+        self.path: Optional[str] = None
+        self._file = None
+        self._header_length = 0
+        
+        # Running capture statistics
+        self._last_time: Optional[float] = None
+        self._interval_sum = 0.0
+        self._interval_squares = 0.0
+        self._lateness_counts = np.zeros(len(LATENESS_EDGES) - 1, dtype=np.int64)
+        self._lateness_max = 0.0
+    
+    def open(self, path: str):
+        """
+        Create the recording file and write its header.
+        
+        Args:
+            path: Recording file to create
+        """
+        self.path = path
+        self.start_time = time.time()
+        self._file = open(path, "wb", buffering=0)
+        header_bytes = self._header_bytes()
+        self._header_length = len(header_bytes)
+        self._file.write(RECORD_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+    
+    def run(self):
+        """Record until the capture is complete or KeyboardInterrupt."""
+        perf_counter, sleep = time.perf_counter, time.sleep
+        buffer, period = self.buffer, self.period
+        readers = [source.read for source in self.sources]
+        pending = 0
+        
+        # Collection must not stop for a garbage collection pass mid-capture
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        self.start_time = time.time()
+        start = perf_counter()
+        deadline = start
+        try:
+            while self.rows + pending < self.capacity:
+                remaining = deadline - perf_counter()
+                if remaining > SPIN_WINDOW:
+                    sleep(remaining - SPIN_WINDOW)
+                while perf_counter() < deadline:
+                    pass
+                
+                now = perf_counter()
+                row = [now - start, now - deadline]
+                for read in readers:
+                    row += read()
+                buffer[pending] = row
+                pending += 1
+                if pending == len(buffer):
+                    self.append(buffer)
+                    pending = 0
+                
+                deadline += period
+                behind = perf_counter() - deadline
+                if behind >= period:
+                    skipped = int(behind // period)
+                    self.missed += skipped
+                    deadline += skipped * period
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if pending:
+                self.append(buffer[:pending])
+            if gc_enabled:
+                gc.enable()
+    
+    def append(self, rows: np.ndarray):
+        """
+        Append rows to the recording file and to the statistics.
+        
+        Args:
+            rows: Array of shape (samples, columns)
+        """
+        rows = np.ascontiguousarray(rows, dtype="<f8")
+        if not len(rows):
+            return
+        self._file.write(rows.data)
+        self.rows += len(rows)
+        
+        times = rows[:, 0]
+        intervals = np.diff(times, prepend=times[0] if self._last_time is None else self._last_time)
+        if self._last_time is None:
+            intervals = intervals[1:]
+        self._last_time = float(times[-1])
+        self._interval_sum += float(intervals.sum())
+        self._interval_squares += float(np.square(intervals).sum())
+        
+        lateness = rows[:, 1]
+        bins = len(self._lateness_counts)
+        index = np.clip(np.searchsorted(LATENESS_EDGES, lateness, side="right") - 1, 0, bins - 1)
+        self._lateness_counts += np.bincount(index, minlength=bins)
+        self._lateness_max = max(self._lateness_max, float(lateness.max()))
+    
+    def _lateness_percentile(self, q: float) -> float:
+        """Lateness percentile, as the middle of the histogram bin it falls in."""
+        index = min(int(np.searchsorted(self._lateness_counts.cumsum(), q / 100 * self.rows)),
+                    len(self._lateness_counts) - 1)
+        return min(float(LATENESS_EDGES[index] + LATENESS_EDGES[index + 1]) / 2, self._lateness_max)
+    
+    def statistics(self) -> Dict:
+        """
+        Summarize how closely the capture kept to its schedule.
+        
+        Returns:
+            Dict with samples, missed deadlines, achieved rate (Hz), interval
+            mean and standard deviation, and lateness p50/p99 (to 1%) and
+            max (seconds)
+        """
+        intervals = self.rows - 1
+        elapsed = self._last_time if self.rows > 1 else 0.0
+        mean = self._interval_sum / intervals if intervals > 0 else 0.0
+        variance = self._interval_squares / intervals - mean * mean if intervals > 0 else 0.0
+        return {
+            "samples": self.rows,
+            "missed": self.missed,
+            "achieved_hz": intervals / elapsed if elapsed > 0 else 0.0,
+            "interval_mean": mean,
+            "interval_stddev": float(np.sqrt(max(0.0, variance))),
+            "lateness_p50": self._lateness_percentile(50) if self.rows else 0.0,
+            "lateness_p99": self._lateness_percentile(99) if self.rows else 0.0,
+            "lateness_max": self._lateness_max,
+        }
+    
+    def _header(self, final: bool) -> Dict:
+        """The file header; rows and statistics are only known at the end."""
+        return {
+            "columns": self.columns,
+            "hz": self.hz,
+            "start_time": self.start_time,
+            "rows": self.rows if final else None,
+            "hostname": os.uname().nodename,
+            "statistics": self.statistics() if final else None,
+        }
+    
+    def _header_bytes(self, length: int = 0) -> bytes:
+        """
+        Encode the header, padded with spaces.
+        
+        Args:
+            length: Length of the header written at the start, which the
+                final header is padded to; 0 encodes that first header,
+                with HEADER_RESERVE spaces of room
+        """
+        header_bytes = json.dumps(self._header(final=bool(length))).encode("utf-8")
+        if length:
+            if len(header_bytes) > length:
+                raise ValueError("Recording header outgrew its reserved space")
+            return header_bytes + b" " * (length - len(header_bytes))
+        header_bytes += b" " * HEADER_RESERVE
+        # Pad so the rows start 8-byte aligned for memory mapping
+        return header_bytes + b" " * (-(len(RECORD_MAGIC) + 4 + len(header_bytes)) % 8)
+    
+    def finish(self) -> Dict:
+        """
+        Write the final header with the row count and statistics, and
+        close the recording file.
+        
+        Returns:
+            The file header
+        """
+        self._file.seek(len(RECORD_MAGIC) + 4)
+        self._file.write(self._header_bytes(length=self._header_length))
+        self._file.close()
+        self._file = None
+        return self._header(final=True)
+    
+    def close(self):
+        """Close the sources, and finish the recording file if it is still open."""
+        for source in self.sources:
+            source.close()
+        self.sources = []
+        if self._file is not None:
+            self.finish()
+
+
+def open_recording(path: str) -> Tuple[Dict, np.ndarray]:
+    """
+    Open a recording without reading its rows into memory.
+    
+    A recording whose writer died before finishing it has its complete
+    rows counted from the file size, and no statistics.
+    
+    Args:
+        path: Recording file
+        
+    Returns:
+        (header, rows) where rows is a read-only memory map of shape
+        (rows, columns)
+        
+    Raises:
+        ValueError: If the file is not a recording
+    """
+    with open(path, "rb") as f:
+        if f.read(len(RECORD_MAGIC)) != RECORD_MAGIC:
+            raise ValueError(f"{path} is not a monitor recording")
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+        size = os.fstat(f.fileno()).st_size
+    offset = len(RECORD_MAGIC) + 4 + length
+    if header["rows"] is None:
+        header["rows"] = (size - offset) // (8 * len(header["columns"]))
+    shape = (header["rows"], len(header["columns"]))
+    if not header["rows"]:
+        return header, np.zeros(shape, dtype="<f8")
+    return header, np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=shape)
+
+
+def default_recording_path(log_path: str, now: Optional[float] = None) -> str:
+    """
+    Name a new recording in the log directory.
+    
+    Args:
+        log_path: Log directory from the configuration
+        now: Start time (default: now)
+        
+    Returns:
+        Path of the form LOG_PATH/record-YYYYmmdd-HHMMSS.rec
+    """
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+    return os.path.join(log_path, f"record-{stamp}{RECORD_EXTENSION}")
@@ -0,0 +1,213 @@
+"""
+Agent Module for Linux System Monitor
+
+This module runs the collection pipeline without a terminal and publishes
+every processed sample to any number of subscribers over a Unix domain
+socket or TCP.
+"""
+
+import asyncio
+import os
+import socket
+import time
+from typing import Callable, Optional, Set
+
+from monitor.processors.delta import SampleDelta
+from monitor.transport.protocol import (
+    FRAME_SUBSCRIBE,
+    MODE_DELTA,
+    MODE_SNAPSHOT,
+    ProtocolError,
+    SampleEncoder,
+    pack_hello,
+    parse_endpoint,
+    read_frame,
+)
+
+# Subscribers with more than this many bytes queued are skipped until they
+# catch up, and are then resynchronized with a snapshot
+MAX_BUFFERED_BYTES = 1024 * 1024
+
+# Seconds a new connection has to send its SUBSCRIBE frame
+SUBSCRIBE_TIMEOUT = 5.0
+
+
+class Subscriber:
+    """A connected viewer and its delivery state."""
+    
+    def __init__(self, writer: asyncio.StreamWriter, mode: int):
+        """
+        Initialize the subscriber.
+        
+        Args:
+            writer: Stream to send frames on
+            mode: MODE_SNAPSHOT or MODE_DELTA
+        """
+        self.writer = writer
+        self.mode = mode
+        # Delta subscribers start (and restart after falling behind) from a snapshot
+        self.needs_snapshot = True
+    
+    def send(self, delta_frame: bytes, encoder: SampleEncoder):
+        """
+        Send the current sample in the subscriber's mode.
+        
+        Args:
+            delta_frame: Delta frame for the current sample
+            encoder: Encoder holding the current snapshot
+        """
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+            # Slow viewer: drop this sample rather than buffer without bound
+            self.needs_snapshot = True
+            return
+        
+        if self.mode == MODE_SNAPSHOT or self.needs_snapshot:
+            self.writer.write(encoder.snapshot())
+            self.needs_snapshot = False
+        else:
+            self.writer.write(delta_frame)
+
+
+class MetricsAgent:
+    """
+    Headless publisher of processed samples.
+    
+    Collection runs on a fixed schedule independent of the number of
+    subscribers; each sample is encoded once and the same frame bytes are
+    written to every subscriber.
+    """
+    
+    def __init__(self, sample_source: Callable[[], SampleDelta], interval: float = 1.0,
+                 hostname: Optional[str] = None):
+        """
+        Initialize the agent.
+        
+        Args:
+            sample_source: Function returning the delta of the next
+                processed sample (usually MonitorPipeline.sample)
+            interval: Seconds between samples
+            hostname: Name announced to viewers (defaults to the local hostname)
+        """
+        self.sample_source = sample_source
+        self.interval = interval
+        self.hostname = hostname or socket.gethostname()
+        self.encoder = SampleEncoder()
+        self.subscribers: Set[Subscriber] = set()
+        self._handlers: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._publisher: Optional[asyncio.Task] = None
+    
+    async def start(self, endpoint: str):
+        """
+        Start listening and publishing.
+        
+        Args:
+            endpoint: "unix:PATH" or "HOST:PORT"
+        """
+        kind, address = parse_endpoint(endpoint)
+        if kind == "unix":
+            path = os.path.expanduser(address)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle_client, path=path)
+        else:
+            host, port = address
+            self._server = await asyncio.start_server(self._handle_client, host=host, port=port)
+        
+        self._publisher = asyncio.ensure_future(self._publish_loop())
+    
+    @property
+    def sockets(self):
+        """Listening sockets, e.g. to discover an ephemeral TCP port."""
+        return self._server.sockets if self._server else []
+    
+    async def serve_forever(self, endpoint: str):
+        """
+        Start the agent and run until cancelled.
+        
+        Args:
+            endpoint: "unix:PATH" or "HOST:PORT"
+        """
+        await self.start(endpoint)
+        try:
+            await self._publisher
+        finally:
+            await self.stop()
+    
+    async def stop(self):
+        """Stop publishing and close every connection."""
+        if self._publisher is not None:
+            self._publisher.cancel()
+            self._publisher = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+        self.subscribers.clear()
+        # Closing the writers ends each handler's read loop; wait for them
+        # so no handler is left to be cancelled with the event loop
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+    
+    def publish(self, delta: SampleDelta):
+        """
+        Encode a sample once and send it to every subscriber.
+        
+        Args:
+            delta: Delta of the processed sample from the previous one
+        """
+        delta_frame = self.encoder.update(delta, delta.timestamp or time.time())
+        for subscriber in list(self.subscribers):
+            if subscriber.writer.is_closing():
+                self.subscribers.discard(subscriber)
+                continue
+            subscriber.send(delta_frame, self.encoder)
+    
+    async def _publish_loop(self):
+        """Collect and publish on a fixed, drift-free schedule."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            self.publish(self.sample_source())
+            deadline += self.interval
+            delay = deadline - loop.time()
+            if delay < 0:
+                # Collection overran the interval; skip the missed ticks
+                deadline = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle one viewer connection from SUBSCRIBE until disconnect."""
+        subscriber = None
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            writer.write(pack_hello(self.hostname))
+            frame_type, payload = await asyncio.wait_for(read_frame(reader), SUBSCRIBE_TIMEOUT)
+            if frame_type != FRAME_SUBSCRIBE or not payload or payload[0] not in (MODE_SNAPSHOT, MODE_DELTA):
+                raise ProtocolError("Expected SUBSCRIBE frame")
+            
+            subscriber = Subscriber(writer, payload[0])
+            self.subscribers.add(subscriber)
+            
+            # Send the latest state right away instead of waiting for a tick
+            if self.encoder.sequence:
+                subscriber.send(b"", self.encoder)
+            
+            # A viewer may re-subscribe to switch modes; anything else ends the session
+            while True:
+                frame_type, payload = await read_frame(reader)
+                if frame_type != FRAME_SUBSCRIBE or not payload:
+                    raise ProtocolError("Unexpected frame from viewer")
+                subscriber.mode = payload[0]
+                subscriber.needs_snapshot = True
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            if subscriber is not None:
+                self.subscribers.discard(subscriber)
+            self._handlers.discard(handler)
+            writer.close()
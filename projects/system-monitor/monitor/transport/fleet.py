@@ -0,0 +1,230 @@
+"""
+Fleet Module for Linux System Monitor
+
+This module subscribes to many agents at once and merges their sample
+streams into per-host summaries for the fleet view.
+"""
+
+import asyncio
+import heapq
+import os
+import time
+from typing import Dict, List, Optional
+
+from monitor.transport.protocol import (
+    FRAME_DELTA,
+    FRAME_HELLO,
+    FRAME_SNAPSHOT,
+    MODE_DELTA,
+    PROTOCOL_VERSION,
+    FrameBuffer,
+    ProtocolError,
+    SampleDecoder,
+    pack_subscribe,
+    parse_endpoint,
+    unpack_hello,
+)
+
+# Flattened keys copied into each host's summary row
+SUMMARY_KEYS = {
+    "cpu.usage_percent": "cpu",
+    "memory.usage_percent": "memory",
+    "disk.usage_percent": "disk",
+    "cpu.load_avg.1min": "load",
+    "network.download_speed": "net_down",
+    "network.upload_speed": "net_up",
+}
+
+# Reconnect backoff bounds in seconds
+MIN_RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class HostState:
+    """Latest known state of one agent in the fleet."""
+    
+    def __init__(self, endpoint: str):
+        """
+        Initialize an empty host state.
+        
+        Args:
+            endpoint: Endpoint the agent is reached on
+        """
+        self.endpoint = endpoint
+        self.hostname = endpoint
+        self.status = "connecting"
+        self.decoder = SampleDecoder()
+        self.last_update = 0.0
+        # Summary values, kept up to date as frames arrive
+        self.summary: Dict[str, float] = {name: 0.0 for name in SUMMARY_KEYS.values()}
+    
+    def apply(self, frame_type: int, payload: bytes):
+        """
+        Apply a sample frame and refresh the summary values it touched.
+        
+        Args:
+            frame_type: FRAME_SNAPSHOT or FRAME_DELTA
+            payload: Frame payload
+        """
+        changed = self.decoder.apply(frame_type, payload)
+        flat = self.decoder.flat
+        if frame_type == FRAME_SNAPSHOT:
+            changed = SUMMARY_KEYS.keys()
+        for key in changed:
+            name = SUMMARY_KEYS.get(key)
+            if name is not None:
+                value = flat.get(key)
+                self.summary[name] = value if isinstance(value, (int, float)) else 0.0
+        self.last_update = time.time()
+    
+    @property
+    def age(self) -> float:
+        """Seconds since the last sample arrived (infinite if none yet)."""
+        return time.time() - self.last_update if self.last_update else float("inf")
+
+
+class AgentConnection(asyncio.Protocol):
+    """Non-blocking protocol handler for one agent connection."""
+    
+    def __init__(self, host: HostState):
+        """
+        Initialize the connection handler.
+        
+        Args:
+            host: State to update with received samples
+        """
+        self.host = host
+        self.frames = FrameBuffer()
+        self.transport: Optional[asyncio.Transport] = None
+        self.closed = asyncio.get_running_loop().create_future()
+    
+    def connection_made(self, transport):
+        """Subscribe to deltas as soon as the connection is up."""
+        self.transport = transport
+        self.host.status = "connected"
+        transport.write(pack_subscribe(MODE_DELTA))
+    
+    def data_received(self, data: bytes):
+        """Decode every complete frame in the received data."""
+        try:
+            for frame_type, payload in self.frames.feed(data):
+                if frame_type == FRAME_HELLO:
+                    version, self.host.hostname = unpack_hello(payload)
+                    if version != PROTOCOL_VERSION:
+                        raise ProtocolError(f"Unsupported protocol version {version}")
+                elif frame_type in (FRAME_SNAPSHOT, FRAME_DELTA):
+                    self.host.apply(frame_type, payload)
+        except ProtocolError:
+            self.transport.close()
+    
+    def connection_lost(self, exc):
+        """Mark the host as disconnected."""
+        self.host.status = "disconnected"
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+
+class FleetClient:
+    """
+    Maintains subscriptions to many agents on a single event loop.
+    
+    Each connection is a plain asyncio.Protocol that decodes frames as they
+    arrive and updates only the summary fields that changed, so the cost per
+    agent per sample is proportional to the size of its delta.
+    """
+    
+    def __init__(self, endpoints: List[str]):
+        """
+        Initialize the client.
+        
+        Args:
+            endpoints: Agent endpoints ("unix:PATH" or "HOST:PORT")
+        """
+        self.hosts: Dict[str, HostState] = {endpoint: HostState(endpoint) for endpoint in endpoints}
+        self._tasks: List[asyncio.Task] = []
+    
+    def start(self):
+        """Start connecting to every agent (must be called inside a running loop)."""
+        for host in self.hosts.values():
+            self._tasks.append(asyncio.ensure_future(self._maintain(host)))
+    
+    async def stop(self):
+        """Close every connection."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    async def _maintain(self, host: HostState):
+        """Keep one agent connected, reconnecting with exponential backoff."""
+        loop = asyncio.get_running_loop()
+        delay = MIN_RECONNECT_DELAY
+        kind, address = parse_endpoint(host.endpoint)
+        
+        while True:
+            host.status = "connecting"
+            try:
+                if kind == "unix":
+                    transport, protocol = await loop.create_unix_connection(
+                        lambda: AgentConnection(host), os.path.expanduser(address)
+                    )
+                else:
+                    transport, protocol = await loop.create_connection(
+                        lambda: AgentConnection(host), address[0], address[1]
+                    )
+            except OSError:
+                host.status = "unreachable"
+            else:
+                delay = MIN_RECONNECT_DELAY
+                try:
+                    await protocol.closed
+                finally:
+                    transport.close()
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+    
+    def rows(self, sort_key: Optional[str] = None) -> List[HostState]:
+        """
+        Get every host, optionally sorted by a summary value.
+        
+        Args:
+            sort_key: Summary value to sort by (descending), or None to sort by hostname
+        
+        Returns:
+            List of host states
+        """
+        hosts = list(self.hosts.values())
+        if sort_key is None:
+            return sorted(hosts, key=lambda host: host.hostname)
+        return sorted(hosts, key=lambda host: host.summary.get(sort_key, 0), reverse=True)
+    
+    def top(self, key: str, count: int) -> List[HostState]:
+        """
+        Get the busiest connected hosts by a summary value.
+        
+        Args:
+            key: Summary value ("cpu", "memory", ...)
+            count: Number of hosts to return
+        
+        Returns:
+            Up to `count` hosts, busiest first
+        """
+        live = [host for host in self.hosts.values() if host.last_update]
+        return heapq.nlargest(count, live, key=lambda host: host.summary.get(key, 0))
+    
+    def totals(self) -> Dict[str, float]:
+        """
+        Get fleet-wide aggregates.
+        
+        Returns:
+            Dict with host counts and average CPU and memory usage
+        """
+        live = [host for host in self.hosts.values() if host.status == "connected" and host.last_update]
+        count = len(live)
+        return {
+            "hosts": len(self.hosts),
+            "connected": count,
+            "cpu_avg": sum(host.summary["cpu"] for host in live) / count if count else 0.0,
+            "memory_avg": sum(host.summary["memory"] for host in live) / count if count else 0.0,
+        }
@@ -0,0 +1,617 @@
+"""
+Protocol Module for Linux System Monitor
+
+This module defines the compact binary protocol used to publish processed
+samples from a headless agent to remote viewers.
+
+Every frame is a 4-byte big-endian body length followed by the body. The
+body starts with a one-byte frame type:
+
+    HELLO      agent -> viewer  u8 protocol version, str hostname
+    SUBSCRIBE  viewer -> agent  u8 mode (MODE_SNAPSHOT or MODE_DELTA)
+    SNAPSHOT   agent -> viewer  full sample
+    DELTA      agent -> viewer  only the fields that changed
+
+Samples are flattened into dotted key paths ("cpu.load_avg.1min"). Dots
+and backslashes inside a key (mountpoints, VLAN interfaces such as
+"eth0.100") are escaped with a backslash, so every path splits back into
+the keys it was built from. Each path is given a u16 id the first time it
+is seen, and the definition is sent alongside the first value, so
+steady-state frames carry only (id, tag, value) triples. The id of a path
+that disappears is reused for new paths from the next frame on. SNAPSHOT
+and DELTA bodies share one layout:
+
+    f64 timestamp, u32 sequence,
+    u32 new key count, then per key: u16 id, u16 length, utf-8 path,
+    u32 value count, then per value: u16 id, u8 tag, encoded value
+"""
+
+import json
+import struct
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from monitor.collectors.records import Record
+
+if TYPE_CHECKING:
+    from monitor.processors.delta import SampleDelta
+
+PROTOCOL_VERSION = 2
+
+# Frame types
+FRAME_HELLO = 1
+FRAME_SUBSCRIBE = 2
+FRAME_SNAPSHOT = 3
+FRAME_DELTA = 4
+
+# Subscription modes
+MODE_SNAPSHOT = 0
+MODE_DELTA = 1
+
+# Value tags
+TAG_NONE = 0
+TAG_FLOAT = 1
+TAG_INT = 2
+TAG_TRUE = 3
+TAG_FALSE = 4
+TAG_STR = 5
+TAG_FLOAT_ARRAY = 6
+TAG_PERCENT_ARRAY = 7
+TAG_JSON = 8
+TAG_INT_ARRAY = 9
+TAG_DOUBLE_ARRAY = 10
+
+# Keys that are not published; viewers keep their own history
+EXCLUDED_KEYS = {"history"}
+
+# Largest frame body a peer will accept
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Number of distinct key ids; keys beyond this many live ones are not sent
+MAX_KEYS = 0x10000
+
+# Largest magnitude a float array is sent as f32 for; beyond it f32 no
+# longer resolves whole units
+MAX_F32_MAGNITUDE = float(1 << 24)
+
+_LENGTH = struct.Struct(">I")
+_HEADER = struct.Struct(">dI")
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_KEY = struct.Struct(">HH")
+_FLOAT = struct.Struct(">d")
+_INT = struct.Struct(">q")
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed frame."""
+
+
+def pack_frame(frame_type: int, payload: bytes = b"") -> bytes:
+    """
+    Build a length-prefixed frame.
+    
+    Args:
+        frame_type: One of the FRAME_* constants
+        payload: Frame payload
+    
+    Returns:
+        The encoded frame
+    """
+    return _LENGTH.pack(len(payload) + 1) + _U8.pack(frame_type) + payload
+
+
+def pack_hello(hostname: str) -> bytes:
+    """Build a HELLO frame announcing the agent's hostname."""
+    name = hostname.encode("utf-8")[:255]
+    return pack_frame(FRAME_HELLO, _U8.pack(PROTOCOL_VERSION) + _U8.pack(len(name)) + name)
+
+
+def unpack_hello(payload: bytes) -> Tuple[int, str]:
+    """
+    Parse a HELLO payload.
+    
+    Returns:
+        Tuple of (protocol version, hostname)
+    """
+    if len(payload) < 2:
+        raise ProtocolError("Truncated HELLO frame")
+    length = payload[1]
+    return payload[0], payload[2:2 + length].decode("utf-8", "replace")
+
+
+def pack_subscribe(mode: int) -> bytes:
+    """Build a SUBSCRIBE frame for the given mode."""
+    return pack_frame(FRAME_SUBSCRIBE, _U8.pack(mode))
+
+
+def parse_endpoint(endpoint: str) -> Tuple[str, Any]:
+    """
+    Parse an endpoint string.
+    
+    Accepted forms are "unix:/path/to/socket", "/path/to/socket",
+    "host:port" and "tcp:host:port".
+    
+    Args:
+        endpoint: Endpoint string
+    
+    Returns:
+        ("unix", path) or ("tcp", (host, port))
+    """
+    if endpoint.startswith("unix:"):
+        return "unix", endpoint[5:]
+    if endpoint.startswith("/"):
+        return "unix", endpoint
+    if endpoint.startswith("tcp:"):
+        endpoint = endpoint[4:]
+    
+    host, sep, port = endpoint.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid endpoint '{endpoint}', expected unix:PATH or HOST:PORT")
+    return "tcp", (host.strip("[]") or "0.0.0.0", int(port))
+
+
+def escape_key(key: Any) -> str:
+    """
+    Escape one key for use in a key path.
+    
+    Args:
+        key: Dict key (converted to a string)
+    
+    Returns:
+        The key with dots and backslashes escaped by a backslash
+    """
+    key = str(key)
+    if "." in key or "\\" in key:
+        key = key.replace("\\", "\\\\").replace(".", "\\.")
+    return key
+
+
+def split_path(path: str) -> List[str]:
+    """
+    Split a key path into the keys it was built from.
+    
+    Args:
+        path: Key path as built by flatten
+    
+    Returns:
+        Unescaped keys, outermost first
+    """
+    if "\\" not in path:
+        return path.split(".")
+    parts = [""]
+    escaped = False
+    for char in path:
+        if escaped:
+            parts[-1] += char
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ".":
+            parts.append("")
+        else:
+            parts[-1] += char
+    return parts
+
+
+def flatten(data: Dict, prefix: str = "", out: Optional[Dict[str, Any]] = None,
+            excluded=EXCLUDED_KEYS) -> Dict[str, Any]:
+    """
+    Flatten a nested sample into dotted key paths.
+    
+    Dicts and collector records are descended into; every other value
+    (including lists) is a leaf. Keys are escaped with escape_key.
+    
+    Args:
+        data: Nested sample
+        prefix: Path prefix for the keys of `data`
+        out: Dict to add to (a new one is created if omitted)
+        excluded: Keys to leave out at any depth
+    
+    Returns:
+        Mapping of key path to leaf value
+    """
+    if out is None:
+        out = {}
+    for key, value in data.items():
+        if key in excluded:
+            continue
+        if type(key) is not str or "." in key or "\\" in key:
+            key = escape_key(key)
+        path = prefix + key
+        if isinstance(value, (dict, Record)) and value:
+            flatten(value, path + ".", out, excluded)
+        else:
+            out[path] = value
+    return out
+
+
+def unflatten(flat: Dict[str, Any]) -> Dict:
+    """
+    Rebuild a nested sample from dotted key paths.
+    
+    Args:
+        flat: Mapping of key path to value
+    
+    Returns:
+        Nested dictionary
+    """
+    result: Dict = {}
+    for path, value in flat.items():
+        node = result
+        parts = split_path(path)
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        node[parts[-1]] = value
+    return result
+
+
+def _encode_value(path: str, value: Any, out: bytearray):
+    """Append the tag and encoding of a leaf value to `out`."""
+    if value is None:
+        out += _U8.pack(TAG_NONE)
+    elif value is True:
+        out += _U8.pack(TAG_TRUE)
+    elif value is False:
+        out += _U8.pack(TAG_FALSE)
+    elif isinstance(value, float):
+        out += _U8.pack(TAG_FLOAT)
+        out += _FLOAT.pack(value)
+    elif isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        out += _U8.pack(TAG_INT)
+        out += _INT.pack(value)
+    elif isinstance(value, str) and len(value) < 16384:
+        # At most 4 bytes per character, so the length fits in a u16
+        raw = value.encode("utf-8")
+        out += _U8.pack(TAG_STR)
+        out += _U16.pack(len(raw))
+        out += raw
+    elif isinstance(value, (list, tuple)) and len(value) < 65536 and all(
+        isinstance(item, (int, float)) and not isinstance(item, bool) for item in value
+    ):
+        if all(isinstance(item, int) and -(1 << 63) <= item < (1 << 63) for item in value):
+            # Counters and ids are sent exactly
+            out += _U8.pack(TAG_INT_ARRAY)
+            out += _U16.pack(len(value))
+            out += struct.pack(f">{len(value)}q", *value)
+        elif path.endswith("percent") and all(0 <= item <= 655.35 for item in value):
+            # Percentages fit in 2 bytes at 0.01 resolution
+            out += _U8.pack(TAG_PERCENT_ARRAY)
+            out += _U16.pack(len(value))
+            out += struct.pack(f">{len(value)}H", *[int(round(item * 100)) for item in value])
+        elif all(-MAX_F32_MAGNITUDE < item < MAX_F32_MAGNITUDE for item in value):
+            out += _U8.pack(TAG_FLOAT_ARRAY)
+            out += _U16.pack(len(value))
+            out += struct.pack(f">{len(value)}f", *value)
+        else:
+            out += _U8.pack(TAG_DOUBLE_ARRAY)
+            out += _U16.pack(len(value))
+            out += struct.pack(f">{len(value)}d", *value)
+    else:
+        raw = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+        out += _U8.pack(TAG_JSON)
+        out += _LENGTH.pack(len(raw))
+        out += raw
+
+
+def _decode_value(buf: memoryview, offset: int) -> Tuple[Any, int]:
+    """
+    Decode one tagged value.
+    
+    Returns:
+        Tuple of (value, offset after the value)
+    """
+    tag = buf[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_TRUE:
+        return True, offset
+    if tag == TAG_FALSE:
+        return False, offset
+    if tag == TAG_FLOAT:
+        return _FLOAT.unpack_from(buf, offset)[0], offset + 8
+    if tag == TAG_INT:
+        return _INT.unpack_from(buf, offset)[0], offset + 8
+    if tag == TAG_STR:
+        length = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+        return bytes(buf[offset:offset + length]).decode("utf-8", "replace"), offset + length
+    if tag == TAG_FLOAT_ARRAY:
+        count = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+        return list(struct.unpack_from(f">{count}f", buf, offset)), offset + 4 * count
+    if tag == TAG_INT_ARRAY:
+        count = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+        return list(struct.unpack_from(f">{count}q", buf, offset)), offset + 8 * count
+    if tag == TAG_DOUBLE_ARRAY:
+        count = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+        return list(struct.unpack_from(f">{count}d", buf, offset)), offset + 8 * count
+    if tag == TAG_PERCENT_ARRAY:
+        count = _U16.unpack_from(buf, offset)[0]
+        offset += 2
+        values = struct.unpack_from(f">{count}H", buf, offset)
+        return [value / 100 for value in values], offset + 2 * count
+    if tag == TAG_JSON:
+        length = _LENGTH.unpack_from(buf, offset)[0]
+        offset += 4
+        return json.loads(bytes(buf[offset:offset + length])), offset + length
+    raise ProtocolError(f"Unknown value tag {tag}")
+
+
+class SampleEncoder:
+    """
+    Encodes a stream of sample deltas into SNAPSHOT and DELTA frames.
+    
+    The encoder is shared by all subscribers of an agent: each delta frame
+    is built once, straight from the processor's delta, and the snapshot
+    frame is only built if some subscriber needs it.
+    """
+    
+    def __init__(self, include_history: bool = False):
+        """
+        Initialize an empty key table.
+        
+        Args:
+            include_history: Also encode the history series (viewers
+                normally keep their own history)
+        """
+        self.include_history = include_history
+        self._key_ids: Dict[str, int] = {}
+        self._key_defs: Dict[int, bytes] = {}
+        # Ids of removed keys, reused before new ones are handed out
+        self._free_ids: List[int] = []
+        self._current: Dict[str, Any] = {}
+        self._timestamp = 0.0
+        self._snapshot: Optional[bytes] = None
+        self._delta_sequence = 0
+        self.sequence = 0
+    
+    def _key_id(self, path: str, new_keys: List[bytes]) -> Optional[int]:
+        """
+        Get the id for a key path, registering it if it is new.
+        
+        Returns:
+            The key id, or None if the path cannot be sent (every id is
+            taken by a live key, or the path is longer than 65535 bytes)
+        """
+        key_id = self._key_ids.get(path)
+        if key_id is None:
+            raw = path.encode("utf-8")
+            if len(raw) > 0xFFFF:
+                return None
+            if self._free_ids:
+                key_id = self._free_ids.pop()
+            elif len(self._key_defs) < MAX_KEYS:
+                key_id = len(self._key_defs)
+            else:
+                return None
+            definition = _KEY.pack(key_id, len(raw)) + raw
+            self._key_ids[path] = key_id
+            self._key_defs[key_id] = definition
+            new_keys.append(definition)
+        return key_id
+    
+    def update(self, delta: "SampleDelta", timestamp: float) -> bytes:
+        """
+        Encode a new sample.
+        
+        Args:
+            delta: Change from the previous sample (see ResourceProcessor.delta)
+            timestamp: Sample timestamp
+        
+        Returns:
+            DELTA frame containing only the changed fields
+        """
+        if not delta.follows(self._delta_sequence):
+            # A delta was missed (or this encoder started late); start over
+            # from the whole sample
+            delta = delta.as_full()
+        self._delta_sequence = delta.sequence
+        
+        changed = delta.changed
+        if self.include_history:
+            changed = dict(changed)
+            changed.update(delta.replaced)
+            for path in delta.appended:
+                changed[path] = delta.history[path]
+        
+        current = self._current
+        if delta.full:
+            removed = [path for path in current if path not in changed]
+        else:
+            removed = [path for path in delta.removed if path in current]
+        
+        new_keys: List[bytes] = []
+        values = bytearray()
+        count = len(removed)
+        for path, value in changed.items():
+            key_id = self._key_id(path, new_keys)
+            if key_id is None:
+                # Leave the one value out rather than fail the whole frame
+                continue
+            values += _U16.pack(key_id)
+            _encode_value(path, value, values)
+            current[path] = value
+            count += 1
+        
+        # Keys that disappeared are sent as None
+        for path in removed:
+            values += _U16.pack(self._key_ids[path])
+            values += _U8.pack(TAG_NONE)
+            del current[path]
+        
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self._timestamp = timestamp
+        self._snapshot = None
+        frame = self._pack(FRAME_DELTA, new_keys, count, values)
+        
+        # Decoders apply a frame's key definitions before its values, so
+        # the ids of removed keys can only be reused from the next frame on
+        for path in removed:
+            key_id = self._key_ids.pop(path)
+            del self._key_defs[key_id]
+            self._free_ids.append(key_id)
+        
+        return frame
+    
+    def snapshot(self) -> bytes:
+        """
+        Get a SNAPSHOT frame for the most recent sample.
+        
+        The frame carries the full key table, so a viewer can start from it
+        with no prior state. It is built at most once per sample.
+        
+        Returns:
+            SNAPSHOT frame
+        """
+        if self._snapshot is None:
+            values = bytearray()
+            for path, value in self._current.items():
+                values += _U16.pack(self._key_ids[path])
+                _encode_value(path, value, values)
+            self._snapshot = self._pack(FRAME_SNAPSHOT, list(self._key_defs.values()), len(self._current), values)
+        return self._snapshot
+    
+    def _pack(self, frame_type: int, key_defs: List[bytes], count: int, values: bytearray) -> bytes:
+        """Assemble a SNAPSHOT or DELTA frame."""
+        payload = bytearray(_HEADER.pack(self._timestamp, self.sequence))
+        payload += _U32.pack(len(key_defs))
+        for definition in key_defs:
+            payload += definition
+        payload += _U32.pack(count)
+        payload += values
+        return pack_frame(frame_type, bytes(payload))
+
+
+class SampleDecoder:
+    """
+    Rebuilds samples from SNAPSHOT and DELTA frames.
+    
+    The decoder keeps the flattened state and only rebuilds the nested
+    sample when it is asked for after a change.
+    """
+    
+    def __init__(self):
+        """Initialize an empty state."""
+        self._keys: Dict[int, str] = {}
+        self.flat: Dict[str, Any] = {}
+        self.timestamp = 0.0
+        self.sequence = 0
+        self._sample: Optional[Dict] = None
+    
+    def apply(self, frame_type: int, payload) -> List[str]:
+        """
+        Apply a SNAPSHOT or DELTA payload.
+        
+        Args:
+            frame_type: FRAME_SNAPSHOT or FRAME_DELTA
+            payload: Frame payload (without length and type)
+        
+        Returns:
+            Key paths whose values changed
+        """
+        buf = memoryview(payload)
+        try:
+            self.timestamp, self.sequence = _HEADER.unpack_from(buf, 0)
+            offset = _HEADER.size
+            
+            key_count = _U32.unpack_from(buf, offset)[0]
+            offset += 4
+            if frame_type == FRAME_SNAPSHOT:
+                self._keys = {}
+            for _ in range(key_count):
+                key_id, length = _KEY.unpack_from(buf, offset)
+                offset += _KEY.size
+                self._keys[key_id] = bytes(buf[offset:offset + length]).decode("utf-8")
+                offset += length
+            
+            if frame_type == FRAME_SNAPSHOT:
+                self.flat = {}
+            
+            value_count = _U32.unpack_from(buf, offset)[0]
+            offset += 4
+            changed = []
+            for _ in range(value_count):
+                key_id = _U16.unpack_from(buf, offset)[0]
+                value, offset = _decode_value(buf, offset + 2)
+                path = self._keys[key_id]
+                if value is None and frame_type == FRAME_DELTA:
+                    self.flat.pop(path, None)
+                else:
+                    self.flat[path] = value
+                changed.append(path)
+        except (struct.error, KeyError, IndexError, ValueError) as e:
+            raise ProtocolError(f"Malformed sample frame: {e}") from e
+        
+        self._sample = None
+        return changed
+    
+    def sample(self) -> Dict:
+        """
+        Get the current state as a nested sample.
+        
+        Returns:
+            Nested dictionary in the same shape the processor produces
+        """
+        if self._sample is None:
+            self._sample = unflatten(self.flat)
+        return self._sample
+
+
+class FrameBuffer:
+    """Splits a byte stream into frames for non-blocking readers."""
+    
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._buffer = bytearray()
+    
+    def feed(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """
+        Add received bytes and return every complete frame.
+        
+        Args:
+            data: Bytes received from the peer
+        
+        Returns:
+            List of (frame type, payload) tuples
+        """
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        offset = 0
+        while len(buffer) - offset >= 4:
+            length = _LENGTH.unpack_from(buffer, offset)[0]
+            if length == 0 or length > MAX_FRAME_SIZE:
+                raise ProtocolError(f"Invalid frame length {length}")
+            if len(buffer) - offset - 4 < length:
+                break
+            start = offset + 4
+            frames.append((buffer[start], bytes(buffer[start + 1:start + length])))
+            offset = start + length
+        if offset:
+            del buffer[:offset]
+        return frames
+
+
+async def read_frame(reader) -> Tuple[int, bytes]:
+    """
+    Read one frame from an asyncio StreamReader.
+    
+    Args:
+        reader: asyncio.StreamReader
+    
+    Returns:
+        Tuple of (frame type, payload)
+    """
+    header = await reader.readexactly(4)
+    length = _LENGTH.unpack(header)[0]
+    if length == 0 or length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Invalid frame length {length}")
+    body = await reader.readexactly(length)
+    return body[0], body[1:]
@@ -0,0 +1,448 @@
+"""
+Shared Memory Module for Linux System Monitor
+
+This module lets several dashboards on the same host share one collection
+loop. A publisher writes every processed sample into a fixed-layout ring
+buffer backed by a file in the user's runtime directory, and readers decode
+the newest slot in place without collecting anything themselves.
+
+The ring is private to one user: it is created with mode 0600, and neither
+side uses a ring file that another user owns or could have written to.
+Readers only attach to a publisher whose sample settings (roots, collector
+options, history length) match their own, since they show its samples
+instead of collecting their own.
+
+Ring layout (little-endian):
+
+    header   8s magic, u32 slot count, u32 slot size, u64 latest sequence,
+             f64 update interval, u32 publisher pid, 16s settings digest
+             (padded to 64 bytes)
+    slots    slot count x slot size, each:
+             u64 state, u32 payload length (padded to 16 bytes), payload
+
+A slot's payload is a SNAPSHOT frame of the agent protocol, history
+included. Slot state works as a sequence lock: the writer sets it to
+2 * seq + 1 before writing and to 2 * seq + 2 after, and a reader accepts a
+decoded slot only if the state was 2 * seq + 2 both before and after.
+"""
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from monitor.processors.delta import DeltaTracker, SampleDelta
+from monitor.transport.protocol import FRAME_SNAPSHOT, ProtocolError, SampleDecoder, SampleEncoder
+
+RING_FILE_NAME = "linux-system-monitor.ring"
+
+RING_MAGIC = b"LSMRING2"
+
+# Enough slots that the slot being read is never the one being written
+DEFAULT_SLOT_COUNT = 4
+
+# Slots are sized for large process lists; untouched pages of the
+# ring file are never allocated
+DEFAULT_SLOT_SIZE = 1024 * 1024
+
+_HEADER = struct.Struct("<8sIIQdI16s")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 16
+HEADER_SIZE = 64
+
+_SLOT_HEADER = struct.Struct("<QI")
+SLOT_HEADER_SIZE = 16
+
+# Length and type prefix of a protocol frame, skipped when decoding a slot
+_FRAME_PREFIX_SIZE = 5
+
+# Samples a reader may miss before it checks whether the publisher is gone
+STALE_INTERVALS = 3
+
+
+def default_ring_path() -> str:
+    """
+    Get the ring path for the current user.
+    
+    Returns:
+        The ring file in $XDG_RUNTIME_DIR, or a per-user file under
+        /dev/shm if there is no runtime directory
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, RING_FILE_NAME)
+    return f"/dev/shm/linux-system-monitor-{os.geteuid()}.ring"
+
+
+def settings_digest(settings: Optional[Dict[str, Any]]) -> bytes:
+    """
+    Condense the settings that shape samples into a fixed-size digest.
+    
+    Args:
+        settings: JSON-serializable settings (see pipeline.sample_settings)
+        
+    Returns:
+        16-byte digest
+    """
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).digest()[:16]
+
+
+def _private(fd: int) -> bool:
+    """Whether an open ring file belongs to this user alone."""
+    info = os.fstat(fd)
+    return info.st_uid == os.geteuid() and not info.st_mode & 0o077
+
+
+class SampleRingWriter:
+    """
+    Publisher side of the shared sample ring.
+    
+    Only one writer can hold a ring at a time: the writer keeps an exclusive
+    flock on the ring file, which the kernel releases if the process dies.
+    """
+    
+    def __init__(self, path: Optional[str] = None, slot_count: int = DEFAULT_SLOT_COUNT,
+                 slot_size: int = DEFAULT_SLOT_SIZE):
+        """
+        Initialize the writer.
+        
+        Args:
+            path: Ring file path (default: default_ring_path())
+            slot_count: Number of slots in the ring
+            slot_size: Bytes per slot, including the slot header
+        """
+        self.path = path or default_ring_path()
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.sequence = 0
+        self.dropped = 0
+        self._encoder = SampleEncoder(include_history=True)
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+    
+    def open(self, interval: float, digest: bytes = b"") -> bool:
+        """
+        Take over the ring as its publisher.
+        
+        Args:
+            interval: Seconds between samples, announced to readers
+            digest: Digest of the settings the samples are collected with
+                (see settings_digest), announced to readers
+            
+        Returns:
+            True if this process is now the publisher, False if another
+            publisher holds the ring, or it cannot be created or belongs
+            to another user
+        """
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        except OSError:
+            return False
+        try:
+            if os.fstat(fd).st_uid != os.geteuid():
+                raise PermissionError(f"{self.path} belongs to another user")
+            # Nobody else may read the samples or write fake ones
+            os.fchmod(fd, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        
+        size = HEADER_SIZE + self.slot_count * self.slot_size
+        os.ftruncate(fd, size)
+        self._fd = fd
+        self._mm = mmap.mmap(fd, size)
+        
+        # Continue the sequence of a previous publisher so attached readers
+        # see the takeover as just another sample
+        magic, _, _, sequence, _, _, _ = _HEADER.unpack_from(self._mm, 0)
+        self.sequence = sequence if magic == RING_MAGIC else 0
+        _HEADER.pack_into(self._mm, 0, RING_MAGIC, self.slot_count, self.slot_size,
+                          self.sequence, interval, os.getpid(), digest)
+        return True
+    
+    def publish(self, delta: SampleDelta):
+        """
+        Write a sample into the next slot.
+        
+        Args:
+            delta: Delta of the processed sample from the previous one
+        """
+        self._encoder.update(delta, delta.timestamp or time.time())
+        frame = self._encoder.snapshot()
+        if SLOT_HEADER_SIZE + len(frame) > self.slot_size:
+            self.dropped += 1
+            return
+        
+        sequence = self.sequence + 1
+        offset = HEADER_SIZE + (sequence % self.slot_count) * self.slot_size
+        _SLOT_HEADER.pack_into(self._mm, offset, 2 * sequence + 1, len(frame))
+        payload_offset = offset + SLOT_HEADER_SIZE
+        self._mm[payload_offset:payload_offset + len(frame)] = frame
+        _SLOT_HEADER.pack_into(self._mm, offset, 2 * sequence + 2, len(frame))
+        
+        # Publish the slot only once it is complete
+        _SEQUENCE.pack_into(self._mm, _SEQUENCE_OFFSET, sequence)
+        self.sequence = sequence
+    
+    def close(self):
+        """
+        Release the ring; the file is kept so attached readers can take over.
+        """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SampleRingReader:
+    """
+    Reader side of the shared sample ring.
+    
+    The newest slot is decoded directly from the shared mapping; only the
+    decoded values are allocated, and only when a new sample is present.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the reader.
+        
+        Args:
+            path: Ring file path (default: default_ring_path())
+        """
+        self.path = path or default_ring_path()
+        self.sequence = 0
+        self.interval = 1.0
+        self._decoder = SampleDecoder()
+        self._sample: Optional[Dict] = None
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._digest = b""
+        self._last_change = time.monotonic()
+    
+    def open(self, digest: bytes = b"") -> bool:
+        """
+        Attach to the ring if a publisher is running.
+        
+        Args:
+            digest: Digest of the reader's own sample settings; the ring's
+                publisher must have announced the same
+        
+        Returns:
+            True if attached
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY | os.O_NOFOLLOW)
+        except OSError:
+            return False
+        try:
+            if not _private(fd):
+                raise PermissionError(f"{self.path} is not private to this user")
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            os.close(fd)
+            return False
+        
+        self._fd = fd
+        self._mm = mm
+        if len(mm) < HEADER_SIZE or mm[:len(RING_MAGIC)] != RING_MAGIC or not self.publisher_alive():
+            self.close()
+            return False
+        self._digest = digest.ljust(16, b"\0")
+        if not self.matches:
+            self.close()
+            return False
+        self.interval = _HEADER.unpack_from(mm, 0)[4]
+        return True
+    
+    def publisher_alive(self) -> bool:
+        """Whether some process holds the ring as its publisher."""
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except OSError:
+            return True
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return False
+    
+    @property
+    def matches(self) -> bool:
+        """Whether the current publisher collects with the reader's settings."""
+        return _HEADER.unpack_from(self._mm, 0)[6] == self._digest
+    
+    @property
+    def stale(self) -> bool:
+        """Whether no new sample has arrived for several intervals."""
+        return time.monotonic() - self._last_change > STALE_INTERVALS * self.interval
+    
+    def latest(self) -> Optional[Dict]:
+        """
+        Get the newest sample in the ring.
+        
+        Returns:
+            The newest complete sample, or None if none has been written yet
+        """
+        _, slot_count, slot_size, sequence, _, _, digest = _HEADER.unpack_from(self._mm, 0)
+        if sequence == self.sequence or sequence == 0 or digest != self._digest:
+            # Nothing new, or a publisher with other settings took over
+            return self._sample
+        
+        offset = HEADER_SIZE + (sequence % slot_count) * slot_size
+        state, length = _SLOT_HEADER.unpack_from(self._mm, offset)
+        if state != 2 * sequence + 2 or length > slot_size - SLOT_HEADER_SIZE:
+            # The publisher moved on while we looked; try again next time
+            return self._sample
+        
+        start = offset + SLOT_HEADER_SIZE + _FRAME_PREFIX_SIZE
+        view = memoryview(self._mm)
+        try:
+            payload = view[start:offset + SLOT_HEADER_SIZE + length]
+            try:
+                self._decoder.apply(FRAME_SNAPSHOT, payload)
+            finally:
+                payload.release()
+        except ProtocolError:
+            return self._sample
+        finally:
+            view.release()
+        
+        # Discard the result if the slot was rewritten during decoding
+        if _SLOT_HEADER.unpack_from(self._mm, offset)[0] != state:
+            return self._sample
+        
+        self.sequence = sequence
+        self._sample = self._decoder.sample()
+        self._last_change = time.monotonic()
+        return self._sample
+    
+    def close(self):
+        """Detach from the ring."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedSampleSource:
+    """
+    Sample source that shares one collection loop between local dashboards.
+    
+    The first dashboard of a user on a host becomes the publisher: it runs
+    its own pipeline and writes every sample into the ring. Later dashboards
+    with the same sample settings attach as readers and never build a
+    pipeline; a dashboard with different settings collects locally. If the
+    publisher exits, the first reader to notice takes over, continuing the
+    same ring.
+    """
+    
+    def __init__(self, pipeline_factory: Callable[[], object], interval: float,
+                 path: Optional[str] = None, settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the source and pick a role.
+        
+        Args:
+            pipeline_factory: Function creating a MonitorPipeline, called only
+                when this process becomes the publisher
+            interval: Seconds between samples
+            path: Ring file path (default: default_ring_path())
+            settings: Settings that shape the samples (see
+                pipeline.sample_settings); only a publisher with equal
+                settings is attached to
+        """
+        self.pipeline_factory = pipeline_factory
+        self.interval = interval
+        self.path = path or default_ring_path()
+        self.digest = settings_digest(settings)
+        self.pipeline = None
+        self.writer: Optional[SampleRingWriter] = None
+        self.reader: Optional[SampleRingReader] = None
+        self._listeners: List[Callable[[SampleDelta], None]] = []
+        # Readers diff the samples they decode themselves
+        self._tracker = DeltaTracker()
+        self._attach()
+    
+    @property
+    def role(self) -> str:
+        """"publisher", "reader" or "local" (collecting without sharing)."""
+        if self.reader is not None:
+            return "reader"
+        return "publisher" if self.writer is not None else "local"
+    
+    def _attach(self):
+        """Attach to a running publisher, or become the publisher."""
+        reader = SampleRingReader(self.path)
+        if reader.open(self.digest):
+            self.reader = reader
+            return
+        
+        writer = SampleRingWriter(self.path)
+        if writer.open(self.interval, self.digest):
+            self.writer = writer
+        elif reader.open(self.digest):
+            # Lost the race to another new publisher
+            self.reader = reader
+            return
+        self.pipeline = self.pipeline_factory()
+    
+    def add_listener(self, listener: Callable[[SampleDelta], None]):
+        """
+        Register a function to be called with every new sample.
+        
+        Args:
+            listener: Function called with the delta of each sample
+        """
+        self._listeners.append(listener)
+    
+    def sample(self) -> Optional[SampleDelta]:
+        """
+        Get the next sample, collecting it only if this is the publisher.
+        
+        Returns:
+            Delta from the previous sample, or None if a reader has no new
+            sample since the last call
+        """
+        if self.reader is not None:
+            sequence = self.reader.sequence
+            sample = self.reader.latest()
+            if self.reader.sequence == sequence and (
+                not self.reader.matches or self.reader.stale and not self.reader.publisher_alive()
+            ):
+                # The publisher is gone, or was replaced by one collecting
+                # with other settings; take over collection
+                self.reader.close()
+                self.reader = None
+                self._attach()
+                return self.sample()
+            if self.reader.sequence == sequence:
+                return None
+            delta = self._tracker.update(sample)
+        else:
+            delta = self.pipeline.sample()
+            if self.writer is not None:
+                self.writer.publish(delta)
+        
+        for listener in self._listeners:
+            listener(delta)
+        return delta
+    
+    def reset(self):
+        """Reset statistics (only the publisher owns any)."""
+        if self.pipeline is not None:
+            self.pipeline.reset()
+    
+    def close(self):
+        """Release the ring and, for a publisher, its pipeline."""
+        if self.writer is not None:
+            self.writer.close()
+        if self.reader is not None:
+            self.reader.close()
+        if self.pipeline is not None:
+            self.pipeline.close()
@@ -0,0 +1,87 @@
+"""
+Stand-in Agent Module for Linux System Monitor
+
+This module starts local agents that publish synthetic samples, for
+exercising the fleet view without a real fleet.
+"""
+
+import random
+import time
+from typing import Callable, List, Tuple
+
+from monitor.processors.delta import DeltaTracker, SampleDelta
+from monitor.transport.agent import MetricsAgent
+
+
+def synthetic_source(index: int, cores: int = 8) -> Callable[[], SampleDelta]:
+    """
+    Create a sample source that random-walks plausible processed samples.
+    
+    Args:
+        index: Host number, used for the hostname and random seed
+        cores: Number of logical CPUs to simulate
+    
+    Returns:
+        Function returning the delta of a new processed sample on each call
+    """
+    rng = random.Random(index)
+    state = {
+        "cpu": rng.uniform(5, 60),
+        "memory": rng.uniform(20, 70),
+        "disk": rng.uniform(10, 80),
+        "per_core": [rng.uniform(0, 100) for _ in range(cores)],
+    }
+    hostname = f"standin-{index:04d}"
+    tracker = DeltaTracker()
+    
+    def walk(value: float, step: float) -> float:
+        return min(100.0, max(0.0, value + rng.uniform(-step, step)))
+    
+    def source() -> SampleDelta:
+        state["cpu"] = walk(state["cpu"], 5)
+        state["memory"] = walk(state["memory"], 1)
+        state["disk"] = walk(state["disk"], 0.1)
+        state["per_core"] = [walk(value, 10) for value in state["per_core"]]
+        return tracker.update({
+            "cpu": {
+                "usage_percent": round(state["cpu"], 1),
+                "per_core_percent": [round(value, 1) for value in state["per_core"]],
+                "core_count": cores,
+                "load_avg": {"1min": round(state["cpu"] * cores / 100, 2)},
+            },
+            "memory": {"usage_percent": round(state["memory"], 1), "used": 0, "total": 0},
+            "disk": {"usage_percent": round(state["disk"], 1), "read_speed": 0, "write_speed": 0},
+            "network": {
+                "download_speed": round(rng.uniform(0, 10), 2),
+                "upload_speed": round(rng.uniform(0, 2), 2),
+            },
+            "processes": {"processes": []},
+            "system": {"timestamp": time.time(), "hostname": hostname},
+            "alerts": {},
+        })
+    
+    return source
+
+
+async def start_standin_agents(count: int, interval: float = 1.0,
+                               cores: int = 8) -> Tuple[List[MetricsAgent], List[str]]:
+    """
+    Start stand-in agents on ephemeral localhost TCP ports.
+    
+    Args:
+        count: Number of agents to start
+        interval: Seconds between samples
+        cores: Number of logical CPUs each agent simulates
+    
+    Returns:
+        Tuple of (agents, endpoints to connect to)
+    """
+    agents = []
+    endpoints = []
+    for index in range(count):
+        agent = MetricsAgent(synthetic_source(index, cores), interval, hostname=f"standin-{index:04d}")
+        await agent.start("127.0.0.1:0")
+        port = agent.sockets[0].getsockname()[1]
+        agents.append(agent)
+        endpoints.append(f"127.0.0.1:{port}")
+    return agents, endpoints
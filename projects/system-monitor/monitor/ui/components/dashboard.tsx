@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { 
   LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer,
   BarChart, Bar, PieChart, Pie, Cell
@@ -42,8 +42,7 @@ const generateData = () => {
       ],
       history: Array(30).fill().map((_, i) => ({
         time: new Date(now.getTime() - (29 - i) * 5000).toLocaleTimeString(),
-        read: Math.random() * 15,
-        write: Math.random() * 8
+        value: Math.random() * 23
       }))
     },
     network: {
@@ -55,8 +54,7 @@ const generateData = () => {
       ],
       history: Array(30).fill().map((_, i) => ({
         time: new Date(now.getTime() - (29 - i) * 5000).toLocaleTimeString(),
-        download: Math.random() * 5,
-        upload: Math.random() * 2
+        value: Math.random() * 7
       }))
     },
     processes: {
@@ -74,6 +72,165 @@ const generateData = () => {
   };
 };
 
+// Split a dotted key path into its keys; dots and backslashes inside a key
+// (mountpoints, VLAN interfaces) are escaped with a backslash
+const splitPath = (path) => {
+  const parts = [''];
+  for (let i = 0; i < path.length; i++) {
+    if (path[i] === '\\') {
+      i++;
+      parts[parts.length - 1] += path[i] || '';
+    } else if (path[i] === '.') {
+      parts.push('');
+    } else {
+      parts[parts.length - 1] += path[i];
+    }
+  }
+  return parts;
+};
+
+// Apply a value at a dotted path, copying each object on the way so React
+// sees a new reference for every section that changed
+const setPath = (root, path, update) => {
+  const parts = splitPath(path);
+  const copy = Array.isArray(root) ? [...root] : { ...root };
+  let node = copy;
+  for (let i = 0; i < parts.length - 1; i++) {
+    const child = node[parts[i]];
+    node[parts[i]] = child && typeof child === 'object'
+      ? (Array.isArray(child) ? [...child] : { ...child })
+      : {};
+    node = node[parts[i]];
+  }
+  const key = parts[parts.length - 1];
+  if (update === undefined) {
+    delete node[key];
+  } else {
+    node[key] = update(node[key]);
+  }
+  return copy;
+};
+
+// Apply a delta message from the streaming server to the current state
+const applyDelta = (state, message) => {
+  let data = state.data;
+  Object.entries(message.set || {}).forEach(([path, value]) => {
+    data = setPath(data, path, () => value);
+  });
+  Object.entries(message.patch || {}).forEach(([path, changes]) => {
+    data = setPath(data, path, (values) => {
+      const next = [...(values || [])];
+      Object.entries(changes).forEach(([index, value]) => { next[Number(index)] = value; });
+      return next;
+    });
+  });
+  Object.entries(message.append || {}).forEach(([path, points]) => {
+    data = setPath(data, path, (values) => [...(values || []), ...points].slice(-state.history_size));
+  });
+  (message.remove || []).forEach((path) => {
+    data = setPath(data, path, undefined);
+  });
+  return { ...state, seq: message.seq, ts: message.ts, data };
+};
+
+// Subscribe to a streaming server (`python -m monitor --ws-port PORT`).
+// The server sends one snapshot on connect and then deltas carrying only
+// changed fields and appended history points.
+const useMonitorStream = (url) => {
+  const [stream, setStream] = useState(null);
+  const stateRef = useRef(null);
+  
+  useEffect(() => {
+    if (!url) return undefined;
+    let socket = null;
+    let retryTimer = null;
+    let closed = false;
+    
+    const connect = () => {
+      socket = new WebSocket(url);
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'snapshot') {
+          stateRef.current = message;
+        } else if (stateRef.current && message.seq === stateRef.current.seq + 1) {
+          stateRef.current = applyDelta(stateRef.current, message);
+        } else {
+          // Missed a message: reconnect to start again from a snapshot
+          socket.close();
+          return;
+        }
+        setStream(stateRef.current);
+      };
+      socket.onclose = () => {
+        stateRef.current = null;
+        if (!closed) retryTimer = setTimeout(connect, 2000);
+      };
+    };
+    
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (socket) socket.close();
+    };
+  }, [url]);
+  
+  return stream;
+};
+
+// Convert a streamed sample into the shape the widgets below render
+const toViewData = ({ data, ts, interval }) => {
+  const withTimes = (values = []) => values.map((value, i) => ({
+    time: new Date((ts - (values.length - 1 - i) * interval) * 1000).toLocaleTimeString(),
+    value
+  }));
+  const named = (items) => Array.isArray(items)
+    ? items
+    : Object.entries(items || {}).map(([name, fields]) => ({ name, ...fields }));
+  const cpu = data.cpu || {};
+  const memory = data.memory || {};
+  const disk = data.disk || {};
+  const network = data.network || {};
+  const processes = data.processes || {};
+  
+  return {
+    cpu: {
+      usage_percent: cpu.usage_percent || 0,
+      per_core_percent: cpu.per_core_percent || [],
+      temperature: cpu.temperature ? Math.round(cpu.temperature.celsius) : '--',
+      history: withTimes(cpu.history)
+    },
+    memory: {
+      usage_percent: memory.usage_percent || 0,
+      used: memory.used || 0,
+      total: memory.total || 0,
+      history: withTimes(memory.history)
+    },
+    disk: {
+      usage_percent: disk.usage_percent || 0,
+      read_speed: disk.read_speed || 0,
+      write_speed: disk.write_speed || 0,
+      partitions: named(disk.partitions),
+      history: withTimes(disk.history)
+    },
+    network: {
+      download_speed: network.download_speed || 0,
+      upload_speed: network.upload_speed || 0,
+      interfaces: named(network.interfaces),
+      history: withTimes(network.history)
+    },
+    processes: {
+      total: processes.total || 0,
+      list: (processes.processes || []).slice(0, 20).map((process) => ({
+        pid: process.pid,
+        name: process.name,
+        cpu: process.cpu_percent,
+        memory: process.memory_percent
+      }))
+    }
+  };
+};
+
 const UsageBar = ({ value, color }) => {
   const displayColor = value > 90 ? 'bg-red-500' : 
                         value > 70 ? 'bg-yellow-500' : 
@@ -101,18 +258,23 @@ const IconLabel = ({ children, icon, color }) => {
   );
 };
 
-const SystemMonitor = () => {
-  const [data, setData] = useState(generateData());
+const SystemMonitor = ({ streamUrl = null }) => {
+  const [demoData, setDemoData] = useState(generateData());
   const [refreshInterval, setRefreshInterval] = useState(5);
   const [theme, setTheme] = useState('dark');
+  const stream = useMonitorStream(streamUrl);
   
+  // Without a stream URL the component shows generated demo data
   useEffect(() => {
+    if (streamUrl) return undefined;
     const interval = setInterval(() => {
-      setData(generateData());
+      setDemoData(generateData());
     }, refreshInterval * 1000);
     
     return () => clearInterval(interval);
-  }, [refreshInterval]);
+  }, [refreshInterval, streamUrl]);
+  
+  const data = stream ? toViewData(stream) : demoData;
   
   const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042'];
   
@@ -144,7 +306,7 @@ const SystemMonitor = () => {
             ⚙️
           </button>
           <button 
-            onClick={() => setData(generateData())}
+            onClick={() => setDemoData(generateData())}
             className="p-2 rounded hover:bg-gray-700"
           >
             🔄
@@ -300,8 +462,7 @@ const SystemMonitor = () => {
                   <YAxis />
                   <Tooltip />
                   <Legend />
-                  <Bar dataKey="read" fill="#eab308" name="Read MB/s" />
-                  <Bar dataKey="write" fill="#f59e0b" name="Write MB/s" />
+                  <Bar dataKey="value" fill="#eab308" name="Disk I/O MB/s" />
                 </BarChart>
               </ResponsiveContainer>
             </div>
@@ -350,19 +511,11 @@ const SystemMonitor = () => {
                 <Legend />
                 <Line 
                   type="monotone" 
-                  dataKey="download" 
+                  dataKey="value" 
                   stroke="#22c55e" 
                   strokeWidth={2} 
                   dot={false} 
-                  name="Download MB/s" 
-                />
-                <Line 
-                  type="monotone" 
-                  dataKey="upload" 
-                  stroke="#3b82f6" 
-                  strokeWidth={2} 
-                  dot={false} 
-                  name="Upload MB/s" 
+                  name="Network MB/s" 
                 />
               </LineChart>
             </ResponsiveContainer>
@@ -427,7 +580,7 @@ const SystemMonitor = () => {
       </div>
       
       <footer className="mt-4 text-center text-gray-500 text-sm">
-        Linux System Monitor v1.0.0 • Data refreshes every {refreshInterval} seconds • Press 'q' to quit
+        Linux System Monitor v1.0.0 • {stream ? `Streaming from ${streamUrl}` : `Data refreshes every ${refreshInterval} seconds`} • Press 'q' to quit
       </footer>
     </div>
   );
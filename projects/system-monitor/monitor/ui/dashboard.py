@@ -4,18 +4,50 @@ Dashboard Module for Linux System Monitor
 This module handles the rendering of the main dashboard UI.
 """
 
+import json
+import os
 import time
 from typing import Dict, List, Optional
 
 from blessed import Terminal
 
+from monitor.collectors.records import json_default
 from monitor.config import Config
+from monitor.instrumentation import Instrumentation
+from monitor.processors.delta import SampleDelta
+from monitor.processors.forecast import format_duration
+from monitor.ui.heatmap import CoreHeatmap
+from monitor.ui.keybindings import KeyBindings
 from monitor.ui.layout_manager import LayoutManager
-from monitor.ui.widgets.cpu_widget import CPUWidget
-from monitor.ui.widgets.memory_widget import MemoryWidget
-from monitor.ui.widgets.disk_widget import DiskWidget
-from monitor.ui.widgets.network_widget import NetworkWidget
-from monitor.ui.widgets.process_widget import ProcessWidget
+
+# Views selectable with the number keys; None means the configured layout
+VIEWS = {
+    "1": None,
+    "2": ["cpu"],
+    "3": ["processes"],
+    "4": ["disk", "network"],
+    "5": ["containers"],
+    "6": ["interrupts"],
+    "7": ["sockets"],
+    "8": ["threads"],
+}
+
+# Per-core display modes for the CPU widget
+CPU_VIEWS = ["auto", "list", "heatmap"]
+
+# Process list sort orders mapped to the process field they sort by
+SORT_KEYS = {
+    "cpu": "cpu_percent",
+    "memory": "memory_percent",
+    "disk": "disk_io",
+}
+
+# The same sort orders applied to the container (cgroup) list
+CONTAINER_SORT_KEYS = {
+    "cpu": "cpu_percent",
+    "memory": "memory_current",
+    "disk": "io_rate",
+}
 
 
 class Dashboard:
@@ -29,7 +61,8 @@ class Dashboard:
     - Coordinating updates across widgets
     """
     
-    def __init__(self, term: Terminal, layout_manager: LayoutManager, config: Config):
+    def __init__(self, term: Terminal, layout_manager: LayoutManager, config: Config,
+                 instrumentation: Optional[Instrumentation] = None):
         """
         Initialize the dashboard.
         
@@ -37,6 +70,8 @@ class Dashboard:
             term: Blessed Terminal instance
             layout_manager: Layout manager for UI components
             config: Application configuration
+            instrumentation: Records layout and render latency and terminal
+                output per frame when given
         """
         self.term = term
         self.layout_manager = layout_manager
@@ -66,6 +101,22 @@ class Dashboard:
                 "render": self._render_processes_placeholder,
                 "data": {},
             },
+            "containers": {
+                "render": self._render_containers_placeholder,
+                "data": {},
+            },
+            "interrupts": {
+                "render": self._render_interrupts_placeholder,
+                "data": {},
+            },
+            "sockets": {
+                "render": self._render_sockets_placeholder,
+                "data": {},
+            },
+            "threads": {
+                "render": self._render_threads_placeholder,
+                "data": {},
+            },
         }
         
         # Set the active widget (for navigation)
@@ -74,27 +125,176 @@ class Dashboard:
         # Initialize help panel data
         self.show_help = False
         
+        # Monitor overhead panel, fed by the instrumentation
+        self.show_overhead = False
+        self.instrumentation = instrumentation
+        if instrumentation:
+            instrumentation.instrument(layout_manager, "get_layout", "layout")
+            instrumentation.instrument(layout_manager, "get_focus_layout", "layout")
+            instrumentation.instrument_frame(self, "render")
+        
         # Initialize alert list
         self.alerts = []
+        
+        # Interactive state driven by key bindings
+        self.view = "1"
+        self.sort_key = "cpu"
+        self.selected_process = 0
+        self.use_color = True
+        self.cpu_view = config.display.cpu_view
+        self.data: Dict = {}
+        self._delta_sequence = 0
+        
+        # Per-core heatmap for machines with many cores
+        self.heatmap = CoreHeatmap(term)
+        self._heatmap_groups_cache = (None, [])
     
-    def update(self, data: Dict):
+    def bind_keys(self, bindings: KeyBindings):
         """
-        Update the dashboard with new data.
+        Register the dashboard's key bindings.
         
         Args:
-            data: Dictionary containing processed system data
+            bindings: Key binding dispatcher to register with
+        """
+        bindings.set_fallback(self._close_help_on_key)
+        bindings.bind("h", self.toggle_help, "Toggle help panel")
+        for key in VIEWS:
+            bindings.bind(key, lambda key=key: self.set_view(key))
+        bindings.bind("KEY_UP", lambda: self.move_selection(-1))
+        bindings.bind("KEY_DOWN", lambda: self.move_selection(1))
+        bindings.bind("p", lambda: self.set_sort_key("cpu"), "Sort processes by CPU usage")
+        bindings.bind("m", lambda: self.set_sort_key("memory"), "Sort processes by memory usage")
+        bindings.bind("d", lambda: self.set_sort_key("disk"), "Sort processes by disk I/O")
+        bindings.bind("s", self.take_snapshot, "Take a snapshot of current stats")
+        bindings.bind("c", self.toggle_color, "Toggle color mode")
+        bindings.bind("v", self.cycle_cpu_view, "Cycle per-core view (auto, list, heatmap)")
+        bindings.bind("o", self.toggle_overhead, "Toggle the monitor overhead panel")
+    
+    def toggle_help(self):
+        """Show or hide the help panel."""
+        self.show_help = not self.show_help
+    
+    def toggle_overhead(self):
+        """Show or hide the monitor overhead panel."""
+        self.show_overhead = not self.show_overhead
+    
+    def set_view(self, view: str):
+        """
+        Switch to one of the views in VIEWS.
+        
+        Args:
+            view: View key ("1"-"8")
+        """
+        if view in VIEWS:
+            self.view = view
+    
+    def move_selection(self, step: int):
+        """
+        Move the process list selection.
+        
+        Args:
+            step: Number of rows to move (negative moves up)
+        """
+        count = len(self.widgets["processes"]["data"].get("processes", []))
+        self.selected_process = max(0, min(self.selected_process + step, count - 1))
+    
+    def selected_pid(self) -> Optional[int]:
+        """
+        Get the PID of the selected row in the process list.
+        
+        Returns:
+            The PID, or None if the list is empty
+        """
+        sort_field = SORT_KEYS.get(self.sort_key, "cpu_percent")
+        processes = sorted(self.widgets["processes"]["data"].get("processes", []),
+                           key=lambda p: p.get(sort_field, 0), reverse=True)
+        if self.selected_process < len(processes):
+            return processes[self.selected_process].get("pid")
+        return None
+    
+    def set_sort_key(self, sort_key: str):
+        """
+        Change the process list sort order.
+        
+        Args:
+            sort_key: One of the keys in SORT_KEYS
+        """
+        if sort_key in SORT_KEYS:
+            self.sort_key = sort_key
+            self.selected_process = 0
+    
+    def toggle_color(self):
+        """Switch between colored and monochrome rendering."""
+        self.use_color = not self.use_color
+    
+    def cycle_cpu_view(self):
+        """Cycle the CPU widget through the auto, list and heatmap views."""
+        self.cpu_view = CPU_VIEWS[(CPU_VIEWS.index(self.cpu_view) + 1) % len(CPU_VIEWS)]
+    
+    def take_snapshot(self) -> Optional[str]:
         """
-        # Update each widget's data
-        for widget_name in self.widgets:
-            if widget_name in data:
-                self.widgets[widget_name]["data"] = data[widget_name]
+        Write the most recent data to the snapshot directory.
         
-        # Update alerts
+        Returns:
+            Path of the snapshot file, or None if it could not be written
+        """
+        snapshot_dir = os.path.expanduser(self.config.export.snapshot_path)
+        filename = time.strftime("snapshot-%Y%m%d-%H%M%S.json", time.localtime())
+        path = os.path.join(snapshot_dir, filename)
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(self.data, f, indent=2, default=json_default)
+        except OSError:
+            return None
+        return path
+    
+    def _close_help_on_key(self, key: str) -> bool:
+        """Close the help panel on any key other than 'h' and 'q'."""
+        if self.show_help and key not in ("h", "q"):
+            self.show_help = False
+            return True
+        return False
+    
+    def update(self, delta: SampleDelta):
+        """
+        Update the dashboard with the changes of a new sample.
+        
+        Only widgets whose resource changed are handed new data, and a
+        sample that changed nothing only redraws the clock.
+        
+        Args:
+            delta: Delta of the processed sample from the previous one
+        """
+        data = delta.sample
+        self.data = data
+        if delta.full or not delta.follows(self._delta_sequence):
+            changed_widgets = self.widgets.keys()
+        else:
+            changed_widgets = delta.sections
+        self._delta_sequence = delta.sequence
+        
+        # Update the data of the widgets that changed; a resource missing
+        # from the sample (another fleet host, a section that went away)
+        # must not leave the previous data on screen
+        for widget_name in changed_widgets:
+            if widget_name in self.widgets:
+                self.widgets[widget_name]["data"] = data.get(widget_name, {})
+        
+        # Update alerts (this also expires old ones)
         if "alerts" in data:
             self.update_alerts(data["alerts"])
         
         # Render the dashboard
-        self.render()
+        if delta:
+            self.render()
+        else:
+            self.refresh_clock()
+    
+    def refresh_clock(self):
+        """Redraw the header, whose clock moves on even when no new sample arrives."""
+        with self.term.location():
+            self._render_header()
     
     def render(self):
         """Render the complete dashboard."""
@@ -107,8 +307,12 @@ class Dashboard:
         # Print header
         self._render_header()
         
-        # Get layout for current display mode
-        layout = self.layout_manager.get_layout(width, height)
+        # Get layout for current display mode, or the focused view
+        focus = VIEWS.get(self.view)
+        if focus:
+            layout = self.layout_manager.get_focus_layout(focus, width, height)
+        else:
+            layout = self.layout_manager.get_layout(width, height)
         
         # Render each widget according to layout
         for widget_name, widget_layout in layout.items():
@@ -118,7 +322,9 @@ class Dashboard:
                 with self.term.location(x, y):
                     self.widgets[widget_name]["render"](w, h, self.widgets[widget_name]["data"])
         
-        # Render help panel if active
+        # Render the overhead panel and the help panel if active
+        if self.show_overhead:
+            self._render_overhead_panel()
         if self.show_help:
             self._render_help_panel()
         
@@ -162,7 +368,7 @@ class Dashboard:
         """Render the help panel overlay."""
         # Create a centered box
         width = min(60, self.term.width - 4)
-        height = min(15, self.term.height - 4)
+        height = min(18, self.term.height - 4)
         x = (self.term.width - width) // 2
         y = (self.term.height - height) // 2
         
@@ -176,13 +382,16 @@ class Dashboard:
                 "",
                 "q - Quit the application",
                 "h - Toggle help panel",
-                "1-4 - Switch between different views",
+                "1-8 - Switch views (5: cgroups, 6: IRQs, 7: sockets, 8: threads)",
                 "↑/↓ - Navigate process list",
+                "t - Show the threads of the selected process",
                 "p - Sort processes by CPU usage",
                 "m - Sort processes by memory usage",
                 "d - Sort processes by disk I/O",
                 "s - Take a snapshot of current stats",
                 "c - Toggle color mode",
+                "v - Cycle per-core view (auto, list, heatmap)",
+                "o - Toggle the monitor overhead panel",
                 "r - Reset statistics",
                 "",
                 "Press any key to close help"
@@ -193,6 +402,44 @@ class Dashboard:
                     with self.term.location(x + 2, y + i + 2):
                         print(line)
     
+    def _render_overhead_panel(self):
+        """Render the monitor overhead overlay: per-stage latency and output size."""
+        # Stages measured in this process (layout, render, output), on top
+        # of those from the sample, which may come from the dashboard that
+        # collects for this host
+        snapshot = dict(self.data.get("instrumentation") or {})
+        stages = dict(snapshot.get("stages", {}))
+        if self.instrumentation:
+            local = self.instrumentation.snapshot()
+            stages.update(local["stages"])
+            snapshot.update(frame_bytes=local["frame_bytes"], frames=local["frames"],
+                            output_bytes=local["output_bytes"], cpu_percent=local["cpu_percent"])
+        
+        if stages:
+            lines = [f"{'Stage':<21}{'Calls':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'Max':>8}", ""]
+            for stage, summary in stages.items():
+                lines.append(f"{stage[:20]:<21}{summary['count']:>7}" + "".join(
+                    f"{summary[key] * 1000:>8.2f}" for key in ("p50", "p95", "p99", "max")))
+            lines.append("")
+            lines.append("Latency in ms")
+            frames = snapshot.get("frames", 0)
+            average = snapshot.get("output_bytes", 0) / frames if frames else 0
+            lines.append(f"Output: {snapshot.get('frame_bytes', 0)} bytes last frame, {average:.0f} average")
+            lines.append(f"Monitor CPU: {snapshot.get('cpu_percent', 0):.1f}%")
+        else:
+            lines = ["", "Instrumentation is off.", "Start the monitor with --instrument to measure it."]
+        
+        width = min(62, self.term.width - 4)
+        height = min(len(lines) + 2, self.term.height - 4)
+        x = self.term.width - width - 2
+        y = 2
+        
+        with self.term.location(x, y):
+            print(self.term.white_on_blue + "Monitor Overhead".center(width) + self.term.normal)
+        for i, line in enumerate(lines[:height - 1]):
+            with self.term.location(x, y + i + 1):
+                print(self.term.black_on_white + line[:width].ljust(width) + self.term.normal)
+    
     def _render_alerts(self):
         """Render alert notifications."""
         # Only show the last 3 alerts
@@ -215,6 +462,16 @@ class Dashboard:
                 with self.term.location(x + 1, y + i + 2):
                     print(f"{level_color}{alert['resource'].upper()}: {alert['message']}{self.term.normal}")
     
+    def _usage_color(self, usage_percent: float) -> str:
+        """Get the bar color for a usage percentage (empty in monochrome mode)."""
+        if not self.use_color:
+            return ""
+        if usage_percent > 90:
+            return self.term.red
+        elif usage_percent > 70:
+            return self.term.yellow
+        return self.term.green
+    
     # Placeholder rendering functions for widgets
     # In a full implementation, these would be replaced by proper widget classes
     
@@ -234,25 +491,32 @@ class Dashboard:
         filled = int(bar_width * usage_percent / 100)
         
         # Choose color based on usage
-        if usage_percent > 90:
-            bar_color = self.term.red
-        elif usage_percent > 70:
-            bar_color = self.term.yellow
-        else:
-            bar_color = self.term.green
+        bar_color = self._usage_color(usage_percent)
         
         print("│ " + bar_color + "█" * filled + self.term.normal + "░" * (bar_width - filled) + f" {usage_percent:3.1f}% │")
         
         # Per-core info (if available)
         per_core = data.get("per_core_percent", [])
-        if per_core and height > 6:
+        body_height = height - 4  # Borders, title and usage bar
+        rows_used = 0
+        
+        # Mean usage per NUMA node (or socket), so one saturated node
+        # stands out on multi-socket machines
+        group_line = self._cpu_group_line(data.get("topology", {}), width - 4)
+        if group_line and body_height > 2:
+            print("│ " + group_line + " │")
+            body_height -= 1
+        
+        # Display up to 4 cores per line
+        cores_per_line = max(1, min(4, (width - 4) // 10))
+        core_lines = (len(per_core) + cores_per_line - 1) // cores_per_line
+        
+        if per_core and self._use_cpu_heatmap(core_lines, height):
+            rows_used = self._render_cpu_heatmap(per_core, data.get("groups", {}), width, body_height)
+        elif per_core and height > 6:
             print("│ " + " " * (width - 4) + " │")
             print("│ " + self.term.bold("Per Core:") + " " * (width - 12) + " │")
             
-            # Display up to 4 cores per line
-            cores_per_line = min(4, (width - 4) // 10)
-            core_lines = (len(per_core) + cores_per_line - 1) // cores_per_line
-            
             for i in range(min(core_lines, height - 7)):
                 core_info = ""
                 for j in range(cores_per_line):
@@ -262,13 +526,107 @@ class Dashboard:
                         core_info += f"C{core_idx}: {core_usage:4.1f}% "
                 
                 print("│ " + core_info + " " * (width - 2 - len(core_info)) + "│")
+            rows_used = 2 + min(core_lines, height - 7)
         
         # Draw bottom border
-        for i in range(height - 5 - min(len(per_core) // 4 + 1, height - 7)):
+        for i in range(body_height - rows_used):
             print("│" + " " * (width - 2) + "│")
         
         print("└" + "─" * (width - 2) + "┘")
     
+    def _cpu_group_line(self, topology: Dict, width: int) -> str:
+        """
+        Format mean usage per NUMA node, or per socket on single-node machines.
+        
+        Args:
+            topology: Per-level aggregates from the processor
+            width: Characters available
+            
+        Returns:
+            The padded line, or an empty string on single-socket machines
+        """
+        for level, prefix in (("node", "N"), ("socket", "S")):
+            aggregate = topology.get(level, {})
+            if len(aggregate.get("ids", [])) > 1:
+                break
+        else:
+            return ""
+        
+        line = ""
+        length = 0
+        for group_id, mean in zip(aggregate["ids"], aggregate["mean"]):
+            cell = f"{prefix}{group_id} {mean:3.0f}% "
+            if length + len(cell) > width:
+                break
+            line += self._usage_color(mean) + cell + self.term.normal
+            length += len(cell)
+        return line + " " * (width - length)
+    
+    def _use_cpu_heatmap(self, core_lines: int, height: int) -> bool:
+        """Decide whether the CPU widget shows the per-core heatmap or the list."""
+        if self.cpu_view == "auto":
+            # Fall back to the heatmap as soon as the list would cut cores off
+            return core_lines > height - 7
+        return self.cpu_view == "heatmap"
+    
+    def _render_cpu_heatmap(self, per_core: List[float], groups: Dict, width: int, body_height: int) -> int:
+        """
+        Render per-core usage as a heatmap inside the CPU widget.
+        
+        Args:
+            per_core: Per-core usage percentages
+            groups: Socket and NUMA node ids per logical CPU from the collector
+            width: Widget width
+            body_height: Rows available inside the widget
+            
+        Returns:
+            Number of rows printed
+        """
+        if body_height <= 0:
+            return 0
+        
+        self.heatmap.set_color(self.use_color)
+        inner_width = width - 4
+        show_header = body_height >= 3
+        cell_rows = body_height - 1 if show_header else body_height
+        
+        lines, cores_per_cell = self.heatmap.render(
+            per_core, inner_width, cell_rows, self._heatmap_groups(groups, len(per_core))
+        )
+        
+        if show_header:
+            header = "Per Core:" if cores_per_cell == 1 else f"Per Core (max of {cores_per_cell}/cell):"
+            header = header[:inner_width]
+            print("│ " + self.term.bold(header) + " " * (inner_width - len(header)) + " │")
+        
+        for line in lines:
+            print("│ " + line + " │")
+        
+        return len(lines) + (1 if show_header else 0)
+    
+    def _heatmap_groups(self, groups: Dict, core_count: int) -> List:
+        """
+        Group logical CPUs by NUMA node, or by socket on single-node machines.
+        
+        The grouping only changes when the topology does, so it is cached.
+        """
+        key = (id(groups), core_count)
+        if self._heatmap_groups_cache[0] == key:
+            return self._heatmap_groups_cache[1]
+        
+        result = [("", list(range(core_count)))]
+        for kind, prefix in (("node", "N"), ("socket", "S")):
+            ids = groups.get(kind, [])
+            if len(set(ids)) > 1:
+                by_id: Dict[int, List[int]] = {}
+                for cpu in range(core_count):
+                    by_id.setdefault(ids[cpu] if cpu < len(ids) else 0, []).append(cpu)
+                result = [(f"{prefix}{group_id}", cpus) for group_id, cpus in sorted(by_id.items())]
+                break
+        
+        self._heatmap_groups_cache = (key, result)
+        return result
+    
     def _render_memory_placeholder(self, width: int, height: int, data: Dict):
         """Render memory widget placeholder."""
         # Draw border
@@ -285,12 +643,7 @@ class Dashboard:
         filled = int(bar_width * usage_percent / 100)
         
         # Choose color based on usage
-        if usage_percent > 90:
-            bar_color = self.term.red
-        elif usage_percent > 70:
-            bar_color = self.term.yellow
-        else:
-            bar_color = self.term.green
+        bar_color = self._usage_color(usage_percent)
         
         print("│ " + bar_color + "█" * filled + self.term.normal + "░" * (bar_width - filled) + f" {usage_percent:3.1f}% │")
         
@@ -303,8 +656,16 @@ class Dashboard:
         print(f"│ Used: {used:.1f} GB / Total: {total:.1f} GB " + " " * (width - 30) + " │")
         print(f"│ Free: {free:.1f} GB " + " " * (width - 17) + " │")
         
+        # Projected time until memory or swap is full, while filling
+        trends = []
+        for label, key in (("Memory", "time_to_full"), ("Swap", "swap_time_to_full")):
+            if data.get(key) is not None:
+                trends.append(f"{label} full in {format_duration(data[key])}")
+        for trend in trends:
+            print("│ " + trend[:width - 4] + " " * max(0, width - 4 - len(trend)) + " │")
+        
         # Draw bottom border
-        for i in range(height - 7):
+        for i in range(height - 7 - len(trends)):
             print("│" + " " * (width - 2) + "│")
         
         print("└" + "─" * (width - 2) + "┘")
@@ -331,8 +692,28 @@ class Dashboard:
         print(f"│ Read:  {read_speed:.1f} MB/s " + " " * (width - 19) + " │")
         print(f"│ Write: {write_speed:.1f} MB/s " + " " * (width - 19) + " │")
         
+        # Per-filesystem usage, fullest first
+        partitions = sorted(data.get("partitions", {}).items(),
+                            key=lambda item: item[1].get("usage_percent", 0), reverse=True)
+        rows = []
+        for mountpoint, partition in partitions[:max(0, height - 9)]:
+            if partition.get("responsive", True):
+                size_gb = partition.get("total", 0) / (1024 ** 3)
+                usage = f"{partition.get('usage_percent', 0):5.1f}% of {size_gb:7.1f} GB"
+            else:
+                usage = "not responding"
+            row = f"{usage:>21}  {mountpoint}"
+            if partition.get("time_to_full") is not None:
+                row += f"  full in {format_duration(partition['time_to_full'])}"
+            rows.append(row)
+        if rows:
+            rows.insert(0, "")
+        
+        for row in rows:
+            print("│ " + row[:width - 4] + " " * max(0, width - 4 - len(row)) + " │")
+        
         # Draw bottom border
-        for i in range(height - 8):
+        for i in range(height - 8 - len(rows)):
             print("│" + " " * (width - 2) + "│")
         
         print("└" + "─" * (width - 2) + "┘")
@@ -374,8 +755,9 @@ class Dashboard:
         # Header
         print("│ " + self.term.bold("PID    CPU%  MEM%  Command") + " " * (width - 27) + " │")
         
-        # Process list
-        processes = data.get("processes", [])
+        # Process list in the selected sort order
+        sort_field = SORT_KEYS[self.sort_key]
+        processes = sorted(data.get("processes", []), key=lambda p: p.get(sort_field, 0), reverse=True)
         for i in range(min(len(processes), height - 5)):
             proc = processes[i]
             pid = proc.get("pid", 0)
@@ -388,10 +770,207 @@ class Dashboard:
             if len(name) > max_name_len:
                 name = name[:max_name_len - 3] + "..."
             
-            print(f"│ {pid:5} {cpu:5.1f}% {mem:5.1f}% {name}" + " " * (width - 19 - len(name)) + " │")
+            row = f"{pid:5} {cpu:5.1f}% {mem:5.1f}% {name}" + " " * (width - 19 - len(name))
+            if i == self.selected_process:
+                row = self.term.reverse(row)
+            print("│ " + row + " │")
+        rows_used = min(len(processes), height - 5)
+        
+        # Proportional memory from smaps_rollup, with the age of each reading
+        memory = data.get("memory", {})
+        if memory.get("available") and height - 5 - rows_used >= 3:
+            rows = [
+                "",
+                self.term.bold(f"Memory (PSS, {memory.get('coverage', 0) * 100:.0f}% of processes measured)"),
+                self.term.bold("  PID    PSS MB   USS MB  Swap MB   Age  Command"),
+            ]
+            for entry in memory.get("processes", []):
+                rows.append(f"{entry.get('pid', 0):5} {entry.get('pss', 0) / (1024 * 1024):9.1f} "
+                            f"{entry.get('uss', 0) / (1024 * 1024):8.1f} {entry.get('swap', 0) / (1024 * 1024):8.1f} "
+                            f"{entry.get('age', 0):4.0f}s  {entry.get('name', '')}")
+            for row in rows[:height - 5 - rows_used]:
+                visible = self.term.length(row)
+                if visible > width - 4:
+                    row = self.term.truncate(row, width - 4)
+                    visible = width - 4
+                print("│ " + row + " " * (width - 4 - visible) + " │")
+            rows_used += min(len(rows), height - 5 - rows_used)
         
         # Empty lines if fewer processes
-        for i in range(height - 5 - min(len(processes), height - 5)):
+        for i in range(height - 5 - rows_used):
+            print("│" + " " * (width - 2) + "│")
+        
+        print("└" + "─" * (width - 2) + "┘")
+    
+    def _render_containers_placeholder(self, width: int, height: int, data: Dict):
+        """Render the per-cgroup (container) list."""
+        # Draw border
+        print("┌" + "─" * (width - 2) + "┐")
+        
+        # Title
+        title = f" Containers ({data.get('count', 0)} cgroups) "
+        padding = (width - len(title) - 2) // 2
+        print("│" + " " * padding + self.term.bold(title) + " " * (width - 2 - padding - len(title)) + "│")
+        
+        # Header
+        header = "  CPU%     MEM   IO MB/s  PSI cpu  Cgroup"
+        print("│ " + self.term.bold(header[:width - 4]) + " " * max(0, width - 4 - len(header)) + " │")
+        
+        if not data.get("available", False):
+            message = "cgroup v2 is not available"
+            rows = [message[:width - 4]]
+        else:
+            # Container list in the selected sort order
+            sort_field = CONTAINER_SORT_KEYS[self.sort_key]
+            cgroups = sorted(data.get("cgroups", []), key=lambda c: c.get(sort_field, 0), reverse=True)
+            rows = []
+            for cgroup in cgroups[:max(0, height - 5)]:
+                memory_mb = cgroup.get("memory_current", 0) / (1024 * 1024)
+                io_mb = cgroup.get("io_rate", 0) / (1024 * 1024)
+                name = cgroup.get("name", "")
+                
+                # Keep the end of the path, which names the container
+                max_name_len = width - 46
+                if len(name) > max_name_len:
+                    name = "..." + name[-(max_name_len - 3):]
+                
+                rows.append(f"{cgroup.get('cpu_percent', 0):6.1f} {memory_mb:6.0f}M {io_mb:9.2f} "
+                            f"{cgroup.get('cpu_pressure_some', 0):8.2f}  {name}")
+        
+        for row in rows[:max(0, height - 5)]:
+            print("│ " + row[:width - 4] + " " * max(0, width - 4 - len(row)) + " │")
+        
+        # Empty lines if fewer containers
+        for i in range(height - 5 - min(len(rows), max(0, height - 5))):
+            print("│" + " " * (width - 2) + "│")
+        
+        print("└" + "─" * (width - 2) + "┘")
+    
+    def _render_interrupts_placeholder(self, width: int, height: int, data: Dict):
+        """Render the hottest IRQs and the CPUs handling the most interrupts."""
+        # Draw border
+        print("┌" + "─" * (width - 2) + "┐")
+        
+        # Title
+        title = (f" Interrupts ({data.get('irq_rate', 0):,.0f} IRQ/s, "
+                 f"{data.get('softirq_rate', 0):,.0f} softirq/s) ")
+        padding = (width - len(title) - 2) // 2
+        print("│" + " " * padding + self.term.bold(title) + " " * (width - 2 - padding - len(title)) + "│")
+        
+        if not data.get("available", False):
+            rows = ["/proc/interrupts is not available"]
+        else:
+            # Busiest IRQs, with the share taken by their busiest CPU; a
+            # share near 100% on a busy IRQ means its affinity is pinned
+            irq_rows = max(0, (height - 6) // 2)
+            rows = [self.term.bold("   IRQ       /s   CPU  Share  Device")]
+            for irq in data.get("top_irqs", [])[:irq_rows]:
+                rows.append(f"{irq.get('irq', ''):>6} {irq.get('rate', 0):8.0f} {irq.get('top_cpu', 0):5} "
+                            f"{irq.get('top_cpu_share', 0):5.0f}%  {irq.get('name', '')}")
+            rows.append("")
+            
+            # CPUs handling the most hardware and soft interrupts
+            rows.append(self.term.bold("   CPU    IRQ/s  Softirq/s"))
+            for cpu in data.get("top_cpus", []):
+                rows.append(f"{cpu.get('cpu', 0):6} {cpu.get('irq_rate', 0):8.0f} {cpu.get('softirq_rate', 0):10.0f}")
+        
+        for row in rows[:max(0, height - 3)]:
+            visible = self.term.length(row)
+            if visible > width - 4:
+                row = self.term.truncate(row, width - 4)
+                visible = width - 4
+            print("│ " + row + " " * (width - 4 - visible) + " │")
+        
+        # Empty lines if fewer rows
+        for i in range(height - 3 - min(len(rows), max(0, height - 3))):
+            print("│" + " " * (width - 2) + "│")
+        
+        print("└" + "─" * (width - 2) + "┘")
+    
+    def _render_sockets_placeholder(self, width: int, height: int, data: Dict):
+        """Render socket counts, listening ports, top peers and socket owners."""
+        # Draw border
+        print("┌" + "─" * (width - 2) + "┐")
+        
+        # Title
+        tcp = data.get("tcp", {})
+        title = (f" Sockets (tcp {tcp.get('total', 0)}, udp {data.get('udp', {}).get('total', 0)}, "
+                 f"unix {data.get('unix', {}).get('total', 0)}) ")
+        padding = (width - len(title) - 2) // 2
+        print("│" + " " * padding + self.term.bold(title) + " " * (width - 2 - padding - len(title)) + "│")
+        
+        if not data.get("available", False):
+            rows = ["/proc/net is not available"]
+        elif data.get("pending", False):
+            rows = ["Reading socket tables..."]
+        else:
+            rows = ["  ".join(f"{state} {count}" for state, count in sorted(tcp.get("states", {}).items(),
+                                                                           key=lambda item: -item[1])), ""]
+            
+            # Split the remaining rows between the three lists
+            section_rows = max(1, (height - 3 - len(rows)) // 3 - 2)
+            rows.append(self.term.bold("Listening  Proto  Port   PID     Process"))
+            for entry in data.get("listening", [])[:section_rows]:
+                rows.append(f"{entry.get('address', ''):>9}  {entry.get('protocol', ''):5} {entry.get('port', 0):5} "
+                            f"{entry.get('pid') or '-':>6}  {entry.get('process', '')}")
+            rows.append("")
+            rows.append(self.term.bold("Peer                             Conns"))
+            for peer in data.get("top_peers", [])[:section_rows]:
+                rows.append(f"{peer.get('address', ''):32} {peer.get('connections', 0):6}")
+            rows.append("")
+            rows.append(self.term.bold("   PID  Sockets  Process"))
+            for proc in data.get("top_processes", [])[:section_rows]:
+                rows.append(f"{proc.get('pid', 0):6} {proc.get('sockets', 0):8}  {proc.get('name', '')}")
+        
+        for row in rows[:max(0, height - 3)]:
+            visible = self.term.length(row)
+            if visible > width - 4:
+                row = self.term.truncate(row, width - 4)
+                visible = width - 4
+            print("│ " + row + " " * (width - 4 - visible) + " │")
+        
+        # Empty lines if fewer rows
+        for i in range(height - 3 - min(len(rows), max(0, height - 3))):
+            print("│" + " " * (width - 2) + "│")
+        
+        print("└" + "─" * (width - 2) + "┘")
+
+    def _render_threads_placeholder(self, width: int, height: int, data: Dict):
+        """Render the busiest threads of the selected process."""
+        # Draw border
+        print("┌" + "─" * (width - 2) + "┐")
+        
+        # Title
+        title = " Threads "
+        if data.get("available") and data.get("name"):
+            title = (f" Threads of {data.get('name')} ({data.get('pid')}): {data.get('thread_count', 0)}, "
+                     f"{data.get('cpu_percent', 0):.1f}% CPU ")
+        title = title[:width - 2]
+        padding = (width - len(title) - 2) // 2
+        print("│" + " " * padding + self.term.bold(title) + " " * (width - 2 - padding - len(title)) + "│")
+        
+        if not data.get("available", False):
+            rows = ["No process selected (select one with 't' in view 3, or start with --threads PID)"]
+        elif data.get("pending", False):
+            rows = [f"Reading the threads of process {data.get('pid')}..."]
+        elif data.get("exited", False):
+            rows = [f"Process {data.get('pid')} has exited"]
+        else:
+            rows = [self.term.bold("    TID  S  CPU   CPU%  Name")]
+            for thread in data.get("threads", []):
+                rows.append(f"{thread.get('tid', 0):7}  {thread.get('state', '?')} {thread.get('cpu', 0):4} "
+                            f"{self._usage_color(thread.get('cpu_percent', 0))}{thread.get('cpu_percent', 0):6.1f}"
+                            f"{self.term.normal}  {thread.get('name', '')}")
+        
+        for row in rows[:max(0, height - 3)]:
+            visible = self.term.length(row)
+            if visible > width - 4:
+                row = self.term.truncate(row, width - 4)
+                visible = width - 4
+            print("│ " + row + " " * (width - 4 - visible) + " │")
+        
+        # Empty lines if fewer rows
+        for i in range(height - 3 - min(len(rows), max(0, height - 3))):
             print("│" + " " * (width - 2) + "│")
         
         print("└" + "─" * (width - 2) + "┘")
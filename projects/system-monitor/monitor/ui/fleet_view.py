@@ -0,0 +1,201 @@
+"""
+Fleet View Module for Linux System Monitor
+
+This module renders the multi-host fleet view: one summary row per agent,
+fleet-wide top-N lists, and drill-down into the single-host dashboard.
+"""
+
+import asyncio
+import sys
+import time
+from typing import List, Optional
+
+from blessed import Terminal
+
+from monitor.config import Config
+from monitor.processors.delta import DeltaTracker
+from monitor.transport.fleet import FleetClient, HostState
+from monitor.ui.dashboard import Dashboard
+from monitor.ui.keybindings import KeyBindings
+from monitor.ui.layout_manager import LayoutManager
+
+# Fleet table sort orders mapped to the summary value they sort by
+FLEET_SORT_KEYS = {
+    "name": None,
+    "cpu": "cpu",
+    "memory": "memory",
+}
+
+
+class FleetView:
+    """
+    Terminal view over a FleetClient.
+    
+    The view is redrawn on a timer rather than per received frame, so the
+    rendering cost is independent of how many agents are publishing.
+    """
+    
+    def __init__(self, term: Terminal, client: FleetClient, config: Config, top_count: int = 5):
+        """
+        Initialize the fleet view.
+        
+        Args:
+            term: Blessed Terminal instance
+            client: Fleet client providing host states
+            config: Application configuration
+            top_count: Number of hosts in each top-N list
+        """
+        self.term = term
+        self.client = client
+        self.config = config
+        self.top_count = top_count
+        
+        self.sort_key = "name"
+        self.selected = 0
+        self.drill_host: Optional[HostState] = None
+        self._drill_tracker = DeltaTracker()
+        
+        # The drill-down reuses the single-host dashboard unchanged
+        self.dashboard = Dashboard(term, LayoutManager(term, config.display.layout), config)
+    
+    def bind_keys(self, bindings: KeyBindings):
+        """
+        Register the fleet view's key bindings.
+        
+        Args:
+            bindings: Key binding dispatcher to register with
+        """
+        bindings.bind("KEY_UP", lambda: self.move_selection(-1))
+        bindings.bind("KEY_DOWN", lambda: self.move_selection(1))
+        bindings.bind("KEY_ENTER", self.drill_down, "Show the selected host")
+        bindings.bind("KEY_ESCAPE", self.back, "Return to the fleet view")
+        bindings.bind("b", self.back)
+        bindings.bind("n", lambda: self.set_sort_key("name"), "Sort hosts by name")
+        bindings.bind("p", lambda: self.set_sort_key("cpu"), "Sort hosts by CPU usage")
+        bindings.bind("m", lambda: self.set_sort_key("memory"), "Sort hosts by memory usage")
+    
+    def move_selection(self, step: int):
+        """Move the host selection up or down."""
+        if self.drill_host is None:
+            self.selected = max(0, min(self.selected + step, len(self.client.hosts) - 1))
+    
+    def set_sort_key(self, sort_key: str):
+        """Change the host table sort order."""
+        if sort_key in FLEET_SORT_KEYS and self.drill_host is None:
+            self.sort_key = sort_key
+            self.selected = 0
+    
+    def drill_down(self):
+        """Open the single-host dashboard for the selected host."""
+        rows = self.client.rows(FLEET_SORT_KEYS[self.sort_key])
+        if rows:
+            self.drill_host = rows[self.selected]
+            # The dashboard takes sample deltas; a fresh tracker makes the
+            # first one full, so nothing of the previous host is kept
+            self._drill_tracker = DeltaTracker()
+    
+    def back(self):
+        """Return from the drill-down to the fleet table."""
+        self.drill_host = None
+    
+    def render(self):
+        """Render either the drill-down dashboard or the fleet table."""
+        if self.drill_host is not None:
+            self.dashboard.update(self._drill_tracker.update(self.drill_host.decoder.sample()))
+            return
+        
+        term = self.term
+        width, height = term.width, term.height
+        lines: List[str] = []
+        
+        # Header with fleet-wide aggregates
+        totals = self.client.totals()
+        header = (f"Fleet  |  {totals['connected']}/{totals['hosts']} connected  |  "
+                  f"avg CPU {totals['cpu_avg']:.1f}%  |  avg memory {totals['memory_avg']:.1f}%  |  "
+                  f"{time.strftime('%H:%M:%S')}  |  Enter: drill down, q: quit")
+        lines.append(term.black_on_white(header[:width].ljust(width)))
+        lines.append("")
+        
+        # Top-N lists side by side
+        column = max(20, width // 2)
+        top_cpu = self.client.top("cpu", self.top_count)
+        top_memory = self.client.top("memory", self.top_count)
+        lines.append(term.bold(f"Top {self.top_count} by CPU".ljust(column)) + term.bold(f"Top {self.top_count} by memory"))
+        for i in range(self.top_count):
+            left = self._top_entry(top_cpu, i, "cpu").ljust(column)
+            right = self._top_entry(top_memory, i, "memory")
+            lines.append((left + right)[:width])
+        lines.append("")
+        
+        # Host table, scrolled so the selection stays visible
+        lines.append(term.bold(f"{'HOST':<24} {'STATUS':<12} {'CPU%':>6} {'MEM%':>6} {'DISK%':>6} "
+                               f"{'LOAD':>6} {'DOWN':>8} {'UP':>8} {'AGE':>6}"[:width]))
+        rows = self.client.rows(FLEET_SORT_KEYS[self.sort_key])
+        visible = max(1, height - len(lines) - 1)
+        first = max(0, min(self.selected - visible // 2, len(rows) - visible))
+        for index in range(first, min(len(rows), first + visible)):
+            line = self._host_row(rows[index])[:width]
+            if index == self.selected:
+                line = term.reverse(line.ljust(width))
+            lines.append(line)
+        
+        # One write per frame
+        sys.stdout.write(term.home + term.clear + "\n".join(lines))
+        sys.stdout.flush()
+    
+    def _top_entry(self, hosts: List[HostState], index: int, key: str) -> str:
+        """Format one line of a top-N list."""
+        if index >= len(hosts):
+            return ""
+        host = hosts[index]
+        return f" {index + 1:>2}. {host.hostname[:20]:<20} {host.summary[key]:5.1f}%"
+    
+    def _host_row(self, host: HostState) -> str:
+        """Format one host table row."""
+        summary = host.summary
+        age = host.age
+        age_text = f"{age:5.1f}s" if age != float("inf") else "     -"
+        status = host.status
+        if status == "connected" and age > max(5.0, 3 * self.config.general.update_interval):
+            status = "stale"
+        return (f"{host.hostname[:24]:<24} {status:<12} {summary['cpu']:6.1f} {summary['memory']:6.1f} "
+                f"{summary['disk']:6.1f} {summary['load']:6.2f} {summary['net_down']:8.2f} "
+                f"{summary['net_up']:8.2f} {age_text}")
+
+
+async def run_fleet_view(term: Terminal, client: FleetClient, config: Config, top_count: int = 5):
+    """
+    Run the fleet view until the user quits.
+    
+    Args:
+        term: Blessed Terminal instance
+        client: Fleet client (started by this function)
+        config: Application configuration
+        top_count: Number of hosts in each top-N list
+    """
+    loop = asyncio.get_running_loop()
+    view = FleetView(term, client, config, top_count)
+    done = loop.create_future()
+    
+    bindings = KeyBindings()
+    bindings.bind("q", lambda: done.done() or done.set_result(None), "Quit the application")
+    view.bind_keys(bindings)
+    
+    def on_input():
+        handled = False
+        key = term.inkey(timeout=0)
+        while key:
+            handled = bindings.dispatch(key) or handled
+            key = term.inkey(timeout=0)
+        if handled and not done.done():
+            view.render()
+    
+    client.start()
+    loop.add_reader(sys.stdin.fileno(), on_input)
+    try:
+        while not done.done():
+            view.render()
+            await asyncio.wait([done], timeout=config.general.update_interval)
+    finally:
+        loop.remove_reader(sys.stdin.fileno())
+        await client.stop()
@@ -0,0 +1,163 @@
+"""
+Heatmap Module for Linux System Monitor
+
+This module renders per-core CPU usage as a grid of colored cells, one cell
+per core, so that machines with hundreds of cores fit in a single widget.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from blessed import Terminal
+
+# 256-color palette from cool to hot (green -> yellow -> red), one entry per level
+COLOR_RAMP_256 = [22, 28, 34, 40, 76, 112, 148, 184, 214, 208, 202, 196]
+
+# Glyph ramp used when colors are disabled
+GLYPH_RAMP = " ░▒▓█"
+
+# Glyph used for every cell when colors are enabled
+CELL_GLYPH = "■"
+
+
+class CoreHeatmap:
+    """
+    Renders per-core usage as rows of single-character cells.
+    
+    The cell strings for every integer percentage are built once, so an
+    update is one list lookup per core followed by a single join. Cores are
+    grouped (by socket or NUMA node) with one labelled block per group, and
+    when the widget is too small to show one cell per core, adjacent cores
+    within a group are merged and the cell shows the busiest of them.
+    """
+    
+    def __init__(self, term: Terminal, use_color: bool = True):
+        """
+        Initialize the heatmap and precompute its palette.
+        
+        Args:
+            term: Blessed Terminal instance used for color sequences
+            use_color: Whether to render colored cells or a glyph ramp
+        """
+        self.term = term
+        self.use_color = use_color
+        self._lut = self._build_lookup_table(use_color)
+        self._layout_cache: Dict[Tuple, Tuple[int, int]] = {}
+    
+    def set_color(self, use_color: bool):
+        """
+        Switch between colored cells and the monochrome glyph ramp.
+        
+        Args:
+            use_color: Whether to render colored cells
+        """
+        if use_color != self.use_color:
+            self.use_color = use_color
+            self._lut = self._build_lookup_table(use_color)
+    
+    def _build_lookup_table(self, use_color: bool) -> List[str]:
+        """
+        Precompute the cell string for every integer percentage 0-100.
+        
+        Args:
+            use_color: Whether to build colored cells
+        
+        Returns:
+            List of 101 cell strings indexed by percentage
+        """
+        if not use_color:
+            return [GLYPH_RAMP[min(len(GLYPH_RAMP) - 1, pct * len(GLYPH_RAMP) // 101)] for pct in range(101)]
+        
+        if self.term.number_of_colors >= 256:
+            ramp = [self.term.color(code) for code in COLOR_RAMP_256]
+        else:
+            ramp = [self.term.green, self.term.yellow, self.term.red]
+        
+        return [ramp[min(len(ramp) - 1, pct * len(ramp) // 101)] + CELL_GLYPH for pct in range(101)]
+    
+    def fit(self, groups: List[Tuple[str, List[int]]], width: int, rows: int) -> Tuple[int, int]:
+        """
+        Work out how many cores each cell represents so every group fits.
+        
+        The result depends only on the group shape and widget size, so it is
+        cached and recomputed only when either changes.
+        
+        Args:
+            groups: List of (label, cpu indices) tuples
+            width: Available width in characters
+            rows: Available number of rows
+        
+        Returns:
+            Tuple of (cores per cell, label width)
+        """
+        key = (width, rows, tuple((label, len(cpus)) for label, cpus in groups))
+        cached = self._layout_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        label_width = max((len(label) for label, _ in groups), default=0)
+        if label_width:
+            label_width += 1
+        columns = max(1, width - label_width)
+        
+        cores_per_cell = 1
+        largest = max((len(cpus) for _, cpus in groups), default=1)
+        while cores_per_cell < largest:
+            needed = sum(math.ceil(math.ceil(len(cpus) / cores_per_cell) / columns) for _, cpus in groups)
+            if needed <= rows:
+                break
+            cores_per_cell += 1
+        
+        result = (cores_per_cell, label_width)
+        if len(self._layout_cache) > 32:
+            self._layout_cache.clear()
+        self._layout_cache[key] = result
+        return result
+    
+    def render(self, per_core: Sequence[float], width: int, rows: int,
+               groups: Optional[List[Tuple[str, List[int]]]] = None) -> Tuple[List[str], int]:
+        """
+        Render per-core usage into at most `rows` lines of `width` cells.
+        
+        Args:
+            per_core: Per-core usage percentages indexed by logical CPU
+            width: Available width in characters
+            rows: Available number of rows
+            groups: Optional list of (label, cpu indices); all cores in one
+                unlabelled group if omitted
+        
+        Returns:
+            Tuple of (rendered lines, cores per cell). Lines are padded to
+            exactly `width` visible characters.
+        """
+        if not groups:
+            groups = [("", list(range(len(per_core))))]
+        elif len(groups) > rows:
+            # Not enough rows for one block per group: keep the group order
+            # but drop the labels and let the cells flow together
+            groups = [("", [cpu for _, cpus in groups for cpu in cpus])]
+        
+        cores_per_cell, label_width = self.fit(groups, width, rows)
+        columns = max(1, width - label_width)
+        lut = self._lut
+        normal = self.term.normal if self.use_color else ""
+        count = len(per_core)
+        
+        lines = []
+        for label, cpus in groups:
+            cpus = [cpu for cpu in cpus if cpu < count]
+            if cores_per_cell == 1:
+                values = [per_core[cpu] for cpu in cpus]
+            else:
+                values = [max(per_core[cpu] for cpu in cpus[i:i + cores_per_cell])
+                          for i in range(0, len(cpus), cores_per_cell)]
+            
+            cells = [lut[min(100, max(0, int(value)))] for value in values]
+            for start in range(0, len(cells), columns):
+                row = cells[start:start + columns]
+                prefix = label.ljust(label_width) if start == 0 else " " * label_width
+                lines.append(prefix + "".join(row) + normal + " " * (columns - len(row)))
+                if len(lines) >= rows:
+                    return lines, cores_per_cell
+        
+        return lines, cores_per_cell
@@ -0,0 +1,96 @@
+"""
+Key Bindings Module for Linux System Monitor
+
+This module maps key presses to handler functions.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class KeyBindings:
+    """
+    Dispatcher that routes key presses to registered handlers.
+    
+    Keys are identified either by the character they produce ("q", "1") or,
+    for special keys, by the blessed key name ("KEY_UP", "KEY_DOWN").
+    """
+    
+    def __init__(self):
+        """Initialize an empty set of bindings."""
+        self._handlers: Dict[str, Callable[[], None]] = {}
+        self._descriptions: List[Tuple[str, str]] = []
+        self._fallback: Optional[Callable[[str], bool]] = None
+    
+    def bind(self, key: str, handler: Callable[[], None], description: str = ""):
+        """
+        Register a handler for a key.
+        
+        Args:
+            key: Character or blessed key name
+            handler: Function to call when the key is pressed
+            description: Help text for the binding (omitted from help if empty)
+        """
+        self._handlers[key] = handler
+        if description:
+            self._descriptions.append((key, description))
+    
+    def set_fallback(self, handler: Optional[Callable[[str], bool]]):
+        """
+        Set a handler consulted before the bindings.
+        
+        The fallback receives the key and returns True if it consumed it,
+        which is how modal overlays (like the help panel) swallow input.
+        
+        Args:
+            handler: Function called with the key, or None to clear
+        """
+        self._fallback = handler
+    
+    def dispatch(self, keystroke) -> bool:
+        """
+        Route a key press to its handler.
+        
+        Args:
+            keystroke: blessed Keystroke or plain string
+        
+        Returns:
+            True if the key was handled, False otherwise
+        """
+        key = self.key_for(keystroke)
+        if not key:
+            return False
+        
+        if self._fallback is not None and self._fallback(key):
+            return True
+        
+        handler = self._handlers.get(key)
+        if handler is None:
+            return False
+        
+        handler()
+        return True
+    
+    def describe(self) -> List[Tuple[str, str]]:
+        """
+        Get the registered bindings for display in a help screen.
+        
+        Returns:
+            List of (key, description) tuples in registration order
+        """
+        return list(self._descriptions)
+    
+    @staticmethod
+    def key_for(keystroke) -> str:
+        """
+        Normalize a keystroke to the string used for lookups.
+        
+        Args:
+            keystroke: blessed Keystroke or plain string
+        
+        Returns:
+            Key name for special keys, otherwise the character itself
+        """
+        name = getattr(keystroke, "name", None)
+        if getattr(keystroke, "is_sequence", False) and name:
+            return name
+        return str(keystroke)
@@ -4,7 +4,7 @@ Layout Manager Module for Linux System Monitor
 This module handles the layout of UI components based on terminal size and user preferences.
 """
 
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 
 class LayoutManager:
@@ -153,6 +153,32 @@ class LayoutManager:
         
         return layout
     
+    def get_focus_layout(self, widgets: List[str], width: int, height: int) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Generate a layout that gives the full screen to a few widgets.
+        
+        The widgets are stacked vertically and share the content height equally.
+        
+        Args:
+            widgets: Names of the widgets to show, top to bottom
+            width: Terminal width
+            height: Terminal height
+        
+        Returns:
+            Dictionary mapping widget names to their position/size tuples
+        """
+        # Account for header
+        content_height = height - 2
+        
+        widget_height = content_height // len(widgets)
+        layout = {}
+        for i, widget_name in enumerate(widgets):
+            # The last widget absorbs any rounding remainder
+            h = widget_height if i < len(widgets) - 1 else content_height - widget_height * i
+            layout[widget_name] = (0, 1 + widget_height * i, width, h)
+        
+        return layout
+    
     def set_layout_type(self, layout_type: str):
         """
         Change the current layout type.
@@ -0,0 +1,167 @@
+"""
+Performance benchmarks for the collectors, the processor and the dashboard.
+
+Run with pytest-benchmark and compare against the stored baseline:
+
+    pytest tests/performance/benchmarks.py --benchmark-json=results.json
+    python tests/performance/compare.py check results.json
+"""
+
+import contextlib
+import io
+
+import pytest
+from blessed import Terminal
+
+from monitor.analysis import RecordingAnalysis
+from monitor.collectors.cpu import CPUCollector
+from monitor.collectors.interrupts import InterruptCollector
+from monitor.config import Config
+from monitor.processors.forecast import TrendForecaster
+from monitor.processors.resource_processor import ResourceProcessor
+from monitor.ui.dashboard import Dashboard
+from monitor.ui.layout_manager import LayoutManager
+
+# Scales every benchmark that depends on them runs at
+CORE_COUNTS = [4, 64, 512]
+PROCESS_COUNTS = [100, 10_000, 50_000]
+INTERFACE_COUNTS = [2, 2_000]
+FILESYSTEM_COUNTS = [10, 500]
+
+# Length (seconds at 1 Hz) of the recordings the analysis reads
+RECORDING_SECONDS = 86_400
+
+# Terminal sizes (columns, lines) the layout and the dashboard are rendered at
+TERMINAL_SIZES = [(80, 24), (200, 60), (400, 120)]
+
+scales = pytest.mark.parametrize(
+    "cores,processes,interfaces",
+    [(cores, processes, interfaces)
+     for cores in CORE_COUNTS for processes in PROCESS_COUNTS for interfaces in INTERFACE_COUNTS],
+)
+
+
+@pytest.mark.benchmark(group="collectors")
+@pytest.mark.parametrize("cores", CORE_COUNTS)
+def test_cpu_collector_benchmark(benchmark, fake_roots, cores):
+    collector = CPUCollector(*fake_roots(cores))
+    collector.collect()
+
+    result = benchmark(collector.collect)
+
+    assert len(result["per_core_percent"]) == cores
+    assert len(result["groups"]["core"]) == cores
+
+
+@pytest.mark.benchmark(group="collectors")
+@pytest.mark.parametrize("cores", CORE_COUNTS)
+def test_interrupt_collector_benchmark(benchmark, fake_roots, cores):
+    proc_root, _ = fake_roots(cores)
+    collector = InterruptCollector(interrupts_path=f"{proc_root}/interrupts", softirqs_path=f"{proc_root}/softirqs")
+    collector.collect()
+    
+    result = benchmark(collector.collect)
+    
+    assert len(result["cpus"]) == cores
+
+
+@pytest.mark.benchmark(group="processors")
+@scales
+def test_resource_processor_benchmark(benchmark, samples, cores, processes, interfaces):
+    processor = ResourceProcessor()
+    data = samples(cores, processes, interfaces)
+
+    result = benchmark(processor.process, data)
+
+    assert result["processes"]["total"] == processes
+    assert len(result["network"]["interfaces"]) == interfaces
+    assert sum(result["cpu"]["topology"]["socket"]["cpus"]) == cores
+
+
+@pytest.mark.benchmark(group="processors")
+@scales
+def test_sample_delta_benchmark(benchmark, samples, cores, processes, interfaces):
+    processor = ResourceProcessor()
+    data = samples(cores, processes, interfaces)
+    processed = processor.process(data)
+    processor.delta(processed)
+
+    result = benchmark(processor.delta, processed)
+
+    assert not result
+    assert result.history["cpu.history"] == processed["cpu"]["history"]
+
+
+@pytest.mark.benchmark(group="processors")
+@pytest.mark.parametrize("filesystems", FILESYSTEM_COUNTS)
+def test_trend_forecaster_benchmark(benchmark, filesystems):
+    forecaster = TrendForecaster(1800.0)
+    clock = iter(range(10**9))
+    
+    def update():
+        second = next(clock)
+        # Every filesystem fills at its own rate
+        return forecaster.update(second, {f"/mnt/{index}": 10 + second * index * 1e-4
+                                          for index in range(filesystems)})
+    
+    for _ in range(300):
+        update()
+    
+    result = benchmark(update)
+    
+    assert len(result) == filesystems
+    assert result["/mnt/1"] is not None and result["/mnt/0"] is None
+
+
+@pytest.mark.benchmark(group="analysis")
+@pytest.mark.parametrize("cores", CORE_COUNTS[:2])
+def test_recording_analysis_benchmark(benchmark, recordings, cores):
+    path = recordings(cores, RECORDING_SECONDS)
+    
+    def analyze():
+        analysis = RecordingAnalysis(window=300.0)
+        analysis.add(path)
+        return analysis.summary()
+    
+    result = benchmark(analyze)
+    
+    assert result["steps"] == RECORDING_SECONDS - 1
+    assert len(result["trend"]) <= 24
+    assert 0 < result["metrics"]["cpu.usage_percent"]["p50"] < 100
+
+
+@pytest.mark.benchmark(group="layout")
+@pytest.mark.parametrize("layout_type", ["detailed", "compact", "minimal"])
+@pytest.mark.parametrize("width,height", TERMINAL_SIZES)
+def test_layout_manager_benchmark(benchmark, layout_type, width, height):
+    layout_manager = LayoutManager(None, layout_type)
+
+    layout = benchmark(layout_manager.get_layout, width, height)
+
+    assert layout
+
+
+@pytest.mark.benchmark(group="dashboard")
+@scales
+def test_dashboard_render_benchmark(benchmark, monkeypatch, samples, cores, processes, interfaces):
+    width, height = TERMINAL_SIZES[1]
+    monkeypatch.setenv("COLUMNS", str(width))
+    monkeypatch.setenv("LINES", str(height))
+
+    buffer = io.StringIO()
+    term = Terminal(kind="xterm-256color", stream=buffer, force_styling=True)
+    config = Config()
+    dashboard = Dashboard(term, LayoutManager(term, config.display.layout), config)
+    processor = ResourceProcessor()
+    with contextlib.redirect_stdout(buffer):
+        dashboard.update(processor.delta(processor.process(samples(cores, processes, interfaces))))
+
+    def render():
+        buffer.seek(0)
+        buffer.truncate()
+        with contextlib.redirect_stdout(buffer):
+            dashboard.render()
+
+    benchmark(render)
+
+    assert "CPU Usage" in buffer.getvalue()
@@ -0,0 +1,135 @@
+"""
+Compare pytest-benchmark results with the stored baseline.
+
+    # Record a new baseline from a benchmark run
+    pytest tests/performance/benchmarks.py --benchmark-json=results.json
+    python tests/performance/compare.py save results.json
+
+    # Fail (exit status 1) if any benchmark got slower than the threshold
+    python tests/performance/compare.py check results.json --threshold 0.25
+
+Baselines keep only the timing statistics of each benchmark, keyed by its
+full name, so they can be committed and diffed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from typing import Dict
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json")
+
+# Timing statistics copied from the pytest-benchmark report
+STATS = ("min", "median", "mean", "stddev", "rounds")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Read a pytest-benchmark JSON report.
+
+    Args:
+        path: Report written by --benchmark-json
+
+    Returns:
+        Timing statistics (seconds) per benchmark full name
+    """
+    with open(path, "r") as f:
+        report = json.load(f)
+    return {
+        benchmark["fullname"]: {stat: benchmark["stats"][stat] for stat in STATS}
+        for benchmark in report.get("benchmarks", [])
+    }
+
+
+def save(results_path: str, baseline_path: str):
+    """
+    Store a benchmark report as the baseline.
+
+    Args:
+        results_path: Report written by --benchmark-json
+        baseline_path: Baseline file to write
+    """
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": load_results(results_path),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+    with open(baseline_path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Saved {len(baseline['benchmarks'])} benchmarks to {baseline_path}")
+
+
+def check(results_path: str, baseline_path: str, threshold: float, stat: str) -> int:
+    """
+    Compare a benchmark report with the baseline.
+
+    Args:
+        results_path: Report written by --benchmark-json
+        baseline_path: Baseline file to compare with
+        threshold: Largest accepted slowdown (0.25 = 25% slower)
+        stat: Statistic to compare ("min", "median" or "mean")
+
+    Returns:
+        Exit status: 1 if any benchmark regressed beyond the threshold
+    """
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)["benchmarks"]
+    results = load_results(results_path)
+
+    regressions = 0
+    for name in sorted(results):
+        current = results[name][stat]
+        if name not in baseline:
+            print(f"  new        {current * 1e3:10.3f} ms  {name}")
+            continue
+        previous = baseline[name][stat]
+        change = current / previous - 1 if previous else 0.0
+        if change > threshold:
+            regressions += 1
+            status = "REGRESSION"
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        print(f"  {status:10} {current * 1e3:10.3f} ms  {change * 100:+7.1f}%  {name}")
+
+    for name in sorted(set(baseline) - set(results)):
+        print(f"  missing    {'':10}     {name}")
+
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {threshold * 100:.0f}% ({stat})")
+        return 1
+    print(f"No regressions beyond {threshold * 100:.0f}% ({stat})")
+    return 0
+
+
+def main() -> int:
+    """Parse the command line and run the requested command."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = subparsers.add_parser("save", help="Store a benchmark report as the baseline")
+    save_parser.add_argument("results", help="Report written by --benchmark-json")
+    save_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to write")
+
+    check_parser = subparsers.add_parser("check", help="Fail on regressions against the baseline")
+    check_parser.add_argument("results", help="Report written by --benchmark-json")
+    check_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare with")
+    check_parser.add_argument("--threshold", type=float, default=0.25,
+                              help="Largest accepted slowdown as a fraction (default: 0.25)")
+    check_parser.add_argument("--stat", choices=["min", "median", "mean"], default="median",
+                              help="Statistic to compare (default: median)")
+
+    args = parser.parse_args()
+    if args.command == "save":
+        save(args.results, args.baseline)
+        return 0
+    return check(args.results, args.baseline, args.threshold, args.stat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
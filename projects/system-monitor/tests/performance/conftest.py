@@ -0,0 +1,140 @@
+"""
+Fixtures for the performance benchmarks.
+
+Benchmarks run against synthetic data at fixed scales instead of the host
+they happen to run on: a fake procfs and sysfs for the CPU collector, and
+generated collector output for the processor and the dashboard, and
+generated recordings for the offline analysis.
+"""
+
+import functools
+import random
+from typing import Dict
+
+import numpy as np
+import pytest
+
+from monitor.collectors.fakefs import THREADS_PER_CORE, build_procfs, build_sysfs, cpu_layout
+from monitor.collectors.records import CPUFrequency, CPUSample, LoadAverage
+from monitor.recorder import Recorder
+
+
+def build_sample(cores: int, processes: int, interfaces: int) -> Dict:
+    """
+    Generate raw collector output, as MonitorPipeline.collect returns it.
+
+    Args:
+        cores: Number of logical CPUs
+        processes: Number of processes
+        interfaces: Number of network interfaces
+
+    Returns:
+        Raw sample
+    """
+    rng = random.Random(cores * 1_000_003 + processes * 101 + interfaces)
+    layout = [cpu_layout(cpu, cores) for cpu in range(cores)]
+    per_core = [rng.uniform(0, 100) for _ in range(cores)]
+
+    return {
+        "cpu": CPUSample(
+            usage_percent=sum(per_core) / cores,
+            per_core_percent=per_core,
+            load_avg=LoadAverage(1.0, 1.0, 1.0, cores),
+            frequency=CPUFrequency(2400.0, 800.0, 3600.0),
+            temperature=None,
+            context_switches=987654321,
+            interrupts=123456789,
+            groups={
+                "socket": [socket for socket, _, _ in layout],
+                "node": [node for _, node, _ in layout],
+                "core": [sibling // THREADS_PER_CORE for _, _, sibling in layout],
+            },
+        ),
+        "memory": {"usage_percent": 45.2, "used": 4.5, "total": 15.8},
+        "disk": {"usage_percent": 32.8, "read_speed": 15.6, "write_speed": 8.3},
+        "network": {
+            "download_speed": 1.2,
+            "upload_speed": 0.4,
+            "interfaces": {
+                f"veth{index:05x}": {
+                    "bytes_sent": rng.randrange(1 << 40),
+                    "bytes_recv": rng.randrange(1 << 40),
+                    "upload_speed": rng.uniform(0, 10),
+                    "download_speed": rng.uniform(0, 10),
+                }
+                for index in range(interfaces)
+            },
+        },
+        "processes": {
+            "processes": [
+                {
+                    "pid": pid,
+                    "name": f"worker-{pid % 97}",
+                    "cpu_percent": rng.uniform(0, 100),
+                    "memory_percent": rng.uniform(0, 5),
+                    "disk_io": rng.uniform(0, 1e6),
+                }
+                for pid in range(1, processes + 1)
+            ],
+        },
+        "timestamp": 1700000000.0,
+    }
+
+
+@pytest.fixture(scope="session")
+def fake_roots(tmp_path_factory):
+    """Build (once per session and core count) a fake procfs and sysfs."""
+    roots = {}
+
+    def get(cores: int):
+        if cores not in roots:
+            base = tmp_path_factory.mktemp(f"cores{cores}")
+            build_procfs(str(base / "proc"), cores)
+            build_sysfs(str(base / "sys"), cores)
+            roots[cores] = (str(base / "proc"), str(base / "sys"))
+        return roots[cores]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def samples():
+    """Generate raw samples on demand, cached per scale."""
+    return functools.lru_cache(maxsize=None)(build_sample)
+
+
+@pytest.fixture(scope="session")
+def recordings(fake_roots, tmp_path_factory):
+    """
+    Write (once per session and scale) a 1 Hz recording of the CPU
+    counters of a fake machine, filled with random usage.
+
+    Returns:
+        Function taking a core count and a duration in seconds and
+        returning the recording's path
+    """
+    paths = {}
+
+    def get(cores: int, seconds: int):
+        if (cores, seconds) not in paths:
+            recorder = Recorder(1.0, seconds, ["cpu"], fake_roots(cores)[0])
+            rng = np.random.default_rng(cores)
+            buffer = np.zeros((seconds, len(recorder.columns)))
+            buffer[:, 0] = np.arange(seconds)
+            # Per-CPU busy and total jiffies (100 per second), then the
+            # context switch counter and the run queue
+            per_cpu = recorder.columns.index("ctxt")
+            buffer[:, 4:per_cpu:2] = np.cumsum(rng.integers(0, 101, (seconds, cores)), axis=0)
+            buffer[:, 5:per_cpu:2] = np.arange(1, seconds + 1)[:, None] * 100
+            buffer[:, 2] = buffer[:, 4:per_cpu:2].sum(axis=1)
+            buffer[:, 3] = buffer[:, 5:per_cpu:2].sum(axis=1)
+            buffer[:, per_cpu] = np.cumsum(rng.integers(1000, 5000, seconds))
+            buffer[:, per_cpu + 1] = rng.integers(0, cores, seconds)
+            path = str(tmp_path_factory.mktemp("recordings") / f"cores{cores}.rec")
+            recorder.open(path)
+            recorder.append(buffer)
+            recorder.close()
+            paths[cores, seconds] = path
+        return paths[cores, seconds]
+
+    return get
@@ -0,0 +1,83 @@
+"""
+Unit tests for the cgroup collector and the shared descriptor budget.
+"""
+
+import errno
+import os
+
+import pytest
+
+from monitor.collectors import cgroup
+from monitor.collectors.cgroup import HOT_FILES, CgroupCollector
+from monitor.collectors.descriptors import DescriptorBudget
+from monitor.collectors.fakefs import build_sysfs
+
+
+@pytest.fixture
+def sys_root(tmp_path):
+    """A fake /sys with 10 leaf cgroups."""
+    root = str(tmp_path / "sys")
+    build_sysfs(root, cpus=2, cgroups=10)
+    return root
+
+
+def test_collect_reports_leaf_cgroups(sys_root):
+    collector = CgroupCollector(sys_root=sys_root, fd_budget=DescriptorBudget(1000))
+
+    result = collector.collect()
+
+    assert result["available"]
+    assert result["count"] == 10
+    assert all(entry["name"].startswith("system.slice/") for entry in result["cgroups"])
+    collector.close()
+
+
+def test_budget_is_shared_and_given_back(sys_root):
+    budget = DescriptorBudget(len(HOT_FILES) * 3)
+    first = CgroupCollector(sys_root=sys_root, fd_budget=budget)
+    second = CgroupCollector(sys_root=sys_root, fd_budget=budget)
+
+    first.collect()
+    second.collect()
+    assert budget.held == budget.capacity
+    # Cgroups beyond the budget are still read, by path
+    assert second.collect()["count"] == 10
+
+    first.close()
+    second.close()
+    assert budget.held == 0
+
+
+def test_out_of_descriptors_is_not_a_removed_cgroup(sys_root, monkeypatch):
+    collector = CgroupCollector(sys_root=sys_root, fd_budget=DescriptorBudget(0))
+    collector.collect()
+    scans = []
+    monkeypatch.setattr(collector, "_scan", lambda now: scans.append(now))
+
+    real_open = open
+
+    def exhausted_open(path, *args, **kwargs):
+        if str(path).startswith(sys_root):
+            raise OSError(errno.EMFILE, os.strerror(errno.EMFILE), path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(cgroup, "open", exhausted_open, raising=False)
+    monkeypatch.setattr(collector, "_needs_rescan", lambda now: False)
+    result = collector.collect()
+
+    assert result["count"] == 10
+    assert scans == []
+
+
+def test_incomplete_walk_keeps_known_cgroups(sys_root, monkeypatch):
+    collector = CgroupCollector(sys_root=sys_root, fd_budget=DescriptorBudget(1000))
+    collector.collect()
+
+    def exhausted_scandir(path):
+        raise OSError(errno.ENFILE, os.strerror(errno.ENFILE), path)
+
+    monkeypatch.setattr(cgroup.os, "scandir", exhausted_scandir)
+    collector._scan(0.0)
+
+    assert len(collector._groups) == 12
+    collector.close()
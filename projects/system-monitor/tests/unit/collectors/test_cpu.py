@@ -0,0 +1,68 @@
+"""
+Unit tests for the CPU collector.
+"""
+
+import os
+
+import psutil
+import pytest
+
+from monitor.collectors.cpu import CPUCollector
+from monitor.collectors.fakefs import build_procfs, build_sysfs
+
+# user nice system idle iowait irq softirq steal guest guest_nice
+STAT = """cpu  {0}
+cpu0 {0}
+intr 1000 0 0
+ctxt 2000
+"""
+
+
+@pytest.fixture
+def roots(tmp_path):
+    """A fake 4-CPU machine."""
+    proc_root, sys_root = str(tmp_path / "proc"), str(tmp_path / "sys")
+    build_procfs(proc_root, 4)
+    build_sysfs(sys_root, 4)
+    return proc_root, sys_root
+
+
+def write_stat(proc_root, fields):
+    with open(os.path.join(proc_root, "stat"), "w") as f:
+        f.write(STAT.format(" ".join(map(str, fields))))
+
+
+def test_reads_the_configured_root_only(roots):
+    procfs_path = psutil.PROCFS_PATH
+    collector = CPUCollector(*roots)
+
+    assert collector.cpu_count == 4
+    assert len(collector.collect()["per_core_percent"]) == 4
+    assert psutil.PROCFS_PATH == procfs_path
+    collector.close()
+
+
+def test_steal_counts_as_busy_overall_and_per_core(roots):
+    proc_root, sys_root = roots
+    write_stat(proc_root, [100, 0, 100, 700, 0, 0, 0, 100, 0, 0])
+    collector = CPUCollector(proc_root, sys_root)
+
+    # 100 user, 100 steal and 200 idle jiffies later
+    write_stat(proc_root, [200, 0, 100, 900, 0, 0, 0, 200, 0, 0])
+    sample = collector.collect()
+
+    assert sample["usage_percent"] == pytest.approx(50.0)
+    assert sample["per_core_percent"] == [50.0]
+    collector.close()
+
+
+def test_close_releases_descriptors(roots):
+    collector = CPUCollector(*roots)
+    fds = [collector._stat_fd] + collector._frequency_fds + collector._temperature_fds
+
+    collector.close()
+    collector.close()
+
+    for fd in fds:
+        with pytest.raises(OSError):
+            os.fstat(fd)
@@ -0,0 +1,35 @@
+"""
+Unit tests for the mountinfo parser and filesystem selection.
+"""
+
+from monitor.collectors.filesystem import parse_mountinfo, select_filesystems
+
+MOUNTINFO = """\
+22 1 8:2 / / rw,relatime shared:1 - ext4 /dev/sda2 rw,errors=remount-ro
+23 22 0:21 / /proc rw,nosuid,nodev,noexec,relatime shared:12 - proc proc rw
+24 22 8:3 / /mnt/my\\040disk rw,relatime - xfs /dev/sda3 rw
+25 22 8:2 /srv /var/lib/data rw,relatime shared:1 master:2 - ext4 /dev/sda2 rw
+26 22 0:45 / /home rw,relatime - nfs4 server:/export/home rw,vers=4.2
+27 22 0:46 / /tank rw - zfs tank rw,xattr
+28 22 0:47 / /var/lib/docker/overlay2/abc/merged rw - overlay overlay rw
+truncated line without separator
+"""
+
+
+def test_parse_mountinfo():
+    mounts = parse_mountinfo(MOUNTINFO)
+
+    assert len(mounts) == 7
+    assert mounts[0] == {"device": "8:2", "mountpoint": "/", "fstype": "ext4", "source": "/dev/sda2"}
+    # Octal escapes are decoded
+    assert mounts[2]["mountpoint"] == "/mnt/my disk"
+    # Any number of optional fields may precede the separator
+    assert mounts[3]["mountpoint"] == "/var/lib/data"
+    assert mounts[3]["fstype"] == "ext4"
+
+
+def test_select_filesystems():
+    selected = select_filesystems(parse_mountinfo(MOUNTINFO))
+
+    # Pseudo and overlay filesystems are skipped, bind mounts kept once
+    assert [mount["mountpoint"] for mount in selected] == ["/", "/mnt/my disk", "/home", "/tank"]
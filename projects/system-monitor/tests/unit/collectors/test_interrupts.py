@@ -0,0 +1,100 @@
+"""
+Unit tests for the /proc/interrupts matrix parser and interrupt rates.
+"""
+
+import numpy as np
+import pytest
+
+from monitor.collectors.interrupts import CounterMatrixParser, InterruptCollector
+
+HEADER = "           CPU0       CPU1       CPU2\n"
+
+
+def interrupts(counts):
+    """Format /proc/interrupts rows the way the kernel does."""
+    lines = [HEADER]
+    for label, row, description in counts:
+        fields = "".join(f"{count:>10} " for count in row)
+        lines.append(f"{label:>4}: {fields}  {description}\n")
+    lines.append(" ERR:          7\n")
+    return "".join(lines)
+
+
+@pytest.fixture
+def path(tmp_path):
+    """A 3-CPU /proc/interrupts with two IRQs."""
+    path = tmp_path / "interrupts"
+    path.write_text(interrupts([
+        ("24", [100, 0, 5], "PCI-MSI 512000-edge      nvme0q0"),
+        ("LOC", [4000, 3000, 2000], "Local timer interrupts"),
+    ]))
+    return str(path)
+
+
+def test_read_parses_the_matrix(path):
+    parser = CounterMatrixParser(path)
+
+    matrix = parser.read()
+    parser.close()
+
+    assert parser.cpus == [0, 1, 2]
+    # ERR holds a single total and is not a row of the matrix
+    assert parser.rows == ["24", "LOC"]
+    assert parser.descriptions == ["PCI-MSI 512000-edge nvme0q0", "Local timer interrupts"]
+    np.testing.assert_array_equal(matrix, [[100, 0, 5], [4000, 3000, 2000]])
+
+
+def test_changed_counts_reuse_the_layout(path):
+    parser = CounterMatrixParser(path)
+    parser.read()
+    with open(path, "w") as f:
+        f.write(interrupts([
+            ("24", [4294967295, 1, 5], "PCI-MSI 512000-edge      nvme0q0"),
+            ("LOC", [4001, 3000, 2000], "Local timer interrupts"),
+        ]))
+
+    matrix = parser.read()
+
+    assert parser.layout_builds == 1
+    np.testing.assert_array_equal(matrix, [[4294967295, 1, 5], [4001, 3000, 2000]])
+    parser.close()
+
+
+def test_added_row_rebuilds_the_layout(path):
+    parser = CounterMatrixParser(path)
+    parser.read()
+    with open(path, "w") as f:
+        f.write(interrupts([
+            ("24", [100, 0, 5], "PCI-MSI 512000-edge      nvme0q0"),
+            ("25", [1, 2, 3], "PCI-MSI 512001-edge      nvme0q1"),
+            ("LOC", [4000, 3000, 2000], "Local timer interrupts"),
+        ]))
+
+    matrix = parser.read()
+
+    assert parser.layout_builds == 2
+    assert parser.rows == ["24", "25", "LOC"]
+    np.testing.assert_array_equal(matrix[1], [1, 2, 3])
+    parser.close()
+
+
+def test_unreadable_file(tmp_path):
+    parser = CounterMatrixParser(str(tmp_path / "missing"))
+    assert parser.read() is None
+
+    collector = InterruptCollector(interrupts_path=str(tmp_path / "missing"))
+    assert collector.collect() == {"available": False}
+
+
+def test_rates_wrap_around(path, tmp_path):
+    collector = InterruptCollector(interrupts_path=path, softirqs_path=str(tmp_path / "missing"))
+    parser = collector.interrupts
+    first = np.array([[4294967290, 0, 0], [0, 0, 0]], dtype=np.int64)
+    second = np.array([[4, 0, 0], [0, 0, 10]], dtype=np.int64)
+    parser.read()
+
+    assert not collector._rates(parser, first, 1.0).any()
+    rates = collector._rates(parser, second, 2.0)
+    parser.close()
+
+    np.testing.assert_array_equal(rates, [[5.0, 0.0, 0.0], [0.0, 0.0, 5.0]])
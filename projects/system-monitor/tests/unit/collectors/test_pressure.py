@@ -0,0 +1,101 @@
+"""
+Unit tests for the pressure collector and the CPU bottleneck it decides.
+"""
+
+import pytest
+
+from monitor.collectors import pressure
+from monitor.collectors.pressure import PressureCollector, parse_pressure
+from monitor.collectors.records import CPUSample, LoadAverage
+from monitor.processors.resource_processor import ResourceProcessor
+
+PSI = """some avg10={some:.2f} avg60=1.50 avg300=0.75 total={total}
+full avg10=0.00 avg60=0.00 avg300=0.00 total=100
+"""
+
+
+def write_psi(root, resource, some=0.0, total=0):
+    """Write one PSI file in the kernel's format."""
+    (root / resource).write_text(PSI.format(some=some, total=total))
+
+
+@pytest.fixture
+def psi_root(tmp_path):
+    """A PSI directory with idle cpu, memory and io files."""
+    root = tmp_path / "pressure"
+    root.mkdir()
+    for resource in ("cpu", "memory", "io"):
+        write_psi(root, resource)
+    return root
+
+
+def test_parse_pressure():
+    lines = parse_pressure(PSI.format(some=2.5, total=123456).encode())
+
+    assert lines["some"] == {"avg10": 2.5, "avg60": 1.5, "avg300": 0.75, "total": 123456}
+    assert lines["full"]["total"] == 100
+    # The cpu file of older kernels has no full line
+    assert list(parse_pressure(b"some avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")) == ["some"]
+
+
+def test_stall_percent_between_reads(psi_root, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(pressure.time, "monotonic", lambda: clock[0])
+    collector = PressureCollector(str(psi_root))
+    first = collector.collect()
+
+    # 0.5 s stalled in 2 s
+    write_psi(psi_root, "io", total=500_000)
+    clock[0] += 2.0
+    second = collector.collect()
+    collector.close()
+
+    assert first["io"]["some"]["stall_percent"] == first["io"]["some"]["avg10"]
+    assert second["io"]["some"]["stall_percent"] == pytest.approx(25.0)
+    assert second["cpu"]["some"]["stall_percent"] == 0.0
+
+
+def test_bottleneck_at_threshold(psi_root):
+    write_psi(psi_root, "cpu", some=pressure.BOTTLENECK_THRESHOLD)
+    write_psi(psi_root, "memory", some=pressure.BOTTLENECK_THRESHOLD - 0.01)
+    collector = PressureCollector(str(psi_root))
+
+    result = collector.collect()
+    collector.close()
+
+    assert result["available"]
+    assert result["bottleneck"] == ["cpu"]
+
+
+def test_missing_psi_is_unavailable(tmp_path):
+    result = PressureCollector(str(tmp_path / "missing")).collect()
+
+    assert result == {"available": False, "bottleneck": []}
+
+
+def cpu_sample(usage_percent, load):
+    """A 2-CPU sample with the given usage and 1-minute load."""
+    return CPUSample(usage_percent, [usage_percent] * 2, LoadAverage(load, load, load, 2), None, None, 0, 0, {})
+
+
+def test_processor_prefers_cpu_pressure(tmp_path):
+    processor = ResourceProcessor(proc_root=str(tmp_path))
+    busy = cpu_sample(95.0, 4.0)
+
+    stalled = processor.process({"cpu": cpu_sample(50.0, 0.5),
+                                 "pressure": {"available": True, "bottleneck": ["cpu"]}})
+    calm = processor.process({"cpu": busy, "pressure": {"available": True, "bottleneck": ["io"]}})
+
+    assert stalled["cpu"]["potential_bottleneck"]
+    assert not calm["cpu"]["potential_bottleneck"]
+
+
+def test_processor_falls_back_without_psi(tmp_path):
+    processor = ResourceProcessor(proc_root=str(tmp_path))
+    unavailable = {"available": False, "bottleneck": []}
+
+    busy = processor.process({"cpu": cpu_sample(95.0, 4.0), "pressure": unavailable})
+    idle = processor.process({"cpu": cpu_sample(50.0, 0.5), "pressure": unavailable})
+
+    assert busy["cpu"]["potential_bottleneck"]
+    assert not idle["cpu"]["potential_bottleneck"]
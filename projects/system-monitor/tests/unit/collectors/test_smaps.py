@@ -0,0 +1,89 @@
+"""
+Unit tests for the smaps_rollup collector.
+"""
+
+import os
+import time
+
+import pytest
+
+from monitor.collectors.fakefs import build_procfs
+from monitor.collectors.smaps import SmapsCollector, parse_smaps_rollup
+
+ROLLUP = b"""00400000-7fffffffffff ---p 00000000 00:00 0                          [rollup]
+Rss:                2048 kB
+Pss:                1024 kB
+Pss_Anon:            512 kB
+Shared_Clean:       1024 kB
+Shared_Dirty:          0 kB
+Private_Clean:       256 kB
+Private_Dirty:       768 kB
+Swap:                128 kB
+SwapPss:              64 kB
+"""
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    """A fake /proc with 20 processes."""
+    root = str(tmp_path / "proc")
+    build_procfs(root, cpus=2, processes=20)
+    return root
+
+
+def test_parse_smaps_rollup():
+    assert parse_smaps_rollup(ROLLUP) == {
+        "rss": 2048 * 1024,
+        "pss": 1024 * 1024,
+        "uss": 1024 * 1024,
+        "swap": 128 * 1024,
+        "swap_pss": 64 * 1024,
+    }
+
+
+def test_parse_smaps_rollup_of_kernel_thread():
+    assert parse_smaps_rollup(b"") == {"rss": 0, "pss": 0, "uss": 0, "swap": 0, "swap_pss": 0}
+
+
+def test_collect_reads_every_process(proc_root):
+    collector = SmapsCollector(budget_ms=1000, top_count=5, proc_root=proc_root)
+
+    result = collector.collect()
+
+    assert result["available"]
+    assert result["coverage"] == 1.0
+    assert len(result["processes"]) == 5
+    pss = [process["pss"] for process in result["processes"]]
+    assert pss == sorted(pss, reverse=True)
+
+
+def test_over_budget_processes_are_still_sampled(proc_root):
+    # 400k resident pages are estimated at 40 ms each, twice the budget
+    for pid in range(1, 21):
+        with open(os.path.join(proc_root, str(pid), "statm"), "w") as f:
+            f.write("800000 400000 1000 100 0 200000 0\n")
+    collector = SmapsCollector(budget_ms=20, proc_root=proc_root)
+
+    # Each read calibrates the page cost, and the rest are re-costed with it
+    coverage = [collector.collect()["coverage"] for _ in range(10)]
+
+    assert coverage[1] > 0
+    assert coverage[-1] == 1.0
+
+
+def test_over_budget_reads_are_limited_to_one_per_pass(proc_root, monkeypatch):
+    collector = SmapsCollector(budget_ms=20, proc_root=proc_root)
+    read = []
+
+    def slow_read(process):
+        time.sleep(0.025)
+        read.append(process.pid)
+        return True
+
+    # Every process is too expensive to read within a tick
+    monkeypatch.setattr(collector, "_estimate_cost", lambda process: 1.0)
+    monkeypatch.setattr(collector, "_read", slow_read)
+
+    assert [collector.collect()["sampled"] for _ in range(4)] == [0, 1, 1, 1]
+    # Each pass reads the process that has waited longest
+    assert len(set(read)) == 3
@@ -0,0 +1,68 @@
+"""
+Unit tests for the socket table parser.
+"""
+
+import os
+import socket
+
+import pytest
+
+from monitor.collectors.fakefs import build_procfs
+from monitor.collectors.sockets import SocketCollector, SocketTableReader, decode_address
+
+PROCESSES = 20
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    """A fake /proc with PROCESSES TCP connections; init holds the sshd socket."""
+    root = str(tmp_path / "proc")
+    build_procfs(root, cpus=2, processes=PROCESSES)
+    os.symlink("socket:[1000]", os.path.join(root, "1", "fd", "4"))
+    return root
+
+
+def test_decode_address():
+    assert decode_address(b"0100007F", socket.AF_INET) == "127.0.0.1"
+    assert decode_address(b"00000000000000000000000001000000", socket.AF_INET6) == "::1"
+
+
+def test_reader_joins_lines_split_across_chunks(tmp_path):
+    path = tmp_path / "table"
+    lines = [f"{index:4d}: row {'x' * index}\n" for index in range(50)]
+    path.write_text("  sl  header\n" + "".join(lines))
+
+    # A buffer smaller than some lines forces it to grow
+    reader = SocketTableReader(chunk_size=16)
+    read = b"".join(chunk.tobytes() for chunk in reader.chunks(str(path)))
+
+    assert read.decode() == "".join(lines)
+
+
+def test_reader_skips_missing_tables(tmp_path):
+    assert list(SocketTableReader().chunks(str(tmp_path / "missing"))) == []
+
+
+def test_scan_counts_states_and_owners(proc_root):
+    collector = SocketCollector(top_count=PROCESSES, proc_root=proc_root)
+    collector._reader = SocketTableReader(chunk_size=256)
+
+    result = collector.scan()
+
+    # One listener plus a connection per process, every tenth in TIME_WAIT
+    assert result["tcp"]["total"] == PROCESSES + 1
+    assert result["tcp"]["states"] == {"LISTEN": 1, "ESTABLISHED": 18, "TIME_WAIT": 2}
+    assert result["udp"] == {"total": 1, "bound": 1}
+    assert result["unix"] == {"total": 1, "connected": 0}
+    assert result["listening"] == [
+        {"protocol": "tcp", "address": "0.0.0.0", "port": 22, "pid": 1, "process": "init"},
+        {"protocol": "udp", "address": "0.0.0.0", "port": 53, "pid": None, "process": ""},
+    ]
+    # Every established connection has its peer counted
+    assert sum(peer["connections"] for peer in result["top_peers"]) == 18
+    assert result["top_processes"][0] == {"pid": 1, "name": "init", "sockets": 2}
+    assert result["indexed_sockets"] == PROCESSES + 1
+
+
+def test_scan_without_tables(tmp_path):
+    assert SocketCollector(proc_root=str(tmp_path)).scan() == {"available": False}
@@ -0,0 +1,70 @@
+"""
+Unit tests for the per-thread CPU collector.
+"""
+
+import errno
+import os
+import shutil
+
+import pytest
+
+from monitor.collectors import threads
+from monitor.collectors.descriptors import DescriptorBudget
+from monitor.collectors.fakefs import build_procfs
+from monitor.collectors.threads import ThreadCollector
+
+THREADS = 8
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    """A fake /proc whose PID 2 has THREADS threads."""
+    root = str(tmp_path / "proc")
+    build_procfs(root, cpus=2, processes=2)
+    task = os.path.join(root, "2", "task")
+    for tid in range(100, 100 + THREADS - 1):
+        shutil.copytree(os.path.join(task, "2"), os.path.join(task, str(tid)))
+    return root
+
+
+def test_scan_reads_every_thread(proc_root):
+    budget = DescriptorBudget(1000)
+    collector = ThreadCollector(2, proc_root=proc_root, fd_budget=budget)
+
+    result = collector.scan()
+
+    assert result["thread_count"] == THREADS
+    assert result["name"] == "worker-2"
+    assert budget.held == THREADS
+    collector.close()
+    assert budget.held == 0
+
+
+def test_threads_beyond_budget_are_read_by_path(proc_root):
+    budget = DescriptorBudget(3)
+    collector = ThreadCollector(2, proc_root=proc_root, fd_budget=budget)
+
+    assert collector.scan()["thread_count"] == THREADS
+    assert collector.scan()["thread_count"] == THREADS
+    assert budget.held == 3
+    collector.close()
+
+
+def test_out_of_descriptors_keeps_threads(proc_root, monkeypatch):
+    budget = DescriptorBudget(1000)
+    collector = ThreadCollector(2, proc_root=proc_root, fd_budget=budget)
+    real_open = os.open
+
+    def exhausted_open(path, flags, *args, **kwargs):
+        if kwargs.get("dir_fd") is not None:
+            raise OSError(errno.EMFILE, os.strerror(errno.EMFILE), path)
+        return real_open(path, flags, *args, **kwargs)
+
+    monkeypatch.setattr(threads.os, "open", exhausted_open)
+    first = collector.scan()
+    second = collector.scan()
+
+    assert first["thread_count"] == THREADS
+    assert second["thread_count"] == THREADS
+    assert budget.held == 0
+    collector.close()
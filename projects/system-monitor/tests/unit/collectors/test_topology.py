@@ -0,0 +1,79 @@
+"""
+Unit tests for reading the CPU topology and aggregating along it.
+"""
+
+import os
+
+import pytest
+
+from monitor.collectors import topology
+from monitor.collectors.topology import TopologyAggregator, read_cpu_topology
+
+VALUES = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0]
+
+
+def write(path, text):
+    """Write a sysfs attribute."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text + "\n")
+
+
+@pytest.fixture
+def system_root(tmp_path):
+    """
+    2 sockets x 2 cores x SMT2, with siblings numbered 4 apart as on most
+    x86 machines (CPU n and n + 4 share a core), and the node ids in the
+    opposite order of the sockets.
+    """
+    root = str(tmp_path / "system")
+    for cpu in range(8):
+        first = cpu % 4
+        directory = os.path.join(root, "cpu", f"cpu{cpu}", "topology")
+        write(os.path.join(directory, "physical_package_id"), str(first // 2))
+        write(os.path.join(directory, "core_id"), str(first % 2))
+        write(os.path.join(directory, "thread_siblings_list"), f"{first},{first + 4}")
+    write(os.path.join(root, "node", "node1", "cpulist"), "0-1,4-5")
+    write(os.path.join(root, "node", "node0", "cpulist"), "2-3,6-7")
+    return root
+
+
+def test_parse_cpulist():
+    assert topology.parse_cpulist("0-3,8,10-11") == [0, 1, 2, 3, 8, 10, 11]
+    assert topology.parse_cpulist("") == []
+
+
+def test_read_cpu_topology(system_root):
+    groups = read_cpu_topology(system_root)
+
+    assert groups["socket"] == [0, 0, 1, 1, 0, 0, 1, 1]
+    assert groups["node"] == [1, 1, 0, 0, 1, 1, 0, 0]
+    # core_id repeats across sockets; siblings identify the core
+    assert groups["core"] == [0, 1, 2, 3, 0, 1, 2, 3]
+
+
+def test_aggregate(system_root):
+    aggregator = TopologyAggregator(read_cpu_topology(system_root), len(VALUES))
+
+    result = aggregator.aggregate(VALUES)
+
+    assert result["socket"] == {"ids": [0, 1], "cpus": [4, 4], "mean": [35.0, 55.0], "max": [60.0, 80.0]}
+    assert result["node"] == {"ids": [0, 1], "cpus": [4, 4], "mean": [55.0, 35.0], "max": [80.0, 60.0]}
+    assert result["core"] == {"ids": [0, 1, 2, 3], "cpus": [2, 2, 2, 2],
+                              "mean": [30.0, 40.0, 50.0, 60.0], "max": [50.0, 60.0, 70.0, 80.0]}
+
+
+def test_aggregate_rejects_other_lengths(system_root):
+    aggregator = TopologyAggregator(read_cpu_topology(system_root), len(VALUES))
+
+    assert aggregator.aggregate(VALUES[:-1]) == {}
+    assert aggregator.aggregate(VALUES + [0.0]) == {}
+    assert TopologyAggregator({}, 0).aggregate([]) == {}
+
+
+def test_missing_topology_is_one_group(tmp_path):
+    groups = read_cpu_topology(str(tmp_path))
+    aggregator = TopologyAggregator(groups, 2)
+
+    assert groups == {"socket": [], "node": [], "core": []}
+    assert aggregator.aggregate([10.0, 30.0])["socket"] == {"ids": [0], "cpus": [2], "mean": [20.0], "max": [30.0]}
@@ -0,0 +1,25 @@
+"""
+Unit tests for the Prometheus metric families.
+"""
+
+from monitor.exporters.prometheus import build_families
+
+SAMPLE = {
+    "cpu": {"frequency": {"current_mhz": 2400.0}},
+    "disk": {"read_speed": 1.5, "write_speed": None},
+    "network": {"download_speed": 2.0, "interfaces": {"eth0": {"upload_speed": 0.5, "errors": 3}}},
+}
+
+
+def test_metrics_use_base_units():
+    values = {family.name: family.samples for family in build_families(SAMPLE) if family.samples}
+
+    assert values["system_monitor_cpu_frequency_hertz"] == [("", "", 2.4e9)]
+    assert values["system_monitor_disk_read_bytes_per_second"] == [("", "", 1.5 * 2 ** 20)]
+    assert values["system_monitor_network_download_bytes_per_second"] == [("", "", 2.0 * 2 ** 20)]
+    assert values["system_monitor_network_interface_upload_bytes_per_second"] == [
+        ("", '{interface="eth0"}', 0.5 * 2 ** 20)]
+    assert values["system_monitor_network_interface_errors"] == [("", '{interface="eth0"}', 3)]
+    # Missing values are left out rather than exported as zero
+    assert "system_monitor_disk_write_bytes_per_second" not in values
+    assert not any(name.endswith("_speed") or name.endswith("_mhz") for name in values)
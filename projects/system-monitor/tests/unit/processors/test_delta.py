@@ -0,0 +1,122 @@
+"""
+Unit tests for the sample delta tracker.
+"""
+
+import copy
+import random
+
+from monitor.processors.delta import DeltaTracker, appended_points
+from monitor.transport.protocol import flatten
+
+
+def sample(index: int):
+    """A small processed sample."""
+    return {
+        "cpu": {"usage_percent": 10.0, "load_avg": {"1min": 0.5}, "history": [1.0, 2.0]},
+        "memory": {"usage_percent": 40.0, "history": [3.0]},
+        "disks": {"/": {"usage_percent": 50.0}, "/var": {"usage_percent": 20.0}},
+        "system": {"timestamp": 1700000000.0 + index, "hostname": "alpha"},
+    }
+
+
+def reference_delta(old, new):
+    """Changed and removed paths as a comparison of every flattened leaf finds them."""
+    old_flat, new_flat = flatten(old), flatten(new)
+    missing = object()
+    changed = {path: value for path, value in new_flat.items() if old_flat.get(path, missing) != value}
+    removed = sorted(path for path in old_flat if path not in new_flat)
+    return changed, removed
+
+
+def test_first_delta_is_full():
+    delta = DeltaTracker().update(sample(0))
+
+    assert delta.full
+    assert delta.changed == flatten(sample(0))
+    assert delta.replaced == {"cpu.history": [1.0, 2.0], "memory.history": [3.0]}
+
+
+def test_only_changed_leaves_are_reported():
+    tracker = DeltaTracker()
+    tracker.update(sample(0))
+    current = sample(1)
+    current["disks"]["/var"]["usage_percent"] = 21.0
+
+    delta = tracker.update(current)
+
+    assert delta.changed == {"system.timestamp": 1700000001.0, "disks./var.usage_percent": 21.0}
+    assert delta.removed == []
+    assert delta.sections == {"system", "disks"}
+
+
+def test_unchanged_sample_is_empty():
+    tracker = DeltaTracker()
+    tracker.update(sample(0))
+
+    assert not tracker.update(sample(0))
+
+
+def test_subtrees_that_change_shape():
+    tracker = DeltaTracker()
+    tracker.update(sample(0))
+    current = sample(0)
+    del current["disks"]["/var"]
+    current["memory"]["swap"] = {"used": 1}
+    current["cpu"]["load_avg"] = None
+
+    delta = tracker.update(current)
+
+    assert delta.changed == {"memory.swap.used": 1, "cpu.load_avg": None}
+    assert sorted(delta.removed) == ["cpu.load_avg.1min", "disks./var.usage_percent"]
+
+
+def test_history_points_are_appended():
+    tracker = DeltaTracker()
+    tracker.update(sample(0))
+    current = sample(0)
+    current["cpu"]["history"] = [2.0, 5.0]
+    del current["memory"]
+
+    delta = tracker.update(current)
+
+    assert delta.appended == {"cpu.history": [5.0]}
+    assert "memory.history" in delta.removed
+    assert "memory.usage_percent" in delta.removed
+
+
+def test_appended_points():
+    assert appended_points(None, [1, 2]) is None
+    assert appended_points([1, 2, 3], [2, 3, 4]) == [4]
+    assert appended_points([1, 2], [1, 2, 3]) == [3]
+    # A series that shrank was reset
+    assert appended_points([1, 2], [1], limit=2) is None
+
+
+def test_matches_a_full_comparison():
+    rng = random.Random(7)
+    tracker = DeltaTracker()
+    previous = sample(0)
+    tracker.update(previous)
+    for _ in range(500):
+        current = copy.deepcopy(previous)
+        for _ in range(rng.randrange(4)):
+            section = rng.choice(["cpu", "memory", "disks", "system", "extra"])
+            if not isinstance(current.get(section), dict):
+                current[section] = {}
+            action = rng.random()
+            if action < 0.5:
+                current[section][f"k{rng.randrange(3)}"] = rng.randrange(3)
+            elif action < 0.7:
+                current[section][f"k{rng.randrange(3)}"] = {"x.y": rng.randrange(2)}
+            elif action < 0.85:
+                current.pop(section, None)
+            else:
+                current[section] = rng.randrange(2)
+
+        delta = tracker.update(current)
+
+        changed, removed = reference_delta(previous, current)
+        assert delta.changed == changed
+        assert sorted(path for path in delta.removed if not path.endswith(".history")) == removed
+        previous = current
+
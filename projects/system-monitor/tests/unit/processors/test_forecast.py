@@ -0,0 +1,80 @@
+"""
+Unit tests for the time-to-full forecaster.
+"""
+
+import pytest
+
+from monitor.processors.forecast import TrendForecaster, format_duration
+
+
+def feed(forecaster, series, start=0, end=1000, step=10):
+    """Update the forecaster with each series as a function of time; return the last result."""
+    result = None
+    for timestamp in range(start, end + 1, step):
+        result = forecaster.update(float(timestamp), {key: value(timestamp) for key, value in series.items()})
+    return result
+
+
+def test_linear_fill_is_projected():
+    forecaster = TrendForecaster(window=600)
+
+    result = feed(forecaster, {"/": lambda t: 50 + 0.01 * t, "/var": lambda t: 70 - 0.001 * t})
+
+    # 40 points left at 0.01 per second
+    assert result["/"] == pytest.approx(4000)
+    assert result["/var"] is None
+
+
+def test_short_history_is_not_trusted():
+    forecaster = TrendForecaster(window=600)
+
+    result = feed(forecaster, {"/": lambda t: 50 + 0.01 * t}, end=60)
+
+    assert result["/"] is None
+
+
+def test_full_and_slow_series():
+    forecaster = TrendForecaster(window=600)
+
+    result = feed(forecaster, {"full": lambda t: 100.0, "slow": lambda t: 10 + 1e-6 * t})
+
+    assert result["full"] == 0.0
+    # Beyond the forecast horizon
+    assert result["slow"] is None
+
+
+def test_cleanup_restarts_the_fit():
+    forecaster = TrendForecaster(window=600)
+    feed(forecaster, {"/": lambda t: 50 + 0.01 * t})
+
+    result = forecaster.update(1010.0, {"/": 40.0})
+
+    assert result["/"] is None
+
+
+def test_missing_series_starts_over():
+    forecaster = TrendForecaster(window=600)
+    feed(forecaster, {"/": lambda t: 50 + 0.01 * t, "/mnt": lambda t: 50 + 0.01 * t})
+    feed(forecaster, {"/": lambda t: 50 + 0.01 * t}, start=1010, end=1100)
+
+    result = forecaster.update(1110.0, {"/": 61.1, "/mnt": 61.1})
+
+    assert result["/"] == pytest.approx(3900, rel=0.05)
+    assert result["/mnt"] is None
+
+
+def test_clock_going_backwards_and_reset():
+    forecaster = TrendForecaster(window=600)
+    feed(forecaster, {"/": lambda t: 50 + 0.01 * t})
+    assert forecaster.update(500.0, {"/": 60.0})["/"] is None
+
+    forecaster.reset()
+    assert forecaster.update(0.0, {}) == {}
+    assert feed(forecaster, {"/": lambda t: 50 + 0.01 * t})["/"] == pytest.approx(4000)
+
+
+def test_format_duration():
+    assert format_duration(59) == "0m"
+    assert format_duration(12 * 60 + 30) == "12m"
+    assert format_duration(95 * 60) == "1h 35m"
+    assert format_duration(3 * 86400 + 4 * 3600 + 59) == "3d 4h"
@@ -0,0 +1,99 @@
+"""
+Unit tests for batch output.
+"""
+
+import os
+
+import psutil
+import pytest
+
+from monitor import batch
+from monitor.batch import BatchSampler, format_json, format_text, parse_process_stat
+from monitor.collectors.fakefs import build_procfs, build_sysfs
+
+STAT = """cpu  {0}
+cpu0 {0}
+intr 1000 0 0
+ctxt 2000
+"""
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    """A fake 4-CPU machine with 10 processes, and no first-sample wait."""
+    proc_root, sys_root = str(tmp_path / "proc"), str(tmp_path / "sys")
+    build_procfs(proc_root, 4, processes=10)
+    build_sysfs(sys_root, 4)
+    monkeypatch.setattr(batch, "FIRST_SAMPLE_WINDOW", 0.0)
+    return proc_root, sys_root
+
+
+def test_parse_process_stat():
+    data = b"42 (a (b) c) S 1 42 42 0 -1 0 0 0 0 0 300 100 0 0 20 0 1 0 500 1000 25 0\n"
+
+    name, cpu_seconds, start_time, rss = parse_process_stat(data)
+
+    assert name == "a (b) c"
+    assert cpu_seconds == pytest.approx(400 / os.sysconf("SC_CLK_TCK"))
+    assert start_time == pytest.approx(500 / os.sysconf("SC_CLK_TCK"))
+    assert rss == 25 * os.sysconf("SC_PAGE_SIZE")
+
+
+def test_sample_reads_the_configured_root_only(roots):
+    procfs_path = psutil.PROCFS_PATH
+    sampler = BatchSampler(roots[0], 3, roots[1])
+
+    sample = sampler.sample()
+    sampler.close()
+
+    assert psutil.PROCFS_PATH == procfs_path
+    assert sample["hostname"] == "fake-4c"
+    assert sample["uptime"] == pytest.approx(123456.78)
+    assert len(sample["cpu"]["per_core_percent"]) == 4
+    assert sample["memory"]["total"] == 4 * 4 * 1024 ** 3
+    assert sample["memory"]["usage_percent"] == 50.0
+    assert len(sample["processes"]) == 3
+    assert format_text(sample).endswith("\n")
+    assert format_json(sample).count("\n") == 1
+
+
+def test_first_sample_is_measured_over_a_window(roots, monkeypatch):
+    proc_root, sys_root = roots
+    stat_path = os.path.join(proc_root, "stat")
+    with open(stat_path, "w") as f:
+        # Mostly busy since boot
+        f.write(STAT.format("9000 0 0 1000 0 0 0 0 0 0"))
+    sampler = BatchSampler(proc_root, 0, sys_root)
+
+    def idle_window(seconds):
+        with open(stat_path, "w") as f:
+            f.write(STAT.format("9000 0 0 1100 0 0 0 0 0 0"))
+
+    monkeypatch.setattr(batch.time, "sleep", idle_window)
+    sample = sampler.sample()
+    sampler.close()
+
+    # Idle during the window, not 90% busy as averaged since boot
+    assert sample["cpu"]["usage_percent"] == 0.0
+
+
+def test_new_process_is_measured_over_the_interval(roots, monkeypatch):
+    proc_root, sys_root = roots
+    clock = [1000.0]
+    monkeypatch.setattr(batch.time, "time", lambda: clock[0])
+    sampler = BatchSampler(proc_root, 20, sys_root)
+    sampler.sample()
+
+    # Two processes started a few ticks ago: one busy for 2 of the 10
+    # seconds, one whose tick-rounded CPU time exceeds the whole machine
+    start = int(123456.78 * batch.CLOCK_TICKS) - 3
+    for pid, ticks in ((500, 2 * batch.CLOCK_TICKS), (501, 60 * batch.CLOCK_TICKS)):
+        os.makedirs(os.path.join(proc_root, str(pid)))
+        with open(os.path.join(proc_root, str(pid), "stat"), "w") as f:
+            f.write(f"{pid} (new-{pid}) R 1 {pid} {pid} 0 -1 0 0 0 0 0 {ticks} 0 0 0 20 0 1 0 {start} 1000 10 0\n")
+    clock[0] += 10.0
+    processes = {process["pid"]: process for process in sampler.sample()["processes"]}
+    sampler.close()
+
+    assert processes[500]["cpu_percent"] == 20.0
+    assert processes[501]["cpu_percent"] == 400.0
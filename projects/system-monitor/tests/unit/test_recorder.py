@@ -0,0 +1,82 @@
+"""
+Unit tests for the high-frequency recorder.
+"""
+
+import numpy as np
+import pytest
+
+from monitor.collectors.fakefs import build_procfs
+from monitor.recorder import Recorder, open_recording
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    """A fake /proc with 4 CPUs."""
+    root = str(tmp_path / "proc")
+    build_procfs(root, cpus=4)
+    return root
+
+
+def synthetic_rows(recorder, count, start=0):
+    """Rows one second apart with a recognisable value in every column."""
+    rows = np.zeros((count, len(recorder.columns)))
+    rows[:, 0] = np.arange(start, start + count)
+    rows[:, 1] = 0.001
+    rows[:, 2:] = np.arange(start, start + count)[:, None]
+    return rows
+
+
+def test_long_capture_buffers_one_chunk(proc_root):
+    # A month at 1 Hz buffers at most a minute of samples
+    recorder = Recorder(1.0, 30 * 86400, ["cpu"], proc_root)
+    assert recorder.buffer.shape == (60, len(recorder.columns))
+    recorder.close()
+
+
+def test_appended_chunks_read_back(proc_root, tmp_path):
+    path = str(tmp_path / "long.rec")
+    recorder = Recorder(1.0, 1000, ["cpu"], proc_root)
+    recorder.open(path)
+    for start in range(0, 1000, 100):
+        recorder.append(synthetic_rows(recorder, 100, start))
+    header = recorder.finish()
+    recorder.close()
+
+    read_header, rows = open_recording(path)
+    assert read_header == header
+    assert rows.shape == (1000, len(recorder.columns))
+    np.testing.assert_array_equal(rows[:, 2], np.arange(1000))
+
+    statistics = header["statistics"]
+    assert statistics["samples"] == 1000
+    assert statistics["interval_mean"] == pytest.approx(1.0)
+    assert statistics["interval_stddev"] == pytest.approx(0.0, abs=1e-6)
+    assert statistics["lateness_p50"] == pytest.approx(0.001, rel=0.01)
+
+
+def test_unfinished_recording_keeps_written_rows(proc_root, tmp_path):
+    path = str(tmp_path / "crashed.rec")
+    recorder = Recorder(1.0, 1000, ["cpu"], proc_root)
+    recorder.open(path)
+    recorder.append(synthetic_rows(recorder, 120))
+    # The writer dies: the header is never rewritten
+
+    header, rows = open_recording(path)
+    assert header["rows"] == 120
+    assert header["statistics"] is None
+    np.testing.assert_array_equal(rows[:, 2], np.arange(120))
+    recorder.close()
+
+
+def test_run_writes_every_chunk(proc_root, tmp_path):
+    path = str(tmp_path / "run.rec")
+    recorder = Recorder(1000.0, 0.05, ["cpu"], proc_root, chunk_bytes=1024)
+    assert len(recorder.buffer) < recorder.capacity
+    recorder.open(path)
+    recorder.run()
+    header = recorder.finish()
+    recorder.close()
+
+    _, rows = open_recording(path)
+    assert header["rows"] == header["statistics"]["samples"] == len(rows) == recorder.capacity
+    assert np.all(np.diff(rows[:, 0]) > 0)
@@ -0,0 +1,164 @@
+"""
+Unit tests for the sample transport protocol.
+"""
+
+import pytest
+
+from monitor.processors.delta import DeltaTracker
+from monitor.transport.protocol import (
+    FRAME_SNAPSHOT,
+    MAX_KEYS,
+    FrameBuffer,
+    ProtocolError,
+    SampleDecoder,
+    SampleEncoder,
+    escape_key,
+    flatten,
+    pack_hello,
+    split_path,
+    unflatten,
+    unpack_hello,
+)
+
+DOTTED_SAMPLE = {
+    "disk": {
+        "partitions": {
+            "/mnt/data.v2": {"usage_percent": 12.5},
+            "/mnt/data": {"v2": {"usage_percent": 99.0}},
+            "/var/lib/kubelet/pods/x/volumes/kubernetes.io~secret/token": {"usage_percent": 1.0},
+        },
+    },
+    "network": {"interfaces": {"eth0.100": {"download_speed": 1.5}, "eth0": {"100": 7}}},
+    "odd": {"back\\slash": 1, "trailing.": 2, ".": 3, "": 4},
+}
+
+
+def frames(data: bytes):
+    """Split encoded bytes into (frame type, payload) tuples."""
+    return FrameBuffer().feed(data)
+
+
+class Link:
+    """An encoder and a decoder fed through the same stream of samples."""
+
+    def __init__(self):
+        self.tracker = DeltaTracker()
+        self.encoder = SampleEncoder()
+        self.decoder = SampleDecoder()
+
+    def send(self, sample, timestamp=0.0):
+        for frame_type, payload in frames(self.encoder.update(self.tracker.update(sample), timestamp)):
+            self.decoder.apply(frame_type, payload)
+        return self.decoder.sample()
+
+    def snapshot(self):
+        decoder = SampleDecoder()
+        for frame_type, payload in frames(self.encoder.snapshot()):
+            decoder.apply(frame_type, payload)
+        return decoder.sample()
+
+
+@pytest.mark.parametrize("key", ["plain", "eth0.100", "a\\b", "a\\.b", "trailing\\", ".", ""])
+def test_split_path_inverts_escape_key(key):
+    assert split_path(f"{escape_key(key)}.{escape_key('x.y')}") == [key, "x.y"]
+
+
+def test_flatten_keeps_dotted_keys_apart():
+    flat = flatten(DOTTED_SAMPLE)
+
+    assert flat["disk.partitions./mnt/data\\.v2.usage_percent"] == 12.5
+    assert flat["disk.partitions./mnt/data.v2.usage_percent"] == 99.0
+    assert unflatten(flat) == DOTTED_SAMPLE
+
+
+def test_flatten_converts_keys_to_strings():
+    assert unflatten(flatten({"cpu": {0: 1.0, 1: 2.0}})) == {"cpu": {"0": 1.0, "1": 2.0}}
+
+
+def test_round_trip_with_dotted_keys():
+    link = Link()
+
+    assert link.send(DOTTED_SAMPLE) == DOTTED_SAMPLE
+    assert link.snapshot() == DOTTED_SAMPLE
+
+
+def test_round_trip_of_deltas_and_removals():
+    link = Link()
+    link.send({"cpu": {"usage_percent": 10.0, "count": 4}, "system": {"hostname": "alpha"}})
+
+    sample = link.send({"cpu": {"usage_percent": 20.0, "count": 4}})
+
+    assert sample == {"cpu": {"usage_percent": 20.0, "count": 4}}
+    assert link.snapshot() == sample
+
+
+def test_long_paths_are_not_truncated():
+    prefix = "p" * 300
+    sample = {"disk": {"partitions": {f"{prefix}a": {"used": 1}, f"{prefix}b": {"used": 2}}}}
+    link = Link()
+
+    assert link.send(sample) == sample
+    assert link.snapshot() == sample
+
+
+def test_key_ids_are_recycled():
+    link = Link()
+    # Far more distinct keys over time than there are ids, few at a time
+    for generation in range(MAX_KEYS // 1000 + 5):
+        sample = {"processes": {f"pid{generation}_{index}": index for index in range(1000)}}
+        assert link.send(sample, float(generation)) == sample
+
+    assert len(link.encoder._key_defs) <= 2000
+    assert link.snapshot() == sample
+
+
+def test_removed_and_new_keys_in_consecutive_frames():
+    link = Link()
+    link.send({"a": 1, "b": 2})
+    link.send({"a": 1, "c": 3})
+
+    # The id freed by "b" goes to "d", and "c" must keep its own
+    assert link.send({"a": 1, "c": 3, "d": 4}) == {"a": 1, "c": 3, "d": 4}
+    assert link.send({"c": 5, "d": 4}) == {"c": 5, "d": 4}
+
+
+def test_full_key_table_drops_values_instead_of_failing():
+    link = Link()
+    sample = {"keys": {str(index): index for index in range(MAX_KEYS + 10)}}
+
+    received = link.send(sample)
+
+    assert len(received["keys"]) == MAX_KEYS
+
+
+def test_number_lists_keep_their_precision():
+    sample = {
+        "counters": {"values": [1 << 40, (1 << 24) + 1, -5, 0]},
+        "sizes": {"values": [16777217.0, 2.5e12]},
+        "small": {"values": [0.5, 1.25]},
+        "cpu": {"per_core_percent": [12.34, 100.0]},
+    }
+    received = Link().send(sample)
+
+    assert received["counters"]["values"] == [1 << 40, (1 << 24) + 1, -5, 0]
+    assert all(isinstance(value, int) for value in received["counters"]["values"])
+    assert received["sizes"]["values"] == [16777217.0, 2.5e12]
+    assert received["small"]["values"] == [0.5, 1.25]
+    assert received["cpu"]["per_core_percent"] == [12.34, 100.0]
+
+
+def test_values_outside_fixed_encodings():
+    sample = {"big": {"int": 1 << 70, "text": "x" * 70000, "mixed": [1, "a", None]}}
+
+    assert Link().send(sample) == sample
+
+
+def test_hello_round_trip():
+    (frame_type, payload), = frames(pack_hello("alpha"))
+
+    assert unpack_hello(payload)[1] == "alpha"
+
+
+def test_malformed_frame():
+    with pytest.raises(ProtocolError):
+        SampleDecoder().apply(FRAME_SNAPSHOT, b"\x00" * 5)
@@ -0,0 +1,184 @@
+"""
+Unit tests for the shared sample ring.
+"""
+
+import os
+import stat
+
+import pytest
+
+from monitor.processors.delta import DeltaTracker
+from monitor.transport.shm import (
+    HEADER_SIZE,
+    SampleRingReader,
+    SampleRingWriter,
+    SharedSampleSource,
+    default_ring_path,
+    settings_digest,
+)
+
+DIGEST = settings_digest({"proc_root": "/proc"})
+
+
+def sample(index: int):
+    """A small processed sample."""
+    return {
+        "cpu": {"usage_percent": float(index), "history": [float(i) for i in range(index + 1)]},
+        "system": {"timestamp": 1700000000.0 + index, "hostname": "alpha"},
+    }
+
+
+class FakePipeline:
+    """Stands in for MonitorPipeline, counting its samples."""
+
+    def __init__(self):
+        self.tracker = DeltaTracker()
+        self.count = 0
+
+    def sample(self):
+        self.count += 1
+        return self.tracker.update(sample(self.count))
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def ring_path(tmp_path):
+    return str(tmp_path / "ring")
+
+
+@pytest.fixture
+def writer(ring_path):
+    writer = SampleRingWriter(ring_path, slot_count=4, slot_size=64 * 1024)
+    assert writer.open(1.0, DIGEST)
+    yield writer
+    writer.close()
+
+
+def publish(writer, tracker, index):
+    data = sample(index)
+    writer.publish(tracker.update(data))
+    return data
+
+
+def test_default_ring_path_is_per_user(monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert default_ring_path() == "/run/user/1000/linux-system-monitor.ring"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert default_ring_path() == f"/dev/shm/linux-system-monitor-{os.geteuid()}.ring"
+
+
+def test_ring_is_private(writer, ring_path):
+    assert stat.S_IMODE(os.stat(ring_path).st_mode) == 0o600
+
+
+def test_reader_decodes_newest_sample(writer, ring_path):
+    reader = SampleRingReader(ring_path)
+    assert reader.open(DIGEST)
+    assert reader.latest() is None
+
+    tracker = DeltaTracker()
+    for index in range(1, 7):
+        data = publish(writer, tracker, index)
+
+    assert reader.latest() == data
+    assert reader.sequence == 6
+    reader.close()
+
+
+def test_reader_skips_slot_being_written(writer, ring_path):
+    tracker = DeltaTracker()
+    first = publish(writer, tracker, 1)
+    reader = SampleRingReader(ring_path)
+    assert reader.open(DIGEST)
+    assert reader.latest() == first
+
+    publish(writer, tracker, 2)
+    # Mark the newest slot as mid-write, as the writer does before copying
+    offset = HEADER_SIZE + (2 % writer.slot_count) * writer.slot_size
+    state = int.from_bytes(writer._mm[offset:offset + 8], "little")
+    writer._mm[offset:offset + 8] = (state - 1).to_bytes(8, "little")
+
+    assert reader.latest() == first
+    assert reader.sequence == 1
+    reader.close()
+
+
+def test_reader_needs_matching_settings(writer, ring_path):
+    assert not SampleRingReader(ring_path).open(settings_digest({"proc_root": "/host/proc"}))
+
+
+def test_reader_refuses_ring_others_can_write(writer, ring_path):
+    os.chmod(ring_path, 0o666)
+
+    assert not SampleRingReader(ring_path).open(DIGEST)
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="needs root to hand the ring to another user")
+def test_ring_of_another_user_is_not_used(ring_path):
+    with open(ring_path, "wb"):
+        pass
+    os.chmod(ring_path, 0o600)
+    os.chown(ring_path, 4242, 4242)
+
+    assert not SampleRingWriter(ring_path).open(1.0, DIGEST)
+    assert not SampleRingReader(ring_path).open(DIGEST)
+
+
+def test_writer_does_not_follow_symlinks(tmp_path):
+    target = tmp_path / "elsewhere"
+    target.write_bytes(b"")
+    link = tmp_path / "ring"
+    link.symlink_to(target)
+
+    assert not SampleRingWriter(str(link)).open(1.0, DIGEST)
+
+
+def test_only_one_writer(writer, ring_path):
+    assert not SampleRingWriter(ring_path).open(1.0, DIGEST)
+
+
+def test_shared_source_roles(ring_path):
+    settings = {"proc_root": "/proc"}
+    publisher = SharedSampleSource(FakePipeline, 1.0, ring_path, settings)
+    reader = SharedSampleSource(FakePipeline, 1.0, ring_path, settings)
+    other = SharedSampleSource(FakePipeline, 1.0, ring_path, {"proc_root": "/host/proc"})
+    try:
+        assert publisher.role == "publisher"
+        assert reader.role == "reader"
+        assert reader.pipeline is None
+        assert other.role == "local"
+
+        delta = publisher.sample()
+        received = reader.sample()
+        assert received.sample == delta.sample
+        assert received.full
+        assert reader.sample() is None
+    finally:
+        for source in (publisher, reader, other):
+            source.close()
+
+
+def test_reader_leaves_publisher_with_other_settings(ring_path):
+    publisher = SharedSampleSource(FakePipeline, 1.0, ring_path, {"proc_root": "/proc"})
+    reader = SharedSampleSource(FakePipeline, 1.0, ring_path, {"proc_root": "/proc"})
+    try:
+        publisher.sample()
+        reader.sample()
+
+        # A publisher with other settings takes over the ring
+        publisher.close()
+        replacement = SharedSampleSource(FakePipeline, 1.0, ring_path, {"proc_root": "/host/proc"})
+        replacement.sample()
+
+        assert reader.sample() is not None
+        assert reader.role == "local"
+        replacement.close()
+    finally:
+        publisher.close()
+        reader.close()
@@ -0,0 +1,48 @@
+"""
+Unit tests for the dashboard's incremental redraw.
+"""
+
+import contextlib
+import io
+
+import pytest
+from blessed import Terminal
+
+from monitor.config import Config
+from monitor.processors.delta import DeltaTracker
+from monitor.ui.dashboard import Dashboard
+from monitor.ui.layout_manager import LayoutManager
+
+SAMPLE = {
+    "memory": {"usage_percent": 45.2, "used": 4.5, "total": 15.8},
+    "system": {"timestamp": 1700000000.0, "hostname": "alpha"},
+}
+
+
+@pytest.fixture
+def dashboard(monkeypatch):
+    """A dashboard rendering into a buffer."""
+    monkeypatch.setenv("COLUMNS", "120")
+    monkeypatch.setenv("LINES", "40")
+    term = Terminal(kind="xterm-256color", stream=io.StringIO(), force_styling=True)
+    config = Config()
+    return Dashboard(term, LayoutManager(term, config.display.layout), config)
+
+
+def update(dashboard, delta):
+    """Update the dashboard and return what it wrote."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        dashboard.update(delta)
+    return buffer.getvalue()
+
+
+def test_unchanged_sample_redraws_only_the_clock(dashboard, monkeypatch):
+    tracker = DeltaTracker()
+    assert dashboard.term.clear in update(dashboard, tracker.update(SAMPLE))
+
+    monkeypatch.setattr("time.localtime", lambda *args: (2024, 1, 2, 3, 4, 5, 1, 2, 0))
+    output = update(dashboard, tracker.update(SAMPLE))
+
+    assert "2024-01-02 03:04:05" in output
+    assert dashboard.term.clear not in output
@@ -0,0 +1,101 @@
+"""
+Unit tests for the fleet view's drill-down into a single host.
+"""
+
+import contextlib
+import io
+
+import pytest
+from blessed import Terminal
+
+from monitor.config import Config
+from monitor.processors.resource_processor import ResourceProcessor
+from monitor.transport.fleet import FleetClient
+from monitor.transport.protocol import FRAME_DELTA, SampleEncoder
+from monitor.ui.fleet_view import FleetView
+
+RAW_SAMPLE = {
+    "memory": {"usage_percent": 45.2, "used": 4.5, "total": 15.8},
+    "disk": {"usage_percent": 32.8, "read_speed": 15.6, "write_speed": 8.3},
+    "timestamp": 1700000000.0,
+}
+
+
+@pytest.fixture
+def publisher():
+    """Encode processed samples the way an agent publishes them."""
+    processor = ResourceProcessor()
+    encoder = SampleEncoder()
+
+    def publish(raw):
+        processed = processor.process(raw)
+        frame = encoder.update(processor.delta(processed), raw["timestamp"])
+        # Strip the length prefix and frame type
+        return frame[5:]
+
+    return publish
+
+
+@pytest.fixture
+def view(monkeypatch):
+    """A fleet view over two hosts, rendering into a buffer."""
+    monkeypatch.setenv("COLUMNS", "160")
+    monkeypatch.setenv("LINES", "50")
+    term = Terminal(kind="xterm-256color", stream=io.StringIO(), force_styling=True)
+    client = FleetClient(["unix:/run/a.sock", "unix:/run/b.sock"])
+    client.hosts["unix:/run/a.sock"].hostname = "alpha"
+    client.hosts["unix:/run/b.sock"].hostname = "beta"
+    return FleetView(term, client, Config())
+
+
+def render(view):
+    """Render the view and return what it wrote."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        view.render()
+    return buffer.getvalue()
+
+
+def test_drill_down_renders_host_dashboard(view, publisher):
+    host = view.client.hosts["unix:/run/a.sock"]
+    host.apply(FRAME_DELTA, publisher(RAW_SAMPLE))
+
+    view.drill_down()
+    assert view.drill_host is host
+
+    output = render(view)
+
+    assert "CPU Usage" in output
+    assert view.dashboard.widgets["memory"]["data"]["usage_percent"] == 45.2
+
+
+def test_drill_down_follows_new_samples(view, publisher):
+    host = view.client.hosts["unix:/run/a.sock"]
+    host.apply(FRAME_DELTA, publisher(RAW_SAMPLE))
+    view.drill_down()
+    render(view)
+
+    # An unchanged host only has its clock redrawn
+    output = render(view)
+    assert "Linux System Monitor" in output
+    assert view.term.clear not in output
+
+    host.apply(FRAME_DELTA, publisher(dict(RAW_SAMPLE, memory={"usage_percent": 50.0, "used": 5.0, "total": 15.8},
+                                           timestamp=1700000001.0)))
+    assert render(view)
+    assert view.dashboard.widgets["memory"]["data"]["usage_percent"] == 50.0
+
+
+def test_drill_down_into_another_host_starts_over(view, publisher):
+    alpha = view.client.hosts["unix:/run/a.sock"]
+    alpha.apply(FRAME_DELTA, publisher(RAW_SAMPLE))
+    view.drill_down()
+    render(view)
+    view.back()
+
+    # beta never sent a sample; none of alpha's data may carry over
+    view.move_selection(1)
+    view.drill_down()
+    assert view.drill_host.hostname == "beta"
+    render(view)
+    assert not view.dashboard.widgets["memory"]["data"]